@@ -0,0 +1,164 @@
+"""
+This script compares how long it takes to load compiled bytecode from the binary
+`.monkeybyte` format, and from the pickle-based format that it replaced.
+
+Large programs are generated by repeating a template of functions, strings and integers,
+so that the constant pool grows with the size of the program. Each program is compiled
+once, written out in both formats, and then loaded back several times; the fastest load
+is reported, along with the size of each file.
+
+The time to map the binary file with `map_bytecode()` is reported as well; it creates no
+constants at all until the program runs, so it doesn't grow with the number of constants.
+
+The pickled data has the layout that the old format used: a list holding the instructions
+of the main program, followed by one entry per constant (an int, a str, or a tuple of the
+instructions, the number of locals, the number of arguments, and the name of a function).
+
+usage: python bytecode_loading.py [--sizes N [N ...]] [--trials N]
+"""
+
+import argparse
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Sequence
+
+from monkey import Lexer
+from monkey import Parser
+from monkey.parser.parser import parse_program
+
+import monkey.object as objs
+
+from monkey.code import Instructions
+from monkey.compiler import Bytecode
+from monkey.compiler import bytecode_from_compiler
+from monkey.compiler import Compiler
+from monkey.compiler import compile
+from monkey.serialize.mapped_bytecode import map_bytecode
+from monkey.serialize.serialize import deserialize_bytecode
+from monkey.serialize.serialize import serialize_bytecode
+
+# every copy has its own numbers and strings, so that interning doesn't collapse them
+TEMPLATE = """
+let function_{i} = fn(a, b) {{
+    let total = a + b * {i};
+    if (total > {i}) {{
+        return "large result of function {i}";
+    }}
+    let inner = fn(x) {{ x - {i} + total }};
+    inner(total)
+}};
+function_{i}({i}, {i} + 1);
+"""
+
+DEFAULT_SIZES = [100, 1000, 5000]
+
+
+def generate_program(n_copies: int) -> str:
+    return "".join(TEMPLATE.format(i=i) for i in range(n_copies))
+
+
+def compile_program(source: str) -> Bytecode:
+    program = parse_program(Parser(Lexer(source)))
+    compiler = Compiler()
+    compile(compiler, program)
+    return bytecode_from_compiler(compiler)
+
+
+def pickle_bytecode(bytecode: Bytecode, filepath: Path) -> None:
+    data: list[Any] = [bytecode.instructions]
+    for constant in bytecode.constants:
+        match constant:
+            case objs.IntegerObject() | objs.StringObject():
+                data.append(constant.value)
+            case objs.CompiledFunctionObject():
+                data.append((constant.instructions, constant.n_locals, constant.n_arguments, constant.name))
+
+    with open(filepath, "wb") as fout:
+        pickle.dump(data, fout)
+
+
+def unpickle_bytecode(filepath: Path) -> Bytecode:
+    with open(filepath, "rb") as fin:
+        data: list[Any] = pickle.load(fin)
+
+    constants: list[objs.Object] = []
+    for constant in data[1:]:
+        match constant:
+            case int():
+                constants.append(objs.integer_object(constant))
+            case str():
+                constants.append(objs.StringObject(constant))
+            case [Instructions(), int(), int(), (str() | None)]:
+                instructions, n_locals, n_arguments, name = constant
+                constants.append(objs.CompiledFunctionObject(instructions, n_locals, n_arguments, name))
+
+    return Bytecode(data[0], constants)
+
+
+def fastest_load(load: Callable[[], Bytecode], n_trials: int) -> float:
+    best_time = float("inf")
+    for _ in range(n_trials):
+        start = time.perf_counter()
+        load()
+        best_time = min(best_time, time.perf_counter() - start)
+
+    return best_time
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare loading bytecode from the binary format and from pickle."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="number of copies of the template in each generated program",
+    )
+    parser.add_argument("--trials", type=int, default=5, help="number of timed loads; the fastest is kept")
+    args = parser.parse_args(argv)
+
+    header = (
+        f"{'copies':>8}{'constants':>12}{'binary KiB':>12}{'pickle KiB':>12}"
+        f"{'binary ms':>12}{'pickle ms':>12}{'speedup':>10}{'mapped ms':>12}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    with tempfile.TemporaryDirectory() as directory:
+        binary_filepath = Path(directory) / "program.monkeybyte"
+        pickle_filepath = Path(directory) / "program.pickle"
+
+        for n_copies in args.sizes:
+            bytecode = compile_program(generate_program(n_copies))
+            serialize_bytecode(bytecode, binary_filepath)
+            pickle_bytecode(bytecode, pickle_filepath)
+
+            # both formats must load the same program
+            binary_constants = deserialize_bytecode(binary_filepath).constants
+            assert binary_constants == unpickle_bytecode(pickle_filepath).constants
+
+            binary_seconds = fastest_load(lambda: deserialize_bytecode(binary_filepath), args.trials)
+            pickle_seconds = fastest_load(lambda: unpickle_bytecode(pickle_filepath), args.trials)
+            mapped_seconds = fastest_load(lambda: map_bytecode(binary_filepath), args.trials)
+
+            binary_kib = binary_filepath.stat().st_size / 1024
+            pickle_kib = pickle_filepath.stat().st_size / 1024
+            print(
+                f"{n_copies:>8}{len(bytecode.constants):>12}{binary_kib:>12.1f}{pickle_kib:>12.1f}"
+                f"{1000 * binary_seconds:>12.2f}{1000 * pickle_seconds:>12.2f}"
+                f"{pickle_seconds / binary_seconds:>10.2f}{1000 * mapped_seconds:>12.3f}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
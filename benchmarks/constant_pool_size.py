@@ -0,0 +1,84 @@
+"""
+This script reports how much smaller the constant pool, and the serialized bytecode file,
+become when the compiler interns its constants.
+
+Each monkey source file is compiled twice, once with constant interning and once without
+it, and the number of constants and the size of the `.monkeybyte` file are printed for both.
+
+usage: python constant_pool_size.py [<source_filename> ...]
+"""
+
+import argparse
+import dataclasses
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional
+from typing import Sequence
+
+from monkey import Lexer
+from monkey import Parser
+from monkey.parser.parser import parse_program
+
+from monkey.compiler import Bytecode
+from monkey.compiler import bytecode_from_compiler
+from monkey.compiler import Compiler
+from monkey.compiler import CompilerOptions
+from monkey.compiler import compile
+
+from monkey.serialize.constants import MONKEY_BYTECODE_FILE_SUFFIX
+from monkey.serialize.serialize import serialize_bytecode
+
+EXAMPLES_DIRECTORY = Path(__file__).parent.parent / "examples"
+
+
+@dataclasses.dataclass
+class ConstantPoolSize:
+    n_constants: int
+    n_file_bytes: int
+
+
+def measure(source: str, options: CompilerOptions) -> ConstantPoolSize:
+    program = parse_program(Parser(Lexer(source)))
+    compiler = Compiler(options)
+    compile(compiler, program)
+    bytecode: Bytecode = bytecode_from_compiler(compiler)
+
+    with tempfile.TemporaryDirectory() as directory:
+        executable_file = Path(directory) / f"measured{MONKEY_BYTECODE_FILE_SUFFIX}"
+        serialize_bytecode(bytecode, executable_file)
+        n_file_bytes = executable_file.stat().st_size
+
+    return ConstantPoolSize(len(bytecode.constants), n_file_bytes)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(usage="python constant_pool_size.py [<source_filename> ...]")
+    parser.add_argument(
+        "source_filenames",
+        type=str,
+        nargs="*",
+        help="monkey source code files; defaults to the examples",
+    )
+    args = parser.parse_args(argv)
+
+    if args.source_filenames:
+        source_filenames = [Path(filename) for filename in args.source_filenames]
+    else:
+        source_filenames = sorted(EXAMPLES_DIRECTORY.glob("*.monkey"))
+
+    print(f"{'file':<20}{'constants':>20}{'file bytes':>20}")
+    for source_filename in source_filenames:
+        source = source_filename.read_text()
+        without_interning = measure(source, CompilerOptions(use_constant_interning=False))
+        with_interning = measure(source, CompilerOptions(use_constant_interning=True))
+
+        constants = f"{without_interning.n_constants} -> {with_interning.n_constants}"
+        file_bytes = f"{without_interning.n_file_bytes} -> {with_interning.n_file_bytes}"
+        print(f"{source_filename.name:<20}{constants:>20}{file_bytes:>20}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
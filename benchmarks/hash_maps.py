@@ -0,0 +1,159 @@
+"""
+This script measures how long it takes to build a large hash map, and to look up every one
+of its keys, under three ways of storing the pairs:
+- `object hash`: the way that came before; a dict keyed by a frozen ObjectHash dataclass,
+  which has to be created for every key, both when building and when looking up
+- `native dict`: a dict keyed by the int, str, or boolean tag of each key; this is what hash
+  literals build, through the same functions that the virtual machine calls
+- `persistent`: a PersistentHashMap (a HAMT) keyed the same way
+
+It also measures the cost of adding one pair to a map of that size without changing it:
+copying a native dict and adding to the copy, versus `HashObject.with_pair()`.
+
+Every timing is the fastest of several trials, in microseconds per key.
+
+usage: python hash_maps.py [--n-keys N] [--trials N]
+"""
+
+import argparse
+import dataclasses
+import sys
+import time
+from typing import Callable
+from typing import Optional
+from typing import Sequence
+
+import monkey.object as objs
+import monkey.virtual_machine._operations as ops
+
+from monkey.containers import PersistentHashMap
+from monkey.object.object_type import ObjectType
+
+DEFAULT_N_KEYS = 100_000
+
+# adding a pair by copying a dict takes time proportional to its size, so fewer are timed
+N_COPYING_INSERTS = 20
+N_PERSISTENT_INSERTS = 2000
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ObjectHash:
+    data_type: ObjectType
+    value: int
+
+
+def create_object_hash(obj: objs.Object) -> ObjectHash:
+    if isinstance(obj, objs.BooleanObject):
+        return ObjectHash(ObjectType.BOOLEAN, hash(obj.value))
+    elif isinstance(obj, objs.IntegerObject):
+        return ObjectHash(ObjectType.INTEGER, obj.value)
+    elif isinstance(obj, objs.StringObject):
+        return ObjectHash(ObjectType.STRING, hash(obj.value))
+    else:
+        return ObjectHash(ObjectType.ERROR, -1)
+
+
+def build_object_hash_map(keys_and_values: Sequence[objs.Object]) -> dict[ObjectHash, objs.HashKeyValuePair]:
+    hashmap: dict[ObjectHash, objs.HashKeyValuePair] = {}
+    for i in range(0, len(keys_and_values), 2):
+        key = keys_and_values[i]
+        hashmap[create_object_hash(key)] = objs.HashKeyValuePair(key, keys_and_values[i + 1])
+
+    return hashmap
+
+
+def build_persistent_map(
+    keys_and_values: Sequence[objs.Object],
+) -> PersistentHashMap[objs.HashKey, objs.HashKeyValuePair]:
+    pairs: list[tuple[objs.HashKey, objs.HashKeyValuePair]] = []
+    for i in range(0, len(keys_and_values), 2):
+        key = keys_and_values[i]
+        hash_key = objs.create_hash_key(key)
+        assert hash_key is not None
+        pairs.append((hash_key, objs.HashKeyValuePair(key, keys_and_values[i + 1])))
+
+    return PersistentHashMap(pairs)
+
+
+def fastest_time(function: Callable[[], object], n_trials: int) -> float:
+    best_time = float("inf")
+    for _ in range(n_trials):
+        start = time.perf_counter()
+        function()
+        best_time = min(best_time, time.perf_counter() - start)
+
+    return best_time
+
+
+def measure(label: str, keys: list[objs.Object], n_trials: int) -> None:
+    keys_and_values: list[objs.Object] = []
+    for i_key, key in enumerate(keys):
+        keys_and_values += [key, objs.IntegerObject(i_key)]
+
+    object_hash_map = build_object_hash_map(keys_and_values)
+    native_hash = ops.build_hashmap(keys_and_values)
+    persistent_hash = objs.HashObject(build_persistent_map(keys_and_values))
+
+    def lookup_object_hash() -> None:
+        for key in keys:
+            object_hash_map[create_object_hash(key)]
+
+    def lookup(hashmap: objs.HashObject) -> Callable[[], None]:
+        def lookup_every_key() -> None:
+            for key in keys:
+                ops.evaluate_index_expression(hashmap, key)
+
+        return lookup_every_key
+
+    new_pairs = [
+        (i_key, objs.HashKeyValuePair(objs.IntegerObject(-i_key), objs.NULL_OBJ))
+        for i_key in range(1, N_PERSISTENT_INSERTS + 1)
+    ]
+
+    def insert_by_copying() -> None:
+        for hash_key, pair in new_pairs[:N_COPYING_INSERTS]:
+            pairs = dict(native_hash.pairs)
+            pairs[-hash_key] = pair
+            objs.HashObject(pairs)
+
+    def insert_persistent() -> None:
+        for hash_key, pair in new_pairs:
+            persistent_hash.with_pair(-hash_key, pair)
+
+    def build(build_function: Callable[[Sequence[objs.Object]], object]) -> Callable[[], object]:
+        return lambda: build_function(keys_and_values)
+
+    n_keys = len(keys)
+    rows = [
+        ("build", "object hash", fastest_time(build(build_object_hash_map), n_trials), n_keys),
+        ("build", "native dict", fastest_time(build(ops.build_hashmap), n_trials), n_keys),
+        ("build", "persistent", fastest_time(build(build_persistent_map), n_trials), n_keys),
+        ("lookup", "object hash", fastest_time(lookup_object_hash, n_trials), n_keys),
+        ("lookup", "native dict", fastest_time(lookup(native_hash), n_trials), n_keys),
+        ("lookup", "persistent", fastest_time(lookup(persistent_hash), n_trials), n_keys),
+        ("insert", "native dict", fastest_time(insert_by_copying, n_trials), N_COPYING_INSERTS),
+        ("insert", "persistent", fastest_time(insert_persistent, n_trials), N_PERSISTENT_INSERTS),
+    ]
+
+    for operation, storage, seconds, n_operations in rows:
+        print(f"{label:<10}{operation:<10}{storage:<16}{1.0e6 * seconds / n_operations:>14.3f}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare the ways of storing the pairs of a hash map.")
+    parser.add_argument("--n-keys", type=int, default=DEFAULT_N_KEYS, help="number of keys in each hash map")
+    parser.add_argument("--trials", type=int, default=3, help="number of timed runs; the fastest is kept")
+    args = parser.parse_args(argv)
+
+    header = f"{'keys':<10}{'operation':<10}{'storage':<16}{'us per key':>14}"
+    print(header)
+    print("-" * len(header))
+
+    measure("integer", [objs.IntegerObject(i) for i in range(args.n_keys)], args.trials)
+    measure("string", [objs.StringObject(f"key {i}") for i in range(args.n_keys)], args.trials)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,170 @@
+"""
+This script measures the memory footprint and the throughput of the runtime objects in
+`monkey.object`.
+
+It reports three things:
+- the number of bytes that a single instance of each common object takes up, including its
+  instance dictionary if it has one
+- how many times per second an object can be created, and compared for equality
+- how long a fib/array-heavy monkey program takes to run in the virtual machine, under every
+  execution mode, and the peak memory that the run allocates
+
+usage: python object_model.py [--trials N]
+"""
+
+import argparse
+import sys
+import time
+import timeit
+import tracemalloc
+from typing import Callable
+from typing import Optional
+from typing import Sequence
+
+from monkey import Lexer
+from monkey import Parser
+from monkey.parser.parser import parse_program
+
+import monkey.object as objs
+import monkey.virtual_machine as vm
+
+from monkey.compiler import Bytecode
+from monkey.compiler import bytecode_from_compiler
+from monkey.compiler import Compiler
+from monkey.compiler import compile
+
+PROGRAM = """
+let fib = fn(n) {
+    if (n < 2) {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+};
+
+let build = fn(n) {
+    let elements = [];
+    let i = 0;
+    while (i < n) {
+        elements = push(elements, fib(i - (i / 12) * 12));
+        i = i + 1;
+    }
+    return elements;
+};
+
+let sum = fn(elements) {
+    let total = 0;
+    let i = 0;
+    while (i < len(elements)) {
+        total = total + elements[i];
+        i = i + 1;
+    }
+    return total;
+};
+
+sum(build(300)) + fib(18);
+"""
+
+
+def _sample_objects() -> dict[str, objs.Object]:
+    function = objs.CompiledFunctionObject(bytes(), 0, 0)
+    return {
+        "IntegerObject": objs.IntegerObject(12345),
+        "BooleanObject": objs.BooleanObject(True),
+        "StringObject": objs.StringObject("monkey"),
+        "ArrayObject": objs.ArrayObject([objs.IntegerObject(1), objs.IntegerObject(2)]),
+        "CompiledFunctionObject": function,
+        "ClosureObject": objs.ClosureObject(function, []),
+        "ReturnObject": objs.ReturnObject(objs.IntegerObject(1)),
+    }
+
+
+def instance_size(obj: object) -> int:
+    size = sys.getsizeof(obj)
+    instance_dict = getattr(obj, "__dict__", None)
+    if instance_dict is not None:
+        size += sys.getsizeof(instance_dict)
+
+    return size
+
+
+def _operations() -> dict[str, Callable[[], object]]:
+    array0 = objs.ArrayObject([objs.IntegerObject(i) for i in range(16)])
+    array1 = objs.ArrayObject([objs.IntegerObject(i) for i in range(16)])
+    function = objs.CompiledFunctionObject(bytes(range(64)), 2, 1)
+    closure0 = objs.ClosureObject(function, [objs.IntegerObject(1)])
+    closure1 = objs.ClosureObject(function, [objs.IntegerObject(1)])
+    integer0 = objs.IntegerObject(7)
+    integer1 = objs.IntegerObject(7)
+
+    return {
+        "create IntegerObject": lambda: objs.IntegerObject(7),
+        "create ArrayObject": lambda: objs.ArrayObject([]),
+        "compare IntegerObject": lambda: integer0 == integer1,
+        "compare ArrayObject[16]": lambda: array0 == array1,
+        "compare ClosureObject": lambda: closure0 == closure1,
+    }
+
+
+def operations_per_second(operation: Callable[[], object], n_trials: int) -> float:
+    n_calls = 100_000
+    best_time = min(timeit.repeat(operation, number=n_calls, repeat=n_trials))
+    return n_calls / best_time
+
+
+def _compile_program() -> Bytecode:
+    program = parse_program(Parser(Lexer(PROGRAM)))
+    compiler = Compiler()
+    compile(compiler, program)
+    return bytecode_from_compiler(compiler)
+
+
+def time_program(bytecode: Bytecode, mode: vm.ExecutionMode, n_trials: int) -> float:
+    best_time = float("inf")
+    for _ in range(n_trials):
+        machine = vm.VirtualMachine(bytecode)
+        start = time.perf_counter()
+        vm.run(machine, mode)
+        best_time = min(best_time, time.perf_counter() - start)
+
+    return best_time
+
+
+def peak_program_memory(bytecode: Bytecode, mode: vm.ExecutionMode) -> int:
+    machine = vm.VirtualMachine(bytecode)
+    tracemalloc.start()
+    try:
+        vm.run(machine, mode)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure the size and speed of the runtime objects.")
+    parser.add_argument("--trials", type=int, default=5, help="number of timed runs; the fastest is kept")
+    args = parser.parse_args(argv)
+
+    print(f"{'object':<28}{'bytes per object':>20}")
+    for name, obj in _sample_objects().items():
+        print(f"{name:<28}{instance_size(obj):>20}")
+    print()
+
+    print(f"{'operation':<28}{'ops/sec':>20}")
+    for name, operation in _operations().items():
+        print(f"{name:<28}{operations_per_second(operation, args.trials):>20,.0f}")
+    print()
+
+    bytecode = _compile_program()
+    print(f"{'program run':<28}{'seconds':>20}{'peak KiB':>20}")
+    for mode in vm.ExecutionMode:
+        seconds = time_program(bytecode, mode, args.trials)
+        peak_kib = peak_program_memory(bytecode, mode) / 1024
+        print(f"{mode.name:<28}{seconds:>20.4f}{peak_kib:>20.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,344 @@
+"""
+This script runs the benchmark suite: the monkey programs in `benchmarks/programs`, timed
+through every stage of the pipeline, and under both ways of running a program.
+
+For each program, the stages are:
+- lex: turning the source code into tokens
+- parse: turning the source code into an AST (the parser drives the lexer, so this includes
+  the lexing)
+- parse_iteratively: the same, with the parser that keeps its own stack for nested expressions
+- compile: turning the AST into bytecode
+- serialize: writing the bytecode to a file, and reading it back
+- evaluate: running the AST in the tree-walking evaluator
+- resolved: running the resolver over the AST, and running the result in the evaluator
+- stack: running the AST in the evaluator that keeps its own stack, instead of recursing
+- closures: compiling the AST into Python closures, and running them
+- vm_<mode>: running the bytecode in the virtual machine, once per execution mode
+
+Each stage is run several times, and the fastest run is kept. The results are written out
+as JSON; when a saved set of results is passed in as a baseline, every stage is compared
+against it, and the script exits with a non-zero status if any stage got slower by more
+than the threshold.
+
+The evaluator and the virtual machine must agree on the value of every program; the value
+is stored with the results, so that the programs can't quietly change under a baseline.
+
+usage: python suite.py [--trials N] [--output FILE] [--baseline FILE] [--threshold T] [<program> ...]
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Sequence
+
+from monkey import Lexer
+from monkey import Parser
+from monkey import Program
+from monkey.parser.parser import parse_program
+from monkey.parser.parser import parse_program_iteratively
+from monkey.tokens import token_types
+
+import monkey.object as objs
+import monkey.virtual_machine as vm
+
+from monkey.compiler import Bytecode
+from monkey.compiler import bytecode_from_compiler
+from monkey.compiler import Compiler
+from monkey.compiler import compile
+from monkey.evaluator import compile_to_closures
+from monkey.evaluator import evaluate
+from monkey.evaluator import evaluate_iteratively
+from monkey.evaluator import resolve
+from monkey.serialize.constants import MONKEY_BYTECODE_FILE_SUFFIX
+from monkey.serialize.constants import MONKEY_SOURCE_FILE_SUFFIX
+from monkey.serialize.serialize import deserialize_bytecode
+from monkey.serialize.serialize import serialize_bytecode
+
+PROGRAMS_DIRECTORY = Path(__file__).parent / "programs"
+
+# the evaluator recurses through the AST; a few hundred nested monkey function calls take
+# several thousand python frames
+RECURSION_LIMIT = 20_000
+
+# a trial of a quick stage repeats it until it takes at least this long
+MINIMUM_TRIAL_SECONDS = 0.05
+
+# a stage that is slower than its baseline by more than this fraction counts as a regression
+DEFAULT_THRESHOLD = 0.20
+
+# program name -> stage name -> seconds
+Results = dict[str, dict[str, float]]
+
+
+def load_programs(program_names: Sequence[str]) -> dict[str, str]:
+    paths = sorted(PROGRAMS_DIRECTORY.glob(f"*{MONKEY_SOURCE_FILE_SUFFIX}"))
+    available = {path.stem: path for path in paths}
+
+    for name in program_names:
+        if name not in available:
+            raise ValueError(f"unknown program '{name}'; choose from: {', '.join(available)}")
+
+    selected = program_names or list(available)
+    return {name: available[name].read_text() for name in selected}
+
+
+def lex(source: str) -> int:
+    lexer = Lexer(source)
+    n_tokens = 1
+    while lexer.next_token().token_type != token_types.EOF:
+        n_tokens += 1
+
+    return n_tokens
+
+
+def parse(source: str, parsing_fn: Callable[[Parser], Program] = parse_program) -> Program:
+    program = parsing_fn(Parser(Lexer(source)))
+    if program.has_errors():
+        errors = "\n".join([str(err) for err in program.errors()])
+        raise RuntimeError(errors)
+
+    return program
+
+
+def compile_to_bytecode(program: Program) -> Bytecode:
+    compiler = Compiler()
+    compile(compiler, program)
+    return bytecode_from_compiler(compiler)
+
+
+def serialize_round_trip(bytecode: Bytecode, directory: Path) -> Bytecode:
+    path = (directory / "program").with_suffix(MONKEY_BYTECODE_FILE_SUFFIX)
+    serialize_bytecode(bytecode, path)
+    return deserialize_bytecode(path)
+
+
+def run_resolved(program: Program) -> objs.Object:
+    return evaluate(resolve(program), objs.Environment())
+
+
+def run_closures(program: Program) -> objs.Object:
+    return compile_to_closures(program)(objs.Environment())
+
+
+def run_virtual_machine(bytecode: Bytecode, mode: vm.ExecutionMode) -> objs.Object:
+    machine = vm.VirtualMachine(bytecode)
+    vm.run(machine, mode)
+
+    result = machine.stack.maybe_get_last_popped()
+    if result is None:
+        raise RuntimeError("The virtual machine did not leave a result on the stack.")
+
+    return result
+
+
+def fastest_time(stage: Callable[[], object], n_trials: int) -> float:
+    """
+    Return the fastest time that a single call to the stage takes.
+
+    The early stages finish in well under a millisecond, too quickly to time a single call
+    reliably; so each trial makes as many calls as fit into `MINIMUM_TRIAL_SECONDS`.
+    """
+    start = time.perf_counter()
+    stage()
+    n_calls = max(1, int(MINIMUM_TRIAL_SECONDS / (time.perf_counter() - start)))
+
+    best_time = float("inf")
+    for _ in range(n_trials):
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            stage()
+        best_time = min(best_time, (time.perf_counter() - start) / n_calls)
+
+    return best_time
+
+
+def benchmark_program(source: str, n_trials: int, directory: Path) -> tuple[dict[str, float], str]:
+    """
+    Return the fastest time for every stage of the program, and the program's value.
+    """
+    program = parse(source)
+    if str(parse(source, parse_program_iteratively)) != str(program):
+        raise RuntimeError("The recursive and iterative parsers disagree.")
+
+    bytecode = compile_to_bytecode(program)
+
+    timings: dict[str, float] = {
+        "lex": fastest_time(lambda: lex(source), n_trials),
+        "parse": fastest_time(lambda: parse(source), n_trials),
+        "parse_iteratively": fastest_time(lambda: parse(source, parse_program_iteratively), n_trials),
+        "compile": fastest_time(lambda: compile_to_bytecode(program), n_trials),
+        "serialize": fastest_time(lambda: serialize_round_trip(bytecode, directory), n_trials),
+    }
+
+    evaluated = evaluate(program, objs.Environment()).inspect()
+    timings["evaluate"] = fastest_time(lambda: evaluate(program, objs.Environment()), n_trials)
+
+    resolved_value = run_resolved(program).inspect()
+    if resolved_value != evaluated:
+        raise RuntimeError(
+            f"The evaluator disagrees with itself after resolving: {evaluated} != {resolved_value}"
+        )
+
+    timings["resolved"] = fastest_time(lambda: run_resolved(program), n_trials)
+
+    stack_value = evaluate_iteratively(program, objs.Environment()).inspect()
+    if stack_value != evaluated:
+        raise RuntimeError(f"The recursive and iterative evaluators disagree: {evaluated} != {stack_value}")
+
+    timings["stack"] = fastest_time(lambda: evaluate_iteratively(program, objs.Environment()), n_trials)
+
+    closures_value = run_closures(program).inspect()
+    if closures_value != evaluated:
+        raise RuntimeError(
+            f"The evaluator and the compiled closures disagree: {evaluated} != {closures_value}"
+        )
+
+    timings["closures"] = fastest_time(lambda: run_closures(program), n_trials)
+
+    for mode in vm.ExecutionMode:
+        executed = run_virtual_machine(bytecode, mode).inspect()
+        if executed != evaluated:
+            raise RuntimeError(
+                f"The evaluator and the {mode.name} virtual machine disagree: {evaluated} != {executed}"
+            )
+
+        stage = f"vm_{mode.name.lower()}"
+        timings[stage] = fastest_time(lambda: run_virtual_machine(bytecode, mode), n_trials)
+
+    return timings, evaluated
+
+
+def run_suite(programs: dict[str, str], n_trials: int) -> dict[str, Any]:
+    results: Results = {}
+    values: dict[str, str] = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, source in programs.items():
+            results[name], values[name] = benchmark_program(source, n_trials, Path(directory))
+
+    return {
+        "metadata": {
+            "python_version": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "trials": n_trials,
+        },
+        "values": values,
+        "results": results,
+    }
+
+
+def compare_to_baseline(
+    current: dict[str, Any], baseline: dict[str, Any], threshold: float
+) -> tuple[list[str], list[str]]:
+    """
+    Return the lines of the comparison report, and the regressions among them.
+
+    Only the programs and stages that appear in both sets of results are compared.
+    """
+    lines: list[str] = []
+    regressions: list[str] = []
+
+    header = f"{'program':<24}{'stage':<20}{'baseline':>12}{'current':>12}{'ratio':>10}"
+    lines.append(header)
+    lines.append("-" * len(header))
+
+    for name, timings in current["results"].items():
+        baseline_timings = baseline["results"].get(name, None)
+        if baseline_timings is None:
+            continue
+
+        baseline_value = baseline.get("values", {}).get(name, None)
+        current_value = current["values"][name]
+        if baseline_value is not None and baseline_value != current_value:
+            regressions.append(f"{name}: the value changed from {baseline_value} to {current_value}")
+
+        for stage, seconds in timings.items():
+            baseline_seconds = baseline_timings.get(stage, None)
+            if baseline_seconds is None or baseline_seconds <= 0.0:
+                continue
+
+            ratio = seconds / baseline_seconds
+            if ratio > 1.0 + threshold:
+                flag = "  slower"
+                change = f"{baseline_seconds:.6f}s -> {seconds:.6f}s ({ratio:.2f}x)"
+                regressions.append(f"{name} {stage}: {change}")
+            elif ratio < 1.0 - threshold:
+                flag = "  faster"
+            else:
+                flag = ""
+
+            lines.append(
+                f"{name:<24}{stage:<20}{baseline_seconds:>12.6f}{seconds:>12.6f}{ratio:>10.2f}{flag}"
+            )
+
+    return lines, regressions
+
+
+def format_results(results: Results) -> list[str]:
+    stages = list(next(iter(results.values())))
+    header = f"{'program':<24}" + "".join(f"{stage:>20}" for stage in stages)
+
+    lines = ["seconds per run (lower is better)", header, "-" * len(header)]
+    for name, timings in results.items():
+        lines.append(f"{name:<24}" + "".join(f"{timings[stage]:>20.6f}" for stage in stages))
+
+    return lines
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time the monkey benchmark programs through every stage.")
+    parser.add_argument("program_names", nargs="*", help="programs to run; defaults to all of them")
+    parser.add_argument("--trials", type=int, default=3, help="number of timed runs; the fastest is kept")
+    parser.add_argument("--output", type=str, help="file to write the JSON results to; defaults to stdout")
+    parser.add_argument("--baseline", type=str, help="JSON results from an earlier run to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="fraction by which a stage may be slower than the baseline before it counts as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        programs = load_programs(args.program_names)
+    except ValueError as error:
+        parser.error(str(error))
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), RECURSION_LIMIT))
+    current = run_suite(programs, args.trials)
+
+    # the JSON goes to stdout (unless written to a file), and the readable reports to stderr
+    results_json = json.dumps(current, indent=2)
+    if args.output is not None:
+        Path(args.output).write_text(results_json + "\n")
+    else:
+        print(results_json)
+
+    print("\n".join(format_results(current["results"])), file=sys.stderr)
+
+    if args.baseline is None:
+        return 0
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    lines, regressions = compare_to_baseline(current, baseline, args.threshold)
+
+    print(file=sys.stderr)
+    print("\n".join(lines), file=sys.stderr)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}:", file=sys.stderr)
+        print("\n".join(f"  {regression}" for regression in regressions), file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
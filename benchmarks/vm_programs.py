@@ -0,0 +1,163 @@
+"""
+This script times the virtual machine on scaled up versions of the programs in
+`tests/test_virtual_machine.py`, under every execution mode.
+
+The tests run each program once, on inputs small enough to check by hand; here the same
+programs get inputs large enough for the run time to be dominated by the execution loop.
+Each program is compiled once, and the fastest of several runs is reported.
+
+usage: python vm_programs.py [--trials N] [<program_name> ...]
+"""
+
+import argparse
+import sys
+import time
+from typing import Optional
+from typing import Sequence
+
+from monkey import Lexer
+from monkey import Parser
+from monkey.parser.parser import parse_program
+
+import monkey.virtual_machine as vm
+
+from monkey.compiler import Bytecode
+from monkey.compiler import bytecode_from_compiler
+from monkey.compiler import Compiler
+from monkey.compiler import compile
+
+PROGRAMS: dict[str, str] = {
+    # test_recursive_numeric_workloads
+    "fibonacci": """
+        let fibonacci = fn(n) {
+            if (n < 2) {
+                return n;
+            }
+            fibonacci(n - 1) + fibonacci(n - 2);
+        };
+        fibonacci(20);
+    """,
+    # test_closures
+    "closures": """
+        let new_closure = fn(a, b) {
+            let one = fn() { a };
+            let two = fn() { b };
+            let one_and_two = fn() {
+                return one() + two();
+            };
+            return one_and_two;
+        };
+        let total = 0;
+        let i = 0;
+        while (i < 5000) {
+            total = total + new_closure(i, 90)();
+            i = i + 1;
+        }
+        total;
+    """,
+    # test_recursive_closures, test_tail_calls
+    "countdown": """
+        let countdown = fn(x) {
+            if (x == 0) {
+                return 0;
+            } else {
+                return countdown(x - 1);
+            }
+        };
+        let wrapper = fn() {
+            countdown(20000)
+        };
+        wrapper();
+    """,
+    # test_while_and_assignment
+    "while_sum": """
+        let sum = fn(n) {
+            let i = 0;
+            let total = 0;
+            while (i < n) {
+                i = i + 1;
+                total = total + i;
+            }
+            total
+        };
+        sum(20000);
+    """,
+    # test_array_literals, test_array_indexing
+    "arrays": """
+        let build = fn(n) {
+            let elements = [];
+            let i = 0;
+            while (i < n) {
+                elements = push(elements, [i, i + 1, i * 2][2]);
+                i = i + 1;
+            }
+            elements
+        };
+        let elements = build(500);
+        let total = 0;
+        let i = 0;
+        while (i < len(elements)) {
+            total = total + elements[i];
+            i = i + 1;
+        }
+        total;
+    """,
+    # test_hash_literals, test_hash_indexing
+    "hashes": """
+        let total = 0;
+        let i = 0;
+        while (i < 5000) {
+            let hashmap = {1: i, 2: i * 2, "three": i * 3};
+            total = total + hashmap[1] + hashmap[2] + hashmap["three"];
+            i = i + 1;
+        }
+        total;
+    """,
+}
+
+
+def compile_program(source: str) -> Bytecode:
+    program = parse_program(Parser(Lexer(source)))
+    compiler = Compiler()
+    compile(compiler, program)
+    return bytecode_from_compiler(compiler)
+
+
+def time_program(bytecode: Bytecode, mode: vm.ExecutionMode, n_trials: int) -> float:
+    best_time = float("inf")
+    for _ in range(n_trials):
+        machine = vm.VirtualMachine(bytecode)
+        start = time.perf_counter()
+        vm.run(machine, mode)
+        best_time = min(best_time, time.perf_counter() - start)
+
+    return best_time
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time the VM on scaled up test programs.")
+    parser.add_argument("program_names", nargs="*", help="programs to run; defaults to all of them")
+    parser.add_argument("--trials", type=int, default=3, help="number of timed runs; the fastest is kept")
+    args = parser.parse_args(argv)
+
+    program_names = args.program_names or list(PROGRAMS)
+    for name in program_names:
+        if name not in PROGRAMS:
+            parser.error(f"unknown program '{name}'; choose from: {', '.join(PROGRAMS)}")
+
+    modes = list(vm.ExecutionMode)
+    header = f"{'program':<18}" + "".join(f"{mode.name:>16}" for mode in modes)
+    print("seconds per run (lower is better)")
+    print(header)
+    print("-" * len(header))
+
+    for name in program_names:
+        bytecode = compile_program(PROGRAMS[name])
+        timings = [time_program(bytecode, mode, args.trials) for mode in modes]
+        print(f"{name:<18}" + "".join(f"{timing:>16.4f}" for timing in timings))
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
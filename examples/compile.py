@@ -1,6 +1,10 @@
 """
 This script takes a file representing monkey source code, and compiles it into a
 file that stores the bytecode from the compilation.
+
+The compiled bytecode is cached in a `__monkeycache__` directory next to the source file;
+compiling source code that hasn't changed (with the same options) reuses the cached bytecode
+instead of compiling it again. Pass `--no-cache` to always compile.
 """
 
 import argparse
@@ -16,11 +20,14 @@ from monkey.parser.parser import parse_program
 
 from monkey.serialize.constants import MONKEY_SOURCE_FILE_SUFFIX
 from monkey.serialize.constants import MONKEY_BYTECODE_FILE_SUFFIX
+from monkey.serialize.constants import MONKEY_CACHE_DIRECTORY_NAME
+from monkey.serialize.compile_cache import CompileCache
 from monkey.serialize.serialize import serialize_bytecode
 
 from monkey.compiler import Bytecode
 from monkey.compiler import bytecode_from_compiler
 from monkey.compiler import Compiler
+from monkey.compiler import CompilerOptions
 from monkey.compiler import compile
 
 
@@ -53,24 +60,72 @@ def run_parser(parser: Parser) -> Program:
     return program
 
 
-def run_compiler(executable_file: Path | str, source: str) -> None:
+def compile_source(
+    source: str, options: CompilerOptions = CompilerOptions(), cache: Optional[CompileCache] = None
+) -> Bytecode:
+    if cache is not None:
+        cached_bytecode = cache.get(source, options)
+        if cached_bytecode is not None:
+            return cached_bytecode
+
     lexer = make_lexer(source)
     parser = make_parser(lexer)
     program = run_parser(parser)
 
-    compiler = Compiler()
+    compiler = Compiler(options)
     compile(compiler, program)
 
     bytecode: Bytecode = bytecode_from_compiler(compiler)
 
+    if cache is not None:
+        cache.put(source, options, bytecode)
+
+    return bytecode
+
+
+def source_cache(source_filename: Path) -> CompileCache:
+    return CompileCache(source_filename.parent / MONKEY_CACHE_DIRECTORY_NAME)
+
+
+def run_compiler(
+    executable_file: Path | str,
+    source: str,
+    options: CompilerOptions = CompilerOptions(),
+    cache: Optional[CompileCache] = None,
+) -> None:
+    bytecode = compile_source(source, options, cache)
     serialize_bytecode(bytecode, executable_file)
 
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
-    usage_message = "usage: python compile.py <source_filename>"
+    usage_message = (
+        "usage: python compile.py <source_filename> [--superinstructions] [--no-peephole] [--no-interning]"
+        " [--no-cache]"
+    )
 
     parser = argparse.ArgumentParser(usage=usage_message)
     parser.add_argument("source_filename", type=str, help="monkey source code file")
+    parser.add_argument(
+        "--superinstructions",
+        action="store_true",
+        help="replace common sequences of opcodes with superinstructions",
+    )
+    parser.add_argument(
+        "--no-peephole",
+        action="store_true",
+        help="keep the instructions exactly as the compiler emits them, for debugging",
+    )
+
+    parser.add_argument(
+        "--no-interning",
+        action="store_true",
+        help="give every constant its own slot in the constant pool, even if it repeats",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always compile the source code, instead of reusing the cached bytecode",
+    )
 
     args = parser.parse_args(argv)
 
@@ -85,7 +140,13 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
 
     executable_filename = Path(source_filename.stem).with_suffix(MONKEY_BYTECODE_FILE_SUFFIX)
 
-    run_compiler(executable_filename, source_code)
+    options = CompilerOptions(
+        use_constant_interning=not args.no_interning,
+        use_peephole=not args.no_peephole,
+        use_superinstructions=args.superinstructions,
+    )
+    cache = None if args.no_cache else source_cache(source_filename)
+    run_compiler(executable_filename, source_code, options, cache)
 
     return 0
 
@@ -1,6 +1,10 @@
 """
 This script takes the compiled bytecode output from the compiler, and displays its contents
 to users.
+
+With `--profile`, it also runs the bytecode in a profiled virtual machine, and displays how
+often each opcode and each function ran, and how long they took. Only the dispatch table loop
+can be profiled, so the bytecode is always run in that execution mode.
 """
 
 import argparse
@@ -15,6 +19,7 @@ from monkey.serialize.serialize import deserialize_bytecode
 from monkey.compiler import Bytecode
 import monkey.code as code
 import monkey.object as objs
+import monkey.virtual_machine as vm
 
 DIVIDER_LINE_SIZE = 32
 DIVIDER_LINE = "-" * DIVIDER_LINE_SIZE
@@ -24,12 +29,23 @@ CONSTANT_PADDING_SIZE = 5
 INDEX_PADDING_SIZE = CONSTANT_PADDING_SIZE - len(INDEX_CONSTANT_SEPARATOR)
 CONSTANT_PADDING = " " * CONSTANT_PADDING_SIZE
 
+# the only execution mode that accepts a Profiler
+PROFILED_EXECUTION_MODE = vm.ExecutionMode.DISPATCH_TABLE
+
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
-    usage_message = "usage: python display_bytecode.py <bytecode_file>"
+    usage_message = "usage: python display_bytecode.py <bytecode_file> [--profile]"
 
     parser = argparse.ArgumentParser(usage=usage_message)
     parser.add_argument("bytecode_filename", type=str, help="compiled monkey bytecode file")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "run the bytecode, and display the time spent in each opcode and function; the run always"
+            " uses the dispatch-table execution mode, the only one that can be profiled"
+        ),
+    )
 
     args = parser.parse_args(argv)
 
@@ -42,6 +58,9 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     bytecode: Bytecode = deserialize_bytecode(bytecode_filename)
     _pretty_print_bytecode(bytecode)
 
+    if args.profile:
+        _print_profile(bytecode)
+
     return 0
 
 
@@ -57,6 +76,18 @@ def _pretty_print_bytecode(bytecode: Bytecode) -> None:
         print(f"{i: <{INDEX_PADDING_SIZE}}{INDEX_CONSTANT_SEPARATOR}{padded_constant_output}")
 
 
+def _print_profile(bytecode: Bytecode) -> None:
+    machine = vm.VirtualMachine(bytecode)
+    profiler = vm.Profiler()
+    vm.run(machine, PROFILED_EXECUTION_MODE, profiler=profiler)
+
+    report = profiler.report()
+    print("\nPROFILE")
+    print(DIVIDER_LINE)
+    print(f"total time in instructions: {report.total_seconds:.6f} seconds\n")
+    print(vm.format_profile_report(report))
+
+
 def _padded_constant(constant: objs.Object, padding: str) -> str:
     output = str(constant)
     padded_output = output.replace("\n", f"\n{padding}")
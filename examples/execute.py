@@ -1,6 +1,17 @@
 """
 This script takes the bytecode file that results from compiling monkey source code,
 and runs it using a virtual machine.
+
+It also accepts a monkey source file, which it compiles first. The bytecode is cached in a
+`__monkeycache__` directory next to the source file, so running source code that hasn't
+changed since the last run goes straight to the virtual machine.
+
+With `--sample-profile`, the run is sampled to find out which monkey functions it spends
+its time in, and the samples are written to a file as collapsed stacks, which the usual
+flamegraph tools can turn into a flamegraph.
+
+With `--mapped`, a bytecode file is memory-mapped instead of read, and only the constants
+that the run actually uses are ever created.
 """
 
 import argparse
@@ -11,32 +22,101 @@ from typing import Sequence
 from pathlib import Path
 
 from monkey.serialize.constants import MONKEY_BYTECODE_FILE_SUFFIX
+from monkey.serialize.constants import MONKEY_SOURCE_FILE_SUFFIX
 from monkey.serialize.serialize import deserialize_bytecode
+from monkey.serialize.mapped_bytecode import map_bytecode
 from monkey.compiler import Bytecode
 import monkey.virtual_machine as vm
 
+from compile import compile_source
+from compile import source_cache
+
+
+def load_bytecode(executable_file: Path | str, mapped: bool = False) -> Bytecode:
+    executable_file = Path(executable_file)
+    if executable_file.suffix == MONKEY_SOURCE_FILE_SUFFIX:
+        source = executable_file.read_text()
+        return compile_source(source, cache=source_cache(executable_file))
+    elif mapped:
+        return map_bytecode(executable_file)
+    else:
+        return deserialize_bytecode(executable_file)
+
 
-def run_virtual_machine(executable_file: Path | str) -> None:
-    bytecode: Bytecode = deserialize_bytecode(executable_file)
+def run_virtual_machine(
+    executable_file: Path | str, mode: vm.ExecutionMode = vm.ExecutionMode.BYTECODE, mapped: bool = False
+) -> None:
+    bytecode = load_bytecode(executable_file, mapped)
     machine = vm.VirtualMachine(bytecode)
-    vm.run(machine)
+    vm.run(machine, mode)
+
+
+def run_sampled_virtual_machine(
+    executable_file: Path | str,
+    profile_file: Path | str,
+    mode: vm.ExecutionMode = vm.ExecutionMode.BYTECODE,
+    interval_seconds: float = vm.sampling_profiler.DEFAULT_SAMPLING_INTERVAL_SECONDS,
+    mapped: bool = False,
+) -> None:
+    bytecode = load_bytecode(executable_file, mapped)
+    machine = vm.VirtualMachine(bytecode)
+
+    with vm.SamplingProfiler(machine, interval_seconds) as sampler:
+        vm.run(machine, mode)
+
+    sampler.write_collapsed_stacks(profile_file)
 
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
-    usage_message = "usage: python execute.py <bytecode_file>"
+    usage_message = (
+        "usage: python execute.py <bytecode_or_source_file> [--mode MODE] [--mapped]"
+        " [--sample-profile FILE] [--sample-interval SECONDS]"
+    )
 
     parser = argparse.ArgumentParser(usage=usage_message)
-    parser.add_argument("bytecode_filename", type=str, help="compiled monkey bytecode file")
+    parser.add_argument(
+        "bytecode_filename", type=str, help="compiled monkey bytecode file, or monkey source code file"
+    )
+    parser.add_argument(
+        "--mode",
+        type=str,
+        choices=[mode.name.lower() for mode in vm.ExecutionMode],
+        default=vm.ExecutionMode.BYTECODE.name.lower(),
+        help="the execution loop that the virtual machine uses",
+    )
+    parser.add_argument(
+        "--mapped",
+        action="store_true",
+        help="memory-map the bytecode file, and only create the constants that the run uses",
+    )
+    parser.add_argument(
+        "--sample-profile",
+        type=str,
+        help="sample the run, and write the samples to this file as collapsed stacks",
+    )
+    parser.add_argument(
+        "--sample-interval",
+        type=float,
+        default=vm.sampling_profiler.DEFAULT_SAMPLING_INTERVAL_SECONDS,
+        help="the number of seconds between samples",
+    )
 
     args = parser.parse_args(argv)
 
     bytecode_filename = Path(args.bytecode_filename)
-    if bytecode_filename.suffix != MONKEY_BYTECODE_FILE_SUFFIX:
+    if bytecode_filename.suffix not in (MONKEY_BYTECODE_FILE_SUFFIX, MONKEY_SOURCE_FILE_SUFFIX):
         raise RuntimeError(
-            f"This compiler requires the bytecode file to end in `{MONKEY_BYTECODE_FILE_SUFFIX}`."
+            f"This virtual machine requires the file to end in `{MONKEY_BYTECODE_FILE_SUFFIX}`"
+            f" or `{MONKEY_SOURCE_FILE_SUFFIX}`."
         )
 
-    run_virtual_machine(bytecode_filename)
+    mode = vm.ExecutionMode[args.mode.upper()]
+    if args.sample_profile is not None:
+        run_sampled_virtual_machine(
+            bytecode_filename, args.sample_profile, mode, args.sample_interval, args.mapped
+        )
+    else:
+        run_virtual_machine(bytecode_filename, mode, args.mapped)
 
     return 0
 
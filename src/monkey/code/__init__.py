@@ -8,6 +8,10 @@ from monkey.code.byte_operations import make_instructions_from_opcode_operand_pa
 from monkey.code.byte_operations import instructions_to_string
 from monkey.code.byte_operations import extract_opcode
 from monkey.code.byte_operations import extract_operand
+from monkey.code.byte_operations import iterate_instructions
+from monkey.code.decoding import DecodedInstruction
+from monkey.code.decoding import decode_instructions
+from monkey.code.stack_depth import max_stack_depth
 
 from monkey.code.constants import DUMMY_ADDRESS
 from monkey.code.constants import MAXIMUM_ADDRESS
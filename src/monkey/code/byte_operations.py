@@ -4,6 +4,7 @@ compiler.
 """
 
 import functools
+from typing import Iterator
 from typing import Sequence
 
 from monkey.code.code import Instructions
@@ -13,10 +14,16 @@ from monkey.code.code import OPCODE_SIZE
 from monkey.code.definitions import OpcodeDefinition
 from monkey.code.definitions import is_undefined
 from monkey.code.definitions import lookup_opcode_definition
+from monkey.code.definitions import MAXIMUM_OPCODE_NAME_LENGTH
 
 from monkey.code.constants import MAXIMUM_ADDRESS_DIGITS
 
 from monkey.code.custom_types import OpcodeOperandPair
+from monkey.code.custom_types import Operands
+
+# most instructions take at most two operands; every formatted instruction has at least this
+# many operand columns, even when some are empty
+MINIMUM_OPERAND_COLUMNS: int = 2
 
 
 def extract_opcode(instructions: Instructions, position: int) -> Opcode:
@@ -91,6 +98,31 @@ def instructions_to_string(instructions: Instructions) -> str:
     return "\n".join(formatted_instructions)
 
 
+def iterate_instructions(instructions: Instructions) -> Iterator[tuple[int, Opcode, Operands]]:
+    """
+    Walk through the instructions one opcode at a time, yielding the byte position of
+    each opcode, the opcode itself, and the operands that follow it.
+    """
+    i = 0
+    n_bytes = len(instructions)
+    while i < n_bytes:
+        opcode = extract_opcode(instructions, i)
+        opcode_def = lookup_opcode_definition(opcode)
+        if is_undefined(opcode_def):
+            raise ValueError(f"Cannot look up the opcode definition of '{opcode[0]}'")
+
+        operands: list[int] = []
+        offset = i + 1
+        for width in opcode_def.operand_widths:
+            operand_bytes = instructions[offset : offset + width]
+            operands.append(int.from_bytes(operand_bytes, byteorder="big", signed=False))
+            offset += width
+
+        yield i, opcode, tuple(operands)
+
+        i = offset
+
+
 def _read_operands(
     definition: OpcodeDefinition, remaining_instructions: Instructions
 ) -> tuple[list[int], int]:
@@ -124,18 +156,13 @@ def _format_instruction(definition: OpcodeDefinition, operands: list[int]) -> st
             f"Found: {len(operands)}"
         )
 
+    formatted_operands = [f"{operand:0>{MAXIMUM_ADDRESS_DIGITS}d}" for operand in operands]
+
+    # pad with empty columns, so that the operands of every instruction line up
     empty_space = " " * MAXIMUM_ADDRESS_DIGITS
+    n_empty_columns = max(MINIMUM_OPERAND_COLUMNS - n_expected_operands, 0)
+    formatted_operands.extend(empty_space for _ in range(n_empty_columns))
+
+    joined_operands = "   ".join(formatted_operands)
 
-    if n_expected_operands == 0:
-        formatted_0 = empty_space
-        formatted_1 = empty_space
-    elif n_expected_operands == 1:
-        formatted_0 = f"{operands[0]:0>{MAXIMUM_ADDRESS_DIGITS}d}"
-        formatted_1 = empty_space
-    elif n_expected_operands == 2:
-        formatted_0 = f"{operands[0]:0>{MAXIMUM_ADDRESS_DIGITS}d}"
-        formatted_1 = f"{operands[1]:0>{MAXIMUM_ADDRESS_DIGITS}d}"
-    else:
-        raise ValueError(f"Unable to format an instruction with '{n_expected_operands}' operands.")
-
-    return f"{definition.name:<16s}   {formatted_0}   {formatted_1}"
+    return f"{definition.name:<{MAXIMUM_OPCODE_NAME_LENGTH}s}   {joined_operands}"
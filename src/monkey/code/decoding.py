@@ -0,0 +1,50 @@
+"""
+This module contains the function that turns byte-level Instructions into a pre-decoded
+form, which the virtual machine can execute without re-reading every opcode and operand
+out of the raw bytes at each step.
+
+Each decoded instruction is a tuple whose first element is the opcode as an integer, and
+whose remaining elements are the already-parsed operands. Operands that are instruction
+addresses (such as the targets of jumps) are converted from byte positions into indices
+of the decoded sequence.
+
+The byte-level Instructions remain the format that gets stored and serialized; the decoded
+form only ever exists in memory.
+"""
+
+from monkey.code.code import Instructions
+from monkey.code.byte_operations import iterate_instructions
+from monkey.code.definitions import lookup_opcode_definition
+
+DecodedInstruction = tuple[int, ...]
+
+
+def decode_instructions(instructions: Instructions) -> list[DecodedInstruction]:
+    positioned_instructions = list(iterate_instructions(instructions))
+
+    # a jump is allowed to land just past the final instruction, so the end of the
+    # instructions needs an index as well
+    index_at_position: dict[int, int] = {
+        position: index for (index, (position, _, _)) in enumerate(positioned_instructions)
+    }
+    index_at_position[len(instructions)] = len(positioned_instructions)
+
+    decoded: list[DecodedInstruction] = []
+    for _, opcode, operands in positioned_instructions:
+        address_operands = lookup_opcode_definition(opcode).address_operands
+
+        decoded_operands = list(operands)
+        for i_operand in address_operands:
+            decoded_operands[i_operand] = _resolve_address(index_at_position, operands[i_operand])
+
+        decoded.append((opcode[0], *decoded_operands))
+
+    return decoded
+
+
+def _resolve_address(index_at_position: dict[int, int], address: int) -> int:
+    index = index_at_position.get(address, None)
+    if index is None:
+        raise ValueError(f"The address '{address}' does not point to the start of an instruction.")
+
+    return index
@@ -8,6 +8,7 @@ import monkey.code.opcodes as opcodes
 class OpcodeDefinition:
     name: str
     operand_widths: tuple[int, ...]  # number of bytes per operand
+    address_operands: tuple[int, ...] = ()  # indices of the operands that are instruction addresses
 
 
 UNDEFINED_OPCODE = OpcodeDefinition("UNDEFINED", ())
@@ -27,8 +28,13 @@ OPCODE_DEFINITIONS: dict[Opcode, OpcodeDefinition] = {
     opcodes.OPGREATERTHAN: OpcodeDefinition("OPGREATERTHAN", ()),
     opcodes.OPMINUS: OpcodeDefinition("OPMINUS", ()),
     opcodes.OPBANG: OpcodeDefinition("OPBANG", ()),
-    opcodes.OPJUMP: OpcodeDefinition("OPJUMP", (opcodes.OPJUMP_WIDTH,)),
-    opcodes.OPJUMPWHENFALSE: OpcodeDefinition("OPJUMPWHENFALSE", (opcodes.OPJUMPWHENFALSE_WIDTH,)),
+    opcodes.OPJUMP: OpcodeDefinition("OPJUMP", (opcodes.OPJUMP_WIDTH,), address_operands=(0,)),
+    opcodes.OPJUMPWHENFALSE: OpcodeDefinition(
+        "OPJUMPWHENFALSE", (opcodes.OPJUMPWHENFALSE_WIDTH,), address_operands=(0,)
+    ),
+    opcodes.OPJUMPWHENTRUE: OpcodeDefinition(
+        "OPJUMPWHENTRUE", (opcodes.OPJUMPWHENTRUE_WIDTH,), address_operands=(0,)
+    ),
     opcodes.OPNULL: OpcodeDefinition("OPNULL", ()),
     opcodes.OPSETGLOBAL: OpcodeDefinition("OPSETGLOBAL", (opcodes.OPSETGLOBAL_WIDTH,)),
     opcodes.OPGETGLOBAL: OpcodeDefinition("OPGETGLOBAL", (opcodes.OPGETGLOBAL_WIDTH,)),
@@ -38,6 +44,7 @@ OPCODE_DEFINITIONS: dict[Opcode, OpcodeDefinition] = {
     opcodes.OPHASH: OpcodeDefinition("OPHASH", (opcodes.OPHASH_WIDTH,)),
     opcodes.OPINDEX: OpcodeDefinition("OPINDEX", ()),
     opcodes.OPCALL: OpcodeDefinition("OPCALL", (opcodes.OPCALL_WIDTH,)),
+    opcodes.OPTAILCALL: OpcodeDefinition("OPTAILCALL", (opcodes.OPTAILCALL_WIDTH,)),
     opcodes.OPRETURNVALUE: OpcodeDefinition("OPRETURNVALUE", ()),
     opcodes.OPRETURN: OpcodeDefinition("OPRETURN", ()),
     opcodes.OPGETBUILTIN: OpcodeDefinition("OPGETBUILTIN", (opcodes.OPGETBUILTIN_WIDTH,)),
@@ -46,8 +53,38 @@ OPCODE_DEFINITIONS: dict[Opcode, OpcodeDefinition] = {
     ),
     opcodes.OPGETFREE: OpcodeDefinition("OPGETFREE", (opcodes.OPGETFREE_WIDTH,)),
     opcodes.OPCURRENTCLOSURE: OpcodeDefinition("OPCURRENTCLOSURE", ()),
+    opcodes.OPLOCALCONSTADD: OpcodeDefinition(
+        "OPLOCALCONSTADD", (opcodes.OPLOCALCONSTADD_ARG0_WIDTH, opcodes.OPLOCALCONSTADD_ARG1_WIDTH)
+    ),
+    opcodes.OPLOCALCONSTSUB: OpcodeDefinition(
+        "OPLOCALCONSTSUB", (opcodes.OPLOCALCONSTSUB_ARG0_WIDTH, opcodes.OPLOCALCONSTSUB_ARG1_WIDTH)
+    ),
+    opcodes.OPLOCALLOCALGTJUMP: OpcodeDefinition(
+        "OPLOCALLOCALGTJUMP",
+        (
+            opcodes.OPLOCALLOCALGTJUMP_ARG0_WIDTH,
+            opcodes.OPLOCALLOCALGTJUMP_ARG1_WIDTH,
+            opcodes.OPLOCALLOCALGTJUMP_ARG2_WIDTH,
+        ),
+        address_operands=(2,),
+    ),
+    opcodes.OPCONSTLOCALGTJUMP: OpcodeDefinition(
+        "OPCONSTLOCALGTJUMP",
+        (
+            opcodes.OPCONSTLOCALGTJUMP_ARG0_WIDTH,
+            opcodes.OPCONSTLOCALGTJUMP_ARG1_WIDTH,
+            opcodes.OPCONSTLOCALGTJUMP_ARG2_WIDTH,
+        ),
+        address_operands=(2,),
+    ),
+    opcodes.OPCONSTSETGLOBAL: OpcodeDefinition(
+        "OPCONSTSETGLOBAL", (opcodes.OPCONSTSETGLOBAL_ARG0_WIDTH, opcodes.OPCONSTSETGLOBAL_ARG1_WIDTH)
+    ),
 }
 
+# the widest opcode name, used to line up the operands when instructions are written out
+MAXIMUM_OPCODE_NAME_LENGTH: int = max(len(definition.name) for definition in OPCODE_DEFINITIONS.values())
+
 
 def lookup_opcode_definition(opcode: Opcode) -> OpcodeDefinition:
     return OPCODE_DEFINITIONS.get(opcode, UNDEFINED_OPCODE)
@@ -46,6 +46,19 @@ OPGETBUILTIN: Opcode = b"\x26"
 OPCLOSURE: Opcode = b"\x27"
 OPGETFREE: Opcode = b"\x28"
 OPCURRENTCLOSURE: Opcode = b"\x29"
+OPJUMPWHENTRUE: Opcode = b"\x30"
+
+# superinstructions; each one does the work of the sequence of opcodes that its name spells out,
+# and takes the operands of that sequence, in order
+OPLOCALCONSTADD: Opcode = b"\x31"  # OPGETLOCAL, OPCONSTANT, OPADD
+OPLOCALCONSTSUB: Opcode = b"\x32"  # OPGETLOCAL, OPCONSTANT, OPSUB
+OPLOCALLOCALGTJUMP: Opcode = b"\x33"  # OPGETLOCAL, OPGETLOCAL, OPGREATERTHAN, OPJUMPWHENFALSE
+OPCONSTLOCALGTJUMP: Opcode = b"\x34"  # OPCONSTANT, OPGETLOCAL, OPGREATERTHAN, OPJUMPWHENFALSE
+OPCONSTSETGLOBAL: Opcode = b"\x35"  # OPCONSTANT, OPSETGLOBAL
+
+# a call in tail position; the callee takes over the caller's frame, and its return value
+# goes straight back to the caller's caller
+OPTAILCALL: Opcode = b"\x36"
 
 # a dummy opcode used in situations where an opcode instance needs to exist
 OPDUMMY: Opcode = b"\xFF"
@@ -57,10 +70,24 @@ OPSETLOCAL_WIDTH: int = LOCAL_BINDING_BYTE_SIZE
 OPGETLOCAL_WIDTH: int = LOCAL_BINDING_BYTE_SIZE
 OPJUMP_WIDTH: int = ADDRESS_POSITION_SIZE
 OPJUMPWHENFALSE_WIDTH: int = ADDRESS_POSITION_SIZE
+OPJUMPWHENTRUE_WIDTH: int = ADDRESS_POSITION_SIZE
 OPARRAY_WIDTH: int = MAXIMUM_ARRAY_BYTE_SIZE
 OPHASH_WIDTH: int = MAXIMUM_HASH_BYTE_SIZE
 OPCALL_WIDTH: int = NUMBER_OF_ARGUMENTS_BYTE_SIZE
+OPTAILCALL_WIDTH: int = NUMBER_OF_ARGUMENTS_BYTE_SIZE
 OPGETBUILTIN_WIDTH: int = MAXIMUM_BUILTIN_BYTE_SIZE
 OPCLOSURE_ARG0_WIDTH: int = ADDRESS_POSITION_SIZE
 OPCLOSURE_ARG1_WIDTH: int = MAXIMUM_NUMBER_OF_FREE_VARIABLES_BYTE_SIZE
 OPGETFREE_WIDTH: int = MAXIMUM_NUMBER_OF_FREE_VARIABLES_BYTE_SIZE
+OPLOCALCONSTADD_ARG0_WIDTH: int = LOCAL_BINDING_BYTE_SIZE
+OPLOCALCONSTADD_ARG1_WIDTH: int = ADDRESS_POSITION_SIZE
+OPLOCALCONSTSUB_ARG0_WIDTH: int = LOCAL_BINDING_BYTE_SIZE
+OPLOCALCONSTSUB_ARG1_WIDTH: int = ADDRESS_POSITION_SIZE
+OPLOCALLOCALGTJUMP_ARG0_WIDTH: int = LOCAL_BINDING_BYTE_SIZE
+OPLOCALLOCALGTJUMP_ARG1_WIDTH: int = LOCAL_BINDING_BYTE_SIZE
+OPLOCALLOCALGTJUMP_ARG2_WIDTH: int = ADDRESS_POSITION_SIZE
+OPCONSTLOCALGTJUMP_ARG0_WIDTH: int = ADDRESS_POSITION_SIZE
+OPCONSTLOCALGTJUMP_ARG1_WIDTH: int = LOCAL_BINDING_BYTE_SIZE
+OPCONSTLOCALGTJUMP_ARG2_WIDTH: int = ADDRESS_POSITION_SIZE
+OPCONSTSETGLOBAL_ARG0_WIDTH: int = ADDRESS_POSITION_SIZE
+OPCONSTSETGLOBAL_ARG1_WIDTH: int = GLOBAL_BINDING_BYTE_SIZE
@@ -0,0 +1,111 @@
+"""
+This module contains the function that works out how many operands a sequence of decoded
+instructions can have on the stack at once, at most.
+
+The virtual machine checks that there is room for this many operands (and for the locals)
+once, when it enters a function's frame, so that the pushes themselves don't need to check
+the bounds of the stack.
+
+Each instruction is followed along every path that it can take: a conditional jump goes on
+to both the next instruction and the jump's target, while an unconditional jump, a return,
+or a tail call only goes on to its target, if any. The compiler always reaches an instruction
+with the same number of operands on the stack, no matter which path it takes to get there,
+so each instruction only has to be visited once.
+"""
+
+import monkey.code.opcodes as opcodes
+from monkey.code.decoding import DecodedInstruction
+
+# the change in the number of operands that each opcode makes, for the opcodes that don't
+# depend on their operands; none of them pushes more than that change at any point
+_STACK_EFFECTS: dict[int, int] = {
+    opcodes.OPCONSTANT[0]: 1,
+    opcodes.OPPOP[0]: -1,
+    opcodes.OPADD[0]: -1,
+    opcodes.OPSUB[0]: -1,
+    opcodes.OPMUL[0]: -1,
+    opcodes.OPDIV[0]: -1,
+    opcodes.OPTRUE[0]: 1,
+    opcodes.OPFALSE[0]: 1,
+    opcodes.OPEQUAL[0]: -1,
+    opcodes.OPNOTEQUAL[0]: -1,
+    opcodes.OPGREATERTHAN[0]: -1,
+    opcodes.OPMINUS[0]: 0,
+    opcodes.OPBANG[0]: 0,
+    opcodes.OPJUMP[0]: 0,
+    opcodes.OPJUMPWHENFALSE[0]: -1,
+    opcodes.OPJUMPWHENTRUE[0]: -1,
+    opcodes.OPNULL[0]: 1,
+    opcodes.OPSETGLOBAL[0]: -1,
+    opcodes.OPGETGLOBAL[0]: 1,
+    opcodes.OPSETLOCAL[0]: -1,
+    opcodes.OPGETLOCAL[0]: 1,
+    opcodes.OPINDEX[0]: -1,
+    opcodes.OPRETURNVALUE[0]: 0,
+    opcodes.OPRETURN[0]: 0,
+    opcodes.OPGETBUILTIN[0]: 1,
+    opcodes.OPGETFREE[0]: 1,
+    opcodes.OPCURRENTCLOSURE[0]: 1,
+    opcodes.OPLOCALCONSTADD[0]: 1,
+    opcodes.OPLOCALCONSTSUB[0]: 1,
+    opcodes.OPLOCALLOCALGTJUMP[0]: 0,
+    opcodes.OPCONSTLOCALGTJUMP[0]: 0,
+    opcodes.OPCONSTSETGLOBAL[0]: 0,
+}
+
+# the opcodes that jump, and the position of the jump's target in a decoded instruction
+_JUMP_TARGETS: dict[int, int] = {
+    opcodes.OPJUMP[0]: 1,
+    opcodes.OPJUMPWHENFALSE[0]: 1,
+    opcodes.OPJUMPWHENTRUE[0]: 1,
+    opcodes.OPLOCALLOCALGTJUMP[0]: 3,
+    opcodes.OPCONSTLOCALGTJUMP[0]: 3,
+}
+
+# the opcodes after which the instructions don't carry on to the next one
+_ENDS_OF_PATH: frozenset[int] = frozenset(
+    [opcodes.OPJUMP[0], opcodes.OPRETURNVALUE[0], opcodes.OPRETURN[0], opcodes.OPTAILCALL[0]]
+)
+
+
+def max_stack_depth(instructions: list[DecodedInstruction]) -> int:
+    max_depth = 0
+    visited = [False] * len(instructions)
+
+    # the paths that still need to be followed: where each one starts, and at what depth
+    paths: list[tuple[int, int]] = [(0, 0)]
+    while paths:
+        index, depth = paths.pop()
+        while index < len(instructions) and not visited[index]:
+            visited[index] = True
+
+            instruction = instructions[index]
+            opcode = instruction[0]
+            depth += _stack_effect(instruction)
+            max_depth = max(max_depth, depth)
+
+            i_target = _JUMP_TARGETS.get(opcode, None)
+            if i_target is not None:
+                paths.append((instruction[i_target], depth))
+
+            if opcode in _ENDS_OF_PATH:
+                break
+
+            index += 1
+
+    return max_depth
+
+
+def _stack_effect(instruction: DecodedInstruction) -> int:
+    opcode = instruction[0]
+    if opcode == opcodes.OPARRAY[0] or opcode == opcodes.OPHASH[0]:
+        # the elements are replaced by the container
+        return 1 - instruction[1]
+    elif opcode == opcodes.OPCALL[0] or opcode == opcodes.OPTAILCALL[0]:
+        # the function and its arguments are replaced by the returned value
+        return -instruction[1]
+    elif opcode == opcodes.OPCLOSURE[0]:
+        # the free variables are replaced by the closure
+        return 1 - instruction[2]
+    else:
+        return _STACK_EFFECTS[opcode]
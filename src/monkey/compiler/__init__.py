@@ -3,6 +3,8 @@ from monkey.compiler.compiler import bytecode_from_compiler
 from monkey.compiler.compiler import Compiler
 from monkey.compiler.compiler import EmittedInstruction
 from monkey.compiler.compiler import compile
+from monkey.compiler.compiler_options import CompilerOptions
+from monkey.compiler.custom_exceptions import CompilationError
 
 from monkey.compiler.symbol_table import build_enclosed_symbol_table
 from monkey.compiler.symbol_table import Symbol
@@ -1,4 +1,8 @@
 import dataclasses
+from typing import Hashable
+from typing import Iterator
+from typing import Optional
+from typing import Sequence
 
 from monkey.object import Object
 from monkey.parser import ASTNode
@@ -19,11 +23,16 @@ import monkey.code.opcodes as opcodes
 
 from monkey.containers.fixed_stack import FixedStack
 
+from monkey.compiler.compiler_options import CompilerOptions
+from monkey.compiler.constant_folding import fold_statement
 from monkey.compiler.constants import MAX_COMPILATION_SCOPE_STACK_SIZE
 from monkey.compiler.custom_exceptions import CompilationError
 from monkey.compiler.emitted_instruction import EmittedInstruction
 import monkey.compiler.emitted_instruction as emitted
+from monkey.compiler.peephole import optimize_peephole
 from monkey.compiler.scope_instructions import ScopeInstructions
+from monkey.compiler.superinstructions import fuse_superinstructions
+from monkey.compiler.tail_calls import mark_tail_calls
 
 import monkey.compiler.symbol_table as sym
 
@@ -38,8 +47,10 @@ DUMMY_NUMBER_OF_FREE_VARIABLES: int = 0
 
 
 class Compiler:
-    def __init__(self) -> None:
+    def __init__(self, options: CompilerOptions = CompilerOptions()) -> None:
+        self.options = options
         self._constants: list[Object] = []
+        self._constant_positions: dict[Hashable, int] = {}
 
         self._compilation_scopes = FixedStack[ScopeInstructions](MAX_COMPILATION_SCOPE_STACK_SIZE)
         main_scope = ScopeInstructions()
@@ -92,9 +103,16 @@ class Compiler:
         return current_scope.instructions
 
     def add_constant_and_get_position(self, const: Object) -> int:
+        key = _constant_pool_key(const) if self.options.use_constant_interning else None
+        if key is not None and key in self._constant_positions:
+            return self._constant_positions[key]
+
         position = len(self._constants)
         self._constants.append(const)
 
+        if key is not None:
+            self._constant_positions[key] = position
+
         return position
 
     def add_instruction_and_get_position(self, instr: Instructions) -> int:
@@ -164,34 +182,79 @@ class Compiler:
             )
 
 
+def _constant_pool_key(const: Object) -> Optional[Hashable]:
+    """
+    The key under which a constant is interned; two constants with the same key are
+    interchangeable, and share a position in the constant pool.
+    """
+    match const:
+        case objs.IntegerObject() | objs.StringObject():
+            return (const.data_type(), const.value)
+        case objs.CompiledFunctionObject():
+            # functions with different names stay apart, so that each keeps its own name
+            instructions = bytes(const.instructions)
+            return (const.data_type(), instructions, const.n_locals, const.n_arguments, const.name)
+        case _:
+            return None
+
+
 @dataclasses.dataclass
 class Bytecode:
     """
     Container to hold the instructions that the compiler generated, and the constants
     that the compiler evaluated. Gets passed to the virtual machine.
+
+    The constants only need to be indexable; bytecode that is loaded lazily creates each
+    constant the first time that it is indexed.
     """
 
     instructions: Instructions
-    constants: list[Object]
+    constants: Sequence[Object]
 
 
 def bytecode_from_compiler(compiler: Compiler) -> Bytecode:
-    return Bytecode(compiler.instructions, compiler.constants)
+    instructions = _optimize_instructions(compiler, compiler.instructions, is_main_program=True)
+    return Bytecode(instructions, compiler.constants)
 
 
 def compile(compiler: Compiler, node: ASTNode) -> None:
+    """
+    Emit the instructions for the node, and all of the nodes inside of it.
+
+    The tree is walked with an explicit stack of the nodes that are partway through being
+    compiled, rather than with recursive calls, so even a very deeply nested expression (such
+    as a long chain of additions written by a code generator) doesn't hit the recursion limit.
+    """
+    pending = [_compile_node(compiler, node)]
+    while pending:
+        # resume the node on top of the stack; it either hands back its next child, or is finished
+        for child in pending[-1]:
+            pending.append(_compile_node(compiler, child))
+            break
+        else:
+            pending.pop()
+
+
+def _compile_node(compiler: Compiler, node: ASTNode) -> Iterator[ASTNode]:
+    """
+    Emit the instructions for a single node. Each child node is yielded at the point where
+    its instructions belong, and the generator resumes once they have been emitted.
+    """
     match node:
         case Program():
+            # the folding pass walks each statement's tree once, before any of it is compiled
             for stmt in node.statements:
-                compile(compiler, stmt)
+                if compiler.options.use_constant_folding:
+                    stmt = fold_statement(stmt)
+                yield stmt
         case stmts.ExpressionStatement():
-            compile(compiler, node.value)
+            yield node.value
             compiler.emit(opcodes.OPPOP)  # don't want to keep the (unusable) result on the stack
         case stmts.BlockStatement():
             for statement in node.statements:
-                compile(compiler, statement)
+                yield statement
         case exprs.IntegerLiteral():
-            integer = objs.IntegerObject(int(node.value))
+            integer = objs.integer_object(int(node.value))
             constant_position = compiler.add_constant_and_get_position(integer)
             compiler.emit(opcodes.OPCONSTANT, constant_position)
         case exprs.BooleanLiteral():
@@ -205,7 +268,7 @@ def compile(compiler: Compiler, node: ASTNode) -> None:
             constant_position = compiler.add_constant_and_get_position(string)
             compiler.emit(opcodes.OPCONSTANT, constant_position)
         case exprs.PrefixExpression():
-            compile(compiler, node.expr)
+            yield node.expr
             match node.operator:
                 case token_types.MINUS:
                     compiler.emit(opcodes.OPMINUS)
@@ -224,16 +287,15 @@ def compile(compiler: Compiler, node: ASTNode) -> None:
             # ALTERNATIVE
             # [TARGET OF MANDATORY JUMP, BUT DOES NOTHING ON ITS OWN]
             # ...
-            compile(compiler, node.condition)
+            yield node.condition
 
             # instruction that determines where we jump if the condition isn't true
             consequence_jump_instr_position = compiler.emit(opcodes.OPJUMPWHENFALSE, DUMMY_ADDRESS)
 
             # if the condition is true, we don't jump, and instead continue to this bytecode
             # depending on the expression in the consequence, it might leave an extra OPPOP on the stack
-            compile(compiler, node.consequence)
-            if compiler.is_last_instruction_opcode(opcodes.OPPOP):
-                compiler.remove_last_instruction()
+            yield node.consequence
+            _keep_value_of_block(compiler)
 
             # if we didn't jump before, we have to now, past the bytecode for the alternative
             alternative_jump_instr_position = compiler.emit(opcodes.OPJUMP, DUMMY_ADDRESS)
@@ -247,16 +309,61 @@ def compile(compiler: Compiler, node: ASTNode) -> None:
             if node.alternative is None:
                 compiler.emit(opcodes.OPNULL)
             else:
-                compile(compiler, node.alternative)
-                if compiler.is_last_instruction_opcode(opcodes.OPPOP):
-                    compiler.remove_last_instruction()
+                yield node.alternative
+                _keep_value_of_block(compiler)
 
             # if we didn't jump, and hit the OPJUMP instruction, it should be to here
             alternative_jump_position = len(compiler.instructions)
             compiler.replace_operand(alternative_jump_instr_position, alternative_jump_position)
+        case exprs.WhileExpression():
+            # the while-expression is laid out like the following:
+            # ...
+            # [TARGET OF BACKWARD JUMP]
+            # CONDITION
+            # MAYBE JUMP
+            # BODY
+            # BACKWARD JUMP
+            # [TARGET OF MAYBE JUMP]
+            # NULL
+            # ...
+            loop_start_position = len(compiler.instructions)
+            yield node.condition
+
+            # instruction that determines where we jump if the condition isn't true
+            exit_jump_instr_position = compiler.emit(opcodes.OPJUMPWHENFALSE, DUMMY_ADDRESS)
+
+            # every statement in the body cleans up after itself, so the stack is the same
+            # at the start of every trip around the loop
+            yield node.body
+            compiler.emit(opcodes.OPJUMP, loop_start_position)
+
+            exit_jump_position = len(compiler.instructions)
+            compiler.replace_operand(exit_jump_instr_position, exit_jump_position)
+
+            # the loop is an expression, but it has no value of its own
+            compiler.emit(opcodes.OPNULL)
+        case stmts.AssignStatement():
+            symbol = compiler.symbol_table.resolve(node.name.value)
+            if symbol is None:
+                raise CompilationError(f"undefined variable: {node.name.value}")
+
+            # a closure holds copies of the free variables it captured, so assigning to one of
+            # them couldn't change the variable that the enclosing function sees
+            match symbol.scope:
+                case sym.SymbolScope.GLOBAL:
+                    yield node.value
+                    compiler.emit(opcodes.OPSETGLOBAL, symbol.index)
+                case sym.SymbolScope.LOCAL:
+                    yield node.value
+                    compiler.emit(opcodes.OPSETLOCAL, symbol.index)
+                case _:
+                    raise CompilationError(
+                        f"cannot assign to '{node.name.value}'; only global and local variables can be "
+                        "assigned to, and not builtins, captured variables, or the current function"
+                    )
         case stmts.LetStatement():
             symbol = compiler.symbol_table.define(node.name.value)
-            compile(compiler, node.value)
+            yield node.value
 
             if symbol.scope == sym.SymbolScope.GLOBAL:
                 compiler.emit(opcodes.OPSETGLOBAL, symbol.index)
@@ -273,13 +380,13 @@ def compile(compiler: Compiler, node: ASTNode) -> None:
             #       than operator; however, for pedagogical purposes the book wants to emphasize the ability
             #       for the compiler to reorder expressions, so I'll do that here, even if it is messier
             if node.operator == token_types.LT:
-                compile(compiler, node.right)
-                compile(compiler, node.left)
+                yield node.right
+                yield node.left
                 compiler.emit(opcodes.OPGREATERTHAN)
                 return
 
-            compile(compiler, node.left)
-            compile(compiler, node.right)
+            yield node.left
+            yield node.right
             match node.operator:
                 case token_types.PLUS:
                     compiler.emit(opcodes.OPADD)
@@ -299,22 +406,22 @@ def compile(compiler: Compiler, node: ASTNode) -> None:
                     raise CompilationError(f"Unknown operator for infix expression: {node.operator}")
         case exprs.ArrayLiteral():
             for element in node.elements:
-                compile(compiler, element)
+                yield element
             compiler.emit(opcodes.OPARRAY, len(node.elements))
         case exprs.HashLiteral():
             # NOTE: the HashLiteral type in the book used an actual hash in its data structure, and Go makes no
             # guarantees about the order of elements in a Go map. We use a list instead of a dict, and so we
             # don't run into the same possible ordering bugs that the authors in the Go book would; we can skip
             # that precaution entirely, and directly use the node's key-value pairs!
-            for key, value in node.key_value_pairs:
-                compile(compiler, key)
-                compile(compiler, value)
+            for key, value_node in node.key_value_pairs:
+                yield key
+                yield value_node
 
             n_pairs = len(node.key_value_pairs)
             compiler.emit(opcodes.OPHASH, 2 * n_pairs)
         case exprs.IndexExpression():
-            compile(compiler, node.container)
-            compile(compiler, node.inside)
+            yield node.container
+            yield node.inside
             compiler.emit(opcodes.OPINDEX)
         case exprs.FunctionLiteral():  # parameters, body, name
             # compile the body of the function in its own scope
@@ -326,7 +433,7 @@ def compile(compiler: Compiler, node: ASTNode) -> None:
             for param in node.parameters:
                 compiler.symbol_table.define(param.value)
 
-            compile(compiler, node.body)
+            yield node.body
 
             # covers the case of an implicit return (no return statement, so no ReturnStatement case)
             if compiler.is_last_instruction_opcode(opcodes.OPPOP):
@@ -342,21 +449,21 @@ def compile(compiler: Compiler, node: ASTNode) -> None:
             free_symbols = compiler.symbol_table.free_symbols
             n_free_symbols = len(free_symbols)
 
-            instructions = compiler.leave_scope()
+            instructions = _optimize_instructions(compiler, compiler.leave_scope(), is_main_program=False)
 
             for symbol in free_symbols:
                 _load_symbols(compiler, symbol)
 
             # ensures that the emitted instructions are stored in a separate object after compilation
-            compiled_function = objs.CompiledFunctionObject(instructions, n_locals, n_arguments)
+            compiled_function = objs.CompiledFunctionObject(instructions, n_locals, n_arguments, node.name)
 
             position = compiler.add_constant_and_get_position(compiled_function)
             compiler.emit(opcodes.OPCLOSURE, position, n_free_symbols)
         case stmts.ReturnStatement():  # value
-            compile(compiler, node.value)
+            yield node.value
             compiler.emit(opcodes.OPRETURNVALUE)
         case exprs.CallExpression():  # function, arguments
-            compile(compiler, node.function)
+            yield node.function
 
             # NOTE: I can't check that the number of arguments pass to the function matches
             # the number of parameters that the function accepts, at this section. This is
@@ -367,7 +474,7 @@ def compile(compiler: Compiler, node: ASTNode) -> None:
             # at the VM level
 
             for arg in node.arguments:
-                compile(compiler, arg)
+                yield arg
 
             n_arguments = len(node.arguments)
             compiler.emit(opcodes.OPCALL, n_arguments)
@@ -375,6 +482,39 @@ def compile(compiler: Compiler, node: ASTNode) -> None:
             raise CompilationError(f"Invalid node encountered: {node}")
 
 
+def _optimize_instructions(
+    compiler: Compiler, instructions: Instructions, *, is_main_program: bool
+) -> Instructions:
+    """
+    Run the optional passes that the compiler's options ask for over a finished sequence
+    of instructions; either those of a function's scope, or those of the main program.
+    """
+    if compiler.options.use_peephole:
+        # the last value that the main program pops is its result, so it has to stay
+        instructions = optimize_peephole(instructions, drop_discarded_pushes=not is_main_program)
+
+    # only a function has a frame that a tail call can take over
+    if compiler.options.use_tail_calls and not is_main_program:
+        instructions = mark_tail_calls(instructions)
+
+    # the peephole pass can expose new sequences to fuse, so it runs first
+    if compiler.options.use_superinstructions:
+        instructions = fuse_superinstructions(instructions)
+
+    return instructions
+
+
+def _keep_value_of_block(compiler: Compiler) -> None:
+    # a branch of an if-expression has to leave a value on the stack; an expression statement
+    # leaves one behind if its OPPOP is removed, but a block that is empty, or that ends with a
+    # statement that doesn't produce a value (such as an assignment), evaluates to NULL; and
+    # a block that ends by returning never gets to the end of the branch at all
+    if compiler.is_last_instruction_opcode(opcodes.OPPOP):
+        compiler.remove_last_instruction()
+    elif not compiler.is_last_instruction_opcode(opcodes.OPRETURNVALUE):
+        compiler.emit(opcodes.OPNULL)
+
+
 def _load_symbols(compiler: Compiler, symbol: sym.Symbol) -> None:
     match symbol.scope:
         case sym.SymbolScope.BUILTIN:
@@ -0,0 +1,25 @@
+"""
+This module contains the CompilerOptions class, which holds the switches that control the
+optional passes the Compiler runs over the instructions it produces.
+"""
+
+import dataclasses
+
+
+@dataclasses.dataclass(frozen=True)
+class CompilerOptions:
+    # evaluate the prefix and infix expressions made only of literals at compile time
+    use_constant_folding: bool = True
+
+    # give each distinct integer, string, and compiled function a single slot in the constant pool
+    use_constant_interning: bool = True
+
+    # clean up naive sequences of instructions; turn this off to see exactly what the
+    # compiler emits for each node
+    use_peephole: bool = True
+
+    # run the calls in tail position of a function in the caller's frame, instead of a new one
+    use_tail_calls: bool = True
+
+    # replace common sequences of opcodes with superinstructions
+    use_superinstructions: bool = False
@@ -0,0 +1,207 @@
+"""
+This module contains the constant folding pass, which evaluates the prefix and infix
+expressions whose operands are all literals before any instructions are emitted for them.
+
+For example, `2 * 60 * 60 * 1000` is compiled to a single OPCONSTANT for `7200000`, rather
+than to four OPCONSTANT instructions and three OPMUL instructions that run every time the
+expression is reached.
+
+An expression is only folded when the virtual machine would evaluate it without an error;
+it produces exactly the same value. Anything else (such as a division by zero, or adding a
+string to an integer) is left alone, so that it still raises an error when the program runs.
+"""
+
+import dataclasses
+from typing import Generator
+from typing import Optional
+from typing import TypeVar
+from typing import cast
+
+from monkey.parser import ASTNode
+from monkey.tokens import token_types
+from monkey.tokens.monkey_token import Token
+from monkey.tokens.reserved_identifiers import FALSE_IDENTIFIER
+from monkey.tokens.reserved_identifiers import TRUE_IDENTIFIER
+
+import monkey.parser.expressions as exprs
+import monkey.parser.statements as stmts
+
+NodeT = TypeVar("NodeT", bound=ASTNode)
+
+# yields the children to fold, and returns the folded node
+FoldingSteps = Generator[ASTNode, Optional[ASTNode], NodeT]
+
+
+def fold_statement(statement: stmts.Statement) -> stmts.Statement:
+    """
+    Return the statement with every foldable expression inside of it replaced by a literal.
+    The statement itself is not modified.
+    """
+    return _fold(statement)
+
+
+def _fold(node: NodeT) -> NodeT:
+    """
+    Fold the node with an explicit stack of the nodes that are partway through being folded,
+    rather than with recursive calls, so that very deeply nested expressions can be folded.
+    """
+    pending: list[FoldingSteps[ASTNode]] = [_fold_node(node)]
+    folded_child: Optional[ASTNode] = None
+    while pending:
+        try:
+            child = pending[-1].send(folded_child)
+        except StopIteration as finished:
+            pending.pop()
+            folded_child = finished.value
+        else:
+            pending.append(_fold_node(child))
+            folded_child = None
+
+    # a statement is folded into a statement, a block into a block, an expression into an expression
+    return cast(NodeT, folded_child)
+
+
+def _folded(child: NodeT) -> FoldingSteps[NodeT]:
+    """
+    Yield a child to be folded, and return the folded version that is sent back in its place.
+    """
+    return cast(NodeT, (yield child))
+
+
+def _fold_node(node: ASTNode) -> FoldingSteps[ASTNode]:
+    """
+    Return the folded version of a single node, with each of its children folded by `_folded()`.
+    """
+    match node:
+        case (
+            stmts.ExpressionStatement()
+            | stmts.LetStatement()
+            | stmts.AssignStatement()
+            | stmts.ReturnStatement()
+        ):
+            return dataclasses.replace(node, value=(yield from _folded(node.value)))
+        case stmts.BlockStatement():
+            statements: list[stmts.Statement] = []
+            for statement in node.statements:
+                statements.append((yield from _folded(statement)))
+            return dataclasses.replace(node, statements=statements)
+        case exprs.InfixExpression():
+            left = yield from _folded(node.left)
+            right = yield from _folded(node.right)
+            folded = _fold_infix_expression(node.operator, left, right)
+            if folded is not None:
+                return folded
+
+            return dataclasses.replace(node, left=left, right=right)
+        case exprs.PrefixExpression():
+            operand = yield from _folded(node.expr)
+            folded = _fold_prefix_expression(node.operator, operand)
+            if folded is not None:
+                return folded
+
+            return dataclasses.replace(node, expr=operand)
+        case exprs.IfExpression():
+            alternative = node.alternative
+            return dataclasses.replace(
+                node,
+                condition=(yield from _folded(node.condition)),
+                consequence=(yield from _folded(node.consequence)),
+                alternative=(yield from _folded(alternative)) if alternative is not None else None,
+            )
+        case exprs.WhileExpression():
+            return dataclasses.replace(
+                node,
+                condition=(yield from _folded(node.condition)),
+                body=(yield from _folded(node.body)),
+            )
+        case exprs.FunctionLiteral():
+            return dataclasses.replace(node, body=(yield from _folded(node.body)))
+        case exprs.CallExpression():
+            function = yield from _folded(node.function)
+            arguments: list[exprs.Expression] = []
+            for argument in node.arguments:
+                arguments.append((yield from _folded(argument)))
+            return dataclasses.replace(node, function=function, arguments=arguments)
+        case exprs.ArrayLiteral():
+            elements: list[exprs.Expression] = []
+            for element in node.elements:
+                elements.append((yield from _folded(element)))
+            return dataclasses.replace(node, elements=elements)
+        case exprs.HashLiteral():
+            key_value_pairs: list[tuple[exprs.Expression, exprs.Expression]] = []
+            for key, value in node.key_value_pairs:
+                key_value_pairs.append(((yield from _folded(key)), (yield from _folded(value))))
+            return dataclasses.replace(node, key_value_pairs=key_value_pairs)
+        case exprs.IndexExpression():
+            return dataclasses.replace(
+                node,
+                container=(yield from _folded(node.container)),
+                inside=(yield from _folded(node.inside)),
+            )
+        case _:
+            return node
+
+
+def _fold_infix_expression(
+    operator: str, left: exprs.Expression, right: exprs.Expression
+) -> Optional[exprs.Expression]:
+    match (left, right):
+        case (exprs.IntegerLiteral(), exprs.IntegerLiteral()):
+            left_value = int(left.value)
+            right_value = int(right.value)
+            match operator:
+                case token_types.PLUS:
+                    return _integer_literal(left_value + right_value)
+                case token_types.MINUS:
+                    return _integer_literal(left_value - right_value)
+                case token_types.ASTERISK:
+                    return _integer_literal(left_value * right_value)
+                case token_types.SLASH if right_value != 0:
+                    return _integer_literal(left_value // right_value)
+                case token_types.LT:
+                    return _boolean_literal(left_value < right_value)
+                case token_types.GT:
+                    return _boolean_literal(left_value > right_value)
+                case token_types.EQ:
+                    return _boolean_literal(left_value == right_value)
+                case token_types.NOT_EQ:
+                    return _boolean_literal(left_value != right_value)
+        case (exprs.BooleanLiteral(), exprs.BooleanLiteral()):
+            match operator:
+                case token_types.EQ:
+                    return _boolean_literal(left.value == right.value)
+                case token_types.NOT_EQ:
+                    return _boolean_literal(left.value != right.value)
+        case (exprs.StringLiteral(), exprs.StringLiteral()):
+            if operator == token_types.PLUS:
+                return _string_literal(left.value + right.value)
+
+    return None
+
+
+def _fold_prefix_expression(operator: str, operand: exprs.Expression) -> Optional[exprs.Expression]:
+    match (operator, operand):
+        case (token_types.MINUS, exprs.IntegerLiteral()):
+            return _integer_literal(-int(operand.value))
+        case (token_types.BANG, exprs.BooleanLiteral()):
+            return _boolean_literal(operand.value != TRUE_IDENTIFIER)
+        case (token_types.BANG, exprs.IntegerLiteral() | exprs.StringLiteral()):
+            # like every other object besides `false` and `null`, these are truthy
+            return _boolean_literal(False)
+
+    return None
+
+
+def _integer_literal(value: int) -> exprs.IntegerLiteral:
+    return exprs.IntegerLiteral(Token(token_types.INT, str(value)), str(value))
+
+
+def _boolean_literal(value: bool) -> exprs.BooleanLiteral:
+    if value:
+        return exprs.BooleanLiteral(Token(token_types.TRUE, TRUE_IDENTIFIER), TRUE_IDENTIFIER)
+    else:
+        return exprs.BooleanLiteral(Token(token_types.FALSE, FALSE_IDENTIFIER), FALSE_IDENTIFIER)
+
+
+def _string_literal(value: str) -> exprs.StringLiteral:
+    return exprs.StringLiteral(Token(token_types.STRING, value), value)
@@ -7,3 +7,8 @@ Compiler class.
 DUMMY_EMITTED_INSTRUCTION_POSITION: int = -1
 MAX_COMPILATION_SCOPE_STACK_SIZE: int = 1024
 DUMMY_FUNCTION_SCOPE_INDEX: int = 0
+
+# the version of the bytecode that the compiler emits; it must be changed whenever the same
+# source code and options could compile to different bytecode, so that compiled bytecode
+# that was cached by an older compiler is never used
+COMPILER_VERSION: int = 1
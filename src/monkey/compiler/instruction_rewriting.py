@@ -0,0 +1,90 @@
+"""
+This module contains the tools that the compiler's optimization passes use to rewrite a
+finished sequence of Instructions.
+
+A pass reads the instructions into a list of LocatedInstruction instances, replaces,
+merges, or drops some of them, and writes the result back out. Each LocatedInstruction
+remembers the byte position that it started at in the original instructions, and its
+address operands (such as the targets of jumps) keep referring to positions in the original
+instructions; writing the instructions back out moves every address to where its target
+instruction ended up.
+"""
+
+import bisect
+import dataclasses
+from typing import Sequence
+
+from monkey.code import Instructions
+from monkey.code import Opcode
+from monkey.code import iterate_instructions
+from monkey.code import lookup_opcode_definition
+from monkey.code import make_instruction
+from monkey.code.custom_types import Operands
+
+
+@dataclasses.dataclass(frozen=True)
+class LocatedInstruction:
+    position: int  # byte position of the instruction in the original instructions
+    opcode: Opcode
+    operands: Operands
+
+
+def read_instructions(instructions: Instructions) -> list[LocatedInstruction]:
+    return [
+        LocatedInstruction(position, opcode, operands)
+        for (position, opcode, operands) in iterate_instructions(instructions)
+    ]
+
+
+def find_jump_targets(located_instructions: Sequence[LocatedInstruction]) -> set[int]:
+    """
+    Collect the original byte positions that any address operand points to. A pass must
+    not merge an instruction at one of these positions into the instruction before it, or
+    the jump would have nowhere to land.
+    """
+    targets: set[int] = set()
+    for instruction in located_instructions:
+        for i_operand in lookup_opcode_definition(instruction.opcode).address_operands:
+            targets.add(instruction.operands[i_operand])
+
+    return targets
+
+
+def write_instructions(
+    located_instructions: Sequence[LocatedInstruction], original_size: int
+) -> Instructions:
+    """
+    Encode the rewritten instructions, relocating every address operand.
+
+    The located instructions must still be in the order of their original positions. An
+    address that pointed to an instruction that was dropped now points to the instruction
+    that follows it; an address that pointed to the end of the original instructions now
+    points to the end of the rewritten instructions.
+    """
+    original_positions = [instruction.position for instruction in located_instructions]
+
+    new_positions: list[int] = []
+    new_size = 0
+    for instruction in located_instructions:
+        new_positions.append(new_size)
+        new_size += len(make_instruction(instruction.opcode, *instruction.operands))
+
+    def relocate(address: int) -> int:
+        if address > original_size:
+            raise ValueError(f"The address '{address}' is past the end of the instructions.")
+
+        i_instruction = bisect.bisect_left(original_positions, address)
+        if i_instruction == len(new_positions):
+            return new_size
+
+        return new_positions[i_instruction]
+
+    rewritten = Instructions()
+    for instruction in located_instructions:
+        operands = list(instruction.operands)
+        for i_operand in lookup_opcode_definition(instruction.opcode).address_operands:
+            operands[i_operand] = relocate(operands[i_operand])
+
+        rewritten += make_instruction(instruction.opcode, *operands)
+
+    return rewritten
@@ -0,0 +1,144 @@
+"""
+This module contains the peephole optimization pass, which cleans up the naive sequences
+of instructions that the compiler emits, by looking at a few neighbouring instructions at
+a time.
+
+The rewrites are:
+- a jump to an unconditional jump goes straight to the final target
+- an unconditional jump to a return is replaced by that return
+- an unconditional jump to the very next instruction is dropped
+- `OPTRUE; OPJUMPWHENFALSE` never jumps, and is dropped
+- `OPFALSE; OPJUMPWHENFALSE` always jumps, and becomes an `OPJUMP`
+- `OPBANG; OPJUMPWHENFALSE` becomes an `OPJUMPWHENTRUE`
+- a push that is immediately popped, like `OPNULL; OPPOP`, is dropped; but only when asked
+  for, because the value that the main program pops last is the result that gets read back
+  (by the REPL, and by the tests)
+- instructions that follow an unconditional jump or a return, and that no jump lands on,
+  can never run, and are dropped
+
+A rewrite never merges or drops an instruction that a jump lands on, unless it is the first
+instruction of the rewritten sequence. Each rewrite can expose another, so the pass repeats
+until the instructions stop changing.
+"""
+
+from monkey.code import Instructions
+import monkey.code.opcodes as opcodes
+
+from monkey.compiler.instruction_rewriting import LocatedInstruction
+from monkey.compiler.instruction_rewriting import find_jump_targets
+from monkey.compiler.instruction_rewriting import read_instructions
+from monkey.compiler.instruction_rewriting import write_instructions
+
+# instructions that only push a value, and have no other effect
+PURE_PUSH_OPCODES = (
+    opcodes.OPCONSTANT,
+    opcodes.OPTRUE,
+    opcodes.OPFALSE,
+    opcodes.OPNULL,
+    opcodes.OPGETGLOBAL,
+    opcodes.OPGETLOCAL,
+    opcodes.OPGETBUILTIN,
+    opcodes.OPGETFREE,
+    opcodes.OPCURRENTCLOSURE,
+)
+
+# instructions after which execution never moves on to the next instruction
+UNCONDITIONAL_EXIT_OPCODES = (
+    opcodes.OPJUMP,
+    opcodes.OPRETURNVALUE,
+    opcodes.OPRETURN,
+    opcodes.OPTAILCALL,
+)
+
+RETURN_OPCODES = (
+    opcodes.OPRETURNVALUE,
+    opcodes.OPRETURN,
+)
+
+
+def optimize_peephole(instructions: Instructions, drop_discarded_pushes: bool = True) -> Instructions:
+    while True:
+        optimized = _optimize_once(instructions, drop_discarded_pushes)
+        if optimized == instructions:
+            return optimized
+
+        instructions = optimized
+
+
+def _optimize_once(instructions: Instructions, drop_discarded_pushes: bool) -> Instructions:
+    located_instructions = read_instructions(instructions)
+    jump_targets = find_jump_targets(located_instructions)
+    instruction_at = {instruction.position: instruction for instruction in located_instructions}
+
+    optimized: list[LocatedInstruction] = []
+    i = 0
+    while i < len(located_instructions):
+        current = located_instructions[i]
+        following = located_instructions[i + 1] if i + 1 < len(located_instructions) else None
+        can_merge = following is not None and following.position not in jump_targets
+
+        # threading jumps comes first; the other rewrites look at the threaded target
+        if current.opcode in (opcodes.OPJUMP, opcodes.OPJUMPWHENFALSE, opcodes.OPJUMPWHENTRUE):
+            target = _final_jump_target(current.operands[0], instruction_at)
+            current = LocatedInstruction(current.position, current.opcode, (target,))
+
+        if current.opcode == opcodes.OPJUMP:
+            target_instruction = instruction_at.get(current.operands[0], None)
+            if target_instruction is not None and target_instruction.opcode in RETURN_OPCODES:
+                current = LocatedInstruction(current.position, target_instruction.opcode, ())
+            elif following is not None and current.operands[0] == following.position:
+                i += 1
+                continue
+
+        if can_merge and following is not None:
+            merged = _merge_pair(current, following, drop_discarded_pushes)
+            if merged is not None:
+                optimized.extend(merged)
+                i += 2
+                continue
+
+        optimized.append(current)
+        i += 1
+
+        # skip over the unreachable instructions, up to the next place that a jump lands on
+        if current.opcode in UNCONDITIONAL_EXIT_OPCODES:
+            while i < len(located_instructions) and located_instructions[i].position not in jump_targets:
+                i += 1
+
+    return write_instructions(optimized, len(instructions))
+
+
+def _merge_pair(
+    current: LocatedInstruction, following: LocatedInstruction, drop_discarded_pushes: bool
+) -> list[LocatedInstruction] | None:
+    """
+    Return the instructions that replace the pair, or None if the pair can't be rewritten.
+    """
+    if following.opcode == opcodes.OPJUMPWHENFALSE:
+        match current.opcode:
+            case opcodes.OPTRUE:
+                return []
+            case opcodes.OPFALSE:
+                return [LocatedInstruction(current.position, opcodes.OPJUMP, following.operands)]
+            case opcodes.OPBANG:
+                return [LocatedInstruction(current.position, opcodes.OPJUMPWHENTRUE, following.operands)]
+
+    if drop_discarded_pushes and following.opcode == opcodes.OPPOP and current.opcode in PURE_PUSH_OPCODES:
+        return []
+
+    return None
+
+
+def _final_jump_target(address: int, instruction_at: dict[int, LocatedInstruction]) -> int:
+    # follow a chain of unconditional jumps, stopping if the chain loops back on itself
+    visited: set[int] = set()
+    while address not in visited:
+        visited.add(address)
+
+        target_instruction = instruction_at.get(address, None)
+        if target_instruction is None or target_instruction.opcode != opcodes.OPJUMP:
+            break
+
+        address = target_instruction.operands[0]
+
+    return address
@@ -0,0 +1,78 @@
+"""
+This module contains the optimization pass that replaces common sequences of opcodes with
+a single superinstruction (see the superinstructions in `monkey.code.opcodes`).
+
+Every trip around the virtual machine's loop has a fixed cost, no matter how little the
+instruction does. A superinstruction does the work of several instructions in a single
+trip, which matters most in the small, hot function bodies of recursive numeric code.
+
+The operands of a superinstruction are the operands of the sequence it replaces, in order.
+A sequence is only fused when no jump lands in its middle.
+"""
+
+from monkey.code import Instructions
+from monkey.code import Opcode
+import monkey.code.opcodes as opcodes
+
+from monkey.compiler.instruction_rewriting import LocatedInstruction
+from monkey.compiler.instruction_rewriting import find_jump_targets
+from monkey.compiler.instruction_rewriting import read_instructions
+from monkey.compiler.instruction_rewriting import write_instructions
+
+# the longer sequences come first, so that they win over any shorter sequence they start with
+SUPERINSTRUCTIONS: dict[tuple[Opcode, ...], Opcode] = {
+    (opcodes.OPGETLOCAL, opcodes.OPGETLOCAL, opcodes.OPGREATERTHAN, opcodes.OPJUMPWHENFALSE): (
+        opcodes.OPLOCALLOCALGTJUMP
+    ),
+    (opcodes.OPCONSTANT, opcodes.OPGETLOCAL, opcodes.OPGREATERTHAN, opcodes.OPJUMPWHENFALSE): (
+        opcodes.OPCONSTLOCALGTJUMP
+    ),
+    (opcodes.OPGETLOCAL, opcodes.OPCONSTANT, opcodes.OPADD): opcodes.OPLOCALCONSTADD,
+    (opcodes.OPGETLOCAL, opcodes.OPCONSTANT, opcodes.OPSUB): opcodes.OPLOCALCONSTSUB,
+    (opcodes.OPCONSTANT, opcodes.OPSETGLOBAL): opcodes.OPCONSTSETGLOBAL,
+}
+
+
+def fuse_superinstructions(instructions: Instructions) -> Instructions:
+    located_instructions = read_instructions(instructions)
+    jump_targets = find_jump_targets(located_instructions)
+
+    fused: list[LocatedInstruction] = []
+    i = 0
+    while i < len(located_instructions):
+        superinstruction = _match_superinstruction(located_instructions, i, jump_targets)
+        if superinstruction is None:
+            fused.append(located_instructions[i])
+            i += 1
+            continue
+
+        fused_opcode, n_fused = superinstruction
+        sequence = located_instructions[i : i + n_fused]
+        operands = tuple(operand for instruction in sequence for operand in instruction.operands)
+
+        fused.append(LocatedInstruction(sequence[0].position, fused_opcode, operands))
+        i += n_fused
+
+    return write_instructions(fused, len(instructions))
+
+
+def _match_superinstruction(
+    located_instructions: list[LocatedInstruction], i_start: int, jump_targets: set[int]
+) -> tuple[Opcode, int] | None:
+    for sequence, fused_opcode in SUPERINSTRUCTIONS.items():
+        i_end = i_start + len(sequence)
+        candidates = located_instructions[i_start:i_end]
+
+        if len(candidates) != len(sequence):
+            continue
+
+        if any(candidate.opcode != opcode for (candidate, opcode) in zip(candidates, sequence)):
+            continue
+
+        # a jump that lands after the first instruction would land inside the superinstruction
+        if any(candidate.position in jump_targets for candidate in candidates[1:]):
+            continue
+
+        return fused_opcode, len(sequence)
+
+    return None
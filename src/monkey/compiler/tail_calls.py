@@ -0,0 +1,71 @@
+"""
+This module contains the optimization pass that turns the calls in tail position of a
+function's body into tail calls (see OPTAILCALL in `monkey.code.opcodes`).
+
+A call is in tail position when the function returns its result straight away; either
+because the call is followed by an OPRETURNVALUE, or because it is followed by a chain of
+unconditional jumps that ends at one. This covers an explicit `return f(x);`, a call that is
+the last expression of the body, and a call that is the last expression of a branch of an
+if-expression that is itself the last expression of the body.
+
+The virtual machine runs a tail call in the caller's frame instead of pushing a new one, so
+a function that recurses through its tail position runs in a constant number of frames.
+
+The pass is only meant for the instructions of a function; the main program has no caller
+whose frame could be reused.
+"""
+
+from monkey.code import Instructions
+import monkey.code.opcodes as opcodes
+
+from monkey.compiler.instruction_rewriting import LocatedInstruction
+from monkey.compiler.instruction_rewriting import find_jump_targets
+from monkey.compiler.instruction_rewriting import read_instructions
+from monkey.compiler.instruction_rewriting import write_instructions
+
+
+def mark_tail_calls(instructions: Instructions) -> Instructions:
+    located_instructions = read_instructions(instructions)
+    jump_targets = find_jump_targets(located_instructions)
+    instruction_at = {instruction.position: instruction for instruction in located_instructions}
+
+    marked: list[LocatedInstruction] = []
+    i = 0
+    while i < len(located_instructions):
+        current = located_instructions[i]
+        following = located_instructions[i + 1] if i + 1 < len(located_instructions) else None
+        i += 1
+
+        if current.opcode != opcodes.OPCALL or following is None:
+            marked.append(current)
+            continue
+
+        if not _returns_immediately(following, instruction_at):
+            marked.append(current)
+            continue
+
+        marked.append(LocatedInstruction(current.position, opcodes.OPTAILCALL, current.operands))
+
+        # a tail call never moves on to the next instruction; unless a jump lands on the
+        # return or jump that follows it, that instruction can never run
+        if following.position not in jump_targets:
+            i += 1
+
+    return write_instructions(marked, len(instructions))
+
+
+def _returns_immediately(
+    instruction: LocatedInstruction, instruction_at: dict[int, LocatedInstruction]
+) -> bool:
+    # follow a chain of unconditional jumps, stopping if the chain loops back on itself
+    visited: set[int] = set()
+    while instruction.opcode == opcodes.OPJUMP and instruction.position not in visited:
+        visited.add(instruction.position)
+
+        target_instruction = instruction_at.get(instruction.operands[0], None)
+        if target_instruction is None:
+            return False
+
+        instruction = target_instruction
+
+    return instruction.opcode == opcodes.OPRETURNVALUE
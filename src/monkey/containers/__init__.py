@@ -1,2 +1,4 @@
 from monkey.containers.fixed_stack import FixedStack
 from monkey.containers.fixed_stack import FixedStackError
+from monkey.containers.persistent_vector import PersistentVector
+from monkey.containers.persistent_hash_map import PersistentHashMap
@@ -0,0 +1,196 @@
+"""
+This module contains the PersistentHashMap class, an immutable mapping that is "changed" by
+creating a new map, which shares almost all of its structure with the old one.
+
+Adding a pair to a dict without changing it means copying the whole dict first. The map
+here is a hash array mapped trie (HAMT), where adding a pair only copies the nodes on the
+path from the root to the pair's position; that is at most 7 small nodes, no matter how
+many pairs the map holds.
+
+Each node of the trie uses 5 bits of a key's hash to pick which of its (up to) 32 children
+the key belongs to. Only the children that exist are stored, in a list, along with a 32-bit
+bitmap of which ones they are; the position of a child in the list is the number of bits
+set in the bitmap before its own bit. A child is either a (key, value) pair, or another
+node for the keys that share the same bits so far. Keys whose hashes are the same in every
+bit end up together in a collision node, which is searched one pair at a time.
+
+Lookups are slower than those of a dict, because they walk the trie in Python; the map is
+meant for values that are built up one pair at a time, while the older versions are kept.
+"""
+
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+BITS_PER_LEVEL: int = 5
+INDEX_MASK: int = (1 << BITS_PER_LEVEL) - 1
+
+# the number of bits of a key's hash that the trie uses
+HASH_BITS: int = 32
+HASH_MASK: int = (1 << HASH_BITS) - 1
+
+
+class _BitmapNode:
+    __slots__ = ("bitmap", "children")
+
+    def __init__(self, bitmap: int, children: list[Any]) -> None:
+        self.bitmap = bitmap
+        self.children = children
+
+
+class _CollisionNode:
+    __slots__ = ("pairs",)
+
+    def __init__(self, pairs: list[tuple[Any, Any]]) -> None:
+        self.pairs = pairs
+
+
+_Node = _BitmapNode | _CollisionNode
+
+
+class PersistentHashMap(Mapping[K, V]):
+    __slots__ = ("_root", "_size")
+
+    _root: _Node
+    _size: int
+
+    def __init__(self, pairs: Iterable[tuple[K, V]] = ()) -> None:
+        self._root = _BitmapNode(0, [])
+        self._size = 0
+
+        # nothing else can see the nodes of a map that is still being built, so they are
+        # changed in place, instead of being copied for every pair
+        for key, value in pairs:
+            self._root, added = _set(self._root, 0, hash(key) & HASH_MASK, key, value, in_place=True)
+            self._size += added
+
+    def __getitem__(self, key: K) -> V:
+        key_hash = hash(key) & HASH_MASK
+        node = self._root
+        shift = 0
+
+        while True:
+            if isinstance(node, _CollisionNode):
+                for pair_key, value in node.pairs:
+                    if pair_key == key:
+                        return value  # type: ignore[no-any-return]
+                raise KeyError(key)
+
+            bit = 1 << ((key_hash >> shift) & INDEX_MASK)
+            if not node.bitmap & bit:
+                raise KeyError(key)
+
+            child = node.children[(node.bitmap & (bit - 1)).bit_count()]
+            if type(child) is tuple:
+                if child[0] == key:
+                    return child[1]  # type: ignore[no-any-return]
+                raise KeyError(key)
+
+            node = child
+            shift += BITS_PER_LEVEL
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[K]:
+        for key, _ in _iterate_pairs(self._root):
+            yield key
+
+    def __repr__(self) -> str:
+        return f"PersistentHashMap({dict(_iterate_pairs(self._root))})"
+
+    def set(self, key: K, value: V) -> "PersistentHashMap[K, V]":
+        """
+        Return a new map, in which `key` maps to `value`.
+        """
+        root, added = _set(self._root, 0, hash(key) & HASH_MASK, key, value, in_place=False)
+
+        new_map: PersistentHashMap[K, V] = PersistentHashMap.__new__(PersistentHashMap)
+        new_map._root = root
+        new_map._size = self._size + added
+        return new_map
+
+    def pairs(self) -> Iterator[tuple[K, V]]:
+        """
+        Iterate over the (key, value) pairs, without looking each key up again.
+        """
+        return _iterate_pairs(self._root)
+
+
+def _set(node: _Node, shift: int, key_hash: int, key: Any, value: Any, in_place: bool) -> tuple[_Node, bool]:
+    """
+    Return the node with `key` mapped to `value`, and whether the key is a new one.
+    """
+    if isinstance(node, _CollisionNode):
+        pairs = node.pairs if in_place else list(node.pairs)
+        for i_pair, (pair_key, _) in enumerate(pairs):
+            if pair_key == key:
+                pairs[i_pair] = (key, value)
+                return _CollisionNode(pairs), False
+
+        pairs.append((key, value))
+        return _CollisionNode(pairs), True
+
+    bit = 1 << ((key_hash >> shift) & INDEX_MASK)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    children = node.children if in_place else list(node.children)
+
+    added: bool
+    if not node.bitmap & bit:
+        children.insert(index, (key, value))
+        added = True
+    else:
+        child = children[index]
+        if type(child) is tuple:
+            if child[0] == key:
+                children[index] = (key, value)
+                added = False
+            else:
+                child_hash = hash(child[0]) & HASH_MASK
+                children[index] = _split(shift + BITS_PER_LEVEL, child, child_hash, (key, value), key_hash)
+                added = True
+        else:
+            children[index], added = _set(child, shift + BITS_PER_LEVEL, key_hash, key, value, in_place)
+
+    if in_place:
+        node.bitmap |= bit
+        return node, added
+
+    return _BitmapNode(node.bitmap | bit, children), added
+
+
+def _split(
+    shift: int, pair: tuple[Any, Any], pair_hash: int, new_pair: tuple[Any, Any], new_pair_hash: int
+) -> _Node:
+    """
+    Create the node that holds two pairs, whose hashes are the same up to `shift`.
+    """
+    if shift >= HASH_BITS:
+        return _CollisionNode([pair, new_pair])
+
+    index = (pair_hash >> shift) & INDEX_MASK
+    new_index = (new_pair_hash >> shift) & INDEX_MASK
+    if index == new_index:
+        child = _split(shift + BITS_PER_LEVEL, pair, pair_hash, new_pair, new_pair_hash)
+        return _BitmapNode(1 << index, [child])
+    elif index < new_index:
+        return _BitmapNode((1 << index) | (1 << new_index), [pair, new_pair])
+    else:
+        return _BitmapNode((1 << index) | (1 << new_index), [new_pair, pair])
+
+
+def _iterate_pairs(node: _Node) -> Iterator[tuple[Any, Any]]:
+    if isinstance(node, _CollisionNode):
+        yield from node.pairs
+        return
+
+    for child in node.children:
+        if type(child) is tuple:
+            yield child
+        else:
+            yield from _iterate_pairs(child)
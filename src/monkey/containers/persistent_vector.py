@@ -0,0 +1,245 @@
+"""
+This module contains the PersistentVector class, an immutable sequence that is "changed" by
+creating a new vector, which shares almost all of its structure with the old one.
+
+Arrays in monkey are immutable: `push(array, element)` returns a new array, and leaves the
+old one as it was. With a plain list underneath, that means copying the whole list on every
+push, and building an array of n elements one push at a time takes O(n^2) time.
+
+The vector is laid out like the one in Clojure: a trie in which every node has up to 32
+children, with the elements in its leaves, plus a "tail" that holds the last (up to) 32
+elements outside of the trie.
+- pushing an element copies the tail; once the tail is full, it is moved into the trie,
+  which copies only the nodes on the path to its new position
+- dropping the last element works the same way in reverse
+- reading an element walks down the trie, one level per 5 bits of its position; that is
+  at most 4 levels for a million elements, and none at all for the elements in the tail
+
+Dropping the first element (`rest`) doesn't touch the trie at all; the new vector shares
+the whole trie with the old one, and only skips over the elements before its start. The
+skipped elements are kept alive for as long as the vector is.
+
+The nodes are plain lists, which are never changed once they are part of a vector.
+"""
+
+from typing import Any
+from typing import Generic
+from typing import Iterable
+from typing import Iterator
+from typing import TypeVar
+from typing import overload
+
+T = TypeVar("T")
+
+BITS_PER_LEVEL: int = 5
+BRANCH_FACTOR: int = 1 << BITS_PER_LEVEL
+INDEX_MASK: int = BRANCH_FACTOR - 1
+
+# a node of the trie; a branch holds other nodes, and a leaf holds elements
+Node = list[Any]
+
+
+class PersistentVector(Generic[T]):
+    __slots__ = ("_count", "_shift", "_root", "_tail", "_start")
+
+    # the elements are numbered from the start of the trie; the first `_start` of them are
+    # no longer part of the vector, after calls to `rest()`
+    _count: int
+    _shift: int
+    _root: Node
+    _tail: list[T]
+    _start: int
+
+    def __init__(self, elements: Iterable[T] = ()) -> None:
+        elements = list(elements)
+
+        # the tail is never empty, unless the whole vector is
+        tail_size = len(elements) - BRANCH_FACTOR * ((len(elements) - 1) // BRANCH_FACTOR)
+        trie_size = len(elements) - tail_size
+
+        # build the trie from the bottom up, one level at a time
+        nodes: list[Node] = [elements[i : i + BRANCH_FACTOR] for i in range(0, trie_size, BRANCH_FACTOR)]
+        shift = BITS_PER_LEVEL
+        while len(nodes) > BRANCH_FACTOR:
+            nodes = [nodes[i : i + BRANCH_FACTOR] for i in range(0, len(nodes), BRANCH_FACTOR)]
+            shift += BITS_PER_LEVEL
+
+        self._count = len(elements)
+        self._shift = shift
+        self._root = nodes
+        self._tail = elements[trie_size:]
+        self._start = 0
+
+    def __len__(self) -> int:
+        return self._count - self._start
+
+    @overload
+    def __getitem__(self, index: int) -> T:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "PersistentVector[T]":
+        ...
+
+    def __getitem__(self, index: slice | int) -> "PersistentVector[T] | T":
+        if isinstance(index, slice):
+            return PersistentVector([self[i] for i in range(*index.indices(len(self)))])
+
+        size = self._count - self._start
+        if index < 0:
+            index += size
+        if index < 0 or index >= size:
+            raise IndexError(f"PersistentVector index out of range: {index}")
+
+        position = index + self._start
+        tail_offset = self._count - len(self._tail)
+        if position >= tail_offset:
+            element: T = self._tail[position - tail_offset]
+            return element
+
+        return self._leaf_at(position)[position & INDEX_MASK]  # type: ignore[no-any-return]
+
+    def __iter__(self) -> Iterator[T]:
+        tail_offset = self._count - len(self._tail)
+
+        # the first leaf may start before the start of the vector
+        position = self._start
+        while position < tail_offset:
+            leaf = self._leaf_at(position)
+            yield from leaf[position & INDEX_MASK :]
+            position = (position | INDEX_MASK) + 1
+
+        yield from self._tail[max(position - tail_offset, 0) :]
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, PersistentVector):
+            return NotImplemented
+
+        if len(self) != len(other):
+            return False
+
+        return all(element == other_element for (element, other_element) in zip(self, other))
+
+    # like a list, the vector can't be hashed, because its elements might not be hashable
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"PersistentVector({list(self)})"
+
+    def push(self, element: T) -> "PersistentVector[T]":
+        """
+        Return a new vector with `element` added to the end.
+        """
+        if len(self._tail) < BRANCH_FACTOR:
+            return self._with(self._count + 1, self._shift, self._root, self._tail + [element])
+
+        # the tail is full, and it moves into the trie to make room
+        if (self._count >> BITS_PER_LEVEL) > (1 << self._shift):
+            # the trie is full as well; it gets a new root, one level higher
+            root = [self._root, _new_path(self._shift, self._tail)]
+            shift = self._shift + BITS_PER_LEVEL
+        else:
+            root = self._push_tail(self._shift, self._root, self._tail)
+            shift = self._shift
+
+        return self._with(self._count + 1, shift, root, [element])
+
+    def pop(self) -> "PersistentVector[T]":
+        """
+        Return a new vector without the last element.
+        """
+        if len(self) == 0:
+            raise IndexError("Cannot pop from an empty PersistentVector")
+
+        if len(self) == 1:
+            return PersistentVector()
+
+        if len(self._tail) > 1:
+            return self._with(self._count - 1, self._shift, self._root, self._tail[:-1])
+
+        # the tail is empty now; the last leaf of the trie moves out of it to become the tail
+        new_tail = self._leaf_at(self._count - 2)
+        root = self._pop_tail(self._shift, self._root)
+        shift = self._shift
+        if root is None:
+            root = []
+        elif shift > BITS_PER_LEVEL and len(root) == 1:
+            root = root[0]
+            shift -= BITS_PER_LEVEL
+
+        return self._with(self._count - 1, shift, root, new_tail)
+
+    def rest(self) -> "PersistentVector[T]":
+        """
+        Return a new vector without the first element.
+        """
+        if len(self) == 0:
+            raise IndexError("Cannot take the rest of an empty PersistentVector")
+
+        if len(self) == 1:
+            return PersistentVector()
+
+        vector = self._with(self._count, self._shift, self._root, self._tail)
+        vector._start = self._start + 1
+        return vector
+
+    def _with(self, count: int, shift: int, root: Node, tail: list[T]) -> "PersistentVector[T]":
+        vector: PersistentVector[T] = PersistentVector.__new__(PersistentVector)
+        vector._count = count
+        vector._shift = shift
+        vector._root = root
+        vector._tail = tail
+        vector._start = self._start
+        return vector
+
+    def _leaf_at(self, position: int) -> Node:
+        node = self._root
+        for level in range(self._shift, 0, -BITS_PER_LEVEL):
+            node = node[(position >> level) & INDEX_MASK]
+
+        return node
+
+    def _push_tail(self, level: int, parent: Node, tail: Node) -> Node:
+        # the position of the last element in the trie, once the tail is part of it
+        child_index = ((self._count - 1) >> level) & INDEX_MASK
+
+        new_child: Node
+        if level == BITS_PER_LEVEL:
+            new_child = tail
+        elif child_index < len(parent):
+            new_child = self._push_tail(level - BITS_PER_LEVEL, parent[child_index], tail)
+        else:
+            new_child = _new_path(level - BITS_PER_LEVEL, tail)
+
+        new_parent = list(parent)
+        if child_index < len(new_parent):
+            new_parent[child_index] = new_child
+        else:
+            new_parent.append(new_child)
+
+        return new_parent
+
+    def _pop_tail(self, level: int, node: Node) -> Node | None:
+        # the position of the last element in the trie, which is in the leaf that is removed
+        child_index = ((self._count - 2) >> level) & INDEX_MASK
+
+        if level > BITS_PER_LEVEL:
+            new_child = self._pop_tail(level - BITS_PER_LEVEL, node[child_index])
+            if new_child is None:
+                return node[:child_index] if child_index > 0 else None
+
+            new_node = list(node)
+            new_node[child_index] = new_child
+            return new_node
+        elif child_index > 0:
+            return node[:child_index]
+        else:
+            return None
+
+
+def _new_path(level: int, node: Node) -> Node:
+    while level > 0:
+        node = [node]
+        level -= BITS_PER_LEVEL
+
+    return node
@@ -1 +1,5 @@
 from monkey.evaluator.evaluator import evaluate
+from monkey.evaluator.closure_compiler import compile_to_closures
+from monkey.evaluator.resolver import resolve
+from monkey.evaluator.stack_evaluator import evaluate_iteratively
+from monkey.evaluator.custom_exceptions import EvaluationError
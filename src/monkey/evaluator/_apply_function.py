@@ -1,9 +1,12 @@
 from typing import Callable
+from typing import Optional
 from typing import Sequence
 
 from monkey.parser import ASTNode
 import monkey.object as objs
 
+from monkey.evaluator.resolver import FunctionBody
+
 
 def apply_function(
     eval_func: Callable[[ASTNode, objs.Environment], objs.Object],
@@ -13,24 +16,47 @@ def apply_function(
     # NOTE: for whatever reason (maybe revealed later) a CallExpression can also take
     # an Identifier as well as a FunctionLiteral
     if isinstance(func, objs.FunctionObject):
-        extended_env = _extend_function_environment(func, args)
+        extended_env = extend_function_environment(func, args)
         evaluated = eval_func(func.body, extended_env)
-        return _unwrap_return_value(evaluated)
+        return unwrap_return_value(evaluated)
     elif isinstance(func, objs.BuiltinObject):
         return func.func(*args)
     else:
         return objs.UnknownFunctionErrorObject(func.data_type())
 
 
-def _extend_function_environment(fnobj: objs.FunctionObject, args: Sequence[objs.Object]) -> objs.Environment:
+def extend_function_environment(fnobj: objs.FunctionObject, args: Sequence[objs.Object]) -> objs.Environment:
+    if type(fnobj.body) is FunctionBody:
+        return _create_array_environment(fnobj, fnobj.body.layout, args)
+
     env = objs.new_enclosed_environment(fnobj.env)
+    _bind_parameters(env, fnobj, args)
+
+    return env
+
+
+def _bind_parameters(env: objs.Environment, fnobj: objs.FunctionObject, args: Sequence[objs.Object]) -> None:
     for i_identifier, identifier in enumerate(fnobj.parameters):
         env.set(identifier.value, args[i_identifier])
 
+
+def _create_array_environment(
+    fnobj: objs.FunctionObject, layout: objs.FrameLayout, args: Sequence[objs.Object]
+) -> objs.ArrayEnvironment:
+    n_parameters = layout.n_parameters
+    if len(args) >= n_parameters:
+        slots: list[Optional[objs.Object]] = [*args[:n_parameters], *layout.unbound_slots]
+        return objs.ArrayEnvironment(slots, layout, fnobj.env)
+
+    # with too few arguments, bind the parameters one at a time, so that the call fails
+    # the same way that it does without the resolver
+    env = objs.ArrayEnvironment([None] * len(layout.names), layout, fnobj.env)
+    _bind_parameters(env, fnobj, args)
+
     return env
 
 
-def _unwrap_return_value(obj: objs.Object) -> objs.Object:
+def unwrap_return_value(obj: objs.Object) -> objs.Object:
     if isinstance(obj, objs.ReturnObject):
         return obj.value
     else:
@@ -0,0 +1,38 @@
+"""
+This module contains code specific to finding the environment that an AssignStatement
+changes a binding in.
+"""
+
+import monkey.object as objs
+import monkey.parser.statements as stmts
+
+from monkey.evaluator.resolver import ResolvedIdentifier
+from monkey.evaluator.resolver import resolved_environment
+
+
+def assignment_environment(
+    node: stmts.AssignStatement, env: objs.Environment
+) -> objs.Environment | objs.Object:
+    """
+    Return the environment whose binding the assignment changes, or the error object if the
+    assignment isn't allowed.
+    """
+    identifier_name = node.name.value
+
+    # with an address from the resolver, the search starts in the environment it leads to
+    search_env = env
+    if type(node.name) is ResolvedIdentifier:
+        search_env = resolved_environment(node.name, env)
+
+    # an assignment changes an existing binding in the environment that defined it; it
+    # doesn't create a new one
+    defining_env = search_env.defining_environment(identifier_name)
+    if defining_env is None:
+        return objs.UnknownIdentifierErrorObject(identifier_name)
+
+    # a function can change its own bindings and the global ones, but not the ones it
+    # captured from an enclosing function; the compiled functions capture those by value
+    if defining_env is not env and defining_env.outer is not None:
+        return objs.CapturedAssignmentErrorObject(identifier_name)
+
+    return defining_env
@@ -7,9 +7,15 @@ import monkey.parser.expressions as exprs
 
 from monkey.object.monkey_builtins import BUILTINS_DICT
 
+from monkey.evaluator.resolver import ResolvedIdentifier
+
 
 def evaluate_identifier(node: exprs.Identifier, env: objs.Environment) -> objs.Object:
-    ident_obj = env.get(node.value)
+    if type(node) is ResolvedIdentifier:
+        ident_obj = _get_by_address(node, env)
+    else:
+        ident_obj = env.get(node.value)
+
     if not objs.is_error_object(ident_obj):
         return ident_obj
 
@@ -20,3 +26,22 @@ def evaluate_identifier(node: exprs.Identifier, env: objs.Environment) -> objs.O
         return builtin_obj
 
     return error_obj
+
+
+def _get_by_address(node: ResolvedIdentifier, env: objs.Environment) -> objs.Object:
+    depth = node.depth
+    while depth:
+        assert env.outer is not None
+        env = env.outer
+        depth -= 1
+
+    slot = node.slot
+    if slot is not None:
+        # only the environment of a call to a resolved function has slots
+        assert isinstance(env, objs.ArrayEnvironment)
+        value = env.slots[slot]
+        if value is not None:
+            return value
+
+    # a global name, or a name whose `let` hasn't run yet
+    return env.get(node.value)
@@ -37,11 +37,11 @@ def _evaluate_string_index_expression(string: objs.StringObject, index: objs.Int
 
 
 def _evaluate_hash_index_expression(hashmap: objs.HashObject, key: objs.Object) -> objs.Object:
-    hashed_key = objs.create_object_hash(key)
-    if hashed_key.data_type == objs.ObjectType.ERROR:
+    hash_key = objs.create_hash_key(key)
+    if hash_key is None:
         return objs.UnhashableTypeErrorObject(key.data_type())
 
-    pair = hashmap.pairs.get(hashed_key, None)
+    pair = hashmap.pairs.get(hash_key, None)
     if pair is None:
         return objs.KeyNotFoundErrorObject(key)
 
@@ -61,7 +61,7 @@ def _evaluate_boolean_infix_expression(
     if operator in BOOLEAN_OPERATION_DICT.keys():
         operation = BOOLEAN_OPERATION_DICT[operator]
         value = operation(left.value, right.value)
-        return objs.BooleanObject(value)
+        return objs.boolean_object(value)
     else:
         return objs.UnknownInfixOperatorErrorObject(left.data_type(), right.data_type(), operator)
 
@@ -71,7 +71,7 @@ def _evaluate_integer_algebraic_infix_expression(
 ) -> objs.IntegerObject:
     operation = INTEGER_ALGEBRAIC_OPERATION_DICT[operator]
     value = operation(left.value, right.value)
-    return objs.IntegerObject(value)
+    return objs.integer_object(value)
 
 
 def _evaluate_integer_logical_infix_expression(
@@ -79,7 +79,7 @@ def _evaluate_integer_logical_infix_expression(
 ) -> objs.BooleanObject:
     operation = INTEGER_LOGICAL_OPERATION_DICT[operator]
     value = operation(left.value, right.value)
-    return objs.BooleanObject(value)
+    return objs.boolean_object(value)
 
 
 def _evaluate_string_infix_expression(
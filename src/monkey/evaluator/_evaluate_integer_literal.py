@@ -7,4 +7,4 @@ import monkey.parser.expressions as exprs
 
 
 def evaluate_integer_literal(node: exprs.IntegerLiteral) -> objs.Object:
-    return objs.IntegerObject(int(node.value))
+    return objs.integer_object(int(node.value))
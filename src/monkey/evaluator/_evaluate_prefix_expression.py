@@ -31,4 +31,4 @@ def _evaluate_minus_operator_expression(argument: objs.Object) -> objs.Object:
     if not isinstance(argument, objs.IntegerObject):
         return objs.UnknownPrefixOperatorErrorObject(argument.data_type(), token_types.MINUS)
 
-    return objs.IntegerObject(-argument.value)
+    return objs.integer_object(-argument.value)
@@ -0,0 +1,33 @@
+"""
+This module contains code specific to evaluating instances of WhileExpression.
+"""
+
+from typing import Callable
+
+from monkey.parser import ASTNode
+
+import monkey.parser.expressions as exprs
+import monkey.object as objs
+
+from monkey.object.truthy import is_truthy
+
+
+def evaluate_while_expression(
+    eval_func: Callable[[ASTNode], objs.Object],
+    while_expr: exprs.WhileExpression,
+) -> objs.Object:
+    while True:
+        condition = eval_func(while_expr.condition)
+        if objs.is_error_object(condition):
+            return condition
+
+        if not is_truthy(condition):
+            break
+
+        # a return statement inside of the body leaves the loop, and the function around it
+        result = eval_func(while_expr.body)
+        if result.data_type() in [objs.ObjectType.RETURN, objs.ObjectType.ERROR]:
+            return result
+
+    # like an if-expression without an alternative, a loop doesn't produce a value
+    return objs.NULL_OBJ
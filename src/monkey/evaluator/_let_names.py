@@ -0,0 +1,59 @@
+"""
+This module contains code that finds the names that a function binds in its own environment.
+
+An environment is created for each function call, and a `let` statement binds a name in the
+environment of the function that it is in; blocks don't create environments, so a `let`
+inside of an if-expression or a while-loop binds the name for the whole function.
+"""
+
+from monkey.parser import ASTNode
+from monkey.tokens import Literal
+import monkey.parser.expressions as exprs
+import monkey.parser.statements as stmts
+
+
+def let_names(node: ASTNode) -> tuple[Literal, ...]:
+    """
+    Return the names bound by the `let` statements that run in the same environment as
+    `node`, in the order that they appear; the ones inside of function literals run in
+    environments of their own.
+    """
+    names: dict[Literal, None] = {}
+    nodes: list[ASTNode] = [node]
+
+    while nodes:
+        current = nodes.pop()
+        if isinstance(current, stmts.LetStatement):
+            names[current.name.value] = None
+        nodes.extend(reversed(_child_nodes(current)))
+
+    return tuple(names)
+
+
+def _child_nodes(node: ASTNode) -> list[ASTNode]:
+    if isinstance(node, (stmts.ExpressionStatement, stmts.ReturnStatement)):
+        return [node.value]
+    elif isinstance(node, (stmts.LetStatement, stmts.AssignStatement)):
+        return [node.value]
+    elif isinstance(node, stmts.BlockStatement):
+        return list(node.statements)
+    elif isinstance(node, exprs.PrefixExpression):
+        return [node.expr]
+    elif isinstance(node, exprs.InfixExpression):
+        return [node.left, node.right]
+    elif isinstance(node, exprs.IfExpression):
+        alternative = [] if node.alternative is None else [node.alternative]
+        return [node.condition, node.consequence, *alternative]
+    elif isinstance(node, exprs.WhileExpression):
+        return [node.condition, node.body]
+    elif isinstance(node, exprs.HashLiteral):
+        return [child for pair in node.key_value_pairs for child in pair]
+    elif isinstance(node, exprs.CallExpression):
+        return [node.function, *node.arguments]
+    elif isinstance(node, exprs.ArrayLiteral):
+        return list(node.elements)
+    elif isinstance(node, exprs.IndexExpression):
+        return [node.container, node.inside]
+    else:
+        # literals, identifiers, and function literals, whose bodies get their own scope
+        return []
@@ -0,0 +1,515 @@
+"""
+This module contains the `compile_to_closures` function, which is another way of running the
+AST that the parser produced.
+
+The `evaluate` function decides what to do with a node every time that it reaches it; for a
+function body that runs thousands of times, it goes through the same chains of `isinstance`
+checks thousands of times. Here, the AST is walked once, up front, and every node becomes a
+Python closure that already knows what kind of node it came from, and holds the closures of
+its children. Running the program (or the body of a function) is then just a call to the
+closure at its root.
+
+The closures also do some work ahead of time:
+- literals are turned into their objects once
+- an ExpressionStatement, and a block with a single statement, are replaced by the closure
+  of what is inside of them
+- an infix expression picks its Python operator once, and has a fast path for integers
+- an identifier knows how many environments up the chain its binding can be found in
+
+Before a function literal is compiled, its parameters and every name that it binds with a
+`let` are collected, and a reference to a name starts looking in the closest function that
+binds it, skipping the environments of the functions in between that can't hold it.
+
+The result of running the closures is the same as that of `evaluate`, down to the errors;
+the environments, and the function objects stored in them, are the same kind too, so a
+function created by one can be called by the other.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Sequence
+
+from monkey.parser import ASTNode
+from monkey.parser import Expression
+from monkey.parser import Program
+from monkey.parser import Statement
+from monkey.tokens import Literal
+import monkey.parser.expressions as exprs
+import monkey.parser.statements as stmts
+
+from monkey.object import Object
+from monkey.object import Environment
+import monkey.object as objs
+
+from monkey.object.monkey_builtins import BUILTINS_DICT
+
+from monkey.evaluator.evaluator import evaluate
+from monkey.evaluator._apply_function import apply_function
+from monkey.evaluator._let_names import let_names
+from monkey.evaluator._evaluate_boolean_literal import evaluate_boolean_literal
+from monkey.evaluator._evaluate_index_expression import evaluate_index_expression
+from monkey.evaluator._evaluate_infix_expression import evaluate_infix_expression
+from monkey.evaluator._evaluate_infix_expression import INTEGER_ALGEBRAIC_OPERATION_DICT
+from monkey.evaluator._evaluate_infix_expression import INTEGER_LOGICAL_OPERATION_DICT
+from monkey.evaluator._evaluate_integer_literal import evaluate_integer_literal
+from monkey.evaluator._evaluate_prefix_expression import evaluate_prefix_expression
+from monkey.evaluator._evaluate_string_literal import evaluate_string_literal
+
+Code = Callable[[Environment], Object]
+
+_ERROR = objs.ObjectType.ERROR
+_RETURN = objs.ObjectType.RETURN
+
+
+@dataclass(frozen=True, slots=True, eq=False, repr=False)
+class _FunctionObjectWithCode(objs.FunctionObject):
+    """
+    A FunctionObject that also holds the compiled closure of its body; it compares equal to,
+    and prints the same as, the FunctionObject that `evaluate` creates for the same literal.
+    """
+
+    parameter_names: tuple[Literal, ...]
+    code: Code
+
+
+@dataclass(frozen=True, slots=True)
+class _Scope:
+    """
+    The names that a function can bind in its own environment.
+    """
+
+    names: frozenset[Literal]
+    outer: Optional["_Scope"]
+
+
+def compile_to_closures(node: ASTNode) -> Code:
+    """
+    Compile `node` into a closure, which gives the same result when called with an
+    environment as `evaluate(node, env)` does.
+    """
+    if isinstance(node, Program):
+        return _compile_program(node.statements, None)
+    elif isinstance(node, Statement):
+        return _compile_statement(node, None)
+    elif isinstance(node, Expression):
+        return _compile_expression(node, None)
+    else:
+        assert False, f"unreachable; Tried to compile something un-evaluable: {node}"
+
+
+def _compile_program(statements: Sequence[Statement], scope: Optional[_Scope]) -> Code:
+    codes = [_compile_statement(statement, scope) for statement in statements]
+
+    def program(env: Environment) -> Object:
+        result: Object = objs.NULL_OBJ
+
+        for code in codes:
+            result = code(env)
+
+            if isinstance(result, objs.ReturnObject):
+                return result.value
+            elif result.data_type() is _ERROR:
+                return result
+
+        return result
+
+    return program
+
+
+def _compile_statement(node: Statement, scope: Optional[_Scope]) -> Code:
+    if isinstance(node, stmts.ExpressionStatement):
+        return _compile_expression(node.value, scope)
+    elif isinstance(node, stmts.BlockStatement):
+        return _compile_block_statement(node, scope)
+    elif isinstance(node, stmts.ReturnStatement):
+        return _compile_return_statement(node, scope)
+    elif isinstance(node, stmts.LetStatement):
+        return _compile_let_statement(node, scope)
+    elif isinstance(node, stmts.AssignStatement):
+        return _compile_assign_statement(node, scope)
+    else:
+        stmt_type = type(node)
+        assert False, f"unreachable; statement with no known evaluation: {stmt_type}\nFound: {node}"
+
+
+def _compile_block_statement(node: stmts.BlockStatement, scope: Optional[_Scope]) -> Code:
+    codes = [_compile_statement(statement, scope) for statement in node.statements]
+
+    # a block gives back the result of its last statement anyway, so a block with a single
+    # statement is the same as that statement
+    if len(codes) == 0:
+        return _constant(objs.NULL_OBJ)
+    elif len(codes) == 1:
+        return codes[0]
+
+    def block(env: Environment) -> Object:
+        result: Object = objs.NULL_OBJ
+
+        for code in codes:
+            result = code(env)
+
+            # a return value is passed up as it is, to leave every enclosing block
+            data_type = result.data_type()
+            if data_type is _RETURN or data_type is _ERROR:
+                return result
+
+        return result
+
+    return block
+
+
+def _compile_return_statement(node: stmts.ReturnStatement, scope: Optional[_Scope]) -> Code:
+    value_code = _compile_expression(node.value, scope)
+
+    def return_statement(env: Environment) -> Object:
+        value = value_code(env)
+        if value.data_type() is _ERROR:
+            return value
+        return objs.ReturnObject(value)
+
+    return return_statement
+
+
+def _compile_let_statement(node: stmts.LetStatement, scope: Optional[_Scope]) -> Code:
+    value_code = _compile_expression(node.value, scope)
+    name = node.name.value
+
+    def let_statement(env: Environment) -> Object:
+        value = value_code(env)
+        if value.data_type() is _ERROR:
+            return value
+        env.set(name, value)
+        return objs.NULL_OBJ
+
+    return let_statement
+
+
+def _compile_assign_statement(node: stmts.AssignStatement, scope: Optional[_Scope]) -> Code:
+    value_code = _compile_expression(node.value, scope)
+    name = node.name.value
+    depth = _binding_depth(name, scope)
+
+    def assign_statement(env: Environment) -> Object:
+        defining_env = _enclosing_environment(env, depth).defining_environment(name)
+        if defining_env is None:
+            return objs.UnknownIdentifierErrorObject(name)
+
+        # the same rules as in `evaluate`: the function's own bindings and the global ones
+        # can be changed, but not the ones it captured from an enclosing function
+        if defining_env is not env and defining_env.outer is not None:
+            return objs.CapturedAssignmentErrorObject(name)
+
+        value = value_code(env)
+        if value.data_type() is _ERROR:
+            return value
+
+        defining_env.set(name, value)
+        return objs.NULL_OBJ
+
+    return assign_statement
+
+
+def _compile_expression(node: Expression, scope: Optional[_Scope]) -> Code:
+    if isinstance(node, exprs.IntegerLiteral):
+        return _constant(evaluate_integer_literal(node))
+    elif isinstance(node, exprs.BooleanLiteral):
+        return _constant(evaluate_boolean_literal(node))
+    elif isinstance(node, exprs.StringLiteral):
+        return _constant(evaluate_string_literal(node))
+    elif isinstance(node, exprs.PrefixExpression):
+        return _compile_prefix_expression(node, scope)
+    elif isinstance(node, exprs.InfixExpression):
+        return _compile_infix_expression(node, scope)
+    elif isinstance(node, exprs.IfExpression):
+        return _compile_if_expression(node, scope)
+    elif isinstance(node, exprs.WhileExpression):
+        return _compile_while_expression(node, scope)
+    elif isinstance(node, exprs.HashLiteral):
+        return _compile_hash_literal(node, scope)
+    elif isinstance(node, exprs.Identifier):
+        return _compile_identifier(node, scope)
+    elif isinstance(node, exprs.FunctionLiteral):
+        return _compile_function_literal(node, scope)
+    elif isinstance(node, exprs.CallExpression):
+        return _compile_call_expression(node, scope)
+    elif isinstance(node, exprs.ArrayLiteral):
+        return _compile_array_literal(node, scope)
+    elif isinstance(node, exprs.IndexExpression):
+        return _compile_index_expression(node, scope)
+    else:
+        expr_type = type(node)
+        assert False, f"unreachable; expression with no known evaluation: {expr_type}\nFound: {node}"
+
+
+def _constant(value: Object) -> Code:
+    def constant(env: Environment) -> Object:
+        return value
+
+    return constant
+
+
+def _compile_prefix_expression(node: exprs.PrefixExpression, scope: Optional[_Scope]) -> Code:
+    argument_code = _compile_expression(node.expr, scope)
+    operator = node.operator
+
+    def prefix_expression(env: Environment) -> Object:
+        argument = argument_code(env)
+        if argument.data_type() is _ERROR:
+            return argument
+        return evaluate_prefix_expression(operator, argument)
+
+    return prefix_expression
+
+
+def _compile_infix_expression(node: exprs.InfixExpression, scope: Optional[_Scope]) -> Code:
+    left_code = _compile_expression(node.left, scope)
+    right_code = _compile_expression(node.right, scope)
+    operator = node.operator
+
+    def infix_expression(env: Environment) -> Object:
+        left = left_code(env)
+        if left.data_type() is _ERROR:
+            return left
+        right = right_code(env)
+        if right.data_type() is _ERROR:
+            return right
+        return evaluate_infix_expression(operator, left, right)
+
+    if operator in INTEGER_ALGEBRAIC_OPERATION_DICT:
+        operation = INTEGER_ALGEBRAIC_OPERATION_DICT[operator]
+        # the functions of the `operator` module return Any
+        wrap: Callable[[Any], Object] = objs.integer_object
+    elif operator in INTEGER_LOGICAL_OPERATION_DICT:
+        operation = INTEGER_LOGICAL_OPERATION_DICT[operator]
+        wrap = objs.boolean_object
+    else:
+        return infix_expression
+
+    integer_type = objs.IntegerObject
+
+    # an operator that works on integers goes straight to the Python operator when both sides
+    # are integers, and everything else takes the same path as in `evaluate`
+    def integer_infix_expression(env: Environment) -> Object:
+        left = left_code(env)
+        if type(left) is not integer_type:
+            if left.data_type() is _ERROR:
+                return left
+            right = right_code(env)
+            if right.data_type() is _ERROR:
+                return right
+            return evaluate_infix_expression(operator, left, right)
+
+        right = right_code(env)
+        if type(right) is integer_type:
+            return wrap(operation(left.value, right.value))  # type: ignore[attr-defined]
+        if right.data_type() is _ERROR:
+            return right
+        return evaluate_infix_expression(operator, left, right)
+
+    return integer_infix_expression
+
+
+def _compile_if_expression(node: exprs.IfExpression, scope: Optional[_Scope]) -> Code:
+    condition_code = _compile_expression(node.condition, scope)
+    consequence_code = _compile_block_statement(node.consequence, scope)
+    if node.alternative is not None:
+        alternative_code = _compile_block_statement(node.alternative, scope)
+    else:
+        alternative_code = _constant(objs.NULL_OBJ)
+
+    def if_expression(env: Environment) -> Object:
+        condition = condition_code(env)
+        if condition.data_type() is _ERROR:
+            return condition
+
+        if objs.is_truthy(condition):
+            return consequence_code(env)
+        else:
+            return alternative_code(env)
+
+    return if_expression
+
+
+def _compile_while_expression(node: exprs.WhileExpression, scope: Optional[_Scope]) -> Code:
+    condition_code = _compile_expression(node.condition, scope)
+    body_code = _compile_block_statement(node.body, scope)
+
+    def while_expression(env: Environment) -> Object:
+        while True:
+            condition = condition_code(env)
+            if condition.data_type() is _ERROR:
+                return condition
+
+            if not objs.is_truthy(condition):
+                return objs.NULL_OBJ
+
+            result = body_code(env)
+            data_type = result.data_type()
+            if data_type is _RETURN or data_type is _ERROR:
+                return result
+
+    return while_expression
+
+
+def _compile_hash_literal(node: exprs.HashLiteral, scope: Optional[_Scope]) -> Code:
+    pair_codes = [
+        (_compile_expression(key, scope), _compile_expression(value, scope))
+        for (key, value) in node.key_value_pairs
+    ]
+
+    def hash_literal(env: Environment) -> Object:
+        hash_pairs: dict[objs.HashKey, objs.HashKeyValuePair] = {}
+
+        for key_code, value_code in pair_codes:
+            key = key_code(env)
+            if key.data_type() is _ERROR:
+                return key
+
+            hash_key = objs.create_hash_key(key)
+            if hash_key is None:
+                return objs.UnhashableTypeErrorObject(key.data_type())
+
+            value = value_code(env)
+            if value.data_type() is _ERROR:
+                return value
+
+            hash_pairs[hash_key] = objs.HashKeyValuePair(key, value)
+
+        return objs.HashObject(hash_pairs)
+
+    return hash_literal
+
+
+def _compile_identifier(node: exprs.Identifier, scope: Optional[_Scope]) -> Code:
+    name = node.value
+    depth = _binding_depth(name, scope)
+    builtin = BUILTINS_DICT.get(name, None)
+
+    def found_or_builtin(value: Object) -> Object:
+        if value.data_type() is not _ERROR or builtin is None:
+            return value
+        return builtin
+
+    if depth == 0:
+
+        def local_identifier(env: Environment) -> Object:
+            value = env.store.get(name, None)
+            if value is None:
+                value = env.get(name)
+            return found_or_builtin(value)
+
+        return local_identifier
+
+    def identifier(env: Environment) -> Object:
+        for _ in range(depth):
+            env = env.outer  # type: ignore[assignment]
+
+        value = env.store.get(name, None)
+        if value is None:
+            value = env.get(name)
+        return found_or_builtin(value)
+
+    return identifier
+
+
+def _compile_function_literal(node: exprs.FunctionLiteral, scope: Optional[_Scope]) -> Code:
+    parameter_names = tuple(parameter.value for parameter in node.parameters)
+
+    function_scope = _Scope(frozenset(parameter_names + let_names(node.body)), scope)
+    body_code = _compile_block_statement(node.body, function_scope)
+
+    parameters = node.parameters
+    body = node.body
+
+    def function_literal(env: Environment) -> Object:
+        return _FunctionObjectWithCode(parameters, body, env, parameter_names, body_code)
+
+    return function_literal
+
+
+def _compile_call_expression(node: exprs.CallExpression, scope: Optional[_Scope]) -> Code:
+    function_code = _compile_expression(node.function, scope)
+    argument_codes = [_compile_expression(argument, scope) for argument in node.arguments]
+
+    def call_expression(env: Environment) -> Object:
+        func = function_code(env)
+        if func.data_type() is _ERROR:
+            return func
+
+        arguments: list[Object] = []
+        for argument_code in argument_codes:
+            argument = argument_code(env)
+            if argument.data_type() is _ERROR:
+                return argument
+            arguments.append(argument)
+
+        return _apply_function(func, arguments)
+
+    return call_expression
+
+
+def _apply_function(func: Object, arguments: list[Object]) -> Object:
+    # the functions created by `evaluate`, the builtins, and calls with too few arguments
+    # (which fail in `evaluate` too) are all left to `apply_function`
+    if type(func) is not _FunctionObjectWithCode or len(arguments) < len(func.parameter_names):
+        return apply_function(evaluate, func, arguments)
+
+    extended_env = Environment(dict(zip(func.parameter_names, arguments)), func.env)
+    evaluated = func.code(extended_env)
+    if isinstance(evaluated, objs.ReturnObject):
+        return evaluated.value
+    return evaluated
+
+
+def _compile_array_literal(node: exprs.ArrayLiteral, scope: Optional[_Scope]) -> Code:
+    element_codes = [_compile_expression(element, scope) for element in node.elements]
+
+    def array_literal(env: Environment) -> Object:
+        elements: list[Object] = []
+        for element_code in element_codes:
+            element = element_code(env)
+            if element.data_type() is _ERROR:
+                return element
+            elements.append(element)
+
+        return objs.ArrayObject(elements)
+
+    return array_literal
+
+
+def _compile_index_expression(node: exprs.IndexExpression, scope: Optional[_Scope]) -> Code:
+    container_code = _compile_expression(node.container, scope)
+    inside_code = _compile_expression(node.inside, scope)
+
+    def index_expression(env: Environment) -> Object:
+        container = container_code(env)
+        if container.data_type() is _ERROR:
+            return container
+        inside = inside_code(env)
+        if inside.data_type() is _ERROR:
+            return inside
+        return evaluate_index_expression(container, inside)
+
+    return index_expression
+
+
+def _binding_depth(name: Literal, scope: Optional[_Scope]) -> int:
+    """
+    Return the number of environments to go up from the current one, to reach the closest
+    one that can hold a binding for `name`; the outermost environment can hold anything.
+    """
+    depth = 0
+    while scope is not None and name not in scope.names:
+        scope = scope.outer
+        depth += 1
+
+    return depth
+
+
+def _enclosing_environment(env: Environment, depth: int) -> Environment:
+    for _ in range(depth):
+        env = env.outer  # type: ignore[assignment]
+
+    return env
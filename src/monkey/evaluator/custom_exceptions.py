@@ -0,0 +1,7 @@
+"""
+This module contains the exceptions used when handling evaluator problems.
+"""
+
+
+class EvaluationError(Exception):
+    pass
@@ -17,6 +17,7 @@ from monkey.object import Environment
 import monkey.object as objs
 
 from monkey.evaluator._apply_function import apply_function
+from monkey.evaluator._assignment_environment import assignment_environment
 from monkey.evaluator._evaluate_array_literal import evaluate_array_literal
 from monkey.evaluator._evaluate_boolean_literal import evaluate_boolean_literal
 from monkey.evaluator._evaluate_hash_literal import evaluate_hash_literal
@@ -27,6 +28,7 @@ from monkey.evaluator._evaluate_infix_expression import evaluate_infix_expressio
 from monkey.evaluator._evaluate_if_expression import evaluate_if_expression
 from monkey.evaluator._evaluate_prefix_expression import evaluate_prefix_expression
 from monkey.evaluator._evaluate_string_literal import evaluate_string_literal
+from monkey.evaluator._evaluate_while_expression import evaluate_while_expression
 
 
 def evaluate(node: ASTNode, env: Environment) -> Object:
@@ -59,11 +61,26 @@ def _evaluate_statement(node: Statement, env: Environment) -> Object:
         identifier_name = node.name.value
         env.set(identifier_name, value)
         return objs.NULL_OBJ  # let statements shouldn't return anything?
+    elif isinstance(node, stmts.AssignStatement):
+        return _evaluate_assign_statement(node, env)
     else:
         stmt_type = type(node)
         assert False, f"unreachable; statement with no known evaluation: {stmt_type}\nFound: {node}"
 
 
+def _evaluate_assign_statement(node: stmts.AssignStatement, env: Environment) -> Object:
+    defining_env = assignment_environment(node, env)
+    if isinstance(defining_env, Object):
+        return defining_env
+
+    value = evaluate(node.value, env)
+    if objs.is_error_object(value):
+        return value
+
+    defining_env.set(node.name.value, value)
+    return objs.NULL_OBJ
+
+
 def _evaluate_sequence_of_statements(statements: Sequence[Statement], env: Environment) -> Object:
     result: Object = objs.NULL_OBJ
 
@@ -139,6 +156,8 @@ def _evaluate_expression(node: Expression, env: Environment) -> Object:
         return evaluate_infix_expression(operator, left, right)
     elif isinstance(node, exprs.IfExpression):
         return evaluate_if_expression(lambda n: evaluate(n, env), node)
+    elif isinstance(node, exprs.WhileExpression):
+        return evaluate_while_expression(lambda n: evaluate(n, env), node)
     elif isinstance(node, exprs.HashLiteral):
         return evaluate_hash_literal(lambda n: evaluate(n, env), node)
     elif isinstance(node, exprs.Identifier):
@@ -0,0 +1,170 @@
+"""
+This module contains the resolver, a pass over the AST that works out where every name that
+the program refers to is bound, before the program runs.
+
+Without it, the evaluator looks up a name by searching the dict of the environment that it
+is in, and then the dict of every environment that encloses it, until it finds the name; and
+each function call creates a new dict for its parameters.
+
+The resolver gives every Identifier that is read (or assigned to) an address:
+- `depth`: how many environments up the chain the binding is
+- `slot`: where the binding is, in the environment of that function call
+
+Every function literal is given a FrameLayout, with a slot for each of its parameters and for
+each name that it binds with a `let`. A call to the function creates an ArrayEnvironment,
+where the arguments are copied into the first slots of a list, and a name is read by going
+up `depth` environments, and indexing the list.
+
+A name that no function binds is global; its address only has a depth, which leads to the
+environment that the program runs in, where it is looked up by name.
+
+A name can be read before the `let` that binds it has run; then its slot is still empty, and
+the search carries on in the enclosing environments, as it does without the resolver. So the
+resolved program gives the same results as the original.
+
+The resolver doesn't change the AST that it is given; it returns a new one, where the nodes
+that carry the addresses (and the layouts) are subclasses of the original nodes.
+"""
+
+import dataclasses
+from dataclasses import dataclass
+from typing import Optional
+
+from monkey.parser import Expression
+from monkey.parser import Program
+from monkey.parser import Statement
+from monkey.tokens import Literal
+import monkey.parser.expressions as exprs
+import monkey.parser.statements as stmts
+
+import monkey.object as objs
+
+from monkey.evaluator._let_names import let_names
+
+
+@dataclass(frozen=True, eq=False, repr=False)
+class ResolvedIdentifier(exprs.Identifier):
+    depth: int
+    slot: Optional[int]  # None for a global name, which is looked up by name
+
+
+@dataclass(frozen=True, eq=False, repr=False)
+class FunctionBody(stmts.BlockStatement):
+    layout: objs.FrameLayout
+
+
+@dataclass(frozen=True)
+class _Scope:
+    layout: objs.FrameLayout
+    outer: Optional["_Scope"]
+
+
+def resolve(program: Program) -> Program:
+    """
+    Return a copy of `program`, where the identifiers have addresses, and the bodies of the
+    function literals have layouts.
+    """
+    resolved = Program()
+    for statement in program.statements:
+        resolved.append(_resolve_statement(statement, None))
+    resolved.add_error(program.errors())
+
+    return resolved
+
+
+def resolved_environment(node: ResolvedIdentifier, env: objs.Environment) -> objs.Environment:
+    """
+    Return the environment that the depth of the address of `node` leads to.
+    """
+    for _ in range(node.depth):
+        assert env.outer is not None
+        env = env.outer
+
+    return env
+
+
+def _resolve_statement(node: Statement, scope: Optional[_Scope]) -> Statement:
+    if isinstance(node, (stmts.ExpressionStatement, stmts.ReturnStatement, stmts.LetStatement)):
+        return dataclasses.replace(node, value=_resolve_expression(node.value, scope))
+    elif isinstance(node, stmts.AssignStatement):
+        name = _resolve_identifier(node.name, scope)
+        return dataclasses.replace(node, name=name, value=_resolve_expression(node.value, scope))
+    elif isinstance(node, stmts.BlockStatement):
+        return _resolve_block_statement(node, scope)
+    else:
+        return node
+
+
+def _resolve_block_statement(node: stmts.BlockStatement, scope: Optional[_Scope]) -> stmts.BlockStatement:
+    statements = [_resolve_statement(statement, scope) for statement in node.statements]
+    return dataclasses.replace(node, statements=statements)
+
+
+def _resolve_expression(node: Expression, scope: Optional[_Scope]) -> Expression:
+    if isinstance(node, exprs.Identifier):
+        return _resolve_identifier(node, scope)
+    elif isinstance(node, exprs.PrefixExpression):
+        return dataclasses.replace(node, expr=_resolve_expression(node.expr, scope))
+    elif isinstance(node, exprs.InfixExpression):
+        left = _resolve_expression(node.left, scope)
+        right = _resolve_expression(node.right, scope)
+        return dataclasses.replace(node, left=left, right=right)
+    elif isinstance(node, exprs.IfExpression):
+        condition = _resolve_expression(node.condition, scope)
+        consequence = _resolve_block_statement(node.consequence, scope)
+        alternative = node.alternative
+        if alternative is not None:
+            alternative = _resolve_block_statement(alternative, scope)
+        return dataclasses.replace(
+            node, condition=condition, consequence=consequence, alternative=alternative
+        )
+    elif isinstance(node, exprs.WhileExpression):
+        condition = _resolve_expression(node.condition, scope)
+        body = _resolve_block_statement(node.body, scope)
+        return dataclasses.replace(node, condition=condition, body=body)
+    elif isinstance(node, exprs.HashLiteral):
+        pairs = [
+            (_resolve_expression(key, scope), _resolve_expression(value, scope))
+            for (key, value) in node.key_value_pairs
+        ]
+        return dataclasses.replace(node, key_value_pairs=pairs)
+    elif isinstance(node, exprs.FunctionLiteral):
+        return _resolve_function_literal(node, scope)
+    elif isinstance(node, exprs.CallExpression):
+        function = _resolve_expression(node.function, scope)
+        arguments = [_resolve_expression(argument, scope) for argument in node.arguments]
+        return dataclasses.replace(node, function=function, arguments=arguments)
+    elif isinstance(node, exprs.ArrayLiteral):
+        elements = [_resolve_expression(element, scope) for element in node.elements]
+        return dataclasses.replace(node, elements=elements)
+    elif isinstance(node, exprs.IndexExpression):
+        container = _resolve_expression(node.container, scope)
+        inside = _resolve_expression(node.inside, scope)
+        return dataclasses.replace(node, container=container, inside=inside)
+    else:
+        # the literals have nothing to resolve
+        return node
+
+
+def _resolve_identifier(node: exprs.Identifier, scope: Optional[_Scope]) -> ResolvedIdentifier:
+    depth = 0
+    while scope is not None:
+        slot = scope.layout.slot_indices.get(node.value, None)
+        if slot is not None:
+            return ResolvedIdentifier(node.token, node.value, depth, slot)
+
+        scope = scope.outer
+        depth += 1
+
+    return ResolvedIdentifier(node.token, node.value, depth, None)
+
+
+def _resolve_function_literal(node: exprs.FunctionLiteral, scope: Optional[_Scope]) -> exprs.FunctionLiteral:
+    parameter_names: tuple[Literal, ...] = tuple(parameter.value for parameter in node.parameters)
+    layout = objs.create_frame_layout(parameter_names, let_names(node.body))
+
+    function_scope = _Scope(layout, scope)
+    statements = [_resolve_statement(statement, function_scope) for statement in node.body.statements]
+    body = FunctionBody(node.body.token, statements, layout)
+
+    return dataclasses.replace(node, body=body)
@@ -0,0 +1,427 @@
+"""
+This module contains the `evaluate_iteratively` function, which evaluates the AST the same way
+that `evaluate` does, but without recursing in Python.
+
+The `evaluate` function calls itself for every node inside of another node, and for every
+call of a Monkey function; so a Monkey function that recurses a few hundred times deep runs
+into Python's recursion limit. Here, the work that is left to do is kept on a stack of tasks,
+and the results of the nodes that have been evaluated are kept on a stack of values; a single
+loop pops a task off of the stack and runs it, until there are none left.
+
+A task is a tuple, whose first element is the function that carries it out. A task either
+gives back the value of a node, or pushes more tasks; for example, an infix expression
+pushes a task that applies the operator, and then the tasks that evaluate its right and left
+sides. The left side is on top, so it runs first; when the operator's task runs, both of the
+values it needs are on top of the value stack.
+
+In `evaluate`, an error object is passed straight up by every node that receives one, without
+evaluating anything else, until it becomes the result of the whole program. So here, as soon
+as a task gives back an error object, the loop stops, and the error is the result.
+
+The depth of the Monkey function calls is only limited by memory, unless a maximum is given.
+"""
+
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+from monkey.parser import ASTNode
+from monkey.parser import Program
+import monkey.parser.expressions as exprs
+import monkey.parser.statements as stmts
+
+from monkey.object import Object
+from monkey.object import Environment
+import monkey.object as objs
+
+from monkey.evaluator.custom_exceptions import EvaluationError
+from monkey.evaluator._apply_function import extend_function_environment
+from monkey.evaluator._apply_function import unwrap_return_value
+from monkey.evaluator._assignment_environment import assignment_environment
+from monkey.evaluator._evaluate_boolean_literal import evaluate_boolean_literal
+from monkey.evaluator._evaluate_identifier import evaluate_identifier
+from monkey.evaluator._evaluate_index_expression import evaluate_index_expression
+from monkey.evaluator._evaluate_infix_expression import evaluate_infix_expression
+from monkey.evaluator._evaluate_integer_literal import evaluate_integer_literal
+from monkey.evaluator._evaluate_prefix_expression import evaluate_prefix_expression
+from monkey.evaluator._evaluate_string_literal import evaluate_string_literal
+
+Task = tuple[Any, ...]
+
+_ERROR = objs.ObjectType.ERROR
+_RETURN = objs.ObjectType.RETURN
+
+
+@dataclass(slots=True)
+class _Machine:
+    max_call_depth: Optional[int]
+    tasks: list[Task] = field(default_factory=list)
+    values: list[Object] = field(default_factory=list)
+    call_depth: int = 0
+
+    def push_node(self, node: ASTNode, env: Environment) -> None:
+        self.tasks.append((_NODE_HANDLERS[type(node)], node, env))
+
+    def pop_values(self, n_values: int) -> list[Object]:
+        i_first = len(self.values) - n_values
+        popped = self.values[i_first:]
+        del self.values[i_first:]
+        return popped
+
+
+Handler = Callable[[_Machine, Task], Optional[Object]]
+
+
+def evaluate_iteratively(node: ASTNode, env: Environment, max_call_depth: Optional[int] = None) -> Object:
+    """
+    Evaluate `node` in `env`, with the same result as `evaluate(node, env)`.
+
+    If `max_call_depth` is given, an EvaluationError is raised when the Monkey function calls
+    nest deeper than that.
+    """
+    machine = _Machine(max_call_depth)
+    machine.push_node(node, env)
+
+    tasks = machine.tasks
+    values = machine.values
+    while tasks:
+        task = tasks.pop()
+        value: Optional[Object] = task[0](machine, task)
+        if value is not None:
+            if value.data_type() is _ERROR:
+                return value
+            values.append(value)
+
+    assert len(values) == 1, f"unreachable; the evaluation left {len(values)} values behind"
+    return values[0]
+
+
+# --- statements --------------------------------------------------------------------------
+
+
+def _evaluate_program(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+    machine.values.append(objs.NULL_OBJ)
+    machine.tasks.append((_next_program_statement, node.statements, 0, env))
+    return None
+
+
+def _next_program_statement(machine: _Machine, task: Task) -> Optional[Object]:
+    _, statements, index, env = task
+
+    # the program stops at a return statement, and its value is the value being returned
+    result = machine.values[-1]
+    if isinstance(result, objs.ReturnObject):
+        machine.values[-1] = result.value
+    elif index < len(statements):
+        machine.values.pop()
+        machine.tasks.append((_next_program_statement, statements, index + 1, env))
+        machine.push_node(statements[index], env)
+
+    return None
+
+
+def _evaluate_block_statement(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+    machine.values.append(objs.NULL_OBJ)
+    machine.tasks.append((_next_block_statement, node.statements, 0, env))
+    return None
+
+
+def _next_block_statement(machine: _Machine, task: Task) -> Optional[Object]:
+    _, statements, index, env = task
+
+    # unlike the program, a block passes a return value up as it is (see `evaluate`)
+    if machine.values[-1].data_type() is not _RETURN and index < len(statements):
+        machine.values.pop()
+        machine.tasks.append((_next_block_statement, statements, index + 1, env))
+        machine.push_node(statements[index], env)
+
+    return None
+
+
+def _evaluate_expression_statement(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+    machine.push_node(node.value, env)
+    return None
+
+
+def _evaluate_return_statement(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+    machine.tasks.append((_wrap_return_value,))
+    machine.push_node(node.value, env)
+    return None
+
+
+def _wrap_return_value(machine: _Machine, task: Task) -> Optional[Object]:
+    return objs.ReturnObject(machine.values.pop())
+
+
+def _evaluate_let_statement(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+    machine.tasks.append((_bind_value, node.name.value, env))
+    machine.push_node(node.value, env)
+    return None
+
+
+def _evaluate_assign_statement(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+
+    # whether the assignment is allowed is checked before its value is evaluated
+    defining_env = assignment_environment(node, env)
+    if isinstance(defining_env, Object):
+        return defining_env
+
+    machine.tasks.append((_bind_value, node.name.value, defining_env))
+    machine.push_node(node.value, env)
+    return None
+
+
+def _bind_value(machine: _Machine, task: Task) -> Optional[Object]:
+    _, name, env = task
+    env.set(name, machine.values.pop())
+    return objs.NULL_OBJ
+
+
+# --- expressions -------------------------------------------------------------------------
+
+
+def _evaluate_integer_literal(machine: _Machine, task: Task) -> Optional[Object]:
+    return evaluate_integer_literal(task[1])
+
+
+def _evaluate_boolean_literal(machine: _Machine, task: Task) -> Optional[Object]:
+    return evaluate_boolean_literal(task[1])
+
+
+def _evaluate_string_literal(machine: _Machine, task: Task) -> Optional[Object]:
+    return evaluate_string_literal(task[1])
+
+
+def _evaluate_identifier(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+    return evaluate_identifier(node, env)
+
+
+def _evaluate_function_literal(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+    return objs.FunctionObject(node.parameters, node.body, env)
+
+
+def _evaluate_prefix_expression(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+    machine.tasks.append((_apply_prefix_operator, node.operator))
+    machine.push_node(node.expr, env)
+    return None
+
+
+def _apply_prefix_operator(machine: _Machine, task: Task) -> Optional[Object]:
+    return evaluate_prefix_expression(task[1], machine.values.pop())
+
+
+def _evaluate_infix_expression(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+    machine.tasks.append((_apply_infix_operator, node.operator))
+    machine.push_node(node.right, env)
+    machine.push_node(node.left, env)
+    return None
+
+
+def _apply_infix_operator(machine: _Machine, task: Task) -> Optional[Object]:
+    right = machine.values.pop()
+    left = machine.values.pop()
+    return evaluate_infix_expression(task[1], left, right)
+
+
+def _evaluate_if_expression(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+    machine.tasks.append((_choose_if_branch, node, env))
+    machine.push_node(node.condition, env)
+    return None
+
+
+def _choose_if_branch(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+    condition = machine.values.pop()
+
+    if objs.is_truthy(condition):
+        machine.push_node(node.consequence, env)
+    elif node.alternative is not None:
+        machine.push_node(node.alternative, env)
+    else:
+        return objs.NULL_OBJ
+
+    return None
+
+
+def _evaluate_while_expression(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+    machine.tasks.append((_after_while_condition, node, env))
+    machine.push_node(node.condition, env)
+    return None
+
+
+def _after_while_condition(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+    condition = machine.values.pop()
+
+    # like an if-expression without an alternative, a loop doesn't produce a value
+    if not objs.is_truthy(condition):
+        return objs.NULL_OBJ
+
+    machine.tasks.append((_after_while_body, node, env))
+    machine.push_node(node.body, env)
+    return None
+
+
+def _after_while_body(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+    result = machine.values.pop()
+
+    # a return statement inside of the body leaves the loop, and the function around it
+    if result.data_type() is _RETURN:
+        return result
+
+    machine.tasks.append((_after_while_condition, node, env))
+    machine.push_node(node.condition, env)
+    return None
+
+
+def _evaluate_call_expression(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+    machine.tasks.append((_call_function, len(node.arguments)))
+    for argument in reversed(node.arguments):
+        machine.push_node(argument, env)
+    machine.push_node(node.function, env)
+    return None
+
+
+def _call_function(machine: _Machine, task: Task) -> Optional[Object]:
+    arguments = machine.pop_values(task[1])
+    func = machine.values.pop()
+
+    if isinstance(func, objs.FunctionObject):
+        if machine.max_call_depth is not None and machine.call_depth >= machine.max_call_depth:
+            raise EvaluationError(f"Exceeded the maximum call depth of {machine.max_call_depth}.")
+
+        machine.call_depth += 1
+        machine.tasks.append((_return_from_function,))
+        machine.push_node(func.body, extend_function_environment(func, arguments))
+        return None
+    elif isinstance(func, objs.BuiltinObject):
+        return func.func(*arguments)
+    else:
+        return objs.UnknownFunctionErrorObject(func.data_type())
+
+
+def _return_from_function(machine: _Machine, task: Task) -> Optional[Object]:
+    machine.call_depth -= 1
+    return unwrap_return_value(machine.values.pop())
+
+
+def _evaluate_array_literal(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+    machine.tasks.append((_build_array, len(node.elements)))
+    for element in reversed(node.elements):
+        machine.push_node(element, env)
+    return None
+
+
+def _build_array(machine: _Machine, task: Task) -> Optional[Object]:
+    return objs.ArrayObject(machine.pop_values(task[1]))
+
+
+def _evaluate_hash_literal(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+    machine.tasks.append((_next_hash_pair, node.key_value_pairs, 0, env, {}))
+    return None
+
+
+def _next_hash_pair(machine: _Machine, task: Task) -> Optional[Object]:
+    _, pairs, index, env, hash_pairs = task
+    if index == len(pairs):
+        return objs.HashObject(hash_pairs)
+
+    # the key stays on the value stack while the value is evaluated
+    machine.tasks.append((_after_hash_key, pairs, index, env, hash_pairs))
+    machine.push_node(pairs[index][0], env)
+    return None
+
+
+def _after_hash_key(machine: _Machine, task: Task) -> Optional[Object]:
+    _, pairs, index, env, hash_pairs = task
+    key = machine.values[-1]
+
+    hash_key = objs.create_hash_key(key)
+    if hash_key is None:
+        return objs.UnhashableTypeErrorObject(key.data_type())
+
+    machine.tasks.append((_after_hash_value, pairs, index, env, hash_pairs, hash_key))
+    machine.push_node(pairs[index][1], env)
+    return None
+
+
+def _after_hash_value(machine: _Machine, task: Task) -> Optional[Object]:
+    _, pairs, index, env, hash_pairs, hash_key = task
+    value = machine.values.pop()
+    key = machine.values.pop()
+
+    hash_pairs[hash_key] = objs.HashKeyValuePair(key, value)
+    machine.tasks.append((_next_hash_pair, pairs, index + 1, env, hash_pairs))
+    return None
+
+
+def _evaluate_index_expression(machine: _Machine, task: Task) -> Optional[Object]:
+    _, node, env = task
+    machine.tasks.append((_apply_index,))
+    machine.push_node(node.inside, env)
+    machine.push_node(node.container, env)
+    return None
+
+
+def _apply_index(machine: _Machine, task: Task) -> Optional[Object]:
+    inside = machine.values.pop()
+    container = machine.values.pop()
+    return evaluate_index_expression(container, inside)
+
+
+class _HandlerTable(dict[type, Handler]):
+    """
+    The handler of each type of node; a subclass of a node type (like the ones that the
+    resolver creates) gets the handler of the closest type above it.
+    """
+
+    def __missing__(self, node_type: type) -> Handler:
+        for base_type in node_type.__mro__[1:]:
+            if base_type in self:
+                self[node_type] = self[base_type]
+                return self[base_type]
+
+        assert False, f"unreachable; node with no known evaluation: {node_type}"
+
+
+_NODE_HANDLERS = _HandlerTable(
+    {
+        Program: _evaluate_program,
+        stmts.BlockStatement: _evaluate_block_statement,
+        stmts.ExpressionStatement: _evaluate_expression_statement,
+        stmts.ReturnStatement: _evaluate_return_statement,
+        stmts.LetStatement: _evaluate_let_statement,
+        stmts.AssignStatement: _evaluate_assign_statement,
+        exprs.IntegerLiteral: _evaluate_integer_literal,
+        exprs.BooleanLiteral: _evaluate_boolean_literal,
+        exprs.StringLiteral: _evaluate_string_literal,
+        exprs.Identifier: _evaluate_identifier,
+        exprs.FunctionLiteral: _evaluate_function_literal,
+        exprs.PrefixExpression: _evaluate_prefix_expression,
+        exprs.InfixExpression: _evaluate_infix_expression,
+        exprs.IfExpression: _evaluate_if_expression,
+        exprs.WhileExpression: _evaluate_while_expression,
+        exprs.CallExpression: _evaluate_call_expression,
+        exprs.ArrayLiteral: _evaluate_array_literal,
+        exprs.HashLiteral: _evaluate_hash_literal,
+        exprs.IndexExpression: _evaluate_index_expression,
+    }
+)
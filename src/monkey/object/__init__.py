@@ -3,6 +3,7 @@ from monkey.object.object import Object
 from monkey.object.integer_object import IntegerObject
 from monkey.object.boolean_object import BooleanObject
 from monkey.object.error_object import BuiltinErrorObject
+from monkey.object.error_object import CapturedAssignmentErrorObject
 from monkey.object.error_object import InvalidIndexingErrorObject
 from monkey.object.error_object import KeyNotFoundErrorObject
 from monkey.object.error_object import OutOfBoundsErrorObject
@@ -17,6 +18,9 @@ from monkey.object.null_object import NullObject
 from monkey.object.return_object import ReturnObject
 from monkey.object.environment import Environment
 from monkey.object.environment import new_enclosed_environment
+from monkey.object.array_environment import ArrayEnvironment
+from monkey.object.array_environment import FrameLayout
+from monkey.object.array_environment import create_frame_layout
 from monkey.object.function_object import FunctionObject
 from monkey.object.string_object import StringObject
 from monkey.object.builtin_object import BuiltinObject
@@ -27,12 +31,17 @@ from monkey.object.default_object import DefaultObject
 from monkey.object.closure_object import ClosureObject
 
 from monkey.object.hash_object import HashKeyValuePair
-from monkey.object.object_hasher import create_object_hash
-from monkey.object.object_hasher import ObjectHash
+from monkey.object.object_hasher import create_hash_key
+from monkey.object.object_hasher import HashKey
 
 from monkey.object.constants import NULL_OBJ
 from monkey.object.constants import TRUE_BOOL_OBJ
 from monkey.object.constants import FALSE_BOOL_OBJ
+from monkey.object.constants import boolean_object
+
+from monkey.object.small_integers import integer_object
+from monkey.object.small_integers import configure_small_integer_cache
+from monkey.object.small_integers import small_integer_cache_range
 
 from monkey.object.truthy import is_truthy
 
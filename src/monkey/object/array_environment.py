@@ -0,0 +1,83 @@
+"""
+This module contains the ArrayEnvironment class, the environment of a function call once
+the resolver has been run over the AST.
+
+Instead of a dict, the bindings are kept in a list, with one slot for each name that the
+function can bind; which slot belongs to which name is worked out once per function literal,
+and kept in its FrameLayout. A slot holds None until its name is bound, the same way that a
+name is missing from the dict of an Environment until it is bound.
+"""
+
+import dataclasses
+from typing import Any
+from typing import Optional
+
+from monkey.object.object import Object
+from monkey.object.environment import Environment
+from monkey.tokens import Literal
+
+
+@dataclasses.dataclass(frozen=True)
+class FrameLayout:
+    """
+    The slots of a function's environment: the parameters come first, in order, and then
+    every other name that the function binds with a `let` statement.
+    """
+
+    names: tuple[Literal, ...]
+    n_parameters: int
+    slot_indices: dict[Literal, int]
+    unbound_slots: tuple[None, ...]
+
+
+def create_frame_layout(parameter_names: tuple[Literal, ...], let_names: tuple[Literal, ...]) -> FrameLayout:
+    # every parameter gets a slot, even a repeated one, so that the arguments can be copied
+    # over in order; like binding them one at a time, the last of the repeated ones wins
+    local_names = tuple(name for name in dict.fromkeys(let_names) if name not in parameter_names)
+    names = parameter_names + local_names
+    slot_indices = {name: i_slot for (i_slot, name) in enumerate(names)}
+
+    return FrameLayout(names, len(parameter_names), slot_indices, (None,) * len(local_names))
+
+
+class ArrayEnvironment(Environment):
+    def __init__(self, slots: list[Optional[Object]], layout: FrameLayout, outer: Environment) -> None:
+        self.slots = slots
+        self.layout = layout
+        self.outer = outer
+
+    @property
+    def store(self) -> dict[Literal, Object]:  # type: ignore[override]
+        """
+        A copy of the bindings, as the dict that an Environment would hold.
+        """
+        return {name: value for (name, value) in zip(self.layout.names, self.slots) if value is not None}
+
+    def get(self, name: Literal) -> Object:
+        i_slot = self.layout.slot_indices.get(name, None)
+        if i_slot is not None and (result := self.slots[i_slot]) is not None:
+            return result
+
+        assert self.outer is not None
+        return self.outer.get(name)
+
+    def set(self, name: Literal, obj: Object) -> Object:
+        self.slots[self.layout.slot_indices[name]] = obj
+        return obj
+
+    def defining_environment(self, name: Literal) -> Optional[Environment]:
+        i_slot = self.layout.slot_indices.get(name, None)
+        if i_slot is not None and self.slots[i_slot] is not None:
+            return self
+
+        assert self.outer is not None
+        return self.outer.defining_environment(name)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, ArrayEnvironment):
+            return NotImplemented
+
+        return (self.slots, self.layout, self.outer) == (other.slots, other.layout, other.outer)
+
+    def __repr__(self) -> str:
+        return f"ArrayEnvironment(store={self.store}, outer={self.outer})"
@@ -1,19 +1,30 @@
 """
 This module contains the ArrayObject class, which implements the Object abstract
 class, and represents the result of evaluating an ArrayLiteral.
+
+The elements are held in a PersistentVector, so that the builtins that create a new array
+from an old one (`push`, `pop`, and `rest`) share the old array's elements instead of
+copying them.
 """
 
-from dataclasses import astuple
 from dataclasses import dataclass
 from typing import Any
+from typing import Iterable
 
+from monkey.containers import PersistentVector
 from monkey.object.object_type import ObjectType
 from monkey.object.object import Object
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True, init=False)
 class ArrayObject(Object):
-    elements: list[Object]
+    elements: PersistentVector[Object]
+
+    def __init__(self, elements: Iterable[Object]) -> None:
+        if not isinstance(elements, PersistentVector):
+            elements = PersistentVector(elements)
+
+        object.__setattr__(self, "elements", elements)
 
     def data_type(self) -> ObjectType:
         return ObjectType.ARRAY
@@ -25,7 +36,7 @@ class ArrayObject(Object):
         if not isinstance(other, ArrayObject):
             return NotImplemented
 
-        return astuple(self) == astuple(other)
+        return self.elements == other.elements
 
     def __repr__(self) -> str:
         elem_str = ", ".join([str(p) for p in self.elements])
@@ -3,7 +3,6 @@ This module contains the BuiltinObject class, which implements the Object abstra
 class, and represents a built-in function during evaluation of the AST.
 """
 
-from dataclasses import astuple
 from dataclasses import dataclass
 from typing import Annotated
 from typing import Any
@@ -13,7 +12,7 @@ from monkey.object.object_type import ObjectType
 from monkey.object.object import Object
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BuiltinObject(Object):
     name: str
     func: Callable[[Annotated[Any, "multiple arguments"]], Object]
@@ -28,7 +27,7 @@ class BuiltinObject(Object):
         if not isinstance(other, BuiltinObject):
             return NotImplemented
 
-        return astuple(self) == astuple(other)
+        return self.name == other.name and self.func == other.func
 
     def __repr__(self) -> str:
         return f"[builtin function: {self.name}]"
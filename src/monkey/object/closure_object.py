@@ -4,7 +4,6 @@ class, and represents a function which has already been compiled, as well as the
 free variables that it references within its body.
 """
 
-from dataclasses import astuple
 from dataclasses import dataclass
 from typing import Any
 
@@ -13,7 +12,7 @@ from monkey.object.object import Object
 from monkey.object.compiled_function_object import CompiledFunctionObject
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ClosureObject(Object):
     function: CompiledFunctionObject
     free_variables: list[Object]
@@ -28,7 +27,7 @@ class ClosureObject(Object):
         if not isinstance(other, ClosureObject):
             return NotImplemented
 
-        return astuple(self) == astuple(other)
+        return self.function == other.function and self.free_variables == other.free_variables
 
     def __repr__(self) -> str:
         function_section = f"FUNCTION:\n{self.function}"
@@ -4,23 +4,58 @@ class, and represents a function which has already been compiled. As opposed to
 type, this class holds bytecode instructions that have already been compiled.
 """
 
-from dataclasses import astuple
 from dataclasses import dataclass
+from dataclasses import field
 from typing import Any
+from typing import Optional
 
 from monkey.code.code import Instructions
 from monkey.code.byte_operations import instructions_to_string
+from monkey.code.decoding import DecodedInstruction
+from monkey.code.decoding import decode_instructions
+from monkey.code.stack_depth import max_stack_depth
 
 from monkey.object.object_type import ObjectType
 from monkey.object.object import Object
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CompiledFunctionObject(Object):
     instructions: Instructions
     n_locals: int
     n_arguments: int
 
+    # the name that the function was bound to with a let statement, if any; only used to
+    # describe the function (in profiles, for example), so it plays no part in equality
+    name: Optional[str] = field(default=None, compare=False)
+
+    # the decoding is done once, the first time the function is executed, and then reused
+    # for every later call; the slot that caches it plays no part in equality or copying
+    _decoded_instructions: Optional[list[DecodedInstruction]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _max_stack_depth: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def decoded_instructions(self) -> list[DecodedInstruction]:
+        if self._decoded_instructions is None:
+            object.__setattr__(self, "_decoded_instructions", decode_instructions(self.instructions))
+
+        return self._decoded_instructions  # type: ignore
+
+    @property
+    def max_stack_depth(self) -> int:
+        """
+        The most operands that the function's instructions can have on the stack at once.
+        Like the decoding, this is worked out once, and then reused for every later call.
+        """
+        depth = self._max_stack_depth
+        if depth is None:
+            depth = max_stack_depth(self.decoded_instructions)
+            object.__setattr__(self, "_max_stack_depth", depth)
+
+        return depth
+
     def data_type(self) -> ObjectType:
         return ObjectType.COMPILED_FUNCTION
 
@@ -31,10 +66,16 @@ class CompiledFunctionObject(Object):
         if not isinstance(other, CompiledFunctionObject):
             return NotImplemented
 
-        return astuple(self) == astuple(other)
+        return (
+            self.instructions == other.instructions
+            and self.n_locals == other.n_locals
+            and self.n_arguments == other.n_arguments
+        )
 
     def __repr__(self) -> str:
         written_instructions = instructions_to_string(self.instructions)
         locals_line = f"[n_locals={self.n_locals}]"
         arguments_line = f"[n_arguments={self.n_arguments}]"
+        if self.name is not None:
+            arguments_line += f"\n[name={self.name}]"
         return f"COMPILED_FUNCTION {{\n{written_instructions}\n{locals_line}\n{arguments_line}\n}}"
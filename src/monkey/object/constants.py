@@ -11,3 +11,10 @@ from monkey.object.boolean_object import BooleanObject
 NULL_OBJ = NullObject()
 TRUE_BOOL_OBJ = BooleanObject(True)
 FALSE_BOOL_OBJ = BooleanObject(False)
+
+
+def boolean_object(value: bool) -> BooleanObject:
+    if value:
+        return TRUE_BOOL_OBJ
+    else:
+        return FALSE_BOOL_OBJ
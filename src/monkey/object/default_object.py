@@ -14,7 +14,7 @@ from monkey.object.object_type import ObjectType
 from monkey.object.object import Object
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DefaultObject(Object):
     def data_type(self) -> ObjectType:
         return ObjectType.DEFAULT
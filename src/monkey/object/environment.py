@@ -29,6 +29,19 @@ class Environment:
         self.store[name] = obj
         return obj
 
+    def defining_environment(self, name: Literal) -> Optional["Environment"]:
+        """
+        Find the environment that holds the binding for `name`; either this one, or one
+        of the environments that it is enclosed by.
+        """
+        if name in self.store:
+            return self
+
+        if self.outer is not None:
+            return self.outer.defining_environment(name)
+
+        return None
+
 
 def new_enclosed_environment(outer: Environment) -> Environment:
     return Environment(outer=outer)
@@ -4,7 +4,6 @@ the Object abstract class. They are used to help handle user or internal errors.
 """
 
 from dataclasses import dataclass
-from dataclasses import astuple
 from typing import Any
 
 from monkey.tokens import Literal
@@ -14,7 +13,7 @@ from monkey.object.object_type import OBJECT_TYPE_DICT
 from monkey.object.object import Object
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TypeMismatchErrorObject(Object):
     object_type0: ObjectType
     object_type1: ObjectType
@@ -30,7 +29,11 @@ class TypeMismatchErrorObject(Object):
         if not isinstance(other, TypeMismatchErrorObject):
             return NotImplemented
 
-        return astuple(self) == astuple(other)
+        return (
+            self.object_type0 == other.object_type0
+            and self.object_type1 == other.object_type1
+            and self.operator == other.operator
+        )
 
     def __repr__(self) -> str:
         type0_str = OBJECT_TYPE_DICT[self.object_type0]
@@ -38,7 +41,7 @@ class TypeMismatchErrorObject(Object):
         return f"ERROR[type mismatch]: {type0_str} {self.operator} {type1_str}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UnknownInfixOperatorErrorObject(Object):
     object_type0: ObjectType
     object_type1: ObjectType
@@ -54,7 +57,11 @@ class UnknownInfixOperatorErrorObject(Object):
         if not isinstance(other, UnknownInfixOperatorErrorObject):
             return NotImplemented
 
-        return astuple(self) == astuple(other)
+        return (
+            self.object_type0 == other.object_type0
+            and self.object_type1 == other.object_type1
+            and self.operator == other.operator
+        )
 
     def __repr__(self) -> str:
         type0_str = OBJECT_TYPE_DICT[self.object_type0]
@@ -62,7 +69,7 @@ class UnknownInfixOperatorErrorObject(Object):
         return f"ERROR[unknown infix operator]: {type0_str} {self.operator} {type1_str}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UnknownPrefixOperatorErrorObject(Object):
     object_type0: ObjectType
     operator: Literal
@@ -77,14 +84,14 @@ class UnknownPrefixOperatorErrorObject(Object):
         if not isinstance(other, UnknownPrefixOperatorErrorObject):
             return NotImplemented
 
-        return astuple(self) == astuple(other)
+        return self.object_type0 == other.object_type0 and self.operator == other.operator
 
     def __repr__(self) -> str:
         type0_str = OBJECT_TYPE_DICT[self.object_type0]
         return f"ERROR[unknown prefix operator]: {self.operator}{type0_str}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UnknownIdentifierErrorObject(Object):
     identifier: Literal
 
@@ -104,7 +111,27 @@ class UnknownIdentifierErrorObject(Object):
         return f"ERROR[unknown identifier]: {self.identifier}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class CapturedAssignmentErrorObject(Object):
+    identifier: Literal
+
+    def data_type(self) -> ObjectType:
+        return ObjectType.ERROR
+
+    def inspect(self) -> str:
+        return self.__repr__()
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, CapturedAssignmentErrorObject):
+            return NotImplemented
+
+        return self.identifier == other.identifier
+
+    def __repr__(self) -> str:
+        return f"ERROR[assignment to captured variable]: {self.identifier}"
+
+
+@dataclass(frozen=True, slots=True)
 class UnknownFunctionErrorObject(Object):
     object_type: ObjectType
 
@@ -125,7 +152,7 @@ class UnknownFunctionErrorObject(Object):
         return f"ERROR[unknown function]: found {type_str}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BuiltinErrorObject(Object):
     message: str
 
@@ -145,7 +172,7 @@ class BuiltinErrorObject(Object):
         return f"ERROR[builtin function]: {self.message}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OutOfBoundsErrorObject(Object):
     container_type: ObjectType
     index: int
@@ -161,7 +188,11 @@ class OutOfBoundsErrorObject(Object):
         if not isinstance(other, OutOfBoundsErrorObject):
             return NotImplemented
 
-        return astuple(self) == astuple(other)
+        return (
+            self.container_type == other.container_type
+            and self.index == other.index
+            and self.size == other.size
+        )
 
     def __repr__(self) -> str:
         type_str = OBJECT_TYPE_DICT[self.container_type]
@@ -173,7 +204,7 @@ class OutOfBoundsErrorObject(Object):
         return "\n".join(message_lines)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class InvalidIndexingErrorObject(Object):
     container_type: ObjectType
     inside_type: ObjectType
@@ -188,7 +219,7 @@ class InvalidIndexingErrorObject(Object):
         if not isinstance(other, InvalidIndexingErrorObject):
             return NotImplemented
 
-        return astuple(self) == astuple(other)
+        return self.container_type == other.container_type and self.inside_type == other.inside_type
 
     def __repr__(self) -> str:
         container_str = OBJECT_TYPE_DICT[self.container_type]
@@ -201,7 +232,7 @@ class InvalidIndexingErrorObject(Object):
         return "\n".join(message_lines)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UnhashableTypeErrorObject(Object):
     attempted_type: ObjectType
 
@@ -215,14 +246,14 @@ class UnhashableTypeErrorObject(Object):
         if not isinstance(other, UnhashableTypeErrorObject):
             return NotImplemented
 
-        return astuple(self) == astuple(other)
+        return self.attempted_type == other.attempted_type
 
     def __repr__(self) -> str:
         attempted_str = OBJECT_TYPE_DICT[self.attempted_type]
         return f"ERROR[unhashable type]: cannot hash object of type '{attempted_str}'"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class KeyNotFoundErrorObject(Object):
     key: Object
 
@@ -236,7 +267,7 @@ class KeyNotFoundErrorObject(Object):
         if not isinstance(other, KeyNotFoundErrorObject):
             return NotImplemented
 
-        return astuple(self) == astuple(other)
+        return self.key == other.key
 
     def __repr__(self) -> str:
         return f"ERROR[key not found]: '{self.key}' not present in map"
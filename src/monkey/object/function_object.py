@@ -3,7 +3,6 @@ This module contains the FunctionObject class, which implements the Object abstr
 class, and represents a function object during evaluation.
 """
 
-from dataclasses import astuple
 from dataclasses import dataclass
 from typing import Any
 
@@ -15,7 +14,7 @@ from monkey.object.object import Object
 from monkey.object.environment import Environment
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FunctionObject(Object):
     parameters: list[Identifier]
     body: BlockStatement
@@ -31,7 +30,7 @@ class FunctionObject(Object):
         if not isinstance(other, FunctionObject):
             return NotImplemented
 
-        return astuple(self) == astuple(other)
+        return (self.parameters, self.body, self.env) == (other.parameters, other.body, other.env)
 
     def __repr__(self) -> str:
         param_list = ", ".join([str(p) for p in self.parameters])
@@ -1,30 +1,48 @@
 """
 This module contains the HashObject class, which implements the Object abstract
 class, and represents the result of evaluating a HashLiteral.
+
+The pairs are stored under the keys made by `create_hash_key()`. A hash literal stores them
+in a dict, which is the fastest to build and to look keys up in. Adding a pair with
+`with_pair()` creates a new HashObject and leaves the old one as it was; the new one holds
+its pairs in a PersistentHashMap, which shares them with the old one instead of copying
+them, so that building a hash up one pair at a time doesn't copy it every time.
 """
 
-from dataclasses import astuple
 from dataclasses import dataclass
 from typing import Any
+from typing import Mapping
 
+from monkey.containers import PersistentHashMap
 from monkey.object.object_type import ObjectType
 from monkey.object.object import Object
-from monkey.object.object_hasher import ObjectHash
+from monkey.object.object_hasher import HashKey
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HashKeyValuePair:
     key: Object
     value: Object
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HashObject(Object):
-    pairs: dict[ObjectHash, HashKeyValuePair]
+    pairs: Mapping[HashKey, HashKeyValuePair]
 
     def data_type(self) -> ObjectType:
         return ObjectType.HASH
 
+    def with_pair(self, hash_key: HashKey, pair: HashKeyValuePair) -> "HashObject":
+        """
+        Return a new HashObject, with `pair` added under `hash_key`.
+        """
+        pairs = self.pairs
+        if not isinstance(pairs, PersistentHashMap):
+            # only the first pair that is added copies the pairs
+            pairs = PersistentHashMap(pairs.items())
+
+        return HashObject(pairs.set(hash_key, pair))
+
     def inspect(self) -> str:
         return self.__repr__()
 
@@ -32,7 +50,7 @@ class HashObject(Object):
         if not isinstance(other, HashObject):
             return NotImplemented
 
-        return astuple(self) == astuple(other)
+        return self.pairs == other.pairs
 
     def __repr__(self) -> str:
         pairs_list = ", ".join([f"{hash_pair.key}: {hash_pair.value}" for hash_pair in self.pairs.values()])
@@ -10,7 +10,7 @@ from monkey.object.object_type import ObjectType
 from monkey.object.object import Object
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IntegerObject(Object):
     value: int
 
@@ -3,6 +3,7 @@ This module contains implementation for the BuiltinObject for the `last` functio
 which returns the last element of a container in the monkey language.
 """
 
+from monkey.containers import PersistentVector
 from monkey.object.object_type import ObjectType
 from monkey.object.object_type import OBJECT_TYPE_DICT
 from monkey.object.object import Object
@@ -35,7 +36,7 @@ def _last_of_string(inner_string: str) -> Object:
         return OutOfBoundsErrorObject(ObjectType.STRING, 0, len(inner_string))
 
 
-def _last_of_array(elements: list[Object]) -> Object:
+def _last_of_array(elements: PersistentVector[Object]) -> Object:
     if len(elements) >= 1:
         return elements[-1]
     else:
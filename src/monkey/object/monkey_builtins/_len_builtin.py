@@ -5,9 +5,9 @@ which calculates the length of an object in the monkey language.
 
 from monkey.object.object import Object
 from monkey.object.array_object import ArrayObject
-from monkey.object.integer_object import IntegerObject
 from monkey.object.error_object import BuiltinErrorObject
 from monkey.object.string_object import StringObject
+from monkey.object.small_integers import integer_object
 
 
 def len_builtin_impl(*args: Object) -> Object:
@@ -17,9 +17,9 @@ def len_builtin_impl(*args: Object) -> Object:
 
     arg = args[0]
     if isinstance(arg, StringObject):
-        return IntegerObject(len(arg.value))
+        return integer_object(len(arg.value))
     elif isinstance(arg, ArrayObject):
-        return IntegerObject(len(arg.elements))
+        return integer_object(len(arg.elements))
     else:
         message = f"Cannot find length of object of type '{arg.data_type()}'"
         return BuiltinErrorObject(message)
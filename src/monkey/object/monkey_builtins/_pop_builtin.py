@@ -6,6 +6,7 @@ for the last one.
 This was not implemented in the book.
 """
 
+from monkey.containers import PersistentVector
 from monkey.object.object_type import OBJECT_TYPE_DICT
 from monkey.object.object import Object
 from monkey.object.array_object import ArrayObject
@@ -35,9 +36,8 @@ def _pop_from_string(inner_string: str) -> Object:
     return StringObject(inner_string[:-1])
 
 
-def _pop_from_array(elements: list[Object]) -> Object:
+def _pop_from_array(elements: PersistentVector[Object]) -> Object:
     if len(elements) == 0:
         return BuiltinErrorObject("The array is empty. Cannot pop an element off it!")
 
-    new_elements = elements[:-1]
-    return ArrayObject(new_elements)
+    return ArrayObject(elements.pop())
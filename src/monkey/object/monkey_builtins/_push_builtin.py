@@ -2,10 +2,12 @@
 This module contains implementation for the BuiltinObject for the `push` function,
 which creates a new container with all the elements of the old container, and a new
 element at the end.
-"""
 
-import copy
+An array shares its elements with the array it was pushed onto; both are immutable, so
+neither can see a change made through the other.
+"""
 
+from monkey.containers import PersistentVector
 from monkey.object.object_type import OBJECT_TYPE_DICT
 from monkey.object.object import Object
 from monkey.object.array_object import ArrayObject
@@ -41,6 +43,5 @@ def _push_to_string(inner_string: str, new_char: str) -> Object:
     return StringObject(inner_string + new_char)
 
 
-def _push_to_array(elements: list[Object], new_element: Object) -> Object:
-    new_elements_list = copy.deepcopy(elements + [new_element])
-    return ArrayObject(new_elements_list)
+def _push_to_array(elements: PersistentVector[Object], new_element: Object) -> Object:
+    return ArrayObject(elements.push(new_element))
@@ -3,6 +3,7 @@ This module contains implementation for the BuiltinObject for the `rest` functio
 which returns all elements after the first element in a container in the monkey language.
 """
 
+from monkey.containers import PersistentVector
 from monkey.object.object_type import ObjectType
 from monkey.object.object_type import OBJECT_TYPE_DICT
 from monkey.object.object import Object
@@ -35,8 +36,8 @@ def _rest_of_string(inner_string: str) -> Object:
         return OutOfBoundsErrorObject(ObjectType.STRING, 0, len(inner_string))
 
 
-def _rest_of_array(elements: list[Object]) -> Object:
+def _rest_of_array(elements: PersistentVector[Object]) -> Object:
     if len(elements) >= 1:
-        return ArrayObject(elements[1:])
+        return ArrayObject(elements.rest())
     else:
         return OutOfBoundsErrorObject(ObjectType.ARRAY, 0, len(elements))
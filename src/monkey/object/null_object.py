@@ -10,7 +10,7 @@ from monkey.object.object_type import ObjectType
 from monkey.object.object import Object
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NullObject(Object):
     def data_type(self) -> ObjectType:
         return ObjectType.NULL
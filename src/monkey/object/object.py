@@ -11,6 +11,10 @@ from monkey.object.object_type import ObjectType
 
 
 class Object(ABC):
+    # the concrete objects are slotted dataclasses; an empty `__slots__` here keeps this base
+    # class from giving each of their instances a `__dict__` anyway
+    __slots__ = ()
+
     @abstractmethod
     def data_type(self) -> ObjectType:
         """Returns the type of object that this Object wraps."""
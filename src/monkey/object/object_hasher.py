@@ -1,9 +1,20 @@
 """
-This module contains the ObjectHasher class, which is responsible for generating
-the hash keys for each object.
+This module contains the functions that create the keys that a HashObject stores its pairs
+under.
+
+The key of an object is the Python value inside of it, so that looking up a key doesn't
+have to create anything:
+- an IntegerObject is keyed by its int
+- a StringObject is keyed by its str
+- a BooleanObject is keyed by one of two tuples, which are created once, up front
+
+The booleans need keys of their own, because in Python `True == 1` and `True` hashes the
+same as `1`; keyed by the bool itself, `true` and `1` would be the same key. An int and a
+str are never equal to each other, or to a tuple, so no other type needs tagging.
 """
 
-from dataclasses import dataclass
+from typing import Optional
+from typing import Union
 
 from monkey.object.object import Object
 from monkey.object.object_type import ObjectType
@@ -23,31 +34,21 @@ from monkey.object.string_object import StringObject
 
 # NOTE: this leaves only Boolean, Integer, and String
 
+HashKey = Union[int, str, tuple[ObjectType, bool]]
 
-@dataclass(frozen=True)
-class ObjectHash:
-    data_type: ObjectType
-    value: int
+TRUE_HASH_KEY: HashKey = (ObjectType.BOOLEAN, True)
+FALSE_HASH_KEY: HashKey = (ObjectType.BOOLEAN, False)
 
 
-def create_object_hash(obj: Object) -> ObjectHash:
-    if isinstance(obj, BooleanObject):
-        return _boolean_object_hash_key(obj)
-    elif isinstance(obj, IntegerObject):
-        return _integer_object_hash_key(obj)
+def create_hash_key(obj: Object) -> Optional[HashKey]:
+    """
+    Return the key that `obj` is stored under in a HashObject, or None if it can't be a key.
+    """
+    if isinstance(obj, IntegerObject):
+        return obj.value
     elif isinstance(obj, StringObject):
-        return _string_object_hash_key(obj)
+        return obj.value
+    elif isinstance(obj, BooleanObject):
+        return TRUE_HASH_KEY if obj.value else FALSE_HASH_KEY
     else:
-        return ObjectHash(ObjectType.ERROR, -1)
-
-
-def _boolean_object_hash_key(obj: BooleanObject) -> ObjectHash:
-    return ObjectHash(ObjectType.BOOLEAN, hash(obj.value))
-
-
-def _integer_object_hash_key(obj: IntegerObject) -> ObjectHash:
-    return ObjectHash(ObjectType.INTEGER, obj.value)
-
-
-def _string_object_hash_key(obj: StringObject) -> ObjectHash:
-    return ObjectHash(ObjectType.STRING, hash(obj.value))
+        return None
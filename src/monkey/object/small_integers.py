@@ -0,0 +1,53 @@
+"""
+This module contains the cache of small IntegerObject instances.
+
+Programs spend much of their time on small integers: loop counters, indices, lengths, and
+the results of arithmetic on them. Rather than creating a new IntegerObject every time
+one of these values comes about, `integer_object()` hands out a single shared instance
+for each value in a range, and only creates new instances for values outside of it.
+
+The objects are immutable, so sharing them is never observable from a monkey program.
+"""
+
+from monkey.object.integer_object import IntegerObject
+
+DEFAULT_SMALL_INTEGER_MINIMUM: int = -128
+DEFAULT_SMALL_INTEGER_MAXIMUM: int = 1024
+
+# the dictionary is only ever updated in place, so that lookups never see a stale copy
+_SMALL_INTEGERS: dict[int, IntegerObject] = {}
+
+
+def integer_object(value: int) -> IntegerObject:
+    """
+    Return the IntegerObject for `value`; the cached instance if the value is in the range
+    of the cache, or a new instance otherwise.
+    """
+    obj = _SMALL_INTEGERS.get(value, None)
+    if obj is None:
+        return IntegerObject(value)
+
+    return obj
+
+
+def configure_small_integer_cache(minimum: int, maximum: int) -> None:
+    """
+    Replace the cache with one that holds every integer from `minimum` to `maximum`,
+    inclusive. An empty range (where `maximum < minimum`) turns the cache off.
+    """
+    _SMALL_INTEGERS.clear()
+    _SMALL_INTEGERS.update({value: IntegerObject(value) for value in range(minimum, maximum + 1)})
+
+
+def small_integer_cache_range() -> tuple[int, int]:
+    """
+    Return the smallest and largest integers that the cache currently holds, or the empty
+    range `(0, -1)` if the cache is turned off.
+    """
+    if not _SMALL_INTEGERS:
+        return (0, -1)
+
+    return (min(_SMALL_INTEGERS), max(_SMALL_INTEGERS))
+
+
+configure_small_integer_cache(DEFAULT_SMALL_INTEGER_MINIMUM, DEFAULT_SMALL_INTEGER_MAXIMUM)
@@ -3,4 +3,5 @@ from monkey.parser.expressions import Expression
 from monkey.parser.statements import Statement
 from monkey.parser.parser import Parser
 from monkey.parser.parser import parse_program
+from monkey.parser.parser import parse_program_iteratively
 from monkey.parser.program import Program
@@ -13,3 +13,4 @@ from monkey.parser.expressions.integer_literal import IntegerLiteral
 from monkey.parser.expressions.prefix_expression import PrefixExpression
 from monkey.parser.expressions.string_literal import StringLiteral
 from monkey.parser.expressions.index_expression import IndexExpression
+from monkey.parser.expressions.while_expression import WhileExpression
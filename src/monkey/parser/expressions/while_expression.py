@@ -0,0 +1,39 @@
+"""
+This module contains the WhileExpression class, which implements the Expression abstract
+class, and represents a `while` loop.
+
+The loop evaluates its body for as long as its condition is truthy; the loop itself
+evaluates to `null`.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from monkey.parser.expressions.expression import Expression
+from monkey.parser.statements import BlockStatement
+from monkey.tokens.monkey_token import Token
+from monkey.tokens.token_types import Literal
+
+
+@dataclass(frozen=True)
+class WhileExpression(Expression):
+    token: Token
+    condition: Expression
+    body: BlockStatement
+
+    def token_literal(self) -> Literal:
+        return self.token.literal
+
+    def expression_node(self) -> None:
+        pass
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, WhileExpression):
+            return NotImplemented
+
+        return (
+            (self.token == other.token) and (self.condition == other.condition) and (self.body == other.body)
+        )
+
+    def __repr__(self) -> str:
+        return f"while {self.condition} {{ {self.body} }}"
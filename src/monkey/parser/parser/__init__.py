@@ -1,2 +1,3 @@
 from monkey.parser.parser.parser import Parser
 from monkey.parser.parser.parse_program import parse_program
+from monkey.parser.parser.parse_program import parse_program_iteratively
@@ -3,6 +3,8 @@ This module contains _constants needed for other modules in this directory.
 """
 
 from typing import Callable
+from typing import Generator
+from typing import TypeVar
 
 from monkey.parser.precedences import Precedence
 from monkey.parser.parser.parser import Parser
@@ -15,3 +17,9 @@ EMPTY_EXPR = exprs.EmptyExpression()
 FAIL_STMT = stmts.FailedStatement()
 EMPTY_STMT = stmts.EmptyStatement()
 ParsingFunction = Callable[[Parser, Precedence], exprs.Expression]
+
+ParsedT = TypeVar("ParsedT")
+
+# the steps of parsing something that holds subexpressions; they yield the precedence to parse
+# each subexpression with, the subexpression is sent back to them, and they return what they parsed
+ParsingSteps = Generator[Precedence, exprs.Expression, ParsedT]
@@ -4,6 +4,8 @@ the Pratt parser.
 
 The definitions are set up such that both a function and a class that implements
 the `__call__()` method can be used.
+
+Every infix expression is made of subexpressions, so each one is parsed in steps.
 """
 
 from typing import Callable
@@ -12,16 +14,16 @@ from monkey.tokens import TokenType
 from monkey.tokens import token_types
 import monkey.parser.expressions as exprs
 
-from monkey.parser.parser._constants import ParsingFunction
+from monkey.parser.parser._constants import ParsingSteps
 from monkey.parser.parser.parser import Parser
 
 from monkey.parser.parser._parse_index_expression import parse_index_expression
 from monkey.parser.parser._parse_infix_expression import parse_infix_expression
 from monkey.parser.parser._parse_call_expression import parse_call_expression
 
-InfixParsingFunction = Callable[[Parser, ParsingFunction, exprs.Expression], exprs.Expression]
+InfixParsingSteps = Callable[[Parser, exprs.Expression], ParsingSteps[exprs.Expression]]
 
-INFIX_PARSING_FUNCTIONS: dict[TokenType, InfixParsingFunction] = {
+INFIX_PARSING_STEPS: dict[TokenType, InfixParsingSteps] = {
     token_types.PLUS: parse_infix_expression,
     token_types.MINUS: parse_infix_expression,
     token_types.SLASH: parse_infix_expression,
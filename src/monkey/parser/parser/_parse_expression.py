@@ -1,33 +1,66 @@
+"""
+This module contains the Pratt parser's loop, `parse_expression_steps()`, which is shared by
+`parse_expression()` and `parse_expression_iteratively()`.
+
+The expressions that are made of subexpressions are parsed in steps: where a subexpression is
+needed, the steps yield the precedence to parse it with, and the subexpression is sent back to
+them. `parse_expression()` parses each subexpression with a recursive call to itself.
+"""
+
 from monkey.parser.precedences import Precedence
 from monkey.parser.parser.parser import Parser
 import monkey.parser.expressions as exprs
 
 from monkey.parser.parser._constants import FAIL_EXPR
+from monkey.parser.parser._constants import ParsingFunction
+from monkey.parser.parser._constants import ParsingSteps
 from monkey.parser.parser._prefix_parsing_functions import PREFIX_PARSING_FUNCTIONS
-from monkey.parser.parser._infix_parsing_functions import INFIX_PARSING_FUNCTIONS
+from monkey.parser.parser._prefix_parsing_functions import PREFIX_PARSING_STEPS
+from monkey.parser.parser._infix_parsing_functions import INFIX_PARSING_STEPS
 
 
 def parse_expression(parser: Parser, precedence: Precedence) -> exprs.Expression:
+    steps = parse_expression_steps(parser, precedence, parse_expression)
+    try:
+        requested_precedence = next(steps)
+        while True:
+            requested_precedence = steps.send(parse_expression(parser, requested_precedence))
+    except StopIteration as finished:
+        expr: exprs.Expression = finished.value
+        return expr
+
+
+def parse_expression_steps(
+    parser: Parser, precedence: Precedence, parsing_fn: ParsingFunction
+) -> ParsingSteps[exprs.Expression]:
+    """
+    The steps of parsing an expression; `parsing_fn` is passed to the prefix parsing functions,
+    to parse the expressions inside of their blocks of statements.
+    """
     ttype = parser.current_token.token_type
+    prefix_parsing_steps = PREFIX_PARSING_STEPS.get(ttype, None)
     prefix_parsing_fn = PREFIX_PARSING_FUNCTIONS.get(ttype, None)
 
-    if prefix_parsing_fn is None:
+    if prefix_parsing_steps is not None:
+        expr = yield from prefix_parsing_steps(parser)
+    elif prefix_parsing_fn is not None:
+        expr = prefix_parsing_fn(parser, parsing_fn)
+    else:
         return FAIL_EXPR
 
-    expr = prefix_parsing_fn(parser, parse_expression)
     if expr == FAIL_EXPR:
         return FAIL_EXPR
 
     while not parser.is_end_of_subexpression(precedence):
         peek_ttype = parser.peek_token.token_type
-        infix_parsing_fn = INFIX_PARSING_FUNCTIONS.get(peek_ttype, None)
+        infix_parsing_steps = INFIX_PARSING_STEPS.get(peek_ttype, None)
 
-        if infix_parsing_fn is None:
+        if infix_parsing_steps is None:
             return FAIL_EXPR
 
         parser.parse_next_token()
 
-        expr = infix_parsing_fn(parser, parse_expression, expr)
+        expr = yield from infix_parsing_steps(parser, expr)
         if expr == FAIL_EXPR:
             return FAIL_EXPR
 
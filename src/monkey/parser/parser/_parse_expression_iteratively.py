@@ -0,0 +1,46 @@
+"""
+This module contains a version of `parse_expression()` that doesn't recurse for every level
+of nesting inside of an expression, so that it can parse (for example) a long run of prefix
+operators, or deeply nested groups, calls, index expressions, arrays, and hashes.
+
+It runs the same parsing steps as `parse_expression()`, but the steps that are waiting for a
+subexpression are kept on a stack, rather than in the frames of recursive calls.
+
+The expressions inside of a block of statements (in an if-expression, a while-expression, or
+a function literal) are parsed with a new call to this function.
+"""
+
+from monkey.parser.precedences import Precedence
+from monkey.parser.parser.parser import Parser
+import monkey.parser.expressions as exprs
+
+from monkey.parser.parser._constants import ParsingSteps
+from monkey.parser.parser._parse_expression import parse_expression_steps
+
+
+def parse_expression_iteratively(parser: Parser, precedence: Precedence) -> exprs.Expression:
+    pending: list[ParsingSteps[exprs.Expression]] = []
+    steps = parse_expression_steps(parser, precedence, parse_expression_iteratively)
+    while True:
+        try:
+            requested_precedence = next(steps)
+        except StopIteration as finished:
+            parsed: exprs.Expression = finished.value
+        else:
+            pending.append(steps)
+            steps = parse_expression_steps(parser, requested_precedence, parse_expression_iteratively)
+            continue
+
+        # send the parsed expression back to the steps that asked for it, until a step asks
+        # for another subexpression
+        while pending:
+            try:
+                requested_precedence = pending[-1].send(parsed)
+            except StopIteration as finished:
+                pending.pop()
+                parsed = finished.value
+            else:
+                steps = parse_expression_steps(parser, requested_precedence, parse_expression_iteratively)
+                break
+        else:
+            return parsed
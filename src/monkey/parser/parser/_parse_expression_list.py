@@ -3,15 +3,14 @@ import monkey.parser.expressions as exprs
 
 from monkey.parser.precedences import Precedence
 from monkey.parser.parser._constants import FAIL_EXPR
-from monkey.parser.parser._constants import ParsingFunction
+from monkey.parser.parser._constants import ParsingSteps
 from monkey.parser.parser.parser import Parser
 
 
 def parse_expression_list(
     parser: Parser,
-    parsing_fn: ParsingFunction,
     end_grouping: token_types.TokenType,
-) -> list[exprs.Expression]:
+) -> ParsingSteps[list[exprs.Expression]]:
     arguments: list[exprs.Expression] = []
 
     parser.parse_next_token()
@@ -20,7 +19,7 @@ def parse_expression_list(
     if parser.current_token_type_is(end_grouping):
         return arguments
 
-    next_arg = parsing_fn(parser, Precedence.LOWEST)
+    next_arg = yield Precedence.LOWEST
     if next_arg == FAIL_EXPR:
         return [FAIL_EXPR]
     arguments.append(next_arg)
@@ -29,7 +28,7 @@ def parse_expression_list(
         parser.parse_next_token()  # move past current argument that was just parsed
         parser.parse_next_token()  # move past current comma
 
-        next_arg = parsing_fn(parser, Precedence.LOWEST)
+        next_arg = yield Precedence.LOWEST
         if next_arg == FAIL_EXPR:
             return [FAIL_EXPR]
         arguments.append(next_arg)
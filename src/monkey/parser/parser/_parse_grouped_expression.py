@@ -3,17 +3,15 @@ import monkey.tokens.token_types as token_types
 import monkey.parser.expressions as exprs
 
 from monkey.parser.parser._constants import FAIL_EXPR
-from monkey.parser.parser._constants import ParsingFunction
+from monkey.parser.parser._constants import ParsingSteps
 from monkey.parser.parser.parser import Parser
 
 
-def parse_grouped_expression(
-    parser: Parser, parsing_fn: ParsingFunction
-) -> exprs.Expression | exprs.FailedExpression:
+def parse_grouped_expression(parser: Parser) -> ParsingSteps[exprs.Expression | exprs.FailedExpression]:
     parser.parse_next_token()  # we want to start parsing whatever comes after the LPARENS
 
     # parse everything that comes after this
-    expr = parsing_fn(parser, Precedence.LOWEST)
+    expr = yield Precedence.LOWEST
     if expr == FAIL_EXPR:
         parser.append_error("Unable to parse a grouped expression")
         return FAIL_EXPR
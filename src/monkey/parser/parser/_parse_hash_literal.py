@@ -3,18 +3,18 @@ import monkey.tokens.token_types as token_types
 import monkey.parser.expressions as exprs
 
 from monkey.parser.parser._constants import FAIL_EXPR
-from monkey.parser.parser._constants import ParsingFunction
+from monkey.parser.parser._constants import ParsingSteps
 from monkey.parser.parser.parser import Parser
 
 
-def parse_hash_literal(parser: Parser, parsing_fn: ParsingFunction) -> exprs.Expression | exprs.HashLiteral:
+def parse_hash_literal(parser: Parser) -> ParsingSteps[exprs.HashLiteral | exprs.FailedExpression]:
     token = parser.current_token
     kv_pairs: list[tuple[exprs.Expression, exprs.Expression]] = []
 
     while not parser.peek_token_type_is(token_types.RBRACE):  # while not the closing brace
         parser.parse_next_token()
 
-        key = parsing_fn(parser, Precedence.LOWEST)
+        key = yield Precedence.LOWEST
         if key == FAIL_EXPR:
             parser.append_error("Unable to parse key of a key-value pair")
             return FAIL_EXPR
@@ -24,7 +24,7 @@ def parse_hash_literal(parser: Parser, parsing_fn: ParsingFunction) -> exprs.Exp
             return FAIL_EXPR
 
         parser.parse_next_token()
-        value = parsing_fn(parser, Precedence.LOWEST)
+        value = yield Precedence.LOWEST
         if value == FAIL_EXPR:
             parser.append_error("Unable to parse value of a key-value pair")
             return FAIL_EXPR
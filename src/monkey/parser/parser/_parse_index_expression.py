@@ -3,19 +3,19 @@ import monkey.parser.expressions as exprs
 
 from monkey.parser.precedences import Precedence
 from monkey.parser.parser._constants import FAIL_EXPR
-from monkey.parser.parser._constants import ParsingFunction
+from monkey.parser.parser._constants import ParsingSteps
 from monkey.parser.parser.parser import Parser
 
 
 def parse_index_expression(
-    parser: Parser, parsing_fn: ParsingFunction, left_expr: exprs.Expression
-) -> exprs.IndexExpression | exprs.FailedExpression:
+    parser: Parser, left_expr: exprs.Expression
+) -> ParsingSteps[exprs.IndexExpression | exprs.FailedExpression]:
     token = parser.current_token
     container = left_expr
 
     parser.parse_next_token()
 
-    inside = parsing_fn(parser, Precedence.LOWEST)
+    inside = yield Precedence.LOWEST
     if inside == FAIL_EXPR:
         parser.append_error(f"Cannot parse inside of index expression of '{container}'")
         return FAIL_EXPR
@@ -4,6 +4,7 @@ import monkey.parser.statements as stmts
 from monkey.parser.parser._constants import ParsingFunction
 from monkey.parser.parser.parser import Parser
 
+from monkey.parser.parser._parse_assign_statement import parse_assign_statement
 from monkey.parser.parser._parse_let_statement import parse_let_statement
 from monkey.parser.parser._parse_return_statement import parse_return_statement
 from monkey.parser.parser._parse_expression_statement import parse_expression_statement
@@ -16,5 +17,7 @@ def parse_statement(parser: Parser, parsing_fn: ParsingFunction) -> stmts.Statem
         return parse_let_statement(parser, parsing_fn)
     elif curr_token_type == token_types.RETURN:
         return parse_return_statement(parser, parsing_fn)
+    elif curr_token_type == token_types.IDENTIFIER and parser.peek_token_type_is(token_types.ASSIGN):
+        return parse_assign_statement(parser, parsing_fn)
     else:
         return parse_expression_statement(parser, parsing_fn)
@@ -0,0 +1,54 @@
+from monkey.parser.precedences import Precedence
+import monkey.tokens.token_types as token_types
+import monkey.parser.expressions as exprs
+
+from monkey.parser.parser._constants import FAIL_EXPR
+from monkey.parser.parser._constants import FAIL_STMT
+from monkey.parser.parser._constants import ParsingFunction
+from monkey.parser.parser.parser import Parser
+from monkey.parser.parser._parse_block_statement import parse_block_statement
+
+
+def parse_while_expression(
+    parser: Parser, parsing_fn: ParsingFunction
+) -> exprs.WhileExpression | exprs.FailedExpression:
+    """
+    A while expression has the format:
+
+        while (<condition>) { <body> }
+    """
+    expr_token = parser.current_token
+
+    # the condition has to lie within a pair of parentheses
+    # - this covers the left side
+    if not parser.expect_peek_and_next(token_types.LPAREN):
+        parser.append_error("Unable to parse while-expression: left parenthesis around the condition")
+        return FAIL_EXPR
+
+    parser.parse_next_token()
+
+    expr_condition = parsing_fn(parser, Precedence.LOWEST)
+    if expr_condition == FAIL_EXPR:
+        parser.append_error("Unable to parse the condition of the while-expression")
+        return FAIL_EXPR
+
+    # the condition has to lie within a pair of parentheses
+    # - this covers the right side
+    if not parser.expect_peek_and_next(token_types.RPAREN):
+        parser.append_error("Unable to parse while-expression: right parenthesis around the condition")
+        return FAIL_EXPR
+
+    # the body has to lie within a pair of braces
+    # - this covers the left side
+    if not parser.expect_peek_and_next(token_types.LBRACE):
+        parser.append_error("Unable to parse while-expression: left brace of the body")
+        return FAIL_EXPR
+
+    # the parsing of the block statement takes care of the right side
+    body = parse_block_statement(parser, parsing_fn)
+    if body == FAIL_STMT:
+        parser.append_error("Unable to parse the body of the while-expression")
+        return FAIL_EXPR
+
+    # ignore reason: already checked for possibilities of FailedStatement and FailedExpression
+    return exprs.WhileExpression(expr_token, expr_condition, body)  # type: ignore
@@ -4,6 +4,9 @@ the Pratt parser.
 
 The definitions are set up such that both a function and a class that implements
 the `__call__()` method can be used.
+
+The prefix expressions that are made of subexpressions are parsed in steps, and the rest
+(the literals, and the expressions that hold blocks of statements) are parsed by functions.
 """
 
 from typing import Callable
@@ -13,6 +16,7 @@ from monkey.tokens import token_types
 import monkey.parser.expressions as exprs
 
 from monkey.parser.parser._constants import ParsingFunction
+from monkey.parser.parser._constants import ParsingSteps
 from monkey.parser.parser.parser import Parser
 
 from monkey.parser.parser._parse_array_literal import parse_array_literal
@@ -25,20 +29,26 @@ from monkey.parser.parser._parse_if_expression import parse_if_expression
 from monkey.parser.parser._parse_function_literal import parse_function_literal
 from monkey.parser.parser._parse_hash_literal import parse_hash_literal
 from monkey.parser.parser._parse_string_literal import parse_string_literal
+from monkey.parser.parser._parse_while_expression import parse_while_expression
 
 PrefixParsingFunction = Callable[[Parser, ParsingFunction], exprs.Expression]
+PrefixParsingSteps = Callable[[Parser], ParsingSteps[exprs.Expression]]
 
 PREFIX_PARSING_FUNCTIONS: dict[TokenType, PrefixParsingFunction] = {
-    token_types.BANG: parse_prefix_expression,
     token_types.FALSE: parse_boolean_literal,
     token_types.FUNCTION: parse_function_literal,
     token_types.IDENTIFIER: parse_identifier,
     token_types.IF: parse_if_expression,
     token_types.INT: parse_integer_literal,
+    token_types.STRING: parse_string_literal,
+    token_types.TRUE: parse_boolean_literal,
+    token_types.WHILE: parse_while_expression,
+}
+
+PREFIX_PARSING_STEPS: dict[TokenType, PrefixParsingSteps] = {
+    token_types.BANG: parse_prefix_expression,
     token_types.LBRACKET: parse_array_literal,
     token_types.LPAREN: parse_grouped_expression,
     token_types.MINUS: parse_prefix_expression,
-    token_types.STRING: parse_string_literal,
-    token_types.TRUE: parse_boolean_literal,
     token_types.LBRACE: parse_hash_literal,
 }
@@ -2,15 +2,30 @@ from monkey.parser.parser.parser import Parser
 from monkey.parser.program import Program
 
 from monkey.parser.parser._constants import FAIL_STMT
+from monkey.parser.parser._constants import ParsingFunction
 from monkey.parser.parser._parse_statement import parse_statement
 from monkey.parser.parser._parse_expression import parse_expression
+from monkey.parser.parser._parse_expression_iteratively import parse_expression_iteratively
 
 
 def parse_program(parser: Parser) -> Program:
+    return _parse_program(parser, parse_expression)
+
+
+def parse_program_iteratively(parser: Parser) -> Program:
+    """
+    Parse the same program as `parse_program()`, with the same errors, but without recursing
+    for each level of nesting inside of an expression; the Python stack only grows with the
+    nesting of blocks of statements, and not with (for example) deeply nested groups or calls.
+    """
+    return _parse_program(parser, parse_expression_iteratively)
+
+
+def _parse_program(parser: Parser, parsing_fn: ParsingFunction) -> Program:
     program = Program()
 
     while not (parser.has_errors() or parser.current_token_is_eof()):
-        if (statement := parse_statement(parser, parse_expression)) != FAIL_STMT:
+        if (statement := parse_statement(parser, parsing_fn)) != FAIL_STMT:
             program.append(statement)
         parser.parse_next_token()
 
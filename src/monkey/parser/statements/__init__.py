@@ -1,4 +1,5 @@
 from monkey.parser.statements.statement import Statement
+from monkey.parser.statements.assign_statement import AssignStatement
 from monkey.parser.statements.block_statement import BlockStatement
 from monkey.parser.statements.empty_statement import EmptyStatement
 from monkey.parser.statements.expression_statement import ExpressionStatement
@@ -0,0 +1,38 @@
+"""
+This module contains the AssignStatement class, a concrete implementation of the Statement
+abstract class, for placing assignments like `x = x + 1;` in the AST.
+
+Unlike a `let` statement, an assignment doesn't create a new binding; it changes the value
+of a binding that already exists.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from monkey.parser.expressions import Expression
+from monkey.parser.expressions import Identifier
+from monkey.parser.statements.statement import Statement
+from monkey.tokens.monkey_token import Token
+from monkey.tokens.token_types import Literal
+
+
+@dataclass(frozen=True)
+class AssignStatement(Statement):
+    token: Token
+    name: Identifier
+    value: Expression
+
+    def token_literal(self) -> Literal:
+        return self.token.literal
+
+    def statement_node(self) -> None:
+        pass
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, AssignStatement):
+            return NotImplemented
+
+        return self.token == other.token and self.name == other.name and self.value == other.value
+
+    def __repr__(self) -> str:
+        return f"{self.name} = {self.value};"
@@ -5,4 +5,9 @@ It also contains code to visualize the serialized data.
 
 from monkey.serialize.serialize import deserialize_bytecode
 from monkey.serialize.serialize import serialize_bytecode
-from monkey.serialize.serialize import SerializeError
+from monkey.serialize.custom_exceptions import SerializeError
+from monkey.serialize.binary_format import decode_bytecode
+from monkey.serialize.binary_format import encode_bytecode
+from monkey.serialize.mapped_bytecode import LazyConstantPool
+from monkey.serialize.mapped_bytecode import map_bytecode
+from monkey.serialize.compile_cache import CompileCache
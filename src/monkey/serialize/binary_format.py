@@ -0,0 +1,269 @@
+"""
+This module contains the functions that convert a `Bytecode` instance to and from the binary
+`.monkeybyte` format.
+
+Every number in the format is an unsigned big-endian integer (like the operands inside of
+the instructions), unless stated otherwise. A file is laid out as:
+
+HEADER (28 bytes)
+- magic number (8 bytes): `MONKEYBC`
+- format version (2 bytes)
+- flags (2 bytes): reserved, always zero
+- checksum (4 bytes): the CRC-32 of every byte that comes after the header
+- number of constants (4 bytes)
+- offset of the main program's instructions (4 bytes)
+- length of the main program's instructions (4 bytes)
+
+CONSTANT TABLE (9 bytes per constant, in the order of the constant pool)
+- type tag (1 byte)
+- offset of the constant's data (4 bytes)
+- length of the constant's data (4 bytes)
+
+DATA
+- the main program's instructions, as raw bytes
+- the data of every constant, one after another:
+  - INTEGER: the value, as a signed big-endian integer of as many bytes as it needs
+  - STRING: the value, encoded as UTF-8
+  - COMPILED_FUNCTION: the number of locals (4 bytes), the number of arguments (4 bytes),
+    the length of the name (4 bytes, signed; -1 if the function has no name), the name
+    encoded as UTF-8, and then the function's instructions as raw bytes
+
+Every offset is counted from the start of the file. Because the table gives the position
+of each constant, a single constant (or the main program's instructions) can be read
+without reading anything that comes before it.
+"""
+
+import dataclasses
+import struct
+import zlib
+from typing import Union
+from typing import cast
+
+import monkey.object as objs
+from monkey.object.object_type import OBJECT_TYPE_DICT
+
+from monkey.code import Instructions
+from monkey.compiler import Bytecode
+
+from monkey.serialize.custom_exceptions import SerializeError
+
+MAGIC_NUMBER: bytes = b"MONKEYBC"
+FORMAT_VERSION: int = 1
+
+INTEGER_TAG: int = 1
+STRING_TAG: int = 2
+COMPILED_FUNCTION_TAG: int = 3
+
+NO_NAME_LENGTH: int = -1
+
+HEADER_STRUCT = struct.Struct(">8sHHIIII")
+CONSTANT_ENTRY_STRUCT = struct.Struct(">BII")
+FUNCTION_FIELDS_STRUCT = struct.Struct(">IIi")
+
+# the checksum covers everything after this position
+CHECKSUM_START: int = HEADER_STRUCT.size
+
+# anything that a format can be read from; the data of a memory-mapped file, for example
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+@dataclasses.dataclass(frozen=True)
+class Header:
+    version: int
+    checksum: int
+    n_constants: int
+    instructions_offset: int
+    instructions_length: int
+
+
+@dataclasses.dataclass(frozen=True)
+class ConstantEntry:
+    tag: int
+    offset: int
+    length: int
+
+
+def encode_bytecode(bytecode: Bytecode) -> bytes:
+    n_constants = len(bytecode.constants)
+    data_start = HEADER_STRUCT.size + n_constants * CONSTANT_ENTRY_STRUCT.size
+
+    table = bytearray()
+    data = bytearray(bytecode.instructions)
+    for constant in bytecode.constants:
+        tag, constant_data = _encode_constant(constant)
+        table += CONSTANT_ENTRY_STRUCT.pack(tag, data_start + len(data), len(constant_data))
+        data += constant_data
+
+    body = bytes(table + data)
+    header = HEADER_STRUCT.pack(
+        MAGIC_NUMBER,
+        FORMAT_VERSION,
+        0,
+        zlib.crc32(body),
+        n_constants,
+        data_start,
+        len(bytecode.instructions),
+    )
+
+    return header + body
+
+
+def decode_bytecode(data: Buffer) -> Bytecode:
+    header = read_header(data)
+    verify_checksum(data, header)
+
+    instructions = Instructions(read_instructions(data, header))
+
+    # this is the same as calling `decode_constant()` on every entry of `read_constant_table()`,
+    # but it unpacks the whole table at once, and skips the intermediate ConstantEntry instances;
+    # for a large program, the time to load it is mostly spent in this loop
+    data = bytes(data)
+    n_bytes = len(data)
+    table_end = HEADER_STRUCT.size + header.n_constants * CONSTANT_ENTRY_STRUCT.size
+    if table_end > n_bytes:
+        raise SerializeError("The bytecode is truncated; the constant table runs past its end.")
+
+    constants: list[objs.Object] = []
+    for tag, offset, length in CONSTANT_ENTRY_STRUCT.iter_unpack(data[HEADER_STRUCT.size : table_end]):
+        end = offset + length
+        if end > n_bytes:
+            raise SerializeError(f"The bytecode is truncated; constant {len(constants)} runs past its end.")
+
+        constants.append(_decode_constant(data, tag, offset, end, copy_instructions=True))
+
+    return Bytecode(instructions, constants)
+
+
+def read_header(data: Buffer) -> Header:
+    if len(data) < HEADER_STRUCT.size:
+        raise SerializeError("The bytecode is too short to hold a header.")
+
+    magic_number, version, _, checksum, n_constants, instructions_offset, instructions_length = (
+        HEADER_STRUCT.unpack_from(data, 0)
+    )
+    if magic_number != MAGIC_NUMBER:
+        raise SerializeError("The data is not monkey bytecode; the magic number does not match.")
+    if version != FORMAT_VERSION:
+        raise SerializeError(
+            f"Unsupported bytecode format version: {version}; this reader supports version {FORMAT_VERSION}"
+        )
+
+    header = Header(version, checksum, n_constants, instructions_offset, instructions_length)
+    if instructions_offset + instructions_length > len(data):
+        raise SerializeError("The bytecode is truncated; the instructions run past its end.")
+
+    return header
+
+
+def verify_checksum(data: Buffer, header: Header) -> None:
+    if zlib.crc32(memoryview(data)[CHECKSUM_START:]) != header.checksum:
+        raise SerializeError("The bytecode is corrupted; its checksum does not match.")
+
+
+def read_instructions(data: Buffer, header: Header) -> memoryview:
+    """
+    Return a view of the main program's instructions, without copying them.
+    """
+    start = header.instructions_offset
+    return memoryview(data)[start : start + header.instructions_length]
+
+
+def read_constant_entry(data: Buffer, i_constant: int) -> ConstantEntry:
+    position = HEADER_STRUCT.size + i_constant * CONSTANT_ENTRY_STRUCT.size
+    tag, offset, length = CONSTANT_ENTRY_STRUCT.unpack_from(data, position)
+    if offset + length > len(data):
+        raise SerializeError(f"The bytecode is truncated; constant {i_constant} runs past its end.")
+
+    return ConstantEntry(tag, offset, length)
+
+
+def read_constant_table(data: Buffer, header: Header) -> list[ConstantEntry]:
+    table_end = HEADER_STRUCT.size + header.n_constants * CONSTANT_ENTRY_STRUCT.size
+    if table_end > len(data):
+        raise SerializeError("The bytecode is truncated; the constant table runs past its end.")
+
+    return [read_constant_entry(data, i_constant) for i_constant in range(header.n_constants)]
+
+
+def decode_constant(data: Buffer, entry: ConstantEntry, *, copy_instructions: bool = True) -> objs.Object:
+    """
+    Create the constant that `entry` describes. If `copy_instructions` is False, the
+    instructions of a compiled function are a read-only view into `data`, instead of a copy.
+    """
+    start = entry.offset
+    end = entry.offset + entry.length
+    return _decode_constant(memoryview(data), entry.tag, start, end, copy_instructions=copy_instructions)
+
+
+def _decode_constant(data: Buffer, tag: int, start: int, end: int, *, copy_instructions: bool) -> objs.Object:
+    if tag == INTEGER_TAG:
+        return objs.integer_object(int.from_bytes(data[start:end], byteorder="big", signed=True))
+    elif tag == STRING_TAG:
+        return objs.StringObject(str(data[start:end], encoding="utf-8"))
+    elif tag == COMPILED_FUNCTION_TAG:
+        return _decode_compiled_function(memoryview(data)[start:end], copy_instructions)
+    else:
+        raise SerializeError(f"Unknown constant type tag: {tag}")
+
+
+def _encode_constant(constant: objs.Object) -> tuple[int, bytes]:
+    # there are only three types of constants: integers, strings, and compiled function objects
+    # - not even booleans are constants (they are dealt with using OPTRUE and OPFALSE)
+    match constant:
+        case objs.IntegerObject():
+            return INTEGER_TAG, _encode_integer(constant.value)
+        case objs.StringObject():
+            return STRING_TAG, constant.value.encode("utf-8")
+        case objs.CompiledFunctionObject():
+            return COMPILED_FUNCTION_TAG, _encode_compiled_function(constant)
+        case _:
+            raise SerializeError(
+                f"Cannot serialize an object of data type: {OBJECT_TYPE_DICT[constant.data_type()]}"
+            )
+
+
+def _encode_integer(value: int) -> bytes:
+    # enough bytes for the magnitude, plus the sign bit
+    n_bytes = (value.bit_length() + 8) // 8
+    return value.to_bytes(n_bytes, byteorder="big", signed=True)
+
+
+def _encode_compiled_function(function: objs.CompiledFunctionObject) -> bytes:
+    if function.name is not None:
+        encoded_name = function.name.encode("utf-8")
+        name_length = len(encoded_name)
+    else:
+        encoded_name = b""
+        name_length = NO_NAME_LENGTH
+
+    fields = FUNCTION_FIELDS_STRUCT.pack(function.n_locals, function.n_arguments, name_length)
+    return fields + encoded_name + bytes(function.instructions)
+
+
+def _decode_compiled_function(
+    constant_data: memoryview, copy_instructions: bool
+) -> objs.CompiledFunctionObject:
+    if len(constant_data) < FUNCTION_FIELDS_STRUCT.size:
+        raise SerializeError("The data of a compiled function is too short to hold its fields.")
+
+    n_locals, n_arguments, name_length = FUNCTION_FIELDS_STRUCT.unpack_from(constant_data, 0)
+
+    name_start = FUNCTION_FIELDS_STRUCT.size
+    if name_length < NO_NAME_LENGTH or name_start + name_length > len(constant_data):
+        raise SerializeError(f"The name of a compiled function has an invalid length: {name_length}")
+
+    if name_length == NO_NAME_LENGTH:
+        name = None
+        instructions_start = name_start
+    else:
+        name = str(constant_data[name_start : name_start + name_length], encoding="utf-8")
+        instructions_start = name_start + name_length
+
+    instructions: Instructions
+    if copy_instructions:
+        instructions = Instructions(constant_data[instructions_start:])
+    else:
+        # the VirtualMachine only ever reads the instructions, which a view supports just as well
+        instructions = cast(Instructions, constant_data[instructions_start:].toreadonly())
+
+    return objs.CompiledFunctionObject(instructions, n_locals, n_arguments, name)
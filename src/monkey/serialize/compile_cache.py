@@ -0,0 +1,174 @@
+"""
+This module contains the CompileCache class, which keeps compiled bytecode on disk so that
+source code that hasn't changed doesn't have to be lexed, parsed, and compiled again.
+
+Much like `__pycache__`, each entry is a `.monkeybyte` file in the cache directory. It is
+named after a hash of everything that decides what the compiled bytecode looks like:
+- the source code itself
+- the CompilerOptions it was compiled with
+- the version of the compiler, and the version of the bytecode format
+
+So an entry never has to be checked against its source file; changing any of these simply
+leads to a different entry. The entries that are no longer used are removed by eviction.
+
+The cache is bounded by the total size of its entries. Once a new entry takes it over that
+size, the entries that were used least recently are removed until it fits again. An entry's
+modification time records when it was last used.
+
+Usage:
+    cache = CompileCache(source_directory / MONKEY_CACHE_DIRECTORY_NAME)
+
+    bytecode = cache.get(source, options)
+    if bytecode is None:
+        bytecode = ...  # lex, parse, and compile the source
+        cache.put(source, options, bytecode)
+"""
+
+import dataclasses
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from monkey.compiler import Bytecode
+from monkey.compiler import CompilerOptions
+from monkey.compiler.constants import COMPILER_VERSION
+
+from monkey.serialize.binary_format import FORMAT_VERSION
+from monkey.serialize.constants import MONKEY_BYTECODE_FILE_SUFFIX
+from monkey.serialize.custom_exceptions import SerializeError
+from monkey.serialize.serialize import deserialize_bytecode
+from monkey.serialize.serialize import serialize_bytecode
+
+DEFAULT_MAX_CACHE_SIZE_BYTES: int = 64 * 1024 * 1024
+
+
+def cache_key(source: str, options: CompilerOptions) -> str:
+    options_fields = ",".join(f"{name}={value}" for (name, value) in dataclasses.asdict(options).items())
+
+    hasher = hashlib.sha256()
+    hasher.update(f"compiler={COMPILER_VERSION};format={FORMAT_VERSION};{options_fields}\0".encode("utf-8"))
+    hasher.update(source.encode("utf-8"))
+
+    return hasher.hexdigest()
+
+
+class CompileCache:
+    def __init__(self, directory: Path | str, max_size_bytes: int = DEFAULT_MAX_CACHE_SIZE_BYTES) -> None:
+        if max_size_bytes < 0:
+            raise ValueError(f"The maximum size of the cache cannot be negative; found {max_size_bytes}")
+
+        self.directory = Path(directory)
+        self.max_size_bytes = max_size_bytes
+
+    def entry_path(self, source: str, options: CompilerOptions) -> Path:
+        return self.directory / f"{cache_key(source, options)}{MONKEY_BYTECODE_FILE_SUFFIX}"
+
+    def get(self, source: str, options: CompilerOptions) -> Optional[Bytecode]:
+        """
+        Return the cached bytecode of `source`, or None if it hasn't been cached.
+        """
+        entry_path = self.entry_path(source, options)
+
+        try:
+            bytecode = deserialize_bytecode(entry_path)
+        except FileNotFoundError:
+            return None
+        except SerializeError:
+            # a damaged entry is dropped, and the source is compiled again
+            _remove_entry(entry_path)
+            return None
+
+        # mark the entry as recently used, so that eviction keeps it around for longer
+        try:
+            os.utime(entry_path)
+        except FileNotFoundError:
+            pass
+
+        return bytecode
+
+    def put(self, source: str, options: CompilerOptions, bytecode: Bytecode) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        # the entry is written to a temporary file first, and moved into place in one step,
+        # so that nothing ever reads a half-written entry
+        file_descriptor, temporary_filepath = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(file_descriptor)
+        try:
+            serialize_bytecode(bytecode, temporary_filepath)
+            os.replace(temporary_filepath, self.entry_path(source, options))
+        except BaseException:
+            _remove_entry(Path(temporary_filepath))
+            raise
+
+        self.evict()
+
+    def invalidate(self, source: str, options: CompilerOptions) -> bool:
+        """
+        Remove the cached bytecode of `source`; return whether there was any to remove.
+        """
+        return _remove_entry(self.entry_path(source, options))
+
+    def clear(self) -> int:
+        """
+        Remove every entry in the cache; return the number of entries that were removed.
+        """
+        return sum(1 for entry_path in self._entry_paths() if _remove_entry(entry_path))
+
+    def size_bytes(self) -> int:
+        return sum(size for (_, _, size) in self._entry_stats())
+
+    def evict(self, max_size_bytes: Optional[int] = None) -> int:
+        """
+        Remove the least recently used entries, until the total size of the ones that are
+        left is at most `max_size_bytes` (the cache's own maximum size, by default); return
+        the number of entries that were removed.
+        """
+        if max_size_bytes is None:
+            max_size_bytes = self.max_size_bytes
+
+        entry_stats = sorted(self._entry_stats(), key=lambda entry_stat: entry_stat[1])
+        total_size_bytes = sum(size for (_, _, size) in entry_stats)
+
+        n_removed = 0
+        for entry_path, _, size in entry_stats:
+            if total_size_bytes <= max_size_bytes:
+                break
+
+            if _remove_entry(entry_path):
+                n_removed += 1
+            total_size_bytes -= size
+
+        return n_removed
+
+    def _entry_paths(self) -> list[Path]:
+        if not self.directory.is_dir():
+            return []
+
+        return list(self.directory.glob(f"*{MONKEY_BYTECODE_FILE_SUFFIX}"))
+
+    def _entry_stats(self) -> list[tuple[Path, int, int]]:
+        """
+        Return the path, the time of last use (in nanoseconds), and the size of every entry.
+        """
+        entry_stats: list[tuple[Path, int, int]] = []
+        for entry_path in self._entry_paths():
+            try:
+                stat_result = entry_path.stat()
+            except FileNotFoundError:
+                # another process removed it in the meantime
+                continue
+
+            entry_stats.append((entry_path, stat_result.st_mtime_ns, stat_result.st_size))
+
+        return entry_stats
+
+
+def _remove_entry(entry_path: Path) -> bool:
+    try:
+        entry_path.unlink()
+    except FileNotFoundError:
+        return False
+
+    return True
@@ -6,3 +6,6 @@ MONKEY_SOURCE_FILE_EXTENSION = "monkey"
 MONKEY_BYTECODE_FILE_EXTENSION = "monkeybyte"
 MONKEY_SOURCE_FILE_SUFFIX = f".{MONKEY_SOURCE_FILE_EXTENSION}"
 MONKEY_BYTECODE_FILE_SUFFIX = f".{MONKEY_BYTECODE_FILE_EXTENSION}"
+
+# the directory, next to the source files, where compiled bytecode is cached
+MONKEY_CACHE_DIRECTORY_NAME = "__monkeycache__"
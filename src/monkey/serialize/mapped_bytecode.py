@@ -0,0 +1,116 @@
+"""
+This module contains the functions that load a `.monkeybyte` file lazily, by memory-mapping
+it instead of reading and decoding all of it up front.
+
+`deserialize_bytecode()` creates every constant in the file before the program starts,
+even though a large program may only ever call a few of its functions. A mapped file
+starts out with nothing created:
+- the main program's instructions are a read-only view into the mapped file
+- the constants are held in a LazyConstantPool, which creates each constant the first
+  time that the VirtualMachine indexes it (through OPCONSTANT, OPCLOSURE, or one of the
+  superinstructions that carry a constant), and hands out the same object after that
+- the instructions of a compiled function are also a view into the mapped file
+
+So the time to start a program, and the memory that it takes up, grow with the part of the
+program that actually runs, and not with the size of the file.
+
+The checksum covers the whole file, so verifying it reads every page of the file, which is
+exactly what mapping the file is meant to avoid; it is only verified if asked for. The
+header and the position of every constant are still checked before they are used.
+
+The mapping is closed once nothing refers to it anymore; that is, once the Bytecode, the
+VirtualMachine running it, and every function created from it are gone.
+"""
+
+import mmap
+import os
+from pathlib import Path
+from typing import Optional
+from typing import Sequence
+from typing import cast
+from typing import overload
+
+import monkey.object as objs
+
+from monkey.code import Instructions
+from monkey.compiler import Bytecode
+
+from monkey.serialize.binary_format import Buffer
+from monkey.serialize.binary_format import Header
+from monkey.serialize.binary_format import decode_constant
+from monkey.serialize.binary_format import read_constant_entry
+from monkey.serialize.binary_format import read_header
+from monkey.serialize.binary_format import read_instructions
+from monkey.serialize.binary_format import verify_checksum
+from monkey.serialize.custom_exceptions import SerializeError
+
+
+class LazyConstantPool(Sequence[objs.Object]):
+    def __init__(self, data: Buffer, header: Header) -> None:
+        self._data = data
+        self._constants: list[Optional[objs.Object]] = [None] * header.n_constants
+
+    @overload
+    def __getitem__(self, index: int) -> objs.Object:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[objs.Object]:
+        ...
+
+    def __getitem__(self, index: slice | int) -> list[objs.Object] | objs.Object:
+        if isinstance(index, slice):
+            return [self[i_constant] for i_constant in range(*index.indices(len(self)))]
+
+        constant = self._constants[index]
+        if constant is None:
+            constant = self._create_constant(index)
+
+        return constant
+
+    def __len__(self) -> int:
+        return len(self._constants)
+
+    def n_created(self) -> int:
+        """
+        Return the number of constants that have been created so far.
+        """
+        return sum(1 for constant in self._constants if constant is not None)
+
+    def _create_constant(self, index: int) -> objs.Object:
+        # negative positions are allowed, like they are for a list
+        i_constant = range(len(self._constants))[index]
+
+        entry = read_constant_entry(self._data, i_constant)
+        constant = decode_constant(self._data, entry, copy_instructions=False)
+        self._constants[i_constant] = constant
+
+        return constant
+
+
+def map_bytecode(serialized_filepath: Path | str, *, check_checksum: bool = False) -> Bytecode:
+    with open(serialized_filepath, "rb") as fin:
+        # an empty file can't be mapped at all
+        if os.fstat(fin.fileno()).st_size == 0:
+            raise SerializeError("The bytecode is too short to hold a header.")
+
+        # the mapping stays open after the file is closed
+        mapping = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+
+    return bytecode_from_buffer(memoryview(mapping), check_checksum=check_checksum)
+
+
+def bytecode_from_buffer(data: Buffer, *, check_checksum: bool = False) -> Bytecode:
+    """
+    Create a Bytecode instance whose instructions and constants are read out of `data` only
+    when they are needed; `data` must not change while the Bytecode is in use.
+    """
+    header = read_header(data)
+    if check_checksum:
+        verify_checksum(data, header)
+
+    # nothing writes to the instructions once they are compiled, so a view can stand in for
+    # the bytearray
+    instructions = cast(Instructions, read_instructions(data, header).toreadonly())
+
+    return Bytecode(instructions, LazyConstantPool(data, header))
@@ -11,3 +11,4 @@ FALSE_IDENTIFIER = "false"
 RETURN_IDENTIFIER = "return"
 IF_IDENTIFIER = "if"
 ELSE_IDENTIFIER = "else"
+WHILE_IDENTIFIER = "while"
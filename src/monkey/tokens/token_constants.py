@@ -42,6 +42,7 @@ FALSE_TOKEN = Token(token_types.FALSE, "FALSE")
 IF_TOKEN = Token(token_types.IF, "IF")
 ELSE_TOKEN = Token(token_types.ELSE, "ELSE")
 RETURN_TOKEN = Token(token_types.RETURN, "RETURN")
+WHILE_TOKEN = Token(token_types.WHILE, "WHILE")
 
 
 SINGLE_CHAR_TOKEN_DICT: dict[str, Token] = {
@@ -14,4 +14,5 @@ KEYWORD_TO_TOKEN: dict[str, token_types.TokenType] = {
     reserved.IF_IDENTIFIER: token_types.IF,
     reserved.ELSE_IDENTIFIER: token_types.ELSE,
     reserved.RETURN_IDENTIFIER: token_types.RETURN,
+    reserved.WHILE_IDENTIFIER: token_types.WHILE,
 }
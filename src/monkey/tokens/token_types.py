@@ -49,3 +49,4 @@ FALSE = "FALSE"
 IF = "IF"
 ELSE = "ELSE"
 RETURN = "RETURN"
+WHILE = "WHILE"
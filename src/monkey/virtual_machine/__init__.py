@@ -1,3 +1,10 @@
 from monkey.virtual_machine.virtual_machine import run
 from monkey.virtual_machine.virtual_machine import VirtualMachine
 from monkey.virtual_machine.custom_exceptions import VirtualMachineError
+from monkey.virtual_machine.execution_mode import ExecutionMode
+from monkey.virtual_machine.profiler import Profiler
+from monkey.virtual_machine.profiler import ProfileReport
+from monkey.virtual_machine.profiler import OpcodeProfile
+from monkey.virtual_machine.profiler import FunctionProfile
+from monkey.virtual_machine.profiler import format_profile_report
+from monkey.virtual_machine.sampling_profiler import SamplingProfiler
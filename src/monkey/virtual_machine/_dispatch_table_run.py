@@ -0,0 +1,451 @@
+"""
+This module contains the execution loop of the VirtualMachine that dispatches each
+pre-decoded instruction through a table, instead of through a chain of comparisons.
+
+The table is a list indexed by the integer value of the opcode, and each entry is the
+handler that executes that opcode. Finding the handler costs the same for every opcode;
+in a chain of comparisons, the opcodes near the end of the chain pay for every failed
+comparison in front of them.
+
+The handlers are closures created inside the run function, so that they share the state
+of the loop (the stack, the current frame, its instructions) without having to look it up
+through the VirtualMachine instance. Every handler accepts the current instruction and the
+current instruction pointer, and returns the instruction pointer to continue from.
+
+When the loop is given a Profiler, it runs an instrumented copy of the main loop, that times
+each handler and tells the profiler whenever a function is entered or left.
+"""
+
+import time
+from typing import Callable
+from typing import Optional
+from typing import TYPE_CHECKING
+
+import monkey.code.opcodes as opcodes
+import monkey.object as objs
+
+from monkey.code import DecodedInstruction
+from monkey.object.monkey_builtins import BUILTINS_LIST
+
+from monkey.virtual_machine.custom_exceptions import VirtualMachineError
+from monkey.virtual_machine.operand_stack import OperandStack
+from monkey.virtual_machine.profiler import Profiler
+from monkey.virtual_machine.stack_frame import StackFrame
+import monkey.virtual_machine._operations as ops
+
+if TYPE_CHECKING:
+    from monkey.virtual_machine.virtual_machine import VirtualMachine
+
+
+Handler = Callable[[DecodedInstruction, int], int]
+
+# an opcode occupies a single byte, so every possible opcode has an entry in the table
+DISPATCH_TABLE_SIZE: int = 256
+
+
+def run_dispatch_table(vm: "VirtualMachine", profiler: Optional[Profiler] = None) -> None:
+    operand_stack = vm.stack
+    if not isinstance(operand_stack, OperandStack):
+        raise VirtualMachineError("The dispatch table loop can only run on an OperandStack.")
+
+    frames = vm.frames
+    constants = vm.constants
+    globals_ = vm.globals
+
+    # the handlers push and pop by indexing the stack's list directly, and share the position
+    # of its top; the stack pointer is written back when the loop ends
+    stack = operand_stack.data
+    stack_pointer = operand_stack.stack_pointer
+
+    frame = frames.peek()
+    instructions = frame.closure.function.decoded_instructions
+
+    def op_constant(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack[stack_pointer] = constants[instruction[1]]
+        stack_pointer += 1
+        return instruction_pointer
+
+    def op_pop(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack_pointer -= 1
+        return instruction_pointer
+
+    def op_add(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack_pointer -= 1
+        right_object = stack[stack_pointer]
+        left_object = stack[stack_pointer - 1]
+        stack[stack_pointer - 1] = ops.add_objects(left_object, right_object)
+        return instruction_pointer
+
+    def op_sub(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack_pointer -= 1
+        right_object = stack[stack_pointer]
+        left_object = stack[stack_pointer - 1]
+        stack[stack_pointer - 1] = ops.subtract_objects(left_object, right_object)
+        return instruction_pointer
+
+    def op_mul(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack_pointer -= 1
+        right_object = stack[stack_pointer]
+        left_object = stack[stack_pointer - 1]
+        stack[stack_pointer - 1] = ops.multiply_objects(left_object, right_object)
+        return instruction_pointer
+
+    def op_div(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack_pointer -= 1
+        right_object = stack[stack_pointer]
+        left_object = stack[stack_pointer - 1]
+        stack[stack_pointer - 1] = ops.divide_objects(left_object, right_object)
+        return instruction_pointer
+
+    def op_true(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack[stack_pointer] = objs.TRUE_BOOL_OBJ
+        stack_pointer += 1
+        return instruction_pointer
+
+    def op_false(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack[stack_pointer] = objs.FALSE_BOOL_OBJ
+        stack_pointer += 1
+        return instruction_pointer
+
+    def op_equal(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack_pointer -= 1
+        right_object = stack[stack_pointer]
+        left_object = stack[stack_pointer - 1]
+        stack[stack_pointer - 1] = ops.equal_objects(left_object, right_object)
+        return instruction_pointer
+
+    def op_notequal(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack_pointer -= 1
+        right_object = stack[stack_pointer]
+        left_object = stack[stack_pointer - 1]
+        stack[stack_pointer - 1] = ops.notequal_objects(left_object, right_object)
+        return instruction_pointer
+
+    def op_greaterthan(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack_pointer -= 1
+        right_object = stack[stack_pointer]
+        left_object = stack[stack_pointer - 1]
+        stack[stack_pointer - 1] = ops.greaterthan_objects(left_object, right_object)
+        return instruction_pointer
+
+    def op_minus(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        stack[stack_pointer - 1] = ops.negate_object(stack[stack_pointer - 1])
+        return instruction_pointer
+
+    def op_bang(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        stack[stack_pointer - 1] = ops.bang_object(stack[stack_pointer - 1])
+        return instruction_pointer
+
+    def op_jump(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        return instruction[1] - 1
+
+    def op_jumpwhenfalse(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack_pointer -= 1
+        if not objs.is_truthy(stack[stack_pointer]):
+            return instruction[1] - 1
+
+        return instruction_pointer
+
+    def op_jumpwhentrue(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack_pointer -= 1
+        if objs.is_truthy(stack[stack_pointer]):
+            return instruction[1] - 1
+
+        return instruction_pointer
+
+    def op_null(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack[stack_pointer] = objs.NULL_OBJ
+        stack_pointer += 1
+        return instruction_pointer
+
+    def op_setglobal(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        i_global = instruction[1]
+        stack_pointer -= 1
+        value_to_bind = stack[stack_pointer]
+        if i_global >= globals_.size():
+            globals_.push(value_to_bind)
+        else:
+            globals_[i_global] = value_to_bind
+        return instruction_pointer
+
+    def op_getglobal(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack[stack_pointer] = globals_[instruction[1]]
+        stack_pointer += 1
+        return instruction_pointer
+
+    def op_setlocal(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack_pointer -= 1
+        stack[frame.base_pointer + instruction[1]] = stack[stack_pointer]
+        return instruction_pointer
+
+    def op_getlocal(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack[stack_pointer] = stack[frame.base_pointer + instruction[1]]
+        stack_pointer += 1
+        return instruction_pointer
+
+    def op_getbuiltin(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack[stack_pointer] = BUILTINS_LIST[instruction[1]]
+        stack_pointer += 1
+        return instruction_pointer
+
+    def op_getfree(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack[stack_pointer] = frame.closure.free_variables[instruction[1]]
+        stack_pointer += 1
+        return instruction_pointer
+
+    def op_array(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        i_first_element = stack_pointer - instruction[1]
+        stack[i_first_element] = ops.build_array(stack[i_first_element:stack_pointer])
+        stack_pointer = i_first_element + 1
+        return instruction_pointer
+
+    def op_hash(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        i_first_element = stack_pointer - instruction[1]
+        stack[i_first_element] = ops.build_hashmap(stack[i_first_element:stack_pointer])
+        stack_pointer = i_first_element + 1
+        return instruction_pointer
+
+    def op_index(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack_pointer -= 1
+        inside = stack[stack_pointer]
+        container = stack[stack_pointer - 1]
+        stack[stack_pointer - 1] = ops.evaluate_index_expression(container, inside)
+        return instruction_pointer
+
+    def op_call(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal frame, instructions, stack_pointer
+
+        n_arguments = instruction[1]
+        function_pointer = stack_pointer - 1 - n_arguments
+        callable = stack[function_pointer]
+
+        match callable:
+            case objs.ClosureObject():
+                ops.check_number_of_arguments(callable, n_arguments)
+                ops.check_frame_space(stack_pointer, callable.function)
+
+                # remember where to come back to, before switching over to the new frame
+                frame.instruction_pointer = instruction_pointer
+                frame = StackFrame(callable, base_pointer=function_pointer + 1)
+                frames.push(frame)
+                stack_pointer += callable.function.n_locals
+
+                instructions = callable.function.decoded_instructions
+                return frame.instruction_pointer
+            case objs.BuiltinObject():
+                arguments = stack[function_pointer + 1 : stack_pointer]
+                stack[function_pointer] = ops.call_builtin(callable, arguments)
+                stack_pointer = function_pointer + 1
+                return instruction_pointer
+            case _:
+                raise VirtualMachineError("Attempted to call a non-function or non-builtin.")
+
+    def return_from_frame(return_value: objs.Object) -> int:
+        nonlocal frame, instructions, stack_pointer
+
+        # drop the arguments, the locals, and the function that sits just beneath them
+        returning_frame = frames.pop()
+        stack_pointer = returning_frame.base_pointer
+        stack[stack_pointer - 1] = return_value
+
+        frame = frames.peek()
+        instructions = frame.closure.function.decoded_instructions
+        return frame.instruction_pointer
+
+    def op_tailcall(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal instructions, stack_pointer
+
+        n_arguments = instruction[1]
+        function_pointer = stack_pointer - 1 - n_arguments
+        callable = stack[function_pointer]
+
+        match callable:
+            case objs.ClosureObject():
+                # the current frame now runs the called function from its start
+                operand_stack.stack_pointer = stack_pointer
+                ops.enter_tail_call(operand_stack, frame, callable, n_arguments)
+                stack_pointer = operand_stack.stack_pointer
+
+                instructions = callable.function.decoded_instructions
+                return frame.instruction_pointer
+            case objs.BuiltinObject():
+                # a builtin doesn't need a frame; call it, and return its result right away
+                arguments = stack[function_pointer + 1 : stack_pointer]
+                return return_from_frame(ops.call_builtin(callable, arguments))
+            case _:
+                raise VirtualMachineError("Attempted to call a non-function or non-builtin.")
+
+    def op_returnvalue(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        return return_from_frame(stack[stack_pointer - 1])
+
+    def op_return(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        return return_from_frame(objs.NULL_OBJ)
+
+    def op_closure(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        function = ops.check_compiled_function(constants[instruction[1]])
+
+        n_free_variables = instruction[2]
+        if n_free_variables != 0:
+            free_variables = stack[stack_pointer - n_free_variables : stack_pointer]
+            stack_pointer -= n_free_variables
+        else:
+            free_variables = []
+
+        stack[stack_pointer] = objs.ClosureObject(function, free_variables)
+        stack_pointer += 1
+        return instruction_pointer
+
+    def op_currentclosure(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        stack[stack_pointer] = frame.closure
+        stack_pointer += 1
+        return instruction_pointer
+
+    def op_localconstadd(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        local_object = stack[frame.base_pointer + instruction[1]]
+        stack[stack_pointer] = ops.add_objects(local_object, constants[instruction[2]])
+        stack_pointer += 1
+        return instruction_pointer
+
+    def op_localconstsub(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        nonlocal stack_pointer
+        local_object = stack[frame.base_pointer + instruction[1]]
+        stack[stack_pointer] = ops.subtract_objects(local_object, constants[instruction[2]])
+        stack_pointer += 1
+        return instruction_pointer
+
+    def op_locallocalgtjump(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        left_object = stack[frame.base_pointer + instruction[1]]
+        right_object = stack[frame.base_pointer + instruction[2]]
+        if not objs.is_truthy(ops.greaterthan_objects(left_object, right_object)):
+            return instruction[3] - 1
+
+        return instruction_pointer
+
+    def op_constlocalgtjump(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        local_object = stack[frame.base_pointer + instruction[2]]
+        if not objs.is_truthy(ops.greaterthan_objects(constants[instruction[1]], local_object)):
+            return instruction[3] - 1
+
+        return instruction_pointer
+
+    def op_constsetglobal(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        i_global = instruction[2]
+        value_to_bind = constants[instruction[1]]
+        if i_global >= globals_.size():
+            globals_.push(value_to_bind)
+        else:
+            globals_[i_global] = value_to_bind
+        return instruction_pointer
+
+    def op_unknown(instruction: DecodedInstruction, instruction_pointer: int) -> int:
+        raise VirtualMachineError(f"Could not find a matching opcode: Found: {instruction[0]!r}")
+
+    handlers: dict[opcodes.Opcode, Handler] = {
+        opcodes.OPCONSTANT: op_constant,
+        opcodes.OPPOP: op_pop,
+        opcodes.OPADD: op_add,
+        opcodes.OPSUB: op_sub,
+        opcodes.OPMUL: op_mul,
+        opcodes.OPDIV: op_div,
+        opcodes.OPTRUE: op_true,
+        opcodes.OPFALSE: op_false,
+        opcodes.OPEQUAL: op_equal,
+        opcodes.OPNOTEQUAL: op_notequal,
+        opcodes.OPGREATERTHAN: op_greaterthan,
+        opcodes.OPMINUS: op_minus,
+        opcodes.OPBANG: op_bang,
+        opcodes.OPJUMP: op_jump,
+        opcodes.OPJUMPWHENFALSE: op_jumpwhenfalse,
+        opcodes.OPJUMPWHENTRUE: op_jumpwhentrue,
+        opcodes.OPNULL: op_null,
+        opcodes.OPSETGLOBAL: op_setglobal,
+        opcodes.OPGETGLOBAL: op_getglobal,
+        opcodes.OPARRAY: op_array,
+        opcodes.OPHASH: op_hash,
+        opcodes.OPINDEX: op_index,
+        opcodes.OPCALL: op_call,
+        opcodes.OPTAILCALL: op_tailcall,
+        opcodes.OPRETURNVALUE: op_returnvalue,
+        opcodes.OPRETURN: op_return,
+        opcodes.OPSETLOCAL: op_setlocal,
+        opcodes.OPGETLOCAL: op_getlocal,
+        opcodes.OPGETBUILTIN: op_getbuiltin,
+        opcodes.OPCLOSURE: op_closure,
+        opcodes.OPGETFREE: op_getfree,
+        opcodes.OPCURRENTCLOSURE: op_currentclosure,
+        opcodes.OPLOCALCONSTADD: op_localconstadd,
+        opcodes.OPLOCALCONSTSUB: op_localconstsub,
+        opcodes.OPLOCALLOCALGTJUMP: op_locallocalgtjump,
+        opcodes.OPCONSTLOCALGTJUMP: op_constlocalgtjump,
+        opcodes.OPCONSTSETGLOBAL: op_constsetglobal,
+    }
+
+    dispatch_table: list[Handler] = [op_unknown] * DISPATCH_TABLE_SIZE
+    for handled_opcode, handler in handlers.items():
+        dispatch_table[handled_opcode[0]] = handler
+
+    instruction_pointer = frame.instruction_pointer
+    try:
+        if profiler is None:
+            while instruction_pointer < len(instructions) - 1:
+                instruction_pointer += 1
+                instruction = instructions[instruction_pointer]
+                instruction_pointer = dispatch_table[instruction[0]](instruction, instruction_pointer)
+        else:
+            clock = time.perf_counter
+            tailcall_opcode = opcodes.OPTAILCALL[0]
+
+            profiler.start(frame.closure.function, constants)
+            n_frames = frames.size()
+            while instruction_pointer < len(instructions) - 1:
+                instruction_pointer += 1
+                instruction = instructions[instruction_pointer]
+                opcode = instruction[0]
+                function = frame.closure.function
+
+                start = clock()
+                instruction_pointer = dispatch_table[opcode](instruction, instruction_pointer)
+                profiler.record_instruction(function, opcode, clock() - start)
+
+                # a call pushes a frame, and a return pops one; a tail call into a closure
+                # keeps the frame, but it now belongs to another call
+                if frames.size() > n_frames:
+                    profiler.enter_function(frame.closure.function)
+                elif frames.size() < n_frames:
+                    profiler.exit_function()
+                elif opcode == tailcall_opcode:
+                    profiler.exit_function()
+                    profiler.enter_function(frame.closure.function)
+                n_frames = frames.size()
+    finally:
+        if profiler is not None:
+            profiler.finish()
+
+        operand_stack.stack_pointer = stack_pointer
+        frame.instruction_pointer = instruction_pointer
@@ -0,0 +1,278 @@
+"""
+This module contains the operations that the VirtualMachine performs on Object instances,
+independent of how the operands were taken off the stack.
+
+Every execution loop of the VirtualMachine shares these functions, so that they all produce
+the same results and raise the same errors. The same goes for the few changes to the stack
+and the frames that take more than a couple of lines, like entering a tail call.
+"""
+
+from typing import Sequence
+
+import monkey.object as objs
+
+from monkey.tokens import token_types
+from monkey.object.object_type import OBJECT_TYPE_DICT
+
+from monkey.virtual_machine.constants import MAX_VM_STACK_SIZE
+from monkey.virtual_machine.custom_exceptions import VirtualMachineError
+from monkey.virtual_machine.operand_stack import VirtualMachineStack
+from monkey.virtual_machine.stack_frame import StackFrame
+
+
+def add_objects(left_object: objs.Object, right_object: objs.Object) -> objs.Object:
+    match (left_object, right_object):
+        case (objs.IntegerObject(), objs.IntegerObject()):
+            return objs.integer_object(left_object.value + right_object.value)
+        case (objs.StringObject(), objs.StringObject()):
+            return objs.StringObject(left_object.value + right_object.value)
+        case _:
+            err_msg = invalid_infix_operation_error(token_types.PLUS, left_object, right_object)
+            raise VirtualMachineError(err_msg)
+
+
+def subtract_objects(left_object: objs.Object, right_object: objs.Object) -> objs.Object:
+    match (left_object, right_object):
+        case (objs.IntegerObject(), objs.IntegerObject()):
+            return objs.integer_object(left_object.value - right_object.value)
+        case _:
+            err_msg = invalid_infix_operation_error(token_types.MINUS, left_object, right_object)
+            raise VirtualMachineError(err_msg)
+
+
+def multiply_objects(left_object: objs.Object, right_object: objs.Object) -> objs.Object:
+    match (left_object, right_object):
+        case (objs.IntegerObject(), objs.IntegerObject()):
+            return objs.integer_object(left_object.value * right_object.value)
+        case _:
+            err_msg = invalid_infix_operation_error(token_types.ASTERISK, left_object, right_object)
+            raise VirtualMachineError(err_msg)
+
+
+def divide_objects(left_object: objs.Object, right_object: objs.Object) -> objs.Object:
+    match (left_object, right_object):
+        case (objs.IntegerObject(), objs.IntegerObject()):
+            if right_object.value == 0:
+                raise VirtualMachineError("Integer division by zero.")
+            return objs.integer_object(left_object.value // right_object.value)
+        case _:
+            err_msg = invalid_infix_operation_error(token_types.SLASH, left_object, right_object)
+            raise VirtualMachineError(err_msg)
+
+
+def equal_objects(left_object: objs.Object, right_object: objs.Object) -> objs.Object:
+    match (left_object, right_object):
+        case (objs.IntegerObject(), objs.IntegerObject()) | (objs.BooleanObject(), objs.BooleanObject()):
+            return objs.boolean_object(left_object.value == right_object.value)
+        case _:
+            err_msg = invalid_infix_operation_error(token_types.EQ, left_object, right_object)
+            raise VirtualMachineError(err_msg)
+
+
+def notequal_objects(left_object: objs.Object, right_object: objs.Object) -> objs.Object:
+    match (left_object, right_object):
+        case (objs.IntegerObject(), objs.IntegerObject()) | (objs.BooleanObject(), objs.BooleanObject()):
+            return objs.boolean_object(left_object.value != right_object.value)
+        case _:
+            err_msg = invalid_infix_operation_error(token_types.NOT_EQ, left_object, right_object)
+            raise VirtualMachineError(err_msg)
+
+
+def greaterthan_objects(left_object: objs.Object, right_object: objs.Object) -> objs.Object:
+    match (left_object, right_object):
+        case (objs.IntegerObject(), objs.IntegerObject()):
+            return objs.boolean_object(left_object.value > right_object.value)
+        case _:
+            err_msg = invalid_infix_operation_error(token_types.GT, left_object, right_object)
+            raise VirtualMachineError(err_msg)
+
+
+def negate_object(argument: objs.Object) -> objs.Object:
+    match argument:
+        case objs.IntegerObject():
+            return objs.integer_object(-argument.value)
+        case _:
+            err_msg = invalid_prefix_operation_error(token_types.MINUS, argument)
+            raise VirtualMachineError(err_msg)
+
+
+def bang_object(argument: objs.Object) -> objs.Object:
+    match argument:
+        case objs.BooleanObject():
+            return objs.boolean_object(not argument.value)
+        case objs.NULL_OBJ:
+            return objs.TRUE_BOOL_OBJ
+        case _:
+            return objs.FALSE_BOOL_OBJ
+
+
+def build_array(elements: Sequence[objs.Object]) -> objs.ArrayObject:
+    return objs.ArrayObject(elements)
+
+
+def build_hashmap(keys_and_values: Sequence[objs.Object]) -> objs.HashObject:
+    hashmap: dict[objs.HashKey, objs.HashKeyValuePair] = {}
+
+    # the keys and values come in consecutive pairs, and each counts as an object, so we need
+    # to move forward in pairs
+    for i in range(0, len(keys_and_values), 2):
+        key = keys_and_values[i]
+        value = keys_and_values[i + 1]
+
+        hash_key = objs.create_hash_key(key)
+        if hash_key is None:
+            raise unhashable_key_error(key)
+
+        hashmap[hash_key] = objs.HashKeyValuePair(key, value)
+
+    return objs.HashObject(hashmap)
+
+
+def call_builtin(function: objs.BuiltinObject, arguments: Sequence[objs.Object]) -> objs.Object:
+    result = function.func(*arguments)
+    if objs.is_error_object(result):
+        raise VirtualMachineError(
+            f"Error when executing builtin function `{function.name}:`\n" f"{str(result)}"
+        )
+
+    return result
+
+
+def check_number_of_arguments(closure: objs.ClosureObject, n_arguments: int) -> None:
+    if not n_arguments == closure.function.n_arguments:
+        raise VirtualMachineError(
+            "The number of arguments passed into the function doesn't match the\n"
+            "number of function parameters.\n"
+            f"Number of passed arguments: {n_arguments}\n"
+            f"Number of parameters the function accepts: {closure.function.n_arguments}"
+        )
+
+
+def check_stack_space(stack_pointer: int, n_elements: int) -> None:
+    """
+    Make sure that `n_elements` more elements fit on the stack. The OperandStack doesn't
+    check its bounds on every push; this is checked once for each frame, before it runs.
+    """
+    if stack_pointer + n_elements > MAX_VM_STACK_SIZE:
+        raise stack_overflow_error()
+
+
+def check_frame_space(stack_pointer: int, function: objs.CompiledFunctionObject) -> None:
+    """
+    Make sure that the locals of `function`, and every operand that its instructions can
+    have on the stack at once, fit above `stack_pointer`.
+    """
+    check_stack_space(stack_pointer, function.n_locals + function.max_stack_depth)
+
+
+def stack_overflow_error() -> VirtualMachineError:
+    return VirtualMachineError(f"Stack overflow: the stack can hold at most {MAX_VM_STACK_SIZE} objects.")
+
+
+def unhashable_key_error(key: objs.Object) -> VirtualMachineError:
+    key_str = OBJECT_TYPE_DICT[key.data_type()]
+    return VirtualMachineError("Found an unhashable type as a key in a hashmap.\n" f"key type: {key_str}")
+
+
+def enter_tail_call(
+    stack: VirtualMachineStack, frame: StackFrame, closure: objs.ClosureObject, n_arguments: int
+) -> None:
+    """
+    Make the current frame run the called closure from its start, in place of the function
+    that made the tail call.
+
+    The called closure and its arguments are on top of the stack; they are moved down over
+    the caller's own function, arguments, and locals, which are no longer needed, so that
+    the stack doesn't grow with each tail call either.
+    """
+    check_number_of_arguments(closure, n_arguments)
+
+    function_pointer = stack.size() - 1 - n_arguments
+    new_function_pointer = frame.base_pointer - 1
+    for offset in range(n_arguments + 1):
+        stack[new_function_pointer + offset] = stack[function_pointer + offset]
+
+    stack.shrink_stack_pointer(function_pointer - new_function_pointer)
+    check_frame_space(stack.size(), closure.function)
+    stack.advance_stack_pointer(closure.function.n_locals)
+
+    frame.closure = closure
+    frame.instruction_pointer = -1
+
+
+def check_compiled_function(function: objs.Object) -> objs.CompiledFunctionObject:
+    if not isinstance(function, objs.CompiledFunctionObject):
+        raise VirtualMachineError(
+            "Expected a compiled function object. Found object of type "
+            f"'{OBJECT_TYPE_DICT[function.data_type()]}'"
+        )
+
+    return function
+
+
+def evaluate_index_expression(container: objs.Object, inside: objs.Object) -> objs.Object:
+    if isinstance(container, objs.ArrayObject) and isinstance(inside, objs.IntegerObject):
+        return _evaluate_array_index_expression(container, inside)
+    if isinstance(container, objs.StringObject) and isinstance(inside, objs.IntegerObject):
+        return _evaluate_string_index_expression(container, inside)
+    if isinstance(container, objs.HashObject):
+        return _evaluate_hash_index_expression(container, inside)
+    else:
+        container_str = OBJECT_TYPE_DICT[container.data_type()]
+        inside_str = OBJECT_TYPE_DICT[inside.data_type()]
+        raise VirtualMachineError(
+            "Indexing operation not supported by the compiler.\n"
+            f"container type: {container_str}\n"
+            f"inside type: {inside_str}\n"
+        )
+
+
+def invalid_infix_operation_error(operation: str, left_obj: objs.Object, right_obj: objs.Object) -> str:
+    left_str = OBJECT_TYPE_DICT[left_obj.data_type()]
+    right_str = OBJECT_TYPE_DICT[right_obj.data_type()]
+    message = f"Unable to perform infix '{operation}' on objects of type '{left_str}' and '{right_str}'"
+
+    return message
+
+
+def invalid_prefix_operation_error(operation: str, argument: objs.Object) -> str:
+    argument_str = OBJECT_TYPE_DICT[argument.data_type()]
+    message = f"Unable to perform prefix operation '{operation}' on object of type '{argument_str}'"
+
+    return message
+
+
+def _evaluate_array_index_expression(array: objs.ArrayObject, index: objs.IntegerObject) -> objs.Object:
+    arr_index: int = index.value
+    max_allowed: int = len(array.elements) - 1
+
+    if arr_index < 0 or arr_index > max_allowed:
+        raise VirtualMachineError(
+            "Indexing array out of bounds.\n" f"Array length: {len(array.elements)}\n" f"Index: {index}"
+        )
+
+    return array.elements[arr_index]
+
+
+def _evaluate_string_index_expression(string: objs.StringObject, index: objs.IntegerObject) -> objs.Object:
+    str_index: int = index.value
+    max_allowed: int = len(string.value) - 1
+
+    if str_index < 0 or str_index > max_allowed:
+        raise VirtualMachineError(
+            "Indexing string out of bounds.\n" f"String length: {len(string.value)}\n" f"Index: {index}"
+        )
+
+    return objs.StringObject(string.value[str_index])
+
+
+def _evaluate_hash_index_expression(hashmap: objs.HashObject, key: objs.Object) -> objs.Object:
+    hash_key = objs.create_hash_key(key)
+    if hash_key is None:
+        raise unhashable_key_error(key)
+
+    pair = hashmap.pairs.get(hash_key, None)
+    if pair is None:
+        raise VirtualMachineError(f"Key {key} not found in a hash map.")
+    else:
+        return pair.value
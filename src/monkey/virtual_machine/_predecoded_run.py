@@ -0,0 +1,305 @@
+"""
+This module contains the execution loop of the VirtualMachine that runs the pre-decoded
+form of the instructions (see `monkey.code.decoding`).
+
+Each function's instructions are decoded once, the first time the function is executed,
+and the result is cached on the CompiledFunctionObject. The loop then only has to unpack
+a tuple at each step, instead of slicing the opcode and its operands out of a bytearray
+and converting them with `int.from_bytes()`.
+
+The instruction pointer of each frame is an index into the decoded instructions, and the
+targets of jumps have already been converted into those indices.
+"""
+
+from typing import TYPE_CHECKING
+
+import monkey.code.opcodes as opcodes
+import monkey.object as objs
+
+from monkey.object.monkey_builtins import BUILTINS_LIST
+
+from monkey.virtual_machine.custom_exceptions import VirtualMachineError
+from monkey.virtual_machine.operand_stack import OperandStack
+from monkey.virtual_machine.stack_frame import StackFrame
+import monkey.virtual_machine._operations as ops
+
+if TYPE_CHECKING:
+    from monkey.virtual_machine.virtual_machine import VirtualMachine
+
+
+# the decoded instructions hold the opcodes as integers
+_OPCONSTANT = opcodes.OPCONSTANT[0]
+_OPPOP = opcodes.OPPOP[0]
+_OPADD = opcodes.OPADD[0]
+_OPSUB = opcodes.OPSUB[0]
+_OPMUL = opcodes.OPMUL[0]
+_OPDIV = opcodes.OPDIV[0]
+_OPTRUE = opcodes.OPTRUE[0]
+_OPFALSE = opcodes.OPFALSE[0]
+_OPEQUAL = opcodes.OPEQUAL[0]
+_OPNOTEQUAL = opcodes.OPNOTEQUAL[0]
+_OPGREATERTHAN = opcodes.OPGREATERTHAN[0]
+_OPMINUS = opcodes.OPMINUS[0]
+_OPBANG = opcodes.OPBANG[0]
+_OPJUMP = opcodes.OPJUMP[0]
+_OPJUMPWHENFALSE = opcodes.OPJUMPWHENFALSE[0]
+_OPJUMPWHENTRUE = opcodes.OPJUMPWHENTRUE[0]
+_OPNULL = opcodes.OPNULL[0]
+_OPSETGLOBAL = opcodes.OPSETGLOBAL[0]
+_OPGETGLOBAL = opcodes.OPGETGLOBAL[0]
+_OPARRAY = opcodes.OPARRAY[0]
+_OPHASH = opcodes.OPHASH[0]
+_OPINDEX = opcodes.OPINDEX[0]
+_OPCALL = opcodes.OPCALL[0]
+_OPTAILCALL = opcodes.OPTAILCALL[0]
+_OPRETURNVALUE = opcodes.OPRETURNVALUE[0]
+_OPRETURN = opcodes.OPRETURN[0]
+_OPSETLOCAL = opcodes.OPSETLOCAL[0]
+_OPGETLOCAL = opcodes.OPGETLOCAL[0]
+_OPGETBUILTIN = opcodes.OPGETBUILTIN[0]
+_OPCLOSURE = opcodes.OPCLOSURE[0]
+_OPGETFREE = opcodes.OPGETFREE[0]
+_OPCURRENTCLOSURE = opcodes.OPCURRENTCLOSURE[0]
+_OPLOCALCONSTADD = opcodes.OPLOCALCONSTADD[0]
+_OPLOCALCONSTSUB = opcodes.OPLOCALCONSTSUB[0]
+_OPLOCALLOCALGTJUMP = opcodes.OPLOCALLOCALGTJUMP[0]
+_OPCONSTLOCALGTJUMP = opcodes.OPCONSTLOCALGTJUMP[0]
+_OPCONSTSETGLOBAL = opcodes.OPCONSTSETGLOBAL[0]
+
+
+def run_predecoded(vm: "VirtualMachine") -> None:
+    operand_stack = vm.stack
+    if not isinstance(operand_stack, OperandStack):
+        raise VirtualMachineError("The pre-decoded loop can only run on an OperandStack.")
+
+    frames = vm.frames
+    constants = vm.constants
+
+    # the stack's list and the position of its top are kept in local variables, and pushes
+    # and pops index the list directly; the stack pointer is written back when the loop ends
+    stack = operand_stack.data
+    stack_pointer = operand_stack.stack_pointer
+
+    # the decoded instructions and the instruction pointer of the current frame are kept
+    # in local variables; they only change when a frame is entered or left
+    frame = frames.peek()
+    instructions = frame.closure.function.decoded_instructions
+    instruction_pointer = frame.instruction_pointer
+
+    try:
+        while instruction_pointer < len(instructions) - 1:
+            instruction_pointer += 1
+            instruction = instructions[instruction_pointer]
+            opcode = instruction[0]
+
+            if opcode == _OPCONSTANT:
+                stack[stack_pointer] = constants[instruction[1]]
+                stack_pointer += 1
+            elif opcode == _OPPOP:
+                stack_pointer -= 1
+            elif opcode == _OPADD:
+                stack_pointer -= 1
+                right_object = stack[stack_pointer]
+                left_object = stack[stack_pointer - 1]
+                stack[stack_pointer - 1] = ops.add_objects(left_object, right_object)
+            elif opcode == _OPSUB:
+                stack_pointer -= 1
+                right_object = stack[stack_pointer]
+                left_object = stack[stack_pointer - 1]
+                stack[stack_pointer - 1] = ops.subtract_objects(left_object, right_object)
+            elif opcode == _OPMUL:
+                stack_pointer -= 1
+                right_object = stack[stack_pointer]
+                left_object = stack[stack_pointer - 1]
+                stack[stack_pointer - 1] = ops.multiply_objects(left_object, right_object)
+            elif opcode == _OPDIV:
+                stack_pointer -= 1
+                right_object = stack[stack_pointer]
+                left_object = stack[stack_pointer - 1]
+                stack[stack_pointer - 1] = ops.divide_objects(left_object, right_object)
+            elif opcode == _OPTRUE:
+                stack[stack_pointer] = objs.TRUE_BOOL_OBJ
+                stack_pointer += 1
+            elif opcode == _OPFALSE:
+                stack[stack_pointer] = objs.FALSE_BOOL_OBJ
+                stack_pointer += 1
+            elif opcode == _OPEQUAL:
+                stack_pointer -= 1
+                right_object = stack[stack_pointer]
+                left_object = stack[stack_pointer - 1]
+                stack[stack_pointer - 1] = ops.equal_objects(left_object, right_object)
+            elif opcode == _OPNOTEQUAL:
+                stack_pointer -= 1
+                right_object = stack[stack_pointer]
+                left_object = stack[stack_pointer - 1]
+                stack[stack_pointer - 1] = ops.notequal_objects(left_object, right_object)
+            elif opcode == _OPGREATERTHAN:
+                stack_pointer -= 1
+                right_object = stack[stack_pointer]
+                left_object = stack[stack_pointer - 1]
+                stack[stack_pointer - 1] = ops.greaterthan_objects(left_object, right_object)
+            elif opcode == _OPMINUS:
+                stack[stack_pointer - 1] = ops.negate_object(stack[stack_pointer - 1])
+            elif opcode == _OPBANG:
+                stack[stack_pointer - 1] = ops.bang_object(stack[stack_pointer - 1])
+            elif opcode == _OPJUMP:
+                instruction_pointer = instruction[1] - 1
+            elif opcode == _OPJUMPWHENFALSE:
+                stack_pointer -= 1
+                if not objs.is_truthy(stack[stack_pointer]):
+                    instruction_pointer = instruction[1] - 1
+            elif opcode == _OPJUMPWHENTRUE:
+                stack_pointer -= 1
+                if objs.is_truthy(stack[stack_pointer]):
+                    instruction_pointer = instruction[1] - 1
+            elif opcode == _OPNULL:
+                stack[stack_pointer] = objs.NULL_OBJ
+                stack_pointer += 1
+            elif opcode == _OPSETGLOBAL:
+                i_global = instruction[1]
+                stack_pointer -= 1
+                value_to_bind = stack[stack_pointer]
+                if i_global >= vm.globals.size():
+                    vm.globals.push(value_to_bind)
+                else:
+                    vm.globals[i_global] = value_to_bind
+            elif opcode == _OPGETGLOBAL:
+                stack[stack_pointer] = vm.globals[instruction[1]]
+                stack_pointer += 1
+            elif opcode == _OPSETLOCAL:
+                stack_pointer -= 1
+                stack[frame.base_pointer + instruction[1]] = stack[stack_pointer]
+            elif opcode == _OPGETLOCAL:
+                stack[stack_pointer] = stack[frame.base_pointer + instruction[1]]
+                stack_pointer += 1
+            elif opcode == _OPGETBUILTIN:
+                stack[stack_pointer] = BUILTINS_LIST[instruction[1]]
+                stack_pointer += 1
+            elif opcode == _OPGETFREE:
+                stack[stack_pointer] = frame.closure.free_variables[instruction[1]]
+                stack_pointer += 1
+            elif opcode == _OPARRAY:
+                i_first_element = stack_pointer - instruction[1]
+                array = ops.build_array(stack[i_first_element:stack_pointer])
+                stack[i_first_element] = array
+                stack_pointer = i_first_element + 1
+            elif opcode == _OPHASH:
+                i_first_element = stack_pointer - instruction[1]
+                hashmap = ops.build_hashmap(stack[i_first_element:stack_pointer])
+                stack[i_first_element] = hashmap
+                stack_pointer = i_first_element + 1
+            elif opcode == _OPINDEX:
+                stack_pointer -= 1
+                inside = stack[stack_pointer]
+                container = stack[stack_pointer - 1]
+                stack[stack_pointer - 1] = ops.evaluate_index_expression(container, inside)
+            elif opcode == _OPCALL:
+                n_arguments = instruction[1]
+                function_pointer = stack_pointer - 1 - n_arguments
+                callable = stack[function_pointer]
+
+                match callable:
+                    case objs.ClosureObject():
+                        ops.check_number_of_arguments(callable, n_arguments)
+                        ops.check_frame_space(stack_pointer, callable.function)
+
+                        # remember where to come back to, before switching over to the new frame
+                        frame.instruction_pointer = instruction_pointer
+                        frame = StackFrame(callable, base_pointer=function_pointer + 1)
+                        frames.push(frame)
+                        stack_pointer += callable.function.n_locals
+
+                        instructions = callable.function.decoded_instructions
+                        instruction_pointer = frame.instruction_pointer
+                    case objs.BuiltinObject():
+                        arguments = stack[function_pointer + 1 : stack_pointer]
+                        stack[function_pointer] = ops.call_builtin(callable, arguments)
+                        stack_pointer = function_pointer + 1
+                    case _:
+                        raise VirtualMachineError("Attempted to call a non-function or non-builtin.")
+            elif opcode == _OPTAILCALL:
+                n_arguments = instruction[1]
+                function_pointer = stack_pointer - 1 - n_arguments
+                callable = stack[function_pointer]
+
+                match callable:
+                    case objs.ClosureObject():
+                        # the current frame now runs the called function from its start
+                        operand_stack.stack_pointer = stack_pointer
+                        ops.enter_tail_call(operand_stack, frame, callable, n_arguments)
+                        stack_pointer = operand_stack.stack_pointer
+
+                        instructions = callable.function.decoded_instructions
+                        instruction_pointer = frame.instruction_pointer
+                    case objs.BuiltinObject():
+                        # a builtin doesn't need a frame; call it, and return its result right away
+                        arguments = stack[function_pointer + 1 : stack_pointer]
+                        return_value = ops.call_builtin(callable, arguments)
+
+                        returning_frame = frames.pop()
+                        stack_pointer = returning_frame.base_pointer
+                        stack[stack_pointer - 1] = return_value
+
+                        frame = frames.peek()
+                        instructions = frame.closure.function.decoded_instructions
+                        instruction_pointer = frame.instruction_pointer
+                    case _:
+                        raise VirtualMachineError("Attempted to call a non-function or non-builtin.")
+            elif opcode == _OPRETURNVALUE or opcode == _OPRETURN:
+                if opcode == _OPRETURNVALUE:
+                    return_value = stack[stack_pointer - 1]
+                else:
+                    return_value = objs.NULL_OBJ
+
+                # drop the arguments, the locals, and the function that sits just beneath them
+                returning_frame = frames.pop()
+                stack_pointer = returning_frame.base_pointer
+                stack[stack_pointer - 1] = return_value
+
+                frame = frames.peek()
+                instructions = frame.closure.function.decoded_instructions
+                instruction_pointer = frame.instruction_pointer
+            elif opcode == _OPCLOSURE:
+                function = ops.check_compiled_function(constants[instruction[1]])
+
+                n_free_variables = instruction[2]
+                if n_free_variables != 0:
+                    free_variables = stack[stack_pointer - n_free_variables : stack_pointer]
+                    stack_pointer -= n_free_variables
+                else:
+                    free_variables = []
+
+                stack[stack_pointer] = objs.ClosureObject(function, free_variables)
+                stack_pointer += 1
+            elif opcode == _OPCURRENTCLOSURE:
+                stack[stack_pointer] = frame.closure
+                stack_pointer += 1
+            elif opcode == _OPLOCALCONSTADD:
+                local_object = stack[frame.base_pointer + instruction[1]]
+                stack[stack_pointer] = ops.add_objects(local_object, constants[instruction[2]])
+                stack_pointer += 1
+            elif opcode == _OPLOCALCONSTSUB:
+                local_object = stack[frame.base_pointer + instruction[1]]
+                stack[stack_pointer] = ops.subtract_objects(local_object, constants[instruction[2]])
+                stack_pointer += 1
+            elif opcode == _OPLOCALLOCALGTJUMP:
+                left_object = stack[frame.base_pointer + instruction[1]]
+                right_object = stack[frame.base_pointer + instruction[2]]
+                if not objs.is_truthy(ops.greaterthan_objects(left_object, right_object)):
+                    instruction_pointer = instruction[3] - 1
+            elif opcode == _OPCONSTLOCALGTJUMP:
+                local_object = stack[frame.base_pointer + instruction[2]]
+                if not objs.is_truthy(ops.greaterthan_objects(constants[instruction[1]], local_object)):
+                    instruction_pointer = instruction[3] - 1
+            elif opcode == _OPCONSTSETGLOBAL:
+                i_global = instruction[2]
+                value_to_bind = constants[instruction[1]]
+                if i_global >= vm.globals.size():
+                    vm.globals.push(value_to_bind)
+                else:
+                    vm.globals[i_global] = value_to_bind
+            else:
+                raise VirtualMachineError(f"Could not find a matching opcode: Found: {opcode!r}")
+    finally:
+        operand_stack.stack_pointer = stack_pointer
+        frame.instruction_pointer = instruction_pointer
@@ -0,0 +1,17 @@
+"""
+This module contains the ExecutionMode enumeration, which selects the loop that the
+VirtualMachine uses to execute the instructions it was given.
+"""
+
+import enum
+
+
+class ExecutionMode(enum.Enum):
+    # decode each opcode and its operands from the raw bytes, at every step
+    BYTECODE = enum.auto()
+
+    # execute the pre-decoded form of each function's instructions, decoded once and cached
+    PREDECODED = enum.auto()
+
+    # execute the pre-decoded instructions, looking up the handler of each opcode in a table
+    DISPATCH_TABLE = enum.auto()
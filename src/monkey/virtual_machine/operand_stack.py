@@ -0,0 +1,81 @@
+"""
+This module contains the OperandStack class, the stack that the VirtualMachine pushes its
+operands onto and pops its results off of.
+
+Unlike the FixedStack in `monkey.containers`, the OperandStack does not check its bounds
+on every access. Its elements live in a list that is allocated once, at its full size, and
+the position of the top of the stack is a plain integer. The execution loops copy both into
+local variables, and push and pop by indexing the list directly.
+
+The stack can still only hold so many elements. Instead of checking every push, the
+VirtualMachine checks once, before a frame runs, that there is room for the frame's locals
+and for the most operands that the frame's instructions can have on the stack at once.
+
+Popping from an empty stack is not caught at all; the compiler never emits instructions
+that would do so. To check every access anyway, create the VirtualMachine in debug mode,
+which runs on a FixedStack instead.
+"""
+
+from typing import Optional
+from typing import Union
+from typing import overload
+
+import monkey.object as objs
+
+from monkey.containers import FixedStack
+
+
+class OperandStack:
+    def __init__(self, max_size: int) -> None:
+        self.data: list[objs.Object] = [objs.DefaultObject()] * max_size
+        self.stack_pointer = 0
+
+    def push(self, element: objs.Object) -> None:
+        self.data[self.stack_pointer] = element
+        self.stack_pointer += 1
+
+    def pop(self) -> objs.Object:
+        self.stack_pointer -= 1
+        return self.data[self.stack_pointer]
+
+    def peek(self) -> objs.Object:
+        return self.data[self.stack_pointer - 1]
+
+    @overload
+    def __getitem__(self, index: int) -> objs.Object:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[objs.Object]:
+        ...
+
+    def __getitem__(self, index: slice | int) -> list[objs.Object] | objs.Object:
+        return self.data[index]
+
+    def __setitem__(self, index: int, value: objs.Object) -> None:
+        self.data[index] = value
+
+    def maybe_get_last_popped(self) -> Optional[objs.Object]:
+        if self.stack_pointer >= len(self.data):
+            return None
+
+        return self.data[self.stack_pointer]
+
+    def size(self) -> int:
+        return self.stack_pointer
+
+    def is_empty(self) -> bool:
+        return self.stack_pointer == 0
+
+    def max_size(self) -> int:
+        return len(self.data)
+
+    def shrink_stack_pointer(self, n_elements: int) -> None:
+        self.stack_pointer -= n_elements
+
+    def advance_stack_pointer(self, n_elements: int) -> None:
+        self.stack_pointer += n_elements
+
+
+# the stack of a VirtualMachine; an OperandStack, or a FixedStack when running in debug mode
+VirtualMachineStack = Union[OperandStack, FixedStack[objs.Object]]
@@ -0,0 +1,187 @@
+"""
+This module contains the Profiler class, which records where the VirtualMachine spends its
+time while it runs a program.
+
+A profiler is passed to `run()`, and only the dispatch table loop accepts one. The loop has
+a separate, instrumented copy of its main loop that it switches to when it is given a
+profiler; without one, the loop runs exactly as before, and pays nothing for profiling.
+
+For every opcode, the profiler counts how many times it ran and the total time spent in its
+handler. For every function (the compiled function, not each closure made from it), it
+records:
+- the number of calls, including tail calls
+- the number of instructions that ran in its body
+- the exclusive time: the time spent running instructions of the function itself
+- the inclusive time: the exclusive time, plus the time spent in the functions it called
+
+The time of an OPCALL instruction is part of the caller; the time of the OPRETURN or
+OPRETURNVALUE instruction that leaves a function is part of the function that returns. The
+inclusive time of a recursive function is only counted for its outermost call, so that the
+time of the inner calls isn't counted several times over.
+"""
+
+import dataclasses
+from typing import Optional
+from typing import Sequence
+
+import monkey.code as code
+import monkey.object as objs
+
+# the name given to the main program, which runs inside a function of its own
+MAIN_FUNCTION_NAME: str = "<main>"
+
+# an opcode occupies a single byte
+N_POSSIBLE_OPCODES: int = 256
+
+
+@dataclasses.dataclass
+class OpcodeProfile:
+    name: str
+    count: int = 0
+    seconds: float = 0.0
+
+
+@dataclasses.dataclass
+class FunctionProfile:
+    name: str
+    calls: int = 0
+    n_instructions: int = 0
+    exclusive_seconds: float = 0.0
+    inclusive_seconds: float = 0.0
+
+
+@dataclasses.dataclass(frozen=True)
+class ProfileReport:
+    # the total time spent running instructions
+    total_seconds: float
+
+    # both sorted from the most time spent to the least
+    opcodes: list[OpcodeProfile]
+    functions: list[FunctionProfile]
+
+
+def function_names(
+    main_function: objs.CompiledFunctionObject, constants: Sequence[objs.Object]
+) -> dict[int, str]:
+    """
+    Map the identity of every function in a program to the name it is reported under.
+
+    A function is named after the let statement that it was bound in; a function that was
+    never bound to a name is named after its position in the constant pool.
+    """
+    names: dict[int, str] = {id(main_function): MAIN_FUNCTION_NAME}
+    for i_constant, constant in enumerate(constants):
+        if isinstance(constant, objs.CompiledFunctionObject):
+            name = constant.name if constant.name is not None else f"<function {i_constant}>"
+            names.setdefault(id(constant), name)
+
+    return names
+
+
+class Profiler:
+    def __init__(self) -> None:
+        self._opcode_counts: list[int] = [0] * N_POSSIBLE_OPCODES
+        self._opcode_seconds: list[float] = [0.0] * N_POSSIBLE_OPCODES
+
+        # compiled functions can't be hashed (their instructions are a bytearray), and two
+        # different functions may compare equal; so they are keyed by their identity
+        self._functions: dict[int, FunctionProfile] = {}
+        self._function_names: dict[int, str] = {}
+
+        # the running total of the time spent in instructions; the inclusive time of a call
+        # is the difference between the totals when it ends and when it starts
+        self._total_seconds = 0.0
+
+        # one entry per active call: the function, and the running total when it started
+        self._active_calls: list[tuple[int, float]] = []
+        self._call_depths: dict[int, int] = {}
+
+    def start(self, function: objs.CompiledFunctionObject, constants: Sequence[objs.Object]) -> None:
+        """
+        Begin profiling a run, that starts out inside of `function`.
+        """
+        self._function_names = function_names(function, constants)
+        self.enter_function(function)
+
+    def finish(self) -> None:
+        """
+        End the calls that are still active; called when the run ends, normally or not.
+        """
+        while self._active_calls:
+            self.exit_function()
+
+    def record_instruction(self, function: objs.CompiledFunctionObject, opcode: int, seconds: float) -> None:
+        self._opcode_counts[opcode] += 1
+        self._opcode_seconds[opcode] += seconds
+        self._total_seconds += seconds
+
+        profile = self._function_profile(function)
+        profile.n_instructions += 1
+        profile.exclusive_seconds += seconds
+
+    def enter_function(self, function: objs.CompiledFunctionObject) -> None:
+        function_id = id(function)
+        self._function_profile(function).calls += 1
+        self._active_calls.append((function_id, self._total_seconds))
+        self._call_depths[function_id] = self._call_depths.get(function_id, 0) + 1
+
+    def exit_function(self) -> None:
+        function_id, seconds_at_start = self._active_calls.pop()
+
+        depth = self._call_depths[function_id] - 1
+        self._call_depths[function_id] = depth
+        if depth == 0:
+            self._functions[function_id].inclusive_seconds += self._total_seconds - seconds_at_start
+
+    def report(self) -> ProfileReport:
+        opcode_profiles: list[OpcodeProfile] = []
+        for opcode, count in enumerate(self._opcode_counts):
+            if count == 0:
+                continue
+
+            name = code.lookup_opcode_definition(bytes([opcode])).name
+            opcode_profiles.append(OpcodeProfile(name, count, self._opcode_seconds[opcode]))
+
+        opcode_profiles.sort(key=lambda profile: profile.seconds, reverse=True)
+
+        function_profiles = [dataclasses.replace(profile) for profile in self._functions.values()]
+        function_profiles.sort(key=lambda profile: profile.inclusive_seconds, reverse=True)
+
+        return ProfileReport(self._total_seconds, opcode_profiles, function_profiles)
+
+    def _function_profile(self, function: objs.CompiledFunctionObject) -> FunctionProfile:
+        function_id = id(function)
+        profile = self._functions.get(function_id, None)
+        if profile is None:
+            name = self._function_names.get(function_id, f"<function at {function_id:#x}>")
+            profile = FunctionProfile(name)
+            self._functions[function_id] = profile
+
+        return profile
+
+
+def format_profile_report(report: ProfileReport, max_rows: Optional[int] = None) -> str:
+    """
+    Lay out the report as two tables, one for the opcodes and one for the functions.
+    """
+    total_seconds = report.total_seconds if report.total_seconds > 0.0 else 1.0
+
+    lines: list[str] = []
+    lines.append(f"{'opcode':<24}{'count':>12}{'seconds':>12}{'% time':>10}{'ns/op':>10}")
+    for opcode_profile in report.opcodes[:max_rows]:
+        percentage = 100.0 * opcode_profile.seconds / total_seconds
+        nanoseconds_per_op = 1.0e9 * opcode_profile.seconds / opcode_profile.count
+        lines.append(
+            f"{opcode_profile.name:<24}{opcode_profile.count:>12}{opcode_profile.seconds:>12.6f}"
+            f"{percentage:>10.1f}{nanoseconds_per_op:>10.0f}"
+        )
+
+    lines.append("")
+    lines.append(f"{'function':<24}{'calls':>12}{'instructions':>14}{'exclusive':>12}{'inclusive':>12}")
+    for function_profile in report.functions[:max_rows]:
+        lines.append(
+            f"{function_profile.name:<24}{function_profile.calls:>12}{function_profile.n_instructions:>14}"
+            f"{function_profile.exclusive_seconds:>12.6f}{function_profile.inclusive_seconds:>12.6f}"
+        )
+
+    return "\n".join(lines)
@@ -0,0 +1,124 @@
+"""
+This module contains the SamplingProfiler class, which finds out which monkey functions a
+program spends its time in, by looking at the VirtualMachine's stack of frames every so
+often while the program runs.
+
+Unlike the Profiler, the sampling profiler doesn't touch the execution loops at all, and
+works with every execution mode. It runs in a background thread, that wakes up once per
+interval and records the names of the functions of every frame, from the main program down
+to the function that is currently running. A function that shows up in many samples is
+one that the program spends a lot of time in.
+
+The samples are written out as collapsed stacks: one line per distinct stack, with the
+names of its functions joined by semicolons, followed by the number of samples that caught
+it. This is the format read by the standard flamegraph tools (`flamegraph.pl`, speedscope,
+inferno, and so on).
+
+The background thread can only run when the thread running the program lets go of the
+GIL; so the actual time between samples is at least `sys.getswitchinterval()`, no matter
+how short the requested interval is.
+
+Usage:
+    with SamplingProfiler(machine) as sampler:
+        run(machine, mode)
+
+    sampler.write_collapsed_stacks("program.folded")
+"""
+
+import collections
+import threading
+from pathlib import Path
+from types import TracebackType
+from typing import Optional
+
+from monkey.containers import FixedStackError
+from monkey.virtual_machine.profiler import function_names
+from monkey.virtual_machine.virtual_machine import VirtualMachine
+
+DEFAULT_SAMPLING_INTERVAL_SECONDS: float = 0.001
+
+# a stack of function names, from the main program to the function that is running
+Stack = tuple[str, ...]
+
+
+class SamplingProfiler:
+    def __init__(
+        self, vm: VirtualMachine, interval_seconds: float = DEFAULT_SAMPLING_INTERVAL_SECONDS
+    ) -> None:
+        if interval_seconds <= 0.0:
+            raise ValueError(f"The sampling interval must be positive; found {interval_seconds}")
+
+        self.vm = vm
+        self.interval_seconds = interval_seconds
+        self.samples: collections.Counter[Stack] = collections.Counter()
+
+        main_function = vm.frames[0].closure.function
+        self._function_names = function_names(main_function, vm.constants)
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise RuntimeError("The sampling profiler has already been started.")
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sample_until_stopped, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def take_sample(self) -> None:
+        stack = self.current_stack()
+        if stack is not None:
+            self.samples[stack] += 1
+
+    def current_stack(self) -> Optional[Stack]:
+        """
+        Return the names of the functions of every frame, or None if the frames changed
+        while they were being read.
+        """
+        frames = self.vm.frames
+        try:
+            functions = [frames[i_frame].closure.function for i_frame in range(frames.size())]
+        except FixedStackError:
+            # a frame was popped between reading the number of frames and reading the frame
+            return None
+
+        return tuple(self._function_name(function) for function in functions)
+
+    def collapsed_stacks(self) -> list[str]:
+        """
+        Return one line per distinct stack, in the collapsed stack format.
+        """
+        return [f"{';'.join(stack)} {count}" for (stack, count) in sorted(self.samples.items())]
+
+    def write_collapsed_stacks(self, output_filepath: Path | str) -> None:
+        with open(output_filepath, "w") as fout:
+            for line in self.collapsed_stacks():
+                fout.write(f"{line}\n")
+
+    def _sample_until_stopped(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            self.take_sample()
+
+    def _function_name(self, function: object) -> str:
+        return self._function_names.get(id(function), f"<function at {id(function):#x}>")
@@ -4,24 +4,31 @@ emitted by the compiler.
 """
 
 import dataclasses
+from typing import Optional
 
 import monkey.code as code
 import monkey.code.opcodes as opcodes
 import monkey.compiler as comp
 import monkey.object as objs
 
-from monkey.tokens import token_types
-from monkey.object.object_type import OBJECT_TYPE_DICT
 from monkey.object.monkey_builtins import BUILTINS_LIST
 
 from monkey.containers import FixedStack
+from monkey.containers import FixedStackError
 from monkey.virtual_machine.constants import DUMMY_MAIN_FUNCTION_NUMBER_OF_ARGUMENTS
 from monkey.virtual_machine.constants import DUMMY_MAIN_FUNCTION_NUMBER_OF_LOCALS
 from monkey.virtual_machine.constants import MAX_VM_STACK_SIZE
 from monkey.virtual_machine.constants import MAX_VM_GLOBALS_SIZE
 from monkey.virtual_machine.constants import MAX_VM_FRAME_SIZE
 from monkey.virtual_machine.custom_exceptions import VirtualMachineError
+from monkey.virtual_machine.execution_mode import ExecutionMode
+from monkey.virtual_machine.operand_stack import OperandStack
+from monkey.virtual_machine.operand_stack import VirtualMachineStack
+from monkey.virtual_machine.profiler import Profiler
 from monkey.virtual_machine.stack_frame import StackFrame
+import monkey.virtual_machine._operations as ops
+from monkey.virtual_machine._dispatch_table_run import run_dispatch_table
+from monkey.virtual_machine._predecoded_run import run_predecoded
 
 
 # When creating a closure, we also need to pass in the free variables associated
@@ -38,7 +45,7 @@ def dummy_free_variables_factory() -> list[objs.Object]:
 
 @dataclasses.dataclass
 class VirtualMachine:
-    def __init__(self, bytecode: comp.Bytecode) -> None:
+    def __init__(self, bytecode: comp.Bytecode, *, debug: bool = False) -> None:
         self.globals = FixedStack[objs.Object](MAX_VM_GLOBALS_SIZE)
         self.frames = FixedStack[StackFrame](MAX_VM_FRAME_SIZE)
         self.constants = bytecode.constants
@@ -51,7 +58,15 @@ class VirtualMachine:
         main_frame = StackFrame(main_closure, base_pointer=0)
         self.frames.push(main_frame)
 
-        self.stack = FixedStack[objs.Object](MAX_VM_STACK_SIZE, default_element_factory=objs.DefaultObject)
+        # in debug mode, the stack checks its bounds on every push, pop, and access
+        self.debug = debug
+        self.stack: VirtualMachineStack
+        if debug:
+            self.stack = FixedStack[objs.Object](
+                MAX_VM_STACK_SIZE, default_element_factory=objs.DefaultObject
+            )
+        else:
+            self.stack = OperandStack(MAX_VM_STACK_SIZE)
 
     @property
     def instructions(self) -> code.Instructions:
@@ -66,207 +81,350 @@ class VirtualMachine:
         self.frames.peek().instruction_pointer = other
 
 
-def run(vm: VirtualMachine) -> None:
-    while vm.instruction_pointer < len(vm.instructions) - 1:
-        vm.instruction_pointer += 1
-        opcode = code.extract_opcode(vm.instructions, vm.instruction_pointer)
-
-        match opcode:
-            case opcodes.OPCONSTANT:
-                vm.instruction_pointer += _push_opconstant(vm, vm.instruction_pointer)
-            case opcodes.OPADD:
-                _push_op_add(vm)
-            case opcodes.OPSUB:
-                _push_op_sub(vm)
-            case opcodes.OPMUL:
-                _push_op_mul(vm)
-            case opcodes.OPDIV:
-                _push_op_div(vm)
-            case opcodes.OPPOP:
-                vm.stack.pop()
-            case opcodes.OPTRUE:
-                vm.stack.push(objs.TRUE_BOOL_OBJ)
-            case opcodes.OPFALSE:
-                vm.stack.push(objs.FALSE_BOOL_OBJ)
-            case opcodes.OPEQUAL:
-                _push_op_equal(vm)
-            case opcodes.OPNOTEQUAL:
-                _push_op_notequal(vm)
-            case opcodes.OPGREATERTHAN:
-                _push_op_greaterthan(vm)
-            case opcodes.OPMINUS:
-                _push_op_minus(vm)
-            case opcodes.OPBANG:
-                _push_op_bang(vm)
-            case opcodes.OPJUMP:
-                vm.instruction_pointer = _new_position_after_jump(vm, vm.instruction_pointer)
-            case opcodes.OPJUMPWHENFALSE:
-                vm.instruction_pointer = _new_position_after_jump_when_false(vm, vm.instruction_pointer)
-            case opcodes.OPNULL:
-                vm.stack.push(objs.NULL_OBJ)
-            case opcodes.OPSETGLOBAL:
-                i_global = _global_identifier_index(vm.instructions, vm.instruction_pointer)
-                vm.instruction_pointer += opcodes.OPSETGLOBAL_WIDTH
-
-                # remember that a let statement first pushes something onto the stack, and then
-                # we assign it to a particular variable
-                value_to_bind = vm.stack.pop()
-
-                if i_global >= vm.globals.size():
-                    vm.globals.push(value_to_bind)
-                else:
-                    vm.globals[i_global] = value_to_bind
-            case opcodes.OPGETGLOBAL:
-                i_global = _global_identifier_index(vm.instructions, vm.instruction_pointer)
-                vm.instruction_pointer += opcodes.OPGETGLOBAL_WIDTH
-
-                # the identifier we want to reference could be anywhere in the globals stack, not
-                # just at the top; so we can't pop or anything
-                bound_value = vm.globals[i_global]
-                vm.stack.push(bound_value)
-            case opcodes.OPSETLOCAL:
-                i_local = _local_identifier_index(vm.instructions, vm.instruction_pointer)
-                vm.instruction_pointer += opcodes.OPSETLOCAL_WIDTH
-
-                current_frame = vm.frames.peek()
-                base_pointer = current_frame.base_pointer
-                local_pointer = base_pointer + i_local
-
-                vm.stack[local_pointer] = vm.stack.pop()
-            case opcodes.OPGETLOCAL:
-                i_local = _local_identifier_index(vm.instructions, vm.instruction_pointer)
-                vm.instruction_pointer += opcodes.OPGETLOCAL_WIDTH
-
-                current_frame = vm.frames.peek()
-                base_pointer = current_frame.base_pointer
-                local_pointer = base_pointer + i_local
-
-                object_to_push = vm.stack[local_pointer]
-                vm.stack.push(object_to_push)
-            case opcodes.OPGETBUILTIN:
-                i_builtin = _builtin_identifier_index(vm.instructions, vm.instruction_pointer)
-                vm.instruction_pointer += opcodes.OPGETBUILTIN_WIDTH
-
-                object_to_push = BUILTINS_LIST[i_builtin]
-                vm.stack.push(object_to_push)
-            case opcodes.OPGETFREE:
-                i_free = _free_identifier_index(vm.instructions, vm.instruction_pointer)
-                vm.instruction_pointer += opcodes.OPGETFREE_WIDTH
-
-                current_frame = vm.frames.peek()
-                free_object = current_frame.closure.free_variables[i_free]
-                vm.stack.push(free_object)
-            case opcodes.OPARRAY:
-                # the operand of the OPARRAY opcode is the number of elements in the array
-                n_elements = _number_of_array_elements(vm.instructions, vm.instruction_pointer)
-                vm.instruction_pointer += opcodes.OPARRAY_WIDTH
-
-                i_first_element = vm.stack.size() - n_elements
-                array = _build_array(vm, i_first_element, n_elements)
-
-                # we go back to the position of the first element
-                vm.stack.shrink_stack_pointer(n_elements)
-
-                vm.stack.push(array)
-            case opcodes.OPHASH:
-                # the operand of the OPHASH opcode is (twice) the number of elements in the hashmap
-                n_objects = _number_of_hash_objects(vm.instructions, vm.instruction_pointer)
-                vm.instruction_pointer += opcodes.OPHASH_WIDTH
-
-                i_first_element = vm.stack.size() - n_objects
-                hashmap = _build_hashmap(vm, i_first_element, n_objects)
-
-                # we go back to the position of the first element
-                vm.stack.shrink_stack_pointer(n_objects)
-
-                vm.stack.push(hashmap)
-            case opcodes.OPINDEX:
-                # when an index expression `container[inside]` is compiled, what happens is:
-                # - `container`` is compiled first
-                # - `inside` is compiled next (and is on top of the stack)
-                # - the `OPINDEX` instruction is pushed
-                inside = vm.stack.pop()
-                container = vm.stack.pop()
-
-                # can reuse functions from the interpreter
-                result = _evaluate_index_expression(container, inside)
-                vm.stack.push(result)
-            case opcodes.OPCALL:
-                n_arguments = _number_of_function_arguments(vm.instructions, vm.instruction_pointer)
-                vm.instruction_pointer += opcodes.OPCALL_WIDTH
-
-                # before calling a function, we put on the stack:
-                # - the compiled function object itself
-                # - *then* the arguments to that function
-                # so we need to take that into account when finding the function's location on the stack
-                function_pointer = vm.stack.size() - 1 - n_arguments
-                callable = vm.stack[function_pointer]
-
-                match callable:
-                    case objs.ClosureObject():
-                        _execute_closure_call(callable, vm, n_arguments, function_pointer)
-                    case objs.BuiltinObject():
-                        _execute_builtin_call(callable, vm, n_arguments)
-                    case _:
-                        raise VirtualMachineError("Attempted to call a non-function or non-builtin.")
-            case opcodes.OPRETURNVALUE:
-                # by the end of the function's body, the object we want should be on top of the stack
-                return_value = vm.stack.pop()
-
-                # go back to the parent frame
-                current_frame = vm.frames.pop()
-                n_locals = current_frame.closure.function.n_locals
-                n_arguments = current_frame.closure.function.n_arguments
-                vm.stack.shrink_stack_pointer(n_locals + n_arguments)
-
-                # the function we just went through should be right under the returned value; it was
-                # sitting there the whole time we moved through the function's body; we want it gone now
-                vm.stack.pop()
-
-                # this is replacing the compiled function with the return value we actually want
-                vm.stack.push(return_value)
-            case opcodes.OPRETURN:
-                # a function that ends with an `opcodes.OPRETURN` call doesn't put anything on the
-                # stack within its body; so we need to explicitly put NULL on the stack
-                current_frame = vm.frames.pop()
-                n_locals = current_frame.closure.function.n_locals
-                vm.stack.shrink_stack_pointer(n_locals)
-
-                # because nothing is returned, the function we just went through should be on top of the
-                # stack; no need to pop off, and then push back on, some kind of returned value
-                vm.stack.pop()
-
-                vm.stack.push(objs.NULL_OBJ)
-            case opcodes.OPCLOSURE:
-                function_position = _function_position_in_constants(vm.instructions, vm.instruction_pointer)
-                vm.instruction_pointer += opcodes.OPCLOSURE_ARG0_WIDTH
-
-                n_free_variables = _number_of_closure_free_variables(vm.instructions, vm.instruction_pointer)
-                vm.instruction_pointer += opcodes.OPCLOSURE_ARG1_WIDTH
-
-                function = vm.constants[function_position]
-                if not isinstance(function, objs.CompiledFunctionObject):
-                    raise VirtualMachineError(
-                        "Expected a compiled function object. Found object of type "
-                        f"'{OBJECT_TYPE_DICT[function.data_type()]}'"
+def run(
+    vm: VirtualMachine, mode: ExecutionMode = ExecutionMode.BYTECODE, *, profiler: Optional[Profiler] = None
+) -> None:
+    """
+    Run the bytecode of the VirtualMachine in the given execution mode.
+
+    A Profiler can only be attached when running in `ExecutionMode.DISPATCH_TABLE`, the only
+    loop with an instrumented copy; passing one with any other mode (including the default,
+    `ExecutionMode.BYTECODE`) raises a VirtualMachineError.
+    """
+    # only the original loop goes through the methods of the stack; the others index the
+    # list underneath an OperandStack directly
+    if vm.debug and mode != ExecutionMode.BYTECODE:
+        raise VirtualMachineError(f"A VirtualMachine in debug mode can only run in {ExecutionMode.BYTECODE}")
+
+    # the handlers of the dispatch table loop are where the time of each opcode is measured
+    if profiler is not None and mode != ExecutionMode.DISPATCH_TABLE:
+        raise VirtualMachineError(f"A VirtualMachine can only be profiled in {ExecutionMode.DISPATCH_TABLE}")
+
+    # every other frame is checked as it's entered; the locals of the main function are globals
+    ops.check_stack_space(vm.stack.size(), vm.frames.peek().closure.function.max_stack_depth)
+
+    try:
+        match mode:
+            case ExecutionMode.BYTECODE:
+                _run_bytecode(vm)
+            case ExecutionMode.PREDECODED:
+                run_predecoded(vm)
+            case ExecutionMode.DISPATCH_TABLE:
+                run_dispatch_table(vm, profiler)
+            case _:
+                raise VirtualMachineError(f"Unknown execution mode: {mode}")
+    except FixedStackError as error:
+        # the checked stacks: the frames, the globals, and the stack itself in debug mode
+        raise VirtualMachineError(str(error)) from error
+
+
+def _run_bytecode(vm: VirtualMachine) -> None:
+    stack = vm.stack
+    frames = vm.frames
+    constants = vm.constants
+
+    # the state of the current frame is kept in local variables, instead of being looked up
+    # through `vm.frames.peek()` at every step; it is only reloaded when a frame is entered
+    # or left, and the instruction pointer is written back to the frame before that happens
+    frame = frames.peek()
+    instructions = frame.instructions
+    instruction_pointer = frame.instruction_pointer
+    base_pointer = frame.base_pointer
+
+    try:
+        while instruction_pointer < len(instructions) - 1:
+            instruction_pointer += 1
+            opcode = code.extract_opcode(instructions, instruction_pointer)
+
+            match opcode:
+                case opcodes.OPCONSTANT:
+                    i_constant = _read_position(instructions, instruction_pointer, opcodes.OPCONSTANT_WIDTH)
+                    instruction_pointer += opcodes.OPCONSTANT_WIDTH
+
+                    stack.push(constants[i_constant])
+                case opcodes.OPADD:
+                    _push_op_add(vm)
+                case opcodes.OPSUB:
+                    _push_op_sub(vm)
+                case opcodes.OPMUL:
+                    _push_op_mul(vm)
+                case opcodes.OPDIV:
+                    _push_op_div(vm)
+                case opcodes.OPPOP:
+                    stack.pop()
+                case opcodes.OPTRUE:
+                    stack.push(objs.TRUE_BOOL_OBJ)
+                case opcodes.OPFALSE:
+                    stack.push(objs.FALSE_BOOL_OBJ)
+                case opcodes.OPEQUAL:
+                    _push_op_equal(vm)
+                case opcodes.OPNOTEQUAL:
+                    _push_op_notequal(vm)
+                case opcodes.OPGREATERTHAN:
+                    _push_op_greaterthan(vm)
+                case opcodes.OPMINUS:
+                    _push_op_minus(vm)
+                case opcodes.OPBANG:
+                    _push_op_bang(vm)
+                case opcodes.OPJUMP:
+                    instruction_pointer = _new_position_after_jump(instructions, instruction_pointer)
+                case opcodes.OPJUMPWHENFALSE:
+                    instruction_pointer = _new_position_after_jump_when_false(
+                        vm, instructions, instruction_pointer
+                    )
+                case opcodes.OPJUMPWHENTRUE:
+                    instruction_pointer = _new_position_after_jump_when_true(
+                        vm, instructions, instruction_pointer
+                    )
+                case opcodes.OPNULL:
+                    stack.push(objs.NULL_OBJ)
+                case opcodes.OPSETGLOBAL:
+                    i_global = _global_identifier_index(instructions, instruction_pointer)
+                    instruction_pointer += opcodes.OPSETGLOBAL_WIDTH
+
+                    # remember that a let statement first pushes something onto the stack, and then
+                    # we assign it to a particular variable
+                    value_to_bind = stack.pop()
+
+                    if i_global >= vm.globals.size():
+                        vm.globals.push(value_to_bind)
+                    else:
+                        vm.globals[i_global] = value_to_bind
+                case opcodes.OPGETGLOBAL:
+                    i_global = _global_identifier_index(instructions, instruction_pointer)
+                    instruction_pointer += opcodes.OPGETGLOBAL_WIDTH
+
+                    # the identifier we want to reference could be anywhere in the globals stack, not
+                    # just at the top; so we can't pop or anything
+                    bound_value = vm.globals[i_global]
+                    stack.push(bound_value)
+                case opcodes.OPSETLOCAL:
+                    i_local = _local_identifier_index(instructions, instruction_pointer)
+                    instruction_pointer += opcodes.OPSETLOCAL_WIDTH
+
+                    stack[base_pointer + i_local] = stack.pop()
+                case opcodes.OPGETLOCAL:
+                    i_local = _local_identifier_index(instructions, instruction_pointer)
+                    instruction_pointer += opcodes.OPGETLOCAL_WIDTH
+
+                    stack.push(stack[base_pointer + i_local])
+                case opcodes.OPGETBUILTIN:
+                    i_builtin = _builtin_identifier_index(instructions, instruction_pointer)
+                    instruction_pointer += opcodes.OPGETBUILTIN_WIDTH
+
+                    object_to_push = BUILTINS_LIST[i_builtin]
+                    stack.push(object_to_push)
+                case opcodes.OPGETFREE:
+                    i_free = _free_identifier_index(instructions, instruction_pointer)
+                    instruction_pointer += opcodes.OPGETFREE_WIDTH
+
+                    free_object = frame.closure.free_variables[i_free]
+                    stack.push(free_object)
+                case opcodes.OPARRAY:
+                    # the operand of the OPARRAY opcode is the number of elements in the array
+                    n_elements = _number_of_array_elements(instructions, instruction_pointer)
+                    instruction_pointer += opcodes.OPARRAY_WIDTH
+
+                    i_first_element = stack.size() - n_elements
+                    array = _build_array(vm, i_first_element, n_elements)
+
+                    # we go back to the position of the first element
+                    stack.shrink_stack_pointer(n_elements)
+
+                    stack.push(array)
+                case opcodes.OPHASH:
+                    # the operand of the OPHASH opcode is (twice) the number of elements in the hashmap
+                    n_objects = _number_of_hash_objects(instructions, instruction_pointer)
+                    instruction_pointer += opcodes.OPHASH_WIDTH
+
+                    i_first_element = stack.size() - n_objects
+                    hashmap = _build_hashmap(vm, i_first_element, n_objects)
+
+                    # we go back to the position of the first element
+                    stack.shrink_stack_pointer(n_objects)
+
+                    stack.push(hashmap)
+                case opcodes.OPINDEX:
+                    # when an index expression `container[inside]` is compiled, what happens is:
+                    # - `container`` is compiled first
+                    # - `inside` is compiled next (and is on top of the stack)
+                    # - the `OPINDEX` instruction is pushed
+                    inside = stack.pop()
+                    container = stack.pop()
+
+                    # can reuse functions from the interpreter
+                    result = ops.evaluate_index_expression(container, inside)
+                    stack.push(result)
+                case opcodes.OPCALL:
+                    n_arguments = _number_of_function_arguments(instructions, instruction_pointer)
+                    instruction_pointer += opcodes.OPCALL_WIDTH
+
+                    # before calling a function, we put on the stack:
+                    # - the compiled function object itself
+                    # - *then* the arguments to that function
+                    # so we need to take that into account when finding the function's location on the stack
+                    function_pointer = stack.size() - 1 - n_arguments
+                    callable = stack[function_pointer]
+
+                    match callable:
+                        case objs.ClosureObject():
+                            # remember where to come back to, before switching over to the new frame
+                            frame.instruction_pointer = instruction_pointer
+                            _execute_closure_call(callable, vm, n_arguments, function_pointer)
+
+                            frame = frames.peek()
+                            instructions = frame.instructions
+                            instruction_pointer = frame.instruction_pointer
+                            base_pointer = frame.base_pointer
+                        case objs.BuiltinObject():
+                            _execute_builtin_call(callable, vm, n_arguments)
+                        case _:
+                            raise VirtualMachineError("Attempted to call a non-function or non-builtin.")
+                case opcodes.OPTAILCALL:
+                    n_arguments = _number_of_function_arguments(instructions, instruction_pointer)
+                    instruction_pointer += opcodes.OPTAILCALL_WIDTH
+
+                    function_pointer = stack.size() - 1 - n_arguments
+                    callable = stack[function_pointer]
+
+                    match callable:
+                        case objs.ClosureObject():
+                            # the current frame now runs the called function from its start
+                            ops.enter_tail_call(stack, frame, callable, n_arguments)
+                        case objs.BuiltinObject():
+                            # a builtin doesn't need a frame; call it, and return its result right away
+                            _execute_builtin_call(callable, vm, n_arguments)
+                            _return_from_current_frame(vm, stack.pop())
+                        case _:
+                            raise VirtualMachineError("Attempted to call a non-function or non-builtin.")
+
+                    frame = frames.peek()
+                    instructions = frame.instructions
+                    instruction_pointer = frame.instruction_pointer
+                    base_pointer = frame.base_pointer
+                case opcodes.OPRETURNVALUE | opcodes.OPRETURN:
+                    # by the end of the function's body, the object we want should be on top of the
+                    # stack; a function that ends with an `opcodes.OPRETURN` doesn't put anything on
+                    # the stack within its body, so it returns NULL
+                    if opcode == opcodes.OPRETURNVALUE:
+                        return_value = stack.pop()
+                    else:
+                        return_value = objs.NULL_OBJ
+
+                    _return_from_current_frame(vm, return_value)
+
+                    frame = frames.peek()
+                    instructions = frame.instructions
+                    instruction_pointer = frame.instruction_pointer
+                    base_pointer = frame.base_pointer
+                case opcodes.OPCLOSURE:
+                    function_position = _function_position_in_constants(instructions, instruction_pointer)
+                    instruction_pointer += opcodes.OPCLOSURE_ARG0_WIDTH
+
+                    n_free_variables = _number_of_closure_free_variables(instructions, instruction_pointer)
+                    instruction_pointer += opcodes.OPCLOSURE_ARG1_WIDTH
+
+                    function = ops.check_compiled_function(constants[function_position])
+
+                    if n_free_variables != 0:
+                        i_free_start = stack.size() - n_free_variables
+                        i_free_end = stack.size()
+                        free_variables = stack[i_free_start:i_free_end]
+                        stack.shrink_stack_pointer(n_free_variables)
+                    else:
+                        free_variables = []
+
+                    closure = objs.ClosureObject(function, free_variables)
+                    stack.push(closure)
+                case opcodes.OPCURRENTCLOSURE:
+                    stack.push(frame.closure)
+                case opcodes.OPLOCALCONSTADD:
+                    operands, instruction_pointer = _read_superinstruction_operands(
+                        instructions,
+                        instruction_pointer,
+                        opcodes.OPLOCALCONSTADD_ARG0_WIDTH,
+                        opcodes.OPLOCALCONSTADD_ARG1_WIDTH,
+                    )
+                    i_local, i_constant = operands
+
+                    local_object = stack[base_pointer + i_local]
+                    stack.push(ops.add_objects(local_object, constants[i_constant]))
+                case opcodes.OPLOCALCONSTSUB:
+                    operands, instruction_pointer = _read_superinstruction_operands(
+                        instructions,
+                        instruction_pointer,
+                        opcodes.OPLOCALCONSTSUB_ARG0_WIDTH,
+                        opcodes.OPLOCALCONSTSUB_ARG1_WIDTH,
+                    )
+                    i_local, i_constant = operands
+
+                    local_object = stack[base_pointer + i_local]
+                    stack.push(ops.subtract_objects(local_object, constants[i_constant]))
+                case opcodes.OPLOCALLOCALGTJUMP:
+                    operands, instruction_pointer = _read_superinstruction_operands(
+                        instructions,
+                        instruction_pointer,
+                        opcodes.OPLOCALLOCALGTJUMP_ARG0_WIDTH,
+                        opcodes.OPLOCALLOCALGTJUMP_ARG1_WIDTH,
+                        opcodes.OPLOCALLOCALGTJUMP_ARG2_WIDTH,
+                    )
+                    i_left_local, i_right_local, jump_position = operands
+
+                    left_object = stack[base_pointer + i_left_local]
+                    right_object = stack[base_pointer + i_right_local]
+
+                    condition = ops.greaterthan_objects(left_object, right_object)
+                    if not objs.is_truthy(condition):
+                        instruction_pointer = jump_position - 1
+                case opcodes.OPCONSTLOCALGTJUMP:
+                    operands, instruction_pointer = _read_superinstruction_operands(
+                        instructions,
+                        instruction_pointer,
+                        opcodes.OPCONSTLOCALGTJUMP_ARG0_WIDTH,
+                        opcodes.OPCONSTLOCALGTJUMP_ARG1_WIDTH,
+                        opcodes.OPCONSTLOCALGTJUMP_ARG2_WIDTH,
                     )
+                    i_constant, i_local, jump_position = operands
+
+                    local_object = stack[base_pointer + i_local]
+
+                    condition = ops.greaterthan_objects(constants[i_constant], local_object)
+                    if not objs.is_truthy(condition):
+                        instruction_pointer = jump_position - 1
+                case opcodes.OPCONSTSETGLOBAL:
+                    operands, instruction_pointer = _read_superinstruction_operands(
+                        instructions,
+                        instruction_pointer,
+                        opcodes.OPCONSTSETGLOBAL_ARG0_WIDTH,
+                        opcodes.OPCONSTSETGLOBAL_ARG1_WIDTH,
+                    )
+                    i_constant, i_global = operands
 
-                if n_free_variables != 0:
-                    i_free_start = vm.stack.size() - n_free_variables
-                    i_free_end = vm.stack.size()
-                    free_variables = vm.stack[i_free_start:i_free_end]
-                    vm.stack.shrink_stack_pointer(n_free_variables)
-                else:
-                    free_variables = []
-
-                closure = objs.ClosureObject(function, free_variables)
-                vm.stack.push(closure)
-            case opcodes.OPCURRENTCLOSURE:
-                current_frame = vm.frames.peek()
-                current_closure = current_frame.closure
-                vm.stack.push(current_closure)
-            case _:
-                raise VirtualMachineError(f"Could not find a matching opcode: Found: {opcode!r}")
+                    value_to_bind = constants[i_constant]
+
+                    if i_global >= vm.globals.size():
+                        vm.globals.push(value_to_bind)
+                    else:
+                        vm.globals[i_global] = value_to_bind
+                case _:
+                    raise VirtualMachineError(f"Could not find a matching opcode: Found: {opcode!r}")
+    finally:
+        frame.instruction_pointer = instruction_pointer
+
+
+def _return_from_current_frame(vm: VirtualMachine, return_value: objs.Object) -> None:
+    # go back to the parent frame
+    current_frame = vm.frames.pop()
+    n_locals = current_frame.closure.function.n_locals
+    n_arguments = current_frame.closure.function.n_arguments
+    vm.stack.shrink_stack_pointer(n_locals + n_arguments)
+
+    # the function we just went through should be right under the returned value; it was
+    # sitting there the whole time we moved through the function's body; we want it gone now
+    vm.stack.pop()
+
+    # this is replacing the compiled function with the return value we actually want
+    vm.stack.push(return_value)
 
 
 def _execute_builtin_call(
@@ -287,25 +445,14 @@ def _execute_builtin_call(
     n_objects_to_remove = n_arguments + 1
     vm.stack.shrink_stack_pointer(n_objects_to_remove)
 
-    result = function.func(*arguments)
-    if objs.is_error_object(result):
-        raise VirtualMachineError(
-            f"Error when executing builtin function `{function.name}:`\n" f"{str(result)}"
-        )
-    else:
-        vm.stack.push(result)
+    result = ops.call_builtin(function, arguments)
+    vm.stack.push(result)
 
 
 def _execute_closure_call(
     closure: objs.ClosureObject, vm: VirtualMachine, n_arguments: int, function_pointer: int
 ) -> None:
-    if not n_arguments == closure.function.n_arguments:
-        raise VirtualMachineError(
-            "The number of arguments passed into the function doesn't match the\n"
-            "number of function parameters.\n"
-            f"Number of passed arguments: {n_arguments}\n"
-            f"Number of parameters the function accepts: {closure.function.n_arguments}"
-        )
+    ops.check_number_of_arguments(closure, n_arguments)
 
     # we want to return to just after the function (which we will then pop off the
     # stack using OPRETURNVALUE or OPRETURN)
@@ -316,80 +463,14 @@ def _execute_closure_call(
 
     # reserve `n_locals` entries on the stack for the function's local parameters
     # note that the function's arguments are already on the stack, on top of it
+    ops.check_frame_space(vm.stack.size(), closure.function)
     vm.stack.advance_stack_pointer(closure.function.n_locals)
 
 
-def _evaluate_index_expression(container: objs.Object, inside: objs.Object) -> objs.Object:
-    if isinstance(container, objs.ArrayObject) and isinstance(inside, objs.IntegerObject):
-        return _evaluate_array_index_expression(container, inside)
-    if isinstance(container, objs.StringObject) and isinstance(inside, objs.IntegerObject):
-        return _evaluate_string_index_expression(container, inside)
-    if isinstance(container, objs.HashObject):
-        return _evaluate_hash_index_expression(container, inside)
-    else:
-        container_str = OBJECT_TYPE_DICT[container.data_type()]
-        inside_str = OBJECT_TYPE_DICT[inside.data_type()]
-        raise VirtualMachineError(
-            "Indexing operation not supported by the compiler.\n"
-            f"container type: {container_str}\n"
-            f"inside type: {inside_str}\n"
-        )
-
-
-def _evaluate_array_index_expression(array: objs.ArrayObject, index: objs.IntegerObject) -> objs.Object:
-    arr_index: int = index.value
-    max_allowed: int = len(array.elements) - 1
-
-    if arr_index < 0 or arr_index > max_allowed:
-        raise VirtualMachineError(
-            "Indexing array out of bounds.\n" f"Array length: {len(array.elements)}\n" f"Index: {index}"
-        )
-
-    return array.elements[arr_index]
-
-
-def _evaluate_string_index_expression(string: objs.StringObject, index: objs.IntegerObject) -> objs.Object:
-    str_index: int = index.value
-    max_allowed: int = len(string.value) - 1
-
-    if str_index < 0 or str_index > max_allowed:
-        raise VirtualMachineError(
-            "Indexing string out of bounds.\n" f"String length: {len(string.value)}\n" f"Index: {index}"
-        )
-
-    return objs.StringObject(string.value[str_index])
-
-
-def _evaluate_hash_index_expression(hashmap: objs.HashObject, key: objs.Object) -> objs.Object:
-    hashed_key = objs.create_object_hash(key)
-    if hashed_key.data_type == objs.ObjectType.ERROR:
-        key_str = OBJECT_TYPE_DICT[key.data_type()]
-        raise VirtualMachineError("Found an unhashable type as a key in a hashmap.\n" f"key type: {key_str}")
-
-    pair = hashmap.pairs.get(hashed_key, None)
-    if pair is None:
-        raise VirtualMachineError(f"Key {key} not found in a hash map.")
-    else:
-        return pair.value
-
-
 def _build_hashmap(vm: VirtualMachine, i_start: int, n_objects: int) -> objs.HashObject:
-    hashmap: dict[objs.ObjectHash, objs.HashKeyValuePair] = {}
-
-    # the keys and values come in consecutive pairs, and each counts as an object, so we need
-    # to move forward in pairs
-    for i in range(0, n_objects, 2):
-        key_position = i + i_start
-        value_position = i + i_start + 1
-        key = vm.stack[key_position]
-        value = vm.stack[value_position]
+    keys_and_values = [vm.stack[i + i_start] for i in range(n_objects)]
 
-        hashvalue = objs.create_object_hash(key)
-        pair = objs.HashKeyValuePair(key, value)
-
-        hashmap[hashvalue] = pair
-
-    return objs.HashObject(hashmap)
+    return ops.build_hashmap(keys_and_values)
 
 
 def _number_of_hash_objects(instructions: code.Instructions, instr_ptr: int) -> int:
@@ -403,7 +484,7 @@ def _number_of_hash_objects(instructions: code.Instructions, instr_ptr: int) ->
 def _build_array(vm: VirtualMachine, i_start: int, n_elements: int) -> objs.ArrayObject:
     elements: list[objs.Object] = [vm.stack[i + i_start] for i in range(n_elements)]
 
-    return objs.ArrayObject(elements)
+    return ops.build_array(elements)
 
 
 def _number_of_array_elements(instructions: code.Instructions, instr_ptr: int) -> int:
@@ -430,8 +511,8 @@ def _free_identifier_index(instructions: code.Instructions, instr_ptr: int) -> i
     return _read_position(instructions, instr_ptr, opcodes.OPGETFREE_WIDTH)
 
 
-def _new_position_after_jump(vm: VirtualMachine, instr_ptr: int) -> int:
-    jump_position = _read_position(vm.instructions, instr_ptr, opcodes.OPJUMP_WIDTH)
+def _new_position_after_jump(instructions: code.Instructions, instr_ptr: int) -> int:
+    jump_position = _read_position(instructions, instr_ptr, opcodes.OPJUMP_WIDTH)
     return jump_position - 1
 
 
@@ -447,11 +528,13 @@ def _number_of_closure_free_variables(instructions: code.Instructions, instr_ptr
     return _read_position(instructions, instr_ptr, opcodes.OPCLOSURE_ARG1_WIDTH)
 
 
-def _new_position_after_jump_when_false(vm: VirtualMachine, instr_ptr: int) -> int:
+def _new_position_after_jump_when_false(
+    vm: VirtualMachine, instructions: code.Instructions, instr_ptr: int
+) -> int:
     condition = vm.stack.pop()
 
     if not objs.is_truthy(condition):
-        jump_position = _read_position(vm.instructions, instr_ptr, opcodes.OPJUMPWHENFALSE_WIDTH)
+        jump_position = _read_position(instructions, instr_ptr, opcodes.OPJUMPWHENFALSE_WIDTH)
         new_instr_ptr = jump_position - 1
     else:
         new_instr_ptr = instr_ptr + opcodes.OPJUMPWHENFALSE_WIDTH
@@ -459,162 +542,92 @@ def _new_position_after_jump_when_false(vm: VirtualMachine, instr_ptr: int) -> i
     return new_instr_ptr
 
 
+def _new_position_after_jump_when_true(
+    vm: VirtualMachine, instructions: code.Instructions, instr_ptr: int
+) -> int:
+    condition = vm.stack.pop()
+
+    if objs.is_truthy(condition):
+        jump_position = _read_position(instructions, instr_ptr, opcodes.OPJUMPWHENTRUE_WIDTH)
+        new_instr_ptr = jump_position - 1
+    else:
+        new_instr_ptr = instr_ptr + opcodes.OPJUMPWHENTRUE_WIDTH
+
+    return new_instr_ptr
+
+
 def _push_op_add(vm: VirtualMachine) -> None:
     right_object = vm.stack.pop()
     left_object = vm.stack.pop()
 
-    match (left_object, right_object):
-        case (objs.IntegerObject(), objs.IntegerObject()):
-            left_value = left_object.value
-            right_value = right_object.value
-            result = left_value + right_value
-            integer = objs.IntegerObject(result)
-            vm.stack.push(integer)
-        case (objs.StringObject(), objs.StringObject()):
-            left_value = left_object.value
-            right_value = right_object.value
-            result = left_value + right_value
-            integer = objs.StringObject(result)
-            vm.stack.push(integer)
-        case _:
-            err_msg = _invalid_infix_operation_error(token_types.PLUS, left_object, right_object)
-            raise VirtualMachineError(err_msg)
+    vm.stack.push(ops.add_objects(left_object, right_object))
 
 
 def _push_op_sub(vm: VirtualMachine) -> None:
     right_object = vm.stack.pop()
     left_object = vm.stack.pop()
 
-    match (left_object, right_object):
-        case (objs.IntegerObject(), objs.IntegerObject()):
-            left_value = left_object.value
-            right_value = right_object.value
-            result = left_value - right_value
-            integer = objs.IntegerObject(result)
-            vm.stack.push(integer)
-        case _:
-            err_msg = _invalid_infix_operation_error(token_types.MINUS, left_object, right_object)
-            raise VirtualMachineError(err_msg)
+    vm.stack.push(ops.subtract_objects(left_object, right_object))
 
 
 def _push_op_mul(vm: VirtualMachine) -> None:
     right_object = vm.stack.pop()
     left_object = vm.stack.pop()
 
-    match (left_object, right_object):
-        case (objs.IntegerObject(), objs.IntegerObject()):
-            left_value = left_object.value
-            right_value = right_object.value
-            result = left_value * right_value
-            integer = objs.IntegerObject(result)
-            vm.stack.push(integer)
-        case _:
-            err_msg = _invalid_infix_operation_error(token_types.ASTERISK, left_object, right_object)
-            raise VirtualMachineError(err_msg)
+    vm.stack.push(ops.multiply_objects(left_object, right_object))
 
 
 def _push_op_div(vm: VirtualMachine) -> None:
     right_object = vm.stack.pop()
     left_object = vm.stack.pop()
 
-    match (left_object, right_object):
-        case (objs.IntegerObject(), objs.IntegerObject()):
-            left_value = left_object.value
-            right_value = right_object.value
-            result = left_value // right_value
-            integer = objs.IntegerObject(result)
-            vm.stack.push(integer)
-        case _:
-            err_msg = _invalid_infix_operation_error(token_types.SLASH, left_object, right_object)
-            raise VirtualMachineError(err_msg)
+    vm.stack.push(ops.divide_objects(left_object, right_object))
 
 
 def _push_op_equal(vm: VirtualMachine) -> None:
     right_object = vm.stack.pop()
     left_object = vm.stack.pop()
 
-    match (left_object, right_object):
-        case (objs.IntegerObject(), objs.IntegerObject()) | (objs.BooleanObject(), objs.BooleanObject()):
-            left_value = left_object.value
-            right_value = right_object.value
-            if left_value == right_value:
-                vm.stack.push(objs.TRUE_BOOL_OBJ)
-            else:
-                vm.stack.push(objs.FALSE_BOOL_OBJ)
-        case _:
-            err_msg = _invalid_infix_operation_error(token_types.EQ, left_object, right_object)
-            raise VirtualMachineError(err_msg)
+    vm.stack.push(ops.equal_objects(left_object, right_object))
 
 
 def _push_op_notequal(vm: VirtualMachine) -> None:
     right_object = vm.stack.pop()
     left_object = vm.stack.pop()
 
-    match (left_object, right_object):
-        case (objs.IntegerObject(), objs.IntegerObject()) | (objs.BooleanObject(), objs.BooleanObject()):
-            left_value = left_object.value
-            right_value = right_object.value
-            if left_value != right_value:
-                vm.stack.push(objs.TRUE_BOOL_OBJ)
-            else:
-                vm.stack.push(objs.FALSE_BOOL_OBJ)
-        case _:
-            err_msg = _invalid_infix_operation_error(token_types.NOT_EQ, left_object, right_object)
-            raise VirtualMachineError(err_msg)
+    vm.stack.push(ops.notequal_objects(left_object, right_object))
 
 
 def _push_op_greaterthan(vm: VirtualMachine) -> None:
     right_object = vm.stack.pop()
     left_object = vm.stack.pop()
 
-    match (left_object, right_object):
-        case (objs.IntegerObject(), objs.IntegerObject()):
-            left_value = left_object.value
-            right_value = right_object.value
-            if left_value > right_value:
-                vm.stack.push(objs.TRUE_BOOL_OBJ)
-            else:
-                vm.stack.push(objs.FALSE_BOOL_OBJ)
-        case _:
-            err_msg = _invalid_infix_operation_error(token_types.GT, left_object, right_object)
-            raise VirtualMachineError(err_msg)
-
-
-def _push_opconstant(vm: VirtualMachine, instr_ptr: int) -> int:
-    position = _read_position(vm.instructions, instr_ptr, opcodes.OPCONSTANT_WIDTH)
-    constant = vm.constants[position]
-    vm.stack.push(constant)
-
-    return opcodes.OPCONSTANT_WIDTH
+    vm.stack.push(ops.greaterthan_objects(left_object, right_object))
 
 
 def _push_op_minus(vm: VirtualMachine) -> None:
     argument = vm.stack.pop()
 
-    match argument:
-        case objs.IntegerObject():
-            value = argument.value
-            integer = objs.IntegerObject(-value)
-            vm.stack.push(integer)
-        case _:
-            err_msg = _invalid_prefix_operation_error(token_types.MINUS, argument)
-            raise VirtualMachineError(err_msg)
+    vm.stack.push(ops.negate_object(argument))
 
 
 def _push_op_bang(vm: VirtualMachine) -> None:
     argument = vm.stack.pop()
 
-    match argument:
-        case objs.BooleanObject():
-            value = argument.value
-            if value:
-                vm.stack.push(objs.FALSE_BOOL_OBJ)
-            else:
-                vm.stack.push(objs.TRUE_BOOL_OBJ)
-        case objs.NULL_OBJ:
-            vm.stack.push(objs.TRUE_BOOL_OBJ)
-        case _:
-            vm.stack.push(objs.FALSE_BOOL_OBJ)
+    vm.stack.push(ops.bang_object(argument))
+
+
+def _read_superinstruction_operands(
+    instructions: code.Instructions, instr_ptr: int, *operand_widths: int
+) -> tuple[list[int], int]:
+    # a superinstruction has several operands; read them in order, moving the instruction
+    # pointer past each one, and return the operands along with the moved instruction pointer
+    operands: list[int] = []
+    for width in operand_widths:
+        operands.append(_read_position(instructions, instr_ptr, width))
+        instr_ptr += width
+
+    return operands, instr_ptr
 
 
 def _read_position(instructions: code.Instructions, instr_ptr: int, operand_width: int) -> int:
@@ -622,18 +635,3 @@ def _read_position(instructions: code.Instructions, instr_ptr: int, operand_widt
     end_ptr = begin_ptr + operand_width
     position_bytes = instructions[begin_ptr:end_ptr]
     return int.from_bytes(position_bytes, byteorder="big", signed=False)
-
-
-def _invalid_infix_operation_error(operation: str, left_obj: objs.Object, right_obj: objs.Object) -> str:
-    left_str = OBJECT_TYPE_DICT[left_obj.data_type()]
-    right_str = OBJECT_TYPE_DICT[right_obj.data_type()]
-    message = f"Unable to perform infix '{operation}' on objects of type '{left_str}' and '{right_str}'"
-
-    return message
-
-
-def _invalid_prefix_operation_error(operation: str, argument: objs.Object) -> str:
-    argument_str = OBJECT_TYPE_DICT[argument.data_type()]
-    message = f"Unable to perform prefix operation '{operation}' on object of type '{argument_str}'"
-
-    return message
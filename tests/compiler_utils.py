@@ -21,6 +21,17 @@ import monkey.object as objs
 from monkey.compiler import bytecode_from_compiler
 from monkey.compiler import Compiler
 from monkey.compiler import compile
+from monkey.compiler import CompilerOptions
+
+# the expected instructions in the tests spell out exactly what the compiler emits for each
+# node, so the optional passes that rewrite those instructions are turned off by default
+UNOPTIMIZED_OPTIONS = CompilerOptions(
+    use_constant_folding=False,
+    use_constant_interning=False,
+    use_peephole=False,
+    use_tail_calls=False,
+    use_superinstructions=False,
+)
 
 
 class CompilerTestCase:
@@ -41,7 +52,7 @@ class CompilerTestCaseResult:
     error_msg: Optional[str] = None
 
 
-def perform_compiler_test_case(case: CompilerTestCase):
+def perform_compiler_test_case(case: CompilerTestCase, options: CompilerOptions = UNOPTIMIZED_OPTIONS):
     """
     Assert that the input text in the case, when compiled, produces the expected
     bytecode instructions and constants.
@@ -55,7 +66,7 @@ def perform_compiler_test_case(case: CompilerTestCase):
     be better organized.
     """
     program = parse(case.input_text)
-    compiler = Compiler()
+    compiler = Compiler(options)
 
     compile(compiler, program)
     bytecode = bytecode_from_compiler(compiler)
@@ -67,7 +78,7 @@ def perform_compiler_test_case(case: CompilerTestCase):
         total_output = ""
         if instructions_result.error_msg is not None:
             total_output += f"{instructions_result.error_msg}\n"
-        if instructions_result.error_msg is not None:
+        if constants_result.error_msg is not None:
             total_output += f"{constants_result.error_msg}\n"
 
         pytest.fail(total_output)
@@ -148,6 +148,20 @@ class TestBuiltin_push:
         assert not program.has_errors()
         assert evaluate(program, env) == expected_object
 
+    @pytest.mark.parametrize(
+        "monkey_code, expected_integers",
+        [
+            ("let x = [1, 2]; let y = push(x, 3); x;", [1, 2]),
+            ("let x = [1, 2]; let y = push(push(x, 3), 4); let z = push(x, 5); y;", [1, 2, 3, 4]),
+            ("let x = push(push([1], 2), 3); let y = rest(x); let z = pop(x); x;", [1, 2, 3]),
+        ],
+    )
+    def test_push_leaves_original_unchanged(self, monkey_code, expected_integers):
+        program, env = program_and_env(monkey_code)
+
+        assert not program.has_errors()
+        assert evaluate(program, env) == make_integer_array(expected_integers)
+
     @pytest.mark.parametrize("monkey_code", ["push();", "push([1, 2]);", "push([1], 2, 3);"])
     def test_push_invalid_number_of_elements(self, monkey_code):
         program, env = program_and_env(monkey_code)
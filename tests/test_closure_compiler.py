@@ -0,0 +1,53 @@
+import pytest
+
+from monkey.evaluator import compile_to_closures
+from monkey.evaluator import evaluate
+import monkey.object as objs
+
+from utils_for_tests import DIFFERENTIAL_PROGRAMS
+from utils_for_tests import program_and_env
+
+
+@pytest.mark.parametrize("monkey_code", DIFFERENTIAL_PROGRAMS)
+def test_closures_agree_with_evaluate(monkey_code):
+    program, env = program_and_env(monkey_code)
+    assert not program.has_errors()
+
+    expected = evaluate(program, env)
+    actual = compile_to_closures(program)(objs.Environment())
+
+    assert actual == expected
+    assert actual.inspect() == expected.inspect()
+
+
+def test_compiled_program_runs_more_than_once():
+    monkey_code = "let count = fn(n) { if (n == 0) { 0 } else { 1 + count(n - 1) } }; count(50);"
+    program, _ = program_and_env(monkey_code)
+    code = compile_to_closures(program)
+
+    assert code(objs.Environment()) == objs.IntegerObject(50)
+    assert code(objs.Environment()) == objs.IntegerObject(50)
+
+
+def test_functions_are_shared_with_evaluate():
+    # the environment is kept between the programs, like in the REPL
+    env = objs.Environment()
+
+    compiled_definition, _ = program_and_env("let square = fn(x) { x * x };")
+    compile_to_closures(compiled_definition)(env)
+    evaluated_definition, _ = program_and_env("let cube = fn(x) { x * square(x) };")
+    evaluate(evaluated_definition, env)
+
+    program, _ = program_and_env("square(3) + cube(2);")
+
+    assert compile_to_closures(program)(env) == objs.IntegerObject(17)
+    assert evaluate(program, env) == objs.IntegerObject(17)
+
+
+def test_too_few_arguments_fails_like_evaluate():
+    program, env = program_and_env("let f = fn(x, y) { x }; f(1);")
+
+    with pytest.raises(IndexError):
+        evaluate(program, env)
+    with pytest.raises(IndexError):
+        compile_to_closures(program)(objs.Environment())
@@ -0,0 +1,120 @@
+import os
+
+import pytest
+
+import monkey.compiler as comp
+
+from monkey.serialize import CompileCache
+from monkey.serialize.compile_cache import cache_key
+
+import compiler_utils
+
+
+def compile_source(source: str, options: comp.CompilerOptions) -> comp.Bytecode:
+    compiler = comp.Compiler(options)
+    comp.compile(compiler, compiler_utils.parse(source))
+    return comp.bytecode_from_compiler(compiler)
+
+
+def set_last_use(cache: CompileCache, source: str, options: comp.CompilerOptions, time_ns: int) -> None:
+    os.utime(cache.entry_path(source, options), ns=(time_ns, time_ns))
+
+
+SOURCE = "let add = fn(a, b) { a + b }; add(1, 2);"
+OPTIONS = comp.CompilerOptions()
+
+
+class TestCompileCache:
+    def test_miss_then_hit(self, tmp_path):
+        cache = CompileCache(tmp_path / "cache")
+        bytecode = compile_source(SOURCE, OPTIONS)
+
+        assert cache.get(SOURCE, OPTIONS) is None
+
+        cache.put(SOURCE, OPTIONS, bytecode)
+        cached = cache.get(SOURCE, OPTIONS)
+
+        assert cached is not None
+        assert cached.instructions == bytecode.instructions
+        assert cached.constants == bytecode.constants
+
+    def test_key_depends_on_source_and_options(self):
+        superinstruction_options = comp.CompilerOptions(use_superinstructions=True)
+
+        assert cache_key(SOURCE, OPTIONS) == cache_key(SOURCE, comp.CompilerOptions())
+        assert cache_key(SOURCE, OPTIONS) != cache_key(SOURCE + " ", OPTIONS)
+        assert cache_key(SOURCE, OPTIONS) != cache_key(SOURCE, superinstruction_options)
+
+    def test_key_depends_on_compiler_version(self, monkeypatch):
+        key = cache_key(SOURCE, OPTIONS)
+        monkeypatch.setattr("monkey.serialize.compile_cache.COMPILER_VERSION", -1)
+
+        assert cache_key(SOURCE, OPTIONS) != key
+
+    def test_invalidate(self, tmp_path):
+        cache = CompileCache(tmp_path)
+        cache.put(SOURCE, OPTIONS, compile_source(SOURCE, OPTIONS))
+
+        assert cache.invalidate(SOURCE, OPTIONS)
+        assert not cache.invalidate(SOURCE, OPTIONS)
+        assert cache.get(SOURCE, OPTIONS) is None
+
+    def test_clear(self, tmp_path):
+        cache = CompileCache(tmp_path)
+        sources = ["1;", "2;", "3;"]
+        for source in sources:
+            cache.put(source, OPTIONS, compile_source(source, OPTIONS))
+
+        assert cache.clear() == len(sources)
+        assert cache.size_bytes() == 0
+        assert all(cache.get(source, OPTIONS) is None for source in sources)
+
+    def test_damaged_entry_is_dropped(self, tmp_path):
+        cache = CompileCache(tmp_path)
+        cache.put(SOURCE, OPTIONS, compile_source(SOURCE, OPTIONS))
+        cache.entry_path(SOURCE, OPTIONS).write_bytes(b"not bytecode")
+
+        assert cache.get(SOURCE, OPTIONS) is None
+        assert not cache.entry_path(SOURCE, OPTIONS).exists()
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        cache = CompileCache(tmp_path)
+        sources = ['"first";', '"second";', '"third";']
+        for i_source, source in enumerate(sources):
+            cache.put(source, OPTIONS, compile_source(source, OPTIONS))
+            set_last_use(cache, source, OPTIONS, 10**9 * (i_source + 1))
+
+        # the first entry is used again, so the second is now the least recently used
+        assert cache.get(sources[0], OPTIONS) is not None
+
+        entry_size = cache.entry_path(sources[1], OPTIONS).stat().st_size
+        assert cache.evict(cache.size_bytes() - entry_size) == 1
+
+        assert cache.get(sources[0], OPTIONS) is not None
+        assert cache.get(sources[1], OPTIONS) is None
+        assert cache.get(sources[2], OPTIONS) is not None
+
+    def test_put_keeps_cache_within_its_size(self, tmp_path):
+        # every one of these programs compiles to an entry of the same size
+        probe_cache = CompileCache(tmp_path / "probe_cache")
+        probe_cache.put("1;", OPTIONS, compile_source("1;", OPTIONS))
+        entry_size = probe_cache.size_bytes()
+
+        cache = CompileCache(tmp_path / "cache", max_size_bytes=3 * entry_size)
+        for i_source in range(10):
+            source = f"{i_source};"
+            cache.put(source, OPTIONS, compile_source(source, OPTIONS))
+
+        assert cache.size_bytes() <= 3 * entry_size
+        assert cache.get("9;", OPTIONS) is not None
+
+    def test_empty_cache(self, tmp_path):
+        cache = CompileCache(tmp_path / "missing")
+
+        assert cache.size_bytes() == 0
+        assert cache.evict() == 0
+        assert cache.clear() == 0
+
+    def test_negative_size_raises(self, tmp_path):
+        with pytest.raises(ValueError):
+            CompileCache(tmp_path, max_size_bytes=-1)
@@ -1,6 +1,7 @@
 import pytest
 
 from monkey.compiler import Compiler
+from monkey.compiler import CompilationError
 from monkey.compiler import compile
 from monkey.compiler import EmittedInstruction
 
@@ -1612,6 +1613,147 @@ class TestCompiler:
     def test_recursive_closure(self, case: CompilerTestCase):
         perform_compiler_test_case(case)
 
+    @pytest.mark.parametrize(
+        "case",
+        [
+            CompilerTestCase(
+                "while (true) { 10; }; 3333;",
+                (10, 3333),
+                [
+                    # 0000 [the condition; the backward jump lands here]
+                    (op.OPTRUE, ()),
+                    # 0001 [leave the loop if false]
+                    (op.OPJUMPWHENFALSE, (11,)),
+                    # 0004 [the body]
+                    (op.OPCONSTANT, (0,)),
+                    # 0007 [the body's expression statement pops its own value]
+                    (op.OPPOP, ()),
+                    # 0008 [jump back to the condition]
+                    (op.OPJUMP, (0,)),
+                    # 0011 [the value of the loop]
+                    (op.OPNULL, ()),
+                    # 0012 [pop the value of the loop]
+                    (op.OPPOP, ()),
+                    # 0013 [holds the 3333]
+                    (op.OPCONSTANT, (1,)),
+                    # 0016 [pop the 3333]
+                    (op.OPPOP, ()),
+                ],
+            ),
+            CompilerTestCase(
+                "let x = 1; while (x) { x = 2; };",
+                (1, 2),
+                [
+                    # 0000
+                    (op.OPCONSTANT, (0,)),
+                    # 0003
+                    (op.OPSETGLOBAL, (0,)),
+                    # 0006
+                    (op.OPGETGLOBAL, (0,)),
+                    # 0009
+                    (op.OPJUMPWHENFALSE, (21,)),
+                    # 0012
+                    (op.OPCONSTANT, (1,)),
+                    # 0015
+                    (op.OPSETGLOBAL, (0,)),
+                    # 0018
+                    (op.OPJUMP, (6,)),
+                    # 0021
+                    (op.OPNULL, ()),
+                    # 0022
+                    (op.OPPOP, ()),
+                ],
+            ),
+        ],
+    )
+    def test_while_expressions(self, case: CompilerTestCase):
+        perform_compiler_test_case(case)
+
+    @pytest.mark.parametrize(
+        "case",
+        [
+            CompilerTestCase(
+                "let x = 1; x = 2;",
+                (1, 2),
+                [
+                    (op.OPCONSTANT, (0,)),
+                    (op.OPSETGLOBAL, (0,)),
+                    (op.OPCONSTANT, (1,)),
+                    (op.OPSETGLOBAL, (0,)),
+                ],
+            ),
+            CompilerTestCase(
+                "fn(a) { a = a + 1; a };",
+                (
+                    1,
+                    (
+                        code.make_instructions_from_opcode_operand_pairs(
+                            [
+                                (op.OPGETLOCAL, (0,)),
+                                (op.OPCONSTANT, (0,)),
+                                (op.OPADD, ()),
+                                (op.OPSETLOCAL, (0,)),
+                                (op.OPGETLOCAL, (0,)),
+                                (op.OPRETURNVALUE, ()),
+                            ]
+                        ),
+                        0,
+                        1,
+                    ),
+                ),
+                [
+                    (op.OPCLOSURE, (1, 0)),
+                    (op.OPPOP, ()),
+                ],
+            ),
+        ],
+    )
+    def test_assign_statements(self, case: CompilerTestCase):
+        perform_compiler_test_case(case)
+
+    def test_if_branch_without_a_value(self):
+        case = CompilerTestCase(
+            "let x = 1; if (true) { x = 2; };",
+            (1, 2),
+            [
+                # 0000
+                (op.OPCONSTANT, (0,)),
+                # 0003
+                (op.OPSETGLOBAL, (0,)),
+                # 0006
+                (op.OPTRUE, ()),
+                # 0007 [skip to the NULL if false]
+                (op.OPJUMPWHENFALSE, (20,)),
+                # 0010
+                (op.OPCONSTANT, (1,)),
+                # 0013
+                (op.OPSETGLOBAL, (0,)),
+                # 0016 [an assignment has no value; the branch evaluates to NULL]
+                (op.OPNULL, ()),
+                # 0017
+                (op.OPJUMP, (21,)),
+                # 0020
+                (op.OPNULL, ()),
+                # 0021
+                (op.OPPOP, ()),
+            ],
+        )
+        perform_compiler_test_case(case)
+
+    @pytest.mark.parametrize(
+        "input_text",
+        [
+            "x = 1;",
+            "len = 1;",
+            "let f = fn() { f = 1; };",
+            "fn(a) { fn() { a = 1; } };",
+        ],
+    )
+    def test_invalid_assignment_raises(self, input_text: str):
+        compiler = Compiler()
+        with pytest.raises(CompilationError):
+            compile(compiler, parse(input_text))
+
 
 # NOTE TO DEV: the number of locals in a function is the unique number of variables
 # that are defined in the function's body; not every constant gets a binding, so the
@@ -0,0 +1,115 @@
+import pytest
+
+from monkey.compiler import CompilerOptions
+
+import monkey.code as code
+import monkey.code.opcodes as op
+
+from compiler_utils import CompilerTestCase
+from compiler_utils import perform_compiler_test_case
+
+FOLDING_OPTIONS = CompilerOptions(use_constant_folding=True, use_peephole=False, use_superinstructions=False)
+
+
+class TestConstantFolding:
+    @pytest.mark.parametrize(
+        "case",
+        [
+            CompilerTestCase("2 * 60 * 60 * 1000;", (7200000,), [(op.OPCONSTANT, (0,)), (op.OPPOP, ())]),
+            CompilerTestCase("1 - 2;", (-1,), [(op.OPCONSTANT, (0,)), (op.OPPOP, ())]),
+            CompilerTestCase("-(3 + 4);", (-7,), [(op.OPCONSTANT, (0,)), (op.OPPOP, ())]),
+            CompilerTestCase("7 / 2;", (3,), [(op.OPCONSTANT, (0,)), (op.OPPOP, ())]),
+            CompilerTestCase("-7 / 2;", (-4,), [(op.OPCONSTANT, (0,)), (op.OPPOP, ())]),
+            CompilerTestCase(
+                '"prefix" + "suffix";',
+                ("prefixsuffix",),
+                [(op.OPCONSTANT, (0,)), (op.OPPOP, ())],
+            ),
+            CompilerTestCase("1 < 2;", (), [(op.OPTRUE, ()), (op.OPPOP, ())]),
+            CompilerTestCase("1 > 2;", (), [(op.OPFALSE, ()), (op.OPPOP, ())]),
+            CompilerTestCase("(1 < 2) == true;", (), [(op.OPTRUE, ()), (op.OPPOP, ())]),
+            CompilerTestCase("true != false;", (), [(op.OPTRUE, ()), (op.OPPOP, ())]),
+            CompilerTestCase("!true;", (), [(op.OPFALSE, ()), (op.OPPOP, ())]),
+            CompilerTestCase("!!5;", (), [(op.OPTRUE, ()), (op.OPPOP, ())]),
+            CompilerTestCase('!"";', (), [(op.OPFALSE, ()), (op.OPPOP, ())]),
+        ],
+    )
+    def test_folded_expressions(self, case: CompilerTestCase):
+        perform_compiler_test_case(case, FOLDING_OPTIONS)
+
+    @pytest.mark.parametrize(
+        "case",
+        [
+            # the division by zero has to raise when the program runs, not when it is compiled
+            CompilerTestCase(
+                "1 / 0;",
+                (1, 0),
+                [(op.OPCONSTANT, (0,)), (op.OPCONSTANT, (1,)), (op.OPDIV, ()), (op.OPPOP, ())],
+            ),
+            # the operands get folded, even when the operation itself can't be
+            CompilerTestCase(
+                "10 / (5 - 5);",
+                (10, 0),
+                [(op.OPCONSTANT, (0,)), (op.OPCONSTANT, (1,)), (op.OPDIV, ()), (op.OPPOP, ())],
+            ),
+            CompilerTestCase(
+                '"a" + 1;',
+                ("a", 1),
+                [(op.OPCONSTANT, (0,)), (op.OPCONSTANT, (1,)), (op.OPADD, ()), (op.OPPOP, ())],
+            ),
+            CompilerTestCase("-true;", (), [(op.OPTRUE, ()), (op.OPMINUS, ()), (op.OPPOP, ())]),
+            CompilerTestCase(
+                "true > false;",
+                (),
+                [(op.OPTRUE, ()), (op.OPFALSE, ()), (op.OPGREATERTHAN, ()), (op.OPPOP, ())],
+            ),
+        ],
+    )
+    def test_unfoldable_expressions(self, case: CompilerTestCase):
+        perform_compiler_test_case(case, FOLDING_OPTIONS)
+
+    @pytest.mark.parametrize(
+        "case",
+        [
+            CompilerTestCase(
+                "let x = 5; x * (60 * 60);",
+                (5, 3600),
+                [
+                    (op.OPCONSTANT, (0,)),
+                    (op.OPSETGLOBAL, (0,)),
+                    (op.OPGETGLOBAL, (0,)),
+                    (op.OPCONSTANT, (1,)),
+                    (op.OPMUL, ()),
+                    (op.OPPOP, ()),
+                ],
+            ),
+            CompilerTestCase(
+                "fn() { return 2 + 3; };",
+                (
+                    5,
+                    (
+                        code.make_instructions_from_opcode_operand_pairs(
+                            [(op.OPCONSTANT, (0,)), (op.OPRETURNVALUE, ())],
+                        ),
+                        0,
+                        0,
+                    ),
+                ),
+                [(op.OPCLOSURE, (1, 0)), (op.OPPOP, ())],
+            ),
+            CompilerTestCase(
+                "[1 + 1, 2 * 2][3 - 3];",
+                (2, 4, 0),
+                [
+                    (op.OPCONSTANT, (0,)),
+                    (op.OPCONSTANT, (1,)),
+                    (op.OPARRAY, (2,)),
+                    (op.OPCONSTANT, (2,)),
+                    (op.OPINDEX, ()),
+                    (op.OPPOP, ()),
+                ],
+            ),
+        ],
+    )
+    def test_folding_inside_other_nodes(self, case: CompilerTestCase):
+        perform_compiler_test_case(case, FOLDING_OPTIONS)
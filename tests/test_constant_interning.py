@@ -0,0 +1,113 @@
+import pytest
+
+from monkey.compiler import CompilerOptions
+
+import monkey.code as code
+import monkey.code.opcodes as op
+
+from compiler_utils import CompilerTestCase
+from compiler_utils import perform_compiler_test_case
+
+INTERNING_OPTIONS = CompilerOptions(
+    use_constant_folding=False,
+    use_constant_interning=True,
+    use_peephole=False,
+    use_superinstructions=False,
+)
+
+
+class TestConstantInterning:
+    @pytest.mark.parametrize(
+        "case",
+        [
+            CompilerTestCase(
+                "1 + 1;",
+                (1,),
+                [(op.OPCONSTANT, (0,)), (op.OPCONSTANT, (0,)), (op.OPADD, ()), (op.OPPOP, ())],
+            ),
+            CompilerTestCase(
+                "1; 2; 1;",
+                (1, 2),
+                [
+                    (op.OPCONSTANT, (0,)),
+                    (op.OPPOP, ()),
+                    (op.OPCONSTANT, (1,)),
+                    (op.OPPOP, ()),
+                    (op.OPCONSTANT, (0,)),
+                    (op.OPPOP, ()),
+                ],
+            ),
+            CompilerTestCase(
+                '"monkey"; "monkey";',
+                ("monkey",),
+                [(op.OPCONSTANT, (0,)), (op.OPPOP, ()), (op.OPCONSTANT, (0,)), (op.OPPOP, ())],
+            ),
+            # equal values of different types are different constants
+            CompilerTestCase(
+                '1; "1";',
+                (1, "1"),
+                [(op.OPCONSTANT, (0,)), (op.OPPOP, ()), (op.OPCONSTANT, (1,)), (op.OPPOP, ())],
+            ),
+        ],
+    )
+    def test_interned_literals(self, case: CompilerTestCase):
+        perform_compiler_test_case(case, INTERNING_OPTIONS)
+
+    def test_identical_functions_share_a_constant(self):
+        function_instructions = code.make_instructions_from_opcode_operand_pairs(
+            [(op.OPCONSTANT, (0,)), (op.OPRETURNVALUE, ())]
+        )
+        case = CompilerTestCase(
+            "fn() { 5 }; fn() { 5 };",
+            (5, (function_instructions, 0, 0)),
+            [
+                (op.OPCLOSURE, (1, 0)),
+                (op.OPPOP, ()),
+                (op.OPCLOSURE, (1, 0)),
+                (op.OPPOP, ()),
+            ],
+        )
+        perform_compiler_test_case(case, INTERNING_OPTIONS)
+
+    def test_functions_with_different_arguments_do_not_share_a_constant(self):
+        # the bodies compile to the same instructions, but the frames they need differ
+        function_instructions = code.make_instructions_from_opcode_operand_pairs(
+            [(op.OPCONSTANT, (0,)), (op.OPRETURNVALUE, ())]
+        )
+        case = CompilerTestCase(
+            "fn() { 5 }; fn(a) { 5 };",
+            (5, (function_instructions, 0, 0), (function_instructions, 0, 1)),
+            [
+                (op.OPCLOSURE, (1, 0)),
+                (op.OPPOP, ()),
+                (op.OPCLOSURE, (2, 0)),
+                (op.OPPOP, ()),
+            ],
+        )
+        perform_compiler_test_case(case, INTERNING_OPTIONS)
+
+    def test_functions_with_different_names_do_not_share_a_constant(self):
+        # each function keeps the name it was bound to
+        function_instructions = code.make_instructions_from_opcode_operand_pairs(
+            [(op.OPCONSTANT, (0,)), (op.OPRETURNVALUE, ())]
+        )
+        case = CompilerTestCase(
+            "let a = fn() { 5 }; let b = fn() { 5 };",
+            (5, (function_instructions, 0, 0), (function_instructions, 0, 0)),
+            [
+                (op.OPCLOSURE, (1, 0)),
+                (op.OPSETGLOBAL, (0,)),
+                (op.OPCLOSURE, (2, 0)),
+                (op.OPSETGLOBAL, (1,)),
+            ],
+        )
+        perform_compiler_test_case(case, INTERNING_OPTIONS)
+
+    def test_folded_constant_reuses_existing_slot(self):
+        options = CompilerOptions(use_constant_folding=True, use_peephole=False, use_superinstructions=False)
+        case = CompilerTestCase(
+            "6; 2 * 3;",
+            (6,),
+            [(op.OPCONSTANT, (0,)), (op.OPPOP, ()), (op.OPCONSTANT, (0,)), (op.OPPOP, ())],
+        )
+        perform_compiler_test_case(case, options)
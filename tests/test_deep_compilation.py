@@ -0,0 +1,116 @@
+"""
+The programs in these tests are nested far more deeply than the recursion limit allows. The
+parser can't build trees that deep, so each tree is built by nesting a parsed template.
+"""
+
+import dataclasses
+import sys
+from typing import Callable
+
+import pytest
+
+from monkey.parser.program import Program
+
+import monkey.code as code
+import monkey.code.opcodes as op
+import monkey.compiler as comp
+import monkey.parser.expressions as exprs
+import monkey.virtual_machine as vm
+
+import compiler_utils
+import object_utils
+
+DEPTH = 100_000
+
+
+def nest(template: str, wrap: Callable[[exprs.Expression, exprs.Expression], exprs.Expression]) -> Program:
+    """
+    Parse a program whose last statement is a single expression, and replace that expression
+    with `DEPTH` copies of itself, each one wrapped around the one before it.
+    """
+    program = compiler_utils.parse(template)
+    last_statement = program.statements[-1]
+    outer = last_statement.value
+
+    expression = outer
+    for _ in range(DEPTH - 1):
+        expression = wrap(outer, expression)
+
+    program.statements[-1] = dataclasses.replace(last_statement, value=expression)
+    return program
+
+
+def compile_program(program: Program, options: comp.CompilerOptions) -> comp.Bytecode:
+    compiler = comp.Compiler(options)
+    comp.compile(compiler, program)
+    return comp.bytecode_from_compiler(compiler)
+
+
+def run_program(bytecode: comp.Bytecode):
+    machine = vm.VirtualMachine(bytecode)
+    vm.run(machine)
+
+    return machine.stack.maybe_get_last_popped()
+
+
+def test_depth_is_beyond_the_recursion_limit():
+    assert DEPTH > 10 * sys.getrecursionlimit()
+
+
+def test_left_nested_chain():
+    # ((a + a) + a) + ...
+    program = nest("let a = 2; a + a;", lambda outer, inner: dataclasses.replace(outer, left=inner))
+
+    bytecode = compile_program(program, compiler_utils.UNOPTIMIZED_OPTIONS)
+
+    expected = code.make_instructions_from_opcode_operand_pairs(
+        [(op.OPCONSTANT, (0,)), (op.OPSETGLOBAL, (0,)), (op.OPGETGLOBAL, (0,))]
+        + [(op.OPGETGLOBAL, (0,)), (op.OPADD, ())] * DEPTH
+        + [(op.OPPOP, ())]
+    )
+    assert bytecode.instructions == expected
+    assert object_utils.is_expected_object(run_program(bytecode), 2 * (DEPTH + 1))
+
+
+@pytest.mark.parametrize("side", ["left", "right"])
+def test_nested_constants_fold_to_one(side: str):
+    program = nest("1 + 1;", lambda outer, inner: dataclasses.replace(outer, **{side: inner}))
+
+    bytecode = compile_program(program, comp.CompilerOptions(use_constant_folding=True))
+
+    assert bytecode.instructions == code.make_instructions_from_opcode_operand_pairs(
+        [(op.OPCONSTANT, (0,)), (op.OPPOP, ())]
+    )
+    assert object_utils.is_expected_object(bytecode.constants[0], DEPTH + 1)
+
+
+def test_nested_prefix_expressions():
+    # !!!...!true
+    program = nest("!true;", lambda outer, inner: dataclasses.replace(outer, expr=inner))
+
+    bytecode = compile_program(program, compiler_utils.UNOPTIMIZED_OPTIONS)
+
+    expected = code.make_instructions_from_opcode_operand_pairs(
+        [(op.OPTRUE, ())] + [(op.OPBANG, ())] * DEPTH + [(op.OPPOP, ())]
+    )
+    assert bytecode.instructions == expected
+    assert object_utils.is_expected_object(run_program(bytecode), DEPTH % 2 == 0)
+
+
+def test_nested_calls():
+    # f(f(f(...f(a))))
+    program = nest(
+        "let f = fn(x) { x }; let a = 1; f(a);",
+        lambda outer, inner: dataclasses.replace(outer, arguments=[inner]),
+    )
+
+    bytecode = compile_program(program, compiler_utils.UNOPTIMIZED_OPTIONS)
+
+    expected = code.make_instructions_from_opcode_operand_pairs(
+        [(op.OPCLOSURE, (0, 0)), (op.OPSETGLOBAL, (0,)), (op.OPCONSTANT, (1,)), (op.OPSETGLOBAL, (1,))]
+        + [(op.OPGETGLOBAL, (0,))] * DEPTH
+        + [(op.OPGETGLOBAL, (1,))]
+        + [(op.OPCALL, (1,))] * DEPTH
+        + [(op.OPPOP, ())]
+    )
+    assert bytecode.instructions == expected
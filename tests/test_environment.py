@@ -22,3 +22,43 @@ def test_enclosed_environment():
     inner_env = objs.new_enclosed_environment(outer_env)
     assert inner_env.get(name0) == obj0
     assert inner_env.get("name_that_isnt_there").data_type() == objs.ObjectType.ERROR
+
+
+class TestArrayEnvironment:
+    def test_get_and_set(self):
+        outer_env = objs.Environment()
+        outer_env.set("z", objs.IntegerObject(3))
+
+        layout = objs.create_frame_layout(("x",), ("y",))
+        env = objs.ArrayEnvironment([objs.IntegerObject(1), None], layout, outer_env)
+
+        assert env.get("x") == objs.IntegerObject(1)
+        assert env.get("z") == objs.IntegerObject(3)
+        assert env.get("y").data_type() == objs.ObjectType.ERROR
+
+        env.set("y", objs.IntegerObject(2))
+        assert env.get("y") == objs.IntegerObject(2)
+        assert env.store == {"x": objs.IntegerObject(1), "y": objs.IntegerObject(2)}
+
+    def test_unbound_slot_falls_back_to_outer(self):
+        outer_env = objs.Environment()
+        outer_env.set("y", objs.IntegerObject(10))
+
+        layout = objs.create_frame_layout((), ("y",))
+        env = objs.ArrayEnvironment([None], layout, outer_env)
+
+        assert env.get("y") == objs.IntegerObject(10)
+        assert env.defining_environment("y") is outer_env
+
+        env.set("y", objs.IntegerObject(20))
+        assert env.get("y") == objs.IntegerObject(20)
+        assert env.defining_environment("y") is env
+        assert env.defining_environment("w") is None
+
+    def test_frame_layout(self):
+        layout = objs.create_frame_layout(("a", "b", "a"), ("c", "a", "c", "d"))
+
+        assert layout.names == ("a", "b", "a", "c", "d")
+        assert layout.n_parameters == 3
+        assert layout.slot_indices == {"a": 2, "b": 1, "c": 3, "d": 4}
+        assert layout.unbound_slots == (None, None)
@@ -335,6 +335,47 @@ def test_closure():
     assert evaluate(program, env) == objs.IntegerObject(expected_value)
 
 
+@pytest.mark.parametrize(
+    "monkey_code, expected_value",
+    [
+        ("let x = 1; x = 2; x;", 2),
+        ("let x = 0; let total = 0; while (x < 4) { x = x + 1; total = total + x; } total;", 10),
+        ("let x = 0; while (x > 0) { x = x - 1; } x;", 0),
+        ("let f = fn(n) { let i = 0; while (true) { if (i > n) { return i; } i = i + 1; } }; f(3);", 4),
+        ("let count = 0; let f = fn() { count = count + 1; }; f(); f(); count;", 2),
+    ],
+)
+def test_while_and_assignment(monkey_code, expected_value):
+    program = parse_program(Parser(Lexer(monkey_code)))
+    env = objs.Environment()
+
+    assert evaluate(program, env) == objs.IntegerObject(expected_value)
+
+
+def test_while_evaluates_to_null():
+    program = parse_program(Parser(Lexer("while (false) { 1 };")))
+    env = objs.Environment()
+
+    assert evaluate(program, env) == objs.NULL_OBJ
+
+
+@pytest.mark.parametrize(
+    "monkey_code, expected_error",
+    [
+        ("x = 1;", objs.UnknownIdentifierErrorObject("x")),
+        (
+            "let f = fn() { let a = 1; let g = fn() { a = 2; }; g(); }; f();",
+            objs.CapturedAssignmentErrorObject("a"),
+        ),
+    ],
+)
+def test_assignment_error(monkey_code, expected_error):
+    program = parse_program(Parser(Lexer(monkey_code)))
+    env = objs.Environment()
+
+    assert evaluate(program, env) == expected_error
+
+
 def test_evaluate_string_literal():
     monkey_code = '"hello world";'
     lexer = Lexer(monkey_code)
@@ -441,10 +482,10 @@ def test_evaluate_hash_literal_1():
 
     key0 = objs.StringObject("one")
     value0 = objs.IntegerObject(1)
-    object_hash0 = objs.create_object_hash(key0)
+    hash_key0 = objs.create_hash_key(key0)
     kv_pair0 = objs.HashKeyValuePair(key0, value0)
 
-    pairs = {object_hash0: kv_pair0}
+    pairs = {hash_key0: kv_pair0}
     expected_hash_object = objs.HashObject(pairs)
 
     assert not program.has_errors()
@@ -466,42 +507,42 @@ def test_evaluate_hash_literal_2():
     program, env = program_and_env(monkey_code)
 
     key0 = objs.StringObject("zero")
-    object_hash0 = objs.create_object_hash(key0)
+    hash_key0 = objs.create_hash_key(key0)
     kv_pair0 = objs.HashKeyValuePair(key0, objs.IntegerObject(0))
 
     key1 = objs.StringObject("one")
-    object_hash1 = objs.create_object_hash(key1)
+    hash_key1 = objs.create_hash_key(key1)
     kv_pair1 = objs.HashKeyValuePair(key1, objs.IntegerObject(1))
 
     key2 = objs.StringObject("two")
-    object_hash2 = objs.create_object_hash(key2)
+    hash_key2 = objs.create_hash_key(key2)
     kv_pair2 = objs.HashKeyValuePair(key2, objs.IntegerObject(2))
 
     key3 = objs.StringObject("three")
-    object_hash3 = objs.create_object_hash(key3)
+    hash_key3 = objs.create_hash_key(key3)
     kv_pair3 = objs.HashKeyValuePair(key3, objs.IntegerObject(3))
 
     key4 = objs.IntegerObject(4)
-    object_hash4 = objs.create_object_hash(key4)
+    hash_key4 = objs.create_hash_key(key4)
     kv_pair4 = objs.HashKeyValuePair(key4, objs.IntegerObject(4))
 
     key5 = objs.BooleanObject(True)
-    object_hash5 = objs.create_object_hash(key5)
+    hash_key5 = objs.create_hash_key(key5)
     kv_pair5 = objs.HashKeyValuePair(key5, objs.IntegerObject(5))
 
     key6 = objs.BooleanObject(False)
-    object_hash6 = objs.create_object_hash(key6)
+    hash_key6 = objs.create_hash_key(key6)
     kv_pair6 = objs.HashKeyValuePair(key6, objs.IntegerObject(6))
 
     pairs = dict(
         [
-            (object_hash0, kv_pair0),
-            (object_hash1, kv_pair1),
-            (object_hash2, kv_pair2),
-            (object_hash3, kv_pair3),
-            (object_hash4, kv_pair4),
-            (object_hash5, kv_pair5),
-            (object_hash6, kv_pair6),
+            (hash_key0, kv_pair0),
+            (hash_key1, kv_pair1),
+            (hash_key2, kv_pair2),
+            (hash_key3, kv_pair3),
+            (hash_key4, kv_pair4),
+            (hash_key5, kv_pair5),
+            (hash_key6, kv_pair6),
         ]
     )
     expected_hash_object = objs.HashObject(pairs)
@@ -521,6 +562,8 @@ def test_evaluate_hash_literal_2():
         ("let x = {2 + 1: 3}; x[3];", 3),
         ("{true: 1}[true];", 1),
         ("{false: 1}[false];", 1),
+        ("{1: 1, true: 2}[true];", 2),
+        ("{0: 1, false: 2}[0];", 1),
     ],
 )
 def test_hash_index_expression(monkey_code, expected_value):
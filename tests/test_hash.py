@@ -8,37 +8,37 @@ class TestHash:
         int0 = objs.IntegerObject(5)
         int1 = objs.IntegerObject(5)
 
-        assert objs.create_object_hash(int0) == objs.create_object_hash(int1)
+        assert objs.create_hash_key(int0) == objs.create_hash_key(int1)
 
     def test_integers_not_equal(self):
         int0 = objs.IntegerObject(5)
         int1 = objs.IntegerObject(7)
 
-        assert objs.create_object_hash(int0) != objs.create_object_hash(int1)
+        assert objs.create_hash_key(int0) != objs.create_hash_key(int1)
 
     def test_strings_equal(self):
         string0 = objs.StringObject("hello")
         string1 = objs.StringObject("hello")
 
-        assert objs.create_object_hash(string0) == objs.create_object_hash(string1)
+        assert objs.create_hash_key(string0) == objs.create_hash_key(string1)
 
     def test_strings_not_equal(self):
         string0 = objs.StringObject("hello")
         string1 = objs.StringObject("world")
 
-        assert objs.create_object_hash(string0) != objs.create_object_hash(string1)
+        assert objs.create_hash_key(string0) != objs.create_hash_key(string1)
 
     def test_booleans_equal(self):
         bool0 = objs.BooleanObject(True)
         bool1 = objs.BooleanObject(True)
 
-        assert objs.create_object_hash(bool0) == objs.create_object_hash(bool1)
+        assert objs.create_hash_key(bool0) == objs.create_hash_key(bool1)
 
     def test_booleans_not_equal(self):
         bool0 = objs.BooleanObject(True)
         bool1 = objs.BooleanObject(False)
 
-        assert objs.create_object_hash(bool0) != objs.create_object_hash(bool1)
+        assert objs.create_hash_key(bool0) != objs.create_hash_key(bool1)
 
     @pytest.mark.parametrize(
         "obj",
@@ -47,5 +47,16 @@ class TestHash:
         ],
     )
     def test_no_hash_exists(self, obj):
-        hash_key = objs.create_object_hash(obj)
-        assert hash_key.data_type == objs.ObjectType.ERROR
+        assert objs.create_hash_key(obj) is None
+
+    @pytest.mark.parametrize(
+        "obj0, obj1",
+        [
+            (objs.IntegerObject(1), objs.BooleanObject(True)),
+            (objs.IntegerObject(0), objs.BooleanObject(False)),
+            (objs.IntegerObject(1), objs.StringObject("1")),
+            (objs.StringObject("true"), objs.BooleanObject(True)),
+        ],
+    )
+    def test_different_types_not_equal(self, obj0, obj1):
+        assert objs.create_hash_key(obj0) != objs.create_hash_key(obj1)
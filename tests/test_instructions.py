@@ -5,6 +5,8 @@ from monkey.code import lookup_opcode_definition
 from monkey.code import make_instruction
 from monkey.code import make_instructions_from_opcode_operand_pairs
 from monkey.code import instructions_to_string
+from monkey.code import decode_instructions
+from monkey.code import max_stack_depth
 
 import monkey.code.opcodes as opcodes
 
@@ -44,6 +46,8 @@ def test_make_instruction():
         ([(opcodes.OPSETGLOBAL, (0,))]),
         ([(opcodes.OPGETGLOBAL, (1,))]),
         ([(opcodes.OPCLOSURE, (1, 2))]),
+        ([(opcodes.OPLOCALCONSTADD, (1, 300)), (opcodes.OPCONSTSETGLOBAL, (2, 3))]),
+        ([(opcodes.OPLOCALLOCALGTJUMP, (0, 1, 20)), (opcodes.OPCONSTLOCALGTJUMP, (4, 0, 65534))]),
     ],
 )
 def test_instruction_to_string(instruction_pairs):
@@ -60,6 +64,61 @@ def test_instruction_to_string(instruction_pairs):
         assert actual_operands == expected_operands
 
 
+def test_decode_instructions():
+    instruction_pairs = [
+        (opcodes.OPTRUE, ()),  # byte 0
+        (opcodes.OPJUMPWHENFALSE, (10,)),  # byte 1
+        (opcodes.OPCONSTANT, (300,)),  # byte 4
+        (opcodes.OPJUMP, (11,)),  # byte 7
+        (opcodes.OPNULL, ()),  # byte 10
+        (opcodes.OPCLOSURE, (2, 1)),  # byte 11
+    ]
+    instructions = make_instructions_from_opcode_operand_pairs(instruction_pairs)
+
+    expected = [
+        (ord(opcodes.OPTRUE),),
+        (ord(opcodes.OPJUMPWHENFALSE), 4),
+        (ord(opcodes.OPCONSTANT), 300),
+        (ord(opcodes.OPJUMP), 5),
+        (ord(opcodes.OPNULL),),
+        (ord(opcodes.OPCLOSURE), 2, 1),
+    ]
+
+    assert decode_instructions(instructions) == expected
+
+
+def test_decode_instructions_jump_past_the_end():
+    instruction_pairs = [(opcodes.OPJUMP, (4,)), (opcodes.OPNULL, ())]
+    instructions = make_instructions_from_opcode_operand_pairs(instruction_pairs)
+
+    assert decode_instructions(instructions) == [(ord(opcodes.OPJUMP), 2), (ord(opcodes.OPNULL),)]
+
+
+def test_decode_instructions_superinstruction_jump():
+    instruction_pairs = [
+        (opcodes.OPLOCALLOCALGTJUMP, (0, 1, 7)),  # byte 0
+        (opcodes.OPGETLOCAL, (0,)),  # byte 5
+        (opcodes.OPNULL, ()),  # byte 7
+    ]
+    instructions = make_instructions_from_opcode_operand_pairs(instruction_pairs)
+
+    expected = [
+        (ord(opcodes.OPLOCALLOCALGTJUMP), 0, 1, 2),
+        (ord(opcodes.OPGETLOCAL), 0),
+        (ord(opcodes.OPNULL),),
+    ]
+
+    assert decode_instructions(instructions) == expected
+
+
+def test_decode_instructions_jump_into_an_operand_raises():
+    instruction_pairs = [(opcodes.OPJUMP, (1,)), (opcodes.OPNULL, ())]
+    instructions = make_instructions_from_opcode_operand_pairs(instruction_pairs)
+
+    with pytest.raises(ValueError):
+        decode_instructions(instructions)
+
+
 # --- HELPER FUNCTIONS ---
 
 
@@ -69,3 +128,49 @@ def extract_name_and_operands(formatted_instruction: str) -> tuple[str, tuple[in
     operands = tuple([int(t) for t in tokens[1:]])
 
     return opcode_name, operands
+
+
+@pytest.mark.parametrize(
+    "instruction_pairs, expected_depth",
+    [
+        ([(opcodes.OPRETURN, ())], 0),
+        ([(opcodes.OPCONSTANT, (0,)), (opcodes.OPPOP, ())], 1),
+        ([(opcodes.OPTRUE, ()), (opcodes.OPFALSE, ()), (opcodes.OPNULL, ()), (opcodes.OPARRAY, (3,))], 3),
+        ([(opcodes.OPTRUE, ()), (opcodes.OPTRUE, ()), (opcodes.OPHASH, (2,)), (opcodes.OPTRUE, ())], 2),
+        ([(opcodes.OPGETLOCAL, (0,)), (opcodes.OPCLOSURE, (0, 1)), (opcodes.OPGETFREE, (0,))], 2),
+        (
+            [(opcodes.OPGETGLOBAL, (0,)), (opcodes.OPTRUE, ()), (opcodes.OPCALL, (1,)), (opcodes.OPTRUE, ())],
+            2,
+        ),
+        # if (true) { 1 } else { null }; both branches leave one operand on the stack
+        (
+            [
+                (opcodes.OPTRUE, ()),  # byte 0
+                (opcodes.OPJUMPWHENFALSE, (10,)),  # byte 1
+                (opcodes.OPCONSTANT, (0,)),  # byte 4
+                (opcodes.OPJUMP, (11,)),  # byte 7
+                (opcodes.OPNULL, ()),  # byte 10
+                (opcodes.OPPOP, ()),  # byte 11
+            ],
+            1,
+        ),
+        # the instructions after a return are only reached by the jump, with one operand less
+        (
+            [
+                (opcodes.OPTRUE, ()),  # byte 0
+                (opcodes.OPJUMPWHENFALSE, (10,)),  # byte 1
+                (opcodes.OPTRUE, ()),  # byte 4
+                (opcodes.OPTRUE, ()),  # byte 5
+                (opcodes.OPARRAY, (2,)),  # byte 6
+                (opcodes.OPRETURNVALUE, ()),  # byte 9
+                (opcodes.OPNULL, ()),  # byte 10
+                (opcodes.OPRETURNVALUE, ()),  # byte 11
+            ],
+            2,
+        ),
+    ],
+)
+def test_max_stack_depth(instruction_pairs, expected_depth):
+    instructions = make_instructions_from_opcode_operand_pairs(instruction_pairs)
+
+    assert max_stack_depth(decode_instructions(instructions)) == expected_depth
@@ -0,0 +1,161 @@
+import random
+import sys
+
+import pytest
+
+from monkey.lexer import Lexer
+from monkey.parser.parser import Parser
+from monkey.parser.parser import parse_program
+from monkey.parser.parser import parse_program_iteratively
+import monkey.parser.expressions as exprs
+
+from utils_for_tests import DIFFERENTIAL_PROGRAMS
+
+DEPTH = 20 * sys.getrecursionlimit()
+
+PROGRAMS = [
+    "",
+    "1 + 2 * 3 - 4 / 5;",
+    "-a * b;",
+    "!-a;",
+    "a + b * c + d / e - f;",
+    "3 > 5 == false != 3 < 5;",
+    "(5 + 5) * 2 * (((1)));",
+    "-(5 + 5) + !(true == true);",
+    "a * [1, 2, 3, 4][b * c] * d;",
+    "add(a * b[2], b[1], 2 * [1, 2][1]);",
+    "f(1)(2)(g(3, h()));",
+    'let h = {"one": 1, 2: [3, {true: fn(x) { x }}], "three": {}};',
+    'h["one"][0][1 + 1];',
+    "let f = fn(x, y) { let z = x * -y; if (z > 0) { return [z]; } else { z } };",
+    "while (i < 10) { i = i + 1; f(i)[0]; }",
+    "fn(x) { fn(y) { x + y } }(1)(2);",
+    "if ((a + b) * c > [1][0]) { (a) } else { -(b) };",
+    # programs that fail to parse
+    "1 +;",
+    "-;",
+    "(1 + 2;",
+    "((1 + 2)) * (3 +);",
+    "[1, 2;",
+    "[1, 2,];",
+    "a[1;",
+    "a[];",
+    "f(1, 2;",
+    "f(1,);",
+    "5(1);",
+    "{1: 2, 3};",
+    "{1: 2 3: 4};",
+    "{1 2};",
+    "{: 1};",
+    "{1: };",
+    "let x = (1 + [2, {3: }]);",
+    "return -[1, (2 +)];",
+    "if (x { 1 }",
+    "fn(x) { (x + }",
+    "1 2;",
+    "999999999999999999999999999999999999999 + (1;",
+]
+
+# the parser stops at its first error, so most of these only test the ways of failing
+TOKEN_SOUP = [
+    "1", "x", "f", "+", "-", "*", "/", "<", ">", "==", "!=", "!", "(", ")", "[", "]", "{", "}",
+    ",", ":", ";", "fn", "if", "else", "while", "let", "=", "return", '"s"', "true",
+]  # fmt: skip
+
+
+def random_token_soup(rng: random.Random) -> str:
+    return " ".join(rng.choice(TOKEN_SOUP) for _ in range(rng.randint(1, 20)))
+
+
+def random_expression(rng: random.Random, depth: int) -> str:
+    if depth == 0:
+        return rng.choice(["1", "23", "x", "f", "true", '"s"'])
+
+    def inner() -> str:
+        return random_expression(rng, depth - 1)
+
+    choices = [
+        lambda: f"{rng.choice(['-', '!'])}{inner()}",
+        lambda: f"{inner()} {rng.choice(['+', '-', '*', '/', '<', '>', '==', '!='])} {inner()}",
+        lambda: f"({inner()})",
+        lambda: f"f({', '.join(inner() for _ in range(rng.randint(0, 3)))})",
+        lambda: f"{inner()}[{inner()}]",
+        lambda: f"[{', '.join(inner() for _ in range(rng.randint(0, 3)))}]",
+        lambda: "{" + ", ".join(f"{inner()}: {inner()}" for _ in range(rng.randint(0, 2))) + "}",
+        lambda: f"if ({inner()}) {{ {inner()} }} else {{ {inner()}; }}",
+        lambda: f"fn(x) {{ return {inner()}; }}",
+    ]
+    return rng.choice(choices)()
+
+
+def assert_same_parse(monkey_code: str) -> None:
+    expected = parse_program(Parser(Lexer(monkey_code)))
+    actual = parse_program_iteratively(Parser(Lexer(monkey_code)))
+
+    assert actual.statements == expected.statements
+    assert str(actual) == str(expected)
+    assert actual.errors() == expected.errors()
+
+
+@pytest.mark.parametrize("monkey_code", PROGRAMS + DIFFERENTIAL_PROGRAMS)
+def test_agrees_with_parse_program(monkey_code):
+    assert_same_parse(monkey_code)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_agrees_with_parse_program_on_random_expressions(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        assert_same_parse(f"let y = {random_expression(rng, 4)}; {random_expression(rng, 4)}")
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_agrees_with_parse_program_on_random_tokens(seed):
+    rng = random.Random(seed)
+    for _ in range(200):
+        assert_same_parse(random_token_soup(rng))
+
+
+def parse_single_expression(monkey_code: str) -> exprs.Expression:
+    program = parse_program_iteratively(Parser(Lexer(monkey_code)))
+    assert not program.has_errors()
+    assert len(program.statements) == 1
+
+    return program.statements[0].value
+
+
+@pytest.mark.parametrize(
+    "opening, closing, expr_type, child",
+    [
+        ("-", "", exprs.PrefixExpression, lambda expr: expr.expr),
+        ("!", "", exprs.PrefixExpression, lambda expr: expr.expr),
+        ("1 + (", ")", exprs.InfixExpression, lambda expr: expr.right),
+        ("f(", ")", exprs.CallExpression, lambda expr: expr.arguments[0]),
+        ("a[", "]", exprs.IndexExpression, lambda expr: expr.inside),
+        ("[", "]", exprs.ArrayLiteral, lambda expr: expr.elements[0]),
+        ("{1: ", "}", exprs.HashLiteral, lambda expr: expr.key_value_pairs[0][1]),
+    ],
+)
+def test_deeply_nested_expression(opening, closing, expr_type, child):
+    expr = parse_single_expression(opening * DEPTH + "x" + closing * DEPTH + ";")
+
+    for _ in range(DEPTH):
+        assert isinstance(expr, expr_type)
+        expr = child(expr)
+
+    assert isinstance(expr, exprs.Identifier)
+    assert expr.value == "x"
+
+
+def test_deeply_nested_groups():
+    expr = parse_single_expression("(" * DEPTH + "x" + ")" * DEPTH + ";")
+
+    assert isinstance(expr, exprs.Identifier)
+    assert expr.value == "x"
+
+
+def test_deeply_nested_failure():
+    program = parse_program_iteratively(Parser(Lexer("(" * DEPTH + "x;")))
+
+    assert program.statements == []
+    assert program.errors().count("Unable to parse a grouped expression") == DEPTH - 1
@@ -123,6 +123,7 @@ class TestLexer:
             ("if", Token(token_types.IF, "if")),
             ("else", Token(token_types.ELSE, "else")),
             ("return", Token(token_types.RETURN, "return")),
+            ("while", Token(token_types.WHILE, "while")),
         ],
     )
     def test_read_keyword(self, keyword: str, token: Token):
@@ -120,3 +120,55 @@ def test_compiled_function_object():
     assert compiled_function_obj.instructions == instructions
     assert compiled_function_obj.n_locals == 1
     assert compiled_function_obj.n_arguments == 0
+
+
+def test_compiled_function_object_caches_decoded_instructions():
+    instructions = make_instruction(opcodes.OPCONSTANT, 1) + make_instruction(opcodes.OPRETURNVALUE)
+    compiled_function_obj = CompiledFunctionObject(instructions, 0, 0)
+
+    decoded = compiled_function_obj.decoded_instructions
+    assert compiled_function_obj.decoded_instructions is decoded
+
+    # the cached decoding plays no part in equality
+    assert compiled_function_obj == CompiledFunctionObject(instructions, 0, 0)
+
+
+def test_compiled_function_object_name_is_not_compared():
+    instructions = make_instruction(opcodes.OPNULL)
+    named_function = CompiledFunctionObject(instructions, 0, 0, "identity")
+
+    assert named_function.name == "identity"
+    assert CompiledFunctionObject(instructions, 0, 0).name is None
+    assert named_function == CompiledFunctionObject(instructions, 0, 0, "other")
+    assert named_function == CompiledFunctionObject(instructions, 0, 0)
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        IntegerObject(1),
+        BooleanObject(True),
+        NullObject(),
+        objs.StringObject("monkey"),
+        ReturnObject(IntegerObject(1)),
+        ArrayObject([IntegerObject(1)]),
+        CompiledFunctionObject(make_instruction(opcodes.OPNULL), 0, 0),
+        objs.ClosureObject(CompiledFunctionObject(make_instruction(opcodes.OPNULL), 0, 0), []),
+        objs.HashObject({}),
+        objs.DefaultObject(),
+        objs.UnknownIdentifierErrorObject("x"),
+    ],
+)
+def test_objects_have_no_instance_dict(obj):
+    assert not hasattr(obj, "__dict__")
+
+
+def test_compound_object_equality():
+    one = IntegerObject(1)
+    two = IntegerObject(2)
+    function = CompiledFunctionObject(make_instruction(opcodes.OPNULL), 0, 0)
+
+    assert ArrayObject([one, two]) == ArrayObject([IntegerObject(1), IntegerObject(2)])
+    assert ArrayObject([one]) != ArrayObject([two])
+    assert objs.ClosureObject(function, [one]) == objs.ClosureObject(function, [IntegerObject(1)])
+    assert objs.ClosureObject(function, [one]) != objs.ClosureObject(function, [])
@@ -0,0 +1,60 @@
+import pytest
+
+import monkey.object as objs
+
+from monkey.virtual_machine.operand_stack import OperandStack
+
+
+class TestOperandStack:
+    def test_basic(self):
+        stack = OperandStack(10)
+
+        assert stack.is_empty()
+        assert stack.max_size() == 10
+
+        stack.push(objs.IntegerObject(5))
+
+        assert stack.size() == 1
+        assert stack.peek() == objs.IntegerObject(5)
+        assert stack.pop() == objs.IntegerObject(5)
+        assert stack.is_empty()
+
+    def test_last_popped(self):
+        stack = OperandStack(10)
+        stack.push(objs.IntegerObject(1))
+        stack.push(objs.IntegerObject(2))
+        stack.pop()
+
+        assert stack.maybe_get_last_popped() == objs.IntegerObject(2)
+
+    def test_last_popped_of_full_stack(self):
+        stack = OperandStack(1)
+        stack.push(objs.IntegerObject(1))
+
+        assert stack.maybe_get_last_popped() is None
+
+    def test_indexing(self):
+        stack = OperandStack(10)
+        for value in range(4):
+            stack.push(objs.IntegerObject(value))
+
+        stack[1] = objs.IntegerObject(10)
+
+        assert stack[1] == objs.IntegerObject(10)
+        assert stack[1:3] == [objs.IntegerObject(10), objs.IntegerObject(2)]
+
+    def test_move_stack_pointer(self):
+        stack = OperandStack(10)
+        stack.advance_stack_pointer(3)
+        assert stack.size() == 3
+
+        stack.shrink_stack_pointer(2)
+        assert stack.size() == 1
+
+    def test_push_past_max_raises_index_error(self):
+        stack = OperandStack(2)
+        stack.push(objs.IntegerObject(1))
+        stack.push(objs.IntegerObject(2))
+
+        with pytest.raises(IndexError):
+            stack.push(objs.IntegerObject(3))
@@ -13,8 +13,10 @@ from monkey.parser.expressions import InfixExpression
 from monkey.parser.expressions import IntegerLiteral
 from monkey.parser.expressions import StringLiteral
 from monkey.parser.expressions import PrefixExpression
+from monkey.parser.expressions import WhileExpression
 from monkey.parser.parser import Parser
 from monkey.parser.parser import parse_program
+from monkey.parser.statements import AssignStatement
 from monkey.parser.statements import ExpressionStatement
 from monkey.parser.statements import BlockStatement
 from monkey.parser.statements import LetStatement
@@ -49,6 +51,31 @@ def test_failed_parse_let_statement(monkey_code):
     assert parser.has_errors()
 
 
+def test_parse_assign_statement():
+    lexer = Lexer("x = y;")
+    parser = Parser(lexer)
+    program = parse_program(parser)
+
+    expected_statement = AssignStatement(
+        Token(token_types.ASSIGN, "="),
+        Identifier(Token(token_types.IDENTIFIER, "x"), "x"),
+        Identifier(Token(token_types.IDENTIFIER, "y"), "y"),
+    )
+
+    assert program.number_of_statements() == 1
+    assert program[0] == expected_statement
+    assert not parser.has_errors()
+
+
+@pytest.mark.parametrize("monkey_code", ["x = 5 5;", "x = 5"])
+def test_failed_parse_assign_statement(monkey_code):
+    lexer = Lexer(monkey_code)
+    parser = Parser(lexer)
+    parse_program(parser)
+
+    assert parser.has_errors()
+
+
 @pytest.mark.parametrize("monkey_code", ["return 25;"])
 def test_parse_return_statement(monkey_code):
     lexer = Lexer(monkey_code)
@@ -278,6 +305,47 @@ def test_parse_if_expression():
     assert not parser.has_errors()
 
 
+def test_parse_while_expression():
+    monkey_code = "while (x) { x = 1; };"
+    lexer = Lexer(monkey_code)
+    parser = Parser(lexer)
+    program = parse_program(parser)
+
+    token = Token(token_types.WHILE, "while")
+    condition = Identifier(Token(token_types.IDENTIFIER, "x"), "x")
+
+    body = BlockStatement(
+        Token(token_types.LBRACE, "{"),
+        [
+            AssignStatement(
+                Token(token_types.ASSIGN, "="),
+                Identifier(Token(token_types.IDENTIFIER, "x"), "x"),
+                IntegerLiteral(Token(token_types.INT, "1"), "1"),
+            )
+        ],
+    )
+
+    expr = WhileExpression(token, condition, body)
+
+    expected_statement = ExpressionStatement(Token(token_types.WHILE, "while"), expr)
+
+    assert program.number_of_statements() == 1
+    assert program[0] == expected_statement
+    assert not parser.has_errors()
+
+
+@pytest.mark.parametrize(
+    "monkey_code",
+    ["while x { 1 };", "while (x) 1;", "while () { 1 };", "while (x { 1 };"],
+)
+def test_failed_parse_while_expression(monkey_code):
+    lexer = Lexer(monkey_code)
+    parser = Parser(lexer)
+    parse_program(parser)
+
+    assert parser.has_errors()
+
+
 @pytest.mark.parametrize(
     "monkey_code, expected_parameter_literals",
     [
@@ -0,0 +1,219 @@
+import pytest
+
+from monkey.compiler import CompilerOptions
+
+import monkey.code as code
+import monkey.code.opcodes as op
+
+from monkey.compiler.peephole import optimize_peephole
+
+from compiler_utils import CompilerTestCase
+from compiler_utils import perform_compiler_test_case
+
+PEEPHOLE_OPTIONS = CompilerOptions(use_constant_folding=False, use_peephole=True, use_superinstructions=False)
+
+
+class TestPeepholeCompilation:
+    @pytest.mark.parametrize(
+        "case",
+        [
+            # `OPTRUE; OPJUMPWHENFALSE` never jumps, and the jump over the alternative goes
+            # to the very next instruction
+            CompilerTestCase(
+                "if (true) { 10 }; 3333;",
+                (10, 3333),
+                [
+                    (op.OPCONSTANT, (0,)),
+                    (op.OPPOP, ()),
+                    (op.OPCONSTANT, (1,)),
+                    (op.OPPOP, ()),
+                ],
+            ),
+            # `OPFALSE; OPJUMPWHENFALSE` always jumps; the consequence can then never run
+            CompilerTestCase(
+                "if (false) { 10 } else { 20 };",
+                (10, 20),
+                [
+                    (op.OPCONSTANT, (1,)),
+                    (op.OPPOP, ()),
+                ],
+            ),
+            # `OPBANG; OPJUMPWHENFALSE` becomes a single `OPJUMPWHENTRUE`
+            CompilerTestCase(
+                "let x = true; if (!x) { 10 } else { 20 };",
+                (10, 20),
+                [
+                    (op.OPTRUE, ()),  # 0000
+                    (op.OPSETGLOBAL, (0,)),  # 0001
+                    (op.OPGETGLOBAL, (0,)),  # 0004
+                    (op.OPJUMPWHENTRUE, (16,)),  # 0007
+                    (op.OPCONSTANT, (0,)),  # 0010
+                    (op.OPJUMP, (19,)),  # 0013
+                    (op.OPCONSTANT, (1,)),  # 0016
+                    (op.OPPOP, ()),  # 0019
+                ],
+            ),
+            # the main program keeps its popped values, which are read back as its result
+            CompilerTestCase(
+                "1; 2;",
+                (1, 2),
+                [
+                    (op.OPCONSTANT, (0,)),
+                    (op.OPPOP, ()),
+                    (op.OPCONSTANT, (1,)),
+                    (op.OPPOP, ()),
+                ],
+            ),
+        ],
+    )
+    def test_main_program(self, case: CompilerTestCase):
+        perform_compiler_test_case(case, PEEPHOLE_OPTIONS)
+
+    @pytest.mark.parametrize(
+        "case",
+        [
+            # a function body discards values nobody can see
+            CompilerTestCase(
+                "fn() { 1; 2; 3 };",
+                (
+                    1,
+                    2,
+                    3,
+                    (
+                        code.make_instructions_from_opcode_operand_pairs(
+                            [
+                                (op.OPCONSTANT, (2,)),
+                                (op.OPRETURNVALUE, ()),
+                            ]
+                        ),
+                        0,
+                        0,
+                    ),
+                ),
+                [(op.OPCLOSURE, (3, 0)), (op.OPPOP, ())],
+            ),
+            # a jump to a return becomes that return, and the code after it is unreachable
+            CompilerTestCase(
+                "fn(a) { if (a) { return 1; } else { return 2; } };",
+                (
+                    1,
+                    2,
+                    (
+                        code.make_instructions_from_opcode_operand_pairs(
+                            [
+                                (op.OPGETLOCAL, (0,)),  # 0000
+                                (op.OPJUMPWHENFALSE, (9,)),  # 0002
+                                (op.OPCONSTANT, (0,)),  # 0005
+                                (op.OPRETURNVALUE, ()),  # 0008
+                                (op.OPCONSTANT, (1,)),  # 0009
+                                (op.OPRETURNVALUE, ()),  # 0012
+                            ]
+                        ),
+                        0,
+                        1,
+                    ),
+                ),
+                [(op.OPCLOSURE, (2, 0)), (op.OPPOP, ())],
+            ),
+        ],
+    )
+    def test_function_body(self, case: CompilerTestCase):
+        perform_compiler_test_case(case, PEEPHOLE_OPTIONS)
+
+    def test_loop_in_function_body(self):
+        # the discarded value in the body goes away, and the backward jump is kept
+        case = CompilerTestCase(
+            "fn(x) { while (x) { 1; } };",
+            (
+                1,
+                (
+                    code.make_instructions_from_opcode_operand_pairs(
+                        [
+                            (op.OPGETLOCAL, (0,)),  # 0000
+                            (op.OPJUMPWHENFALSE, (8,)),  # 0002
+                            (op.OPJUMP, (0,)),  # 0005
+                            (op.OPNULL, ()),  # 0008
+                            (op.OPRETURNVALUE, ()),  # 0009
+                        ]
+                    ),
+                    0,
+                    1,
+                ),
+            ),
+            [(op.OPCLOSURE, (1, 0)), (op.OPPOP, ())],
+        )
+        perform_compiler_test_case(case, PEEPHOLE_OPTIONS)
+
+
+def test_jump_to_jump_is_threaded():
+    instruction_pairs = [
+        (op.OPGETLOCAL, (0,)),  # 0000
+        (op.OPJUMPWHENFALSE, (9,)),  # 0002
+        (op.OPJUMP, (9,)),  # 0005
+        (op.OPNULL, ()),  # 0008
+        (op.OPJUMP, (13,)),  # 0009
+        (op.OPTRUE, ()),  # 0012
+        (op.OPRETURNVALUE, ()),  # 0013
+    ]
+    instructions = code.make_instructions_from_opcode_operand_pairs(instruction_pairs)
+
+    # both jumps that landed on the OPJUMP at 0009 now go straight to the return
+    expected = code.make_instructions_from_opcode_operand_pairs(
+        [
+            (op.OPGETLOCAL, (0,)),  # 0000
+            (op.OPJUMPWHENFALSE, (6,)),  # 0002
+            (op.OPRETURNVALUE, ()),  # 0005
+            (op.OPRETURNVALUE, ()),  # 0006
+        ]
+    )
+
+    assert optimize_peephole(instructions) == expected
+
+
+def test_jump_loop_is_left_alone():
+    instruction_pairs = [(op.OPJUMP, (0,))]
+    instructions = code.make_instructions_from_opcode_operand_pairs(instruction_pairs)
+
+    assert optimize_peephole(instructions) == instructions
+
+
+def test_backward_jump_to_jump_is_threaded():
+    instruction_pairs = [
+        (op.OPJUMP, (6,)),  # 0000
+        (op.OPGETLOCAL, (0,)),  # 0003
+        (op.OPPOP, ()),  # 0005
+        (op.OPGETLOCAL, (0,)),  # 0006
+        (op.OPJUMPWHENFALSE, (15,)),  # 0008
+        (op.OPJUMP, (0,)),  # 0011
+        (op.OPNULL, ()),  # 0014
+        (op.OPRETURNVALUE, ()),  # 0015
+    ]
+    instructions = code.make_instructions_from_opcode_operand_pairs(instruction_pairs)
+
+    # the jump back to 0000 goes straight on to 0006; and the instructions at 0003, which no
+    # jump lands on any more, can never run
+    expected = code.make_instructions_from_opcode_operand_pairs(
+        [
+            (op.OPGETLOCAL, (0,)),  # 0000
+            (op.OPJUMPWHENFALSE, (8,)),  # 0002
+            (op.OPJUMP, (0,)),  # 0005
+            (op.OPRETURNVALUE, ()),  # 0008
+        ]
+    )
+
+    assert optimize_peephole(instructions) == expected
+
+
+def test_jump_target_is_never_merged_away():
+    # the OPPOP at byte 0006 is where the jump lands, so it can't be dropped with the OPNULL
+    instruction_pairs = [
+        (op.OPGETLOCAL, (0,)),  # 0000
+        (op.OPJUMPWHENFALSE, (6,)),  # 0002
+        (op.OPNULL, ()),  # 0005
+        (op.OPPOP, ()),  # 0006
+        (op.OPNULL, ()),  # 0007
+        (op.OPRETURNVALUE, ()),  # 0008
+    ]
+    instructions = code.make_instructions_from_opcode_operand_pairs(instruction_pairs)
+
+    assert optimize_peephole(instructions) == instructions
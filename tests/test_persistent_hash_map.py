@@ -0,0 +1,99 @@
+import pytest
+
+import monkey.object as objs
+
+from monkey.containers import PersistentHashMap
+
+
+class CollidingKey:
+    """
+    A key whose hash only has a few possible values, so that many keys share a hash.
+    """
+
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+    def __hash__(self) -> int:
+        return self.value % 3
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CollidingKey) and self.value == other.value
+
+
+class TestPersistentHashMap:
+    @pytest.mark.parametrize("size", [0, 1, 31, 32, 33, 1000, 20000])
+    def test_construction(self, size: int):
+        pairs = {f"key{i}": i for i in range(size)}
+        hashmap = PersistentHashMap(pairs.items())
+
+        assert len(hashmap) == size
+        assert hashmap == pairs
+        assert all(hashmap[key] == value for (key, value) in pairs.items())
+
+    def test_set(self):
+        hashmap = PersistentHashMap[int, int]()
+        for i in range(2000):
+            hashmap = hashmap.set(i * 7919, i)
+
+        assert len(hashmap) == 2000
+        assert dict(hashmap.pairs()) == {i * 7919: i for i in range(2000)}
+
+    def test_set_replaces_value(self):
+        hashmap = PersistentHashMap([("a", 1), ("b", 2)]).set("a", 3)
+
+        assert len(hashmap) == 2
+        assert hashmap == {"a": 3, "b": 2}
+
+    def test_old_versions_are_unchanged(self):
+        original = PersistentHashMap((i, i) for i in range(100))
+        added = original.set(100, 100)
+        replaced = original.set(0, -1)
+
+        assert original == {i: i for i in range(100)}
+        assert added == {i: i for i in range(101)}
+        assert replaced[0] == -1 and original[0] == 0
+
+    def test_missing_key(self):
+        hashmap = PersistentHashMap([(1, "one")])
+
+        assert 2 not in hashmap
+        assert hashmap.get(2) is None
+        with pytest.raises(KeyError):
+            hashmap[2]
+
+    def test_colliding_hashes(self):
+        keys = [CollidingKey(i) for i in range(50)]
+        hashmap = PersistentHashMap[CollidingKey, int]()
+        for key in keys:
+            hashmap = hashmap.set(key, key.value)
+        hashmap = hashmap.set(CollidingKey(7), -7)
+
+        assert len(hashmap) == 50
+        assert hashmap[CollidingKey(7)] == -7
+        assert all(hashmap[key] == key.value for key in keys if key.value != 7)
+        assert CollidingKey(50) not in hashmap
+
+    def test_booleans_and_integers_are_different_keys(self):
+        one_key = objs.create_hash_key(objs.IntegerObject(1))
+        true_key = objs.create_hash_key(objs.TRUE_BOOL_OBJ)
+        assert one_key is not None and true_key is not None
+
+        hashmap = PersistentHashMap([(one_key, "one"), (true_key, "true")])
+
+        assert hashmap[one_key] == "one"
+        assert hashmap[true_key] == "true"
+
+
+class TestHashObjectWithPair:
+    def test_with_pair(self):
+        key = objs.StringObject("b")
+        pair = objs.HashKeyValuePair(key, objs.IntegerObject(2))
+        first_pair = objs.HashKeyValuePair(objs.StringObject("a"), objs.IntegerObject(1))
+        original = objs.HashObject({"a": first_pair})
+
+        added = original.with_pair("b", pair)
+
+        assert len(original.pairs) == 1
+        assert len(added.pairs) == 2
+        assert added.pairs["b"] == pair
+        assert added == objs.HashObject({**original.pairs, "b": pair})
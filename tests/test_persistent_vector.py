@@ -0,0 +1,100 @@
+import pytest
+
+from monkey.containers import PersistentVector
+
+# sizes around the edges of the tail, and of each level of the trie
+SIZES = [0, 1, 31, 32, 33, 64, 65, 1024, 1025, 1056, 1057, 32 * 32 * 32 + 32, 32 * 32 * 32 + 33]
+
+
+class TestPersistentVector:
+    @pytest.mark.parametrize("size", SIZES)
+    def test_construction(self, size: int):
+        vector = PersistentVector(range(size))
+
+        assert len(vector) == size
+        assert list(vector) == list(range(size))
+        assert all(vector[i] == i for i in range(size))
+
+    @pytest.mark.parametrize("size", SIZES)
+    def test_push(self, size: int):
+        vector = PersistentVector[int]()
+        for i in range(size):
+            vector = vector.push(i)
+
+        assert vector == PersistentVector(range(size))
+        assert list(vector) == list(range(size))
+
+    @pytest.mark.parametrize("size", SIZES[1:])
+    def test_pop(self, size: int):
+        vector = PersistentVector(range(size))
+        popped = vector.pop()
+
+        assert list(popped) == list(range(size - 1))
+        assert popped.push(-1)[-1] == -1
+
+    def test_pop_down_to_empty(self):
+        vector = PersistentVector(range(1100))
+        for size in range(1100, 0, -1):
+            assert len(vector) == size
+            assert vector[-1] == size - 1
+            vector = vector.pop()
+
+        assert len(vector) == 0
+        with pytest.raises(IndexError):
+            vector.pop()
+
+    @pytest.mark.parametrize("size", SIZES[1:])
+    def test_rest(self, size: int):
+        vector = PersistentVector(range(size))
+        rest = vector.rest()
+
+        assert list(rest) == list(range(1, size))
+        assert list(rest.push(size)) == list(range(1, size + 1))
+
+    def test_rest_then_pop(self):
+        vector = PersistentVector(range(40))
+        for _ in range(10):
+            vector = vector.rest()
+        for _ in range(20):
+            vector = vector.pop()
+
+        assert list(vector) == list(range(10, 20))
+        assert [vector[i] for i in range(-10, 10)] == list(range(10, 20)) * 2
+
+    def test_old_versions_are_unchanged(self):
+        original = PersistentVector(range(100))
+        pushed = original.push(100)
+        popped = original.pop()
+        rest = original.rest()
+
+        assert list(original) == list(range(100))
+        assert list(pushed) == list(range(101))
+        assert list(popped) == list(range(99))
+        assert list(rest) == list(range(1, 100))
+
+    @pytest.mark.parametrize("index", [3, -4])
+    def test_index_out_of_range(self, index: int):
+        vector = PersistentVector([1, 2, 3])
+
+        with pytest.raises(IndexError):
+            vector[index]
+
+    def test_empty_rest_raises(self):
+        with pytest.raises(IndexError):
+            PersistentVector[int]().rest()
+
+    def test_slice(self):
+        vector = PersistentVector(range(100))
+
+        assert vector[10:20] == PersistentVector(range(10, 20))
+        assert list(vector[::-1]) == list(range(99, -1, -1))
+
+    def test_equality(self):
+        assert PersistentVector([1, 2]) == PersistentVector([1, 2])
+        assert PersistentVector([1, 2]) != PersistentVector([1, 2, 3])
+        assert PersistentVector([1, 2]).rest() == PersistentVector([2])
+        assert PersistentVector([1, 2]) != [1, 2]
+
+    def test_not_hashable(self):
+        with pytest.raises(TypeError):
+            hash(PersistentVector([1]))
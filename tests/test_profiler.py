@@ -0,0 +1,133 @@
+import pytest
+
+import monkey.compiler as comp
+import monkey.virtual_machine as vm
+from monkey.virtual_machine.profiler import MAIN_FUNCTION_NAME
+
+import compiler_utils
+
+
+def profile(input_text: str, options: comp.CompilerOptions = comp.CompilerOptions()) -> vm.ProfileReport:
+    compiler = comp.Compiler(options)
+    comp.compile(compiler, compiler_utils.parse(input_text))
+    machine = vm.VirtualMachine(comp.bytecode_from_compiler(compiler))
+
+    profiler = vm.Profiler()
+    vm.run(machine, vm.ExecutionMode.DISPATCH_TABLE, profiler=profiler)
+
+    return profiler.report()
+
+
+def opcode_counts(report: vm.ProfileReport) -> dict[str, int]:
+    return {opcode_profile.name: opcode_profile.count for opcode_profile in report.opcodes}
+
+
+def function_profiles(report: vm.ProfileReport) -> dict[str, vm.FunctionProfile]:
+    return {function_profile.name: function_profile for function_profile in report.functions}
+
+
+class TestProfiler:
+    def test_opcode_counts(self):
+        report = profile("let a = 1; a + a;")
+
+        assert opcode_counts(report) == {
+            "OPCONSTANT": 1,
+            "OPSETGLOBAL": 1,
+            "OPGETGLOBAL": 2,
+            "OPADD": 1,
+            "OPPOP": 1,
+        }
+
+    def test_times_add_up(self):
+        report = profile("let f = fn(x) { x * 2 }; f(1) + f(2);")
+
+        opcode_seconds = sum(opcode_profile.seconds for opcode_profile in report.opcodes)
+        exclusive_seconds = sum(function_profile.exclusive_seconds for function_profile in report.functions)
+
+        assert report.total_seconds > 0.0
+        assert opcode_seconds == pytest.approx(report.total_seconds)
+        assert exclusive_seconds == pytest.approx(report.total_seconds)
+
+        main_profile = function_profiles(report)[MAIN_FUNCTION_NAME]
+        assert main_profile.inclusive_seconds == pytest.approx(report.total_seconds)
+
+    def test_function_calls(self):
+        report = profile(
+            """
+            let double = fn(x) { x * 2 };
+            let twice = fn(x) { double(double(x)) };
+            twice(1) + twice(2) + twice(3);
+            """
+        )
+        profiles = function_profiles(report)
+
+        assert profiles[MAIN_FUNCTION_NAME].calls == 1
+        assert sorted(profile.calls for profile in report.functions) == [1, 3, 6]
+
+        # the inclusive time of each function covers the functions that it calls
+        n_instructions = sum(profile.n_instructions for profile in report.functions)
+        assert profiles[MAIN_FUNCTION_NAME].n_instructions < n_instructions
+        for function_profile in report.functions:
+            assert function_profile.inclusive_seconds >= function_profile.exclusive_seconds
+
+    @pytest.mark.parametrize("use_tail_calls", [True, False])
+    def test_recursive_calls(self, use_tail_calls: bool):
+        # the recursive call is in tail position; it is only a tail call if the compiler says so
+        report = profile(
+            """
+            let countdown = fn(x) {
+                if (x == 0) {
+                    return 0;
+                }
+                countdown(x - 1)
+            };
+            countdown(9);
+            """,
+            comp.CompilerOptions(use_tail_calls=use_tail_calls),
+        )
+        counts = opcode_counts(report)
+        calls = [profile.calls for profile in report.functions if profile.name != MAIN_FUNCTION_NAME]
+
+        assert calls == [10]
+        if use_tail_calls:
+            assert counts["OPTAILCALL"] == 9
+        else:
+            assert counts["OPCALL"] == 10
+
+    def test_builtin_calls_are_not_functions(self):
+        report = profile('len("monkey") + len([1, 2]);')
+
+        assert [profile.name for profile in report.functions] == [MAIN_FUNCTION_NAME]
+        assert opcode_counts(report)["OPCALL"] == 2
+
+    def test_report_is_formatted(self):
+        report = profile("let f = fn() { 1 }; f();")
+        formatted = vm.format_profile_report(report)
+
+        assert "OPCALL" in formatted
+        assert MAIN_FUNCTION_NAME in formatted
+
+    def test_profile_of_failed_run(self):
+        compiler = comp.Compiler()
+        comp.compile(compiler, compiler_utils.parse("let f = fn(x) { x + true }; f(1);"))
+        machine = vm.VirtualMachine(comp.bytecode_from_compiler(compiler))
+        profiler = vm.Profiler()
+
+        with pytest.raises(vm.VirtualMachineError):
+            vm.run(machine, vm.ExecutionMode.DISPATCH_TABLE, profiler=profiler)
+
+        # the calls that were still active when the error was raised are ended anyway
+        report = profiler.report()
+        assert all(profile.calls == 1 for profile in report.functions)
+        assert function_profiles(report)[MAIN_FUNCTION_NAME].inclusive_seconds == pytest.approx(
+            report.total_seconds
+        )
+
+    @pytest.mark.parametrize("mode", [vm.ExecutionMode.BYTECODE, vm.ExecutionMode.PREDECODED])
+    def test_only_dispatch_table_is_profiled(self, mode: vm.ExecutionMode):
+        compiler = comp.Compiler()
+        comp.compile(compiler, compiler_utils.parse("1 + 2;"))
+        machine = vm.VirtualMachine(comp.bytecode_from_compiler(compiler))
+
+        with pytest.raises(vm.VirtualMachineError):
+            vm.run(machine, mode, profiler=vm.Profiler())
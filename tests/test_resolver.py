@@ -0,0 +1,92 @@
+import pytest
+
+from monkey.evaluator import evaluate
+from monkey.evaluator import resolve
+from monkey.evaluator.resolver import FunctionBody
+from monkey.evaluator.resolver import ResolvedIdentifier
+import monkey.object as objs
+
+from utils_for_tests import DIFFERENTIAL_PROGRAMS
+from utils_for_tests import program_and_env
+
+
+@pytest.mark.parametrize("monkey_code", DIFFERENTIAL_PROGRAMS)
+def test_resolved_program_agrees_with_evaluate(monkey_code):
+    program, env = program_and_env(monkey_code)
+    assert not program.has_errors()
+
+    expected = evaluate(program, env)
+    actual = evaluate(resolve(program), objs.Environment())
+
+    # a function object holds its environment, which is an ArrayEnvironment once resolved
+    assert actual.inspect() == expected.inspect()
+    if not isinstance(expected, objs.FunctionObject):
+        assert actual == expected
+
+
+def test_resolve_leaves_program_unchanged():
+    program, _ = program_and_env("let f = fn(x) { let y = x; y }; f(1);")
+    resolved = resolve(program)
+
+    assert resolved == program
+    assert str(resolved) == str(program)
+    assert type(program.statements[0].value.body) is not FunctionBody
+    assert type(resolved.statements[0].value.body) is FunctionBody
+
+
+def test_addresses():
+    monkey_code = """
+    let g = 1;
+    fn(a, b) {
+        let c = a;
+        fn(d) {
+            a + c + d + g + b;
+        }
+    };
+    """
+    program, _ = program_and_env(monkey_code)
+    resolved = resolve(program)
+
+    outer_literal = resolved.statements[1].value
+    assert isinstance(outer_literal.body, FunctionBody)
+    assert outer_literal.body.layout.names == ("a", "b", "c")
+    assert outer_literal.body.layout.n_parameters == 2
+
+    inner_literal = outer_literal.body.statements[1].value
+    assert inner_literal.body.layout.names == ("d",)
+
+    # ((((a + c) + d) + g) + b)
+    sum_expr = inner_literal.body.statements[0].value
+    addresses = {}
+    while not isinstance(sum_expr, ResolvedIdentifier):
+        addresses[sum_expr.right.value] = (sum_expr.right.depth, sum_expr.right.slot)
+        sum_expr = sum_expr.left
+    addresses[sum_expr.value] = (sum_expr.depth, sum_expr.slot)
+
+    assert addresses == {"a": (1, 0), "b": (1, 1), "c": (1, 2), "d": (0, 0), "g": (2, None)}
+
+
+def test_repeated_parameter_uses_last_argument():
+    program, _ = program_and_env("let f = fn(x, x) { x }; f(1, 2);")
+
+    assert evaluate(program, objs.Environment()) == objs.IntegerObject(2)
+    assert evaluate(resolve(program), objs.Environment()) == objs.IntegerObject(2)
+
+
+def test_too_few_arguments_fails_like_evaluate():
+    program, _ = program_and_env("let f = fn(x, y) { x }; f(1);")
+
+    with pytest.raises(IndexError):
+        evaluate(program, objs.Environment())
+    with pytest.raises(IndexError):
+        evaluate(resolve(program), objs.Environment())
+
+
+def test_function_call_creates_array_environment():
+    program, _ = program_and_env("let f = fn(x) { let y = x + 1; fn() { y } }; f(1);")
+    closure = evaluate(resolve(program), objs.Environment())
+
+    assert isinstance(closure, objs.FunctionObject)
+    assert isinstance(closure.env, objs.ArrayEnvironment)
+    assert closure.env.slots == [objs.IntegerObject(1), objs.IntegerObject(2)]
+    assert closure.env.store == {"x": objs.IntegerObject(1), "y": objs.IntegerObject(2)}
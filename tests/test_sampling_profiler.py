@@ -0,0 +1,87 @@
+import re
+
+import pytest
+
+import monkey.compiler as comp
+import monkey.object as objs
+import monkey.virtual_machine as vm
+from monkey.virtual_machine.profiler import MAIN_FUNCTION_NAME
+from monkey.virtual_machine.stack_frame import StackFrame
+
+import compiler_utils
+
+FIBONACCI_PROGRAM = """
+let fibonacci = fn(n) {
+    if (n < 2) {
+        return n;
+    }
+    fibonacci(n - 1) + fibonacci(n - 2);
+};
+fibonacci(15);
+"""
+
+
+def make_machine(input_text: str) -> vm.VirtualMachine:
+    compiler = comp.Compiler()
+    comp.compile(compiler, compiler_utils.parse(input_text))
+    return vm.VirtualMachine(comp.bytecode_from_compiler(compiler))
+
+
+def function_constant(machine: vm.VirtualMachine, i_constant: int) -> objs.CompiledFunctionObject:
+    constant = machine.constants[i_constant]
+    assert isinstance(constant, objs.CompiledFunctionObject)
+    return constant
+
+
+class TestSamplingProfiler:
+    def test_stack_of_main_program(self):
+        sampler = vm.SamplingProfiler(make_machine("1;"))
+
+        assert sampler.current_stack() == (MAIN_FUNCTION_NAME,)
+
+    def test_stack_names_functions(self):
+        machine = make_machine("let outer = fn() { fn() { 1 } }; outer;")
+        sampler = vm.SamplingProfiler(machine)
+
+        # push frames by hand, as though each function in the constant pool called the next
+        expected_stack = [MAIN_FUNCTION_NAME]
+        for i_constant, constant in enumerate(machine.constants):
+            if isinstance(constant, objs.CompiledFunctionObject):
+                machine.frames.push(StackFrame(objs.ClosureObject(constant, []), base_pointer=0))
+                name = constant.name if constant.name is not None else f"<function {i_constant}>"
+                expected_stack.append(name)
+
+        assert sampler.current_stack() == tuple(expected_stack)
+        assert sorted(expected_stack[1:]) == ["<function 1>", "outer"]
+
+    def test_collapsed_stacks(self):
+        machine = make_machine("1;")
+        sampler = vm.SamplingProfiler(machine)
+        sampler.take_sample()
+        sampler.take_sample()
+
+        assert sampler.collapsed_stacks() == [f"{MAIN_FUNCTION_NAME} 2"]
+
+    @pytest.mark.parametrize("mode", list(vm.ExecutionMode))
+    def test_sampled_run(self, mode: vm.ExecutionMode, tmp_path):
+        machine = make_machine(FIBONACCI_PROGRAM)
+
+        with vm.SamplingProfiler(machine, interval_seconds=0.0001) as sampler:
+            vm.run(machine, mode)
+            # make sure that the sampling thread gets a turn, however quickly the program ran
+            sampler.take_sample()
+
+        assert machine.stack.maybe_get_last_popped() == objs.IntegerObject(610)
+        assert sum(sampler.samples.values()) > 0
+        for stack in sampler.samples:
+            assert stack[0] == MAIN_FUNCTION_NAME
+            assert all(name == "fibonacci" for name in stack[1:])
+
+        filepath = tmp_path / "fibonacci.folded"
+        sampler.write_collapsed_stacks(filepath)
+        for line in filepath.read_text().splitlines():
+            assert re.fullmatch(r"<main>(;fibonacci)* \d+", line)
+
+    def test_invalid_interval(self):
+        with pytest.raises(ValueError):
+            vm.SamplingProfiler(make_machine("1;"), interval_seconds=0.0)
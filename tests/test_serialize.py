@@ -0,0 +1,256 @@
+import pickle
+import struct
+import zlib
+
+import pytest
+
+import monkey.code.opcodes as opcodes
+import monkey.compiler as comp
+import monkey.object as objs
+import monkey.virtual_machine as vm
+
+from monkey.code import make_instruction
+from monkey.serialize import SerializeError
+from monkey.serialize.binary_format import CHECKSUM_START
+from monkey.serialize.binary_format import CONSTANT_ENTRY_STRUCT
+from monkey.serialize.binary_format import FORMAT_VERSION
+from monkey.serialize.binary_format import HEADER_STRUCT
+from monkey.serialize.binary_format import MAGIC_NUMBER
+from monkey.serialize.binary_format import decode_bytecode
+from monkey.serialize.binary_format import encode_bytecode
+from monkey.serialize.mapped_bytecode import LazyConstantPool
+from monkey.serialize.mapped_bytecode import bytecode_from_buffer
+from monkey.serialize.mapped_bytecode import map_bytecode
+from monkey.serialize.serialize import deserialize_bytecode
+from monkey.serialize.serialize import serialize_bytecode
+
+import compiler_utils
+
+
+def compile_bytecode(input_text: str) -> comp.Bytecode:
+    compiler = comp.Compiler()
+    comp.compile(compiler, compiler_utils.parse(input_text))
+    return comp.bytecode_from_compiler(compiler)
+
+
+def damage_function_name_length(data: bytes, name_length: int) -> bytearray:
+    """
+    Replace the length of the name of the first constant, a function, and fix the checksum so
+    that the damage isn't caught by it.
+    """
+    damaged = bytearray(data)
+    _, offset, _ = CONSTANT_ENTRY_STRUCT.unpack_from(damaged, HEADER_STRUCT.size)
+    struct.pack_into(">i", damaged, offset + 8, name_length)
+    struct.pack_into(">I", damaged, len(MAGIC_NUMBER) + 4, zlib.crc32(damaged[CHECKSUM_START:]))
+
+    return damaged
+
+
+def function_names(bytecode: comp.Bytecode) -> list[str | None]:
+    # the names aren't compared by equality, so they are checked separately
+    return [c.name for c in bytecode.constants if isinstance(c, objs.CompiledFunctionObject)]
+
+
+class TestSerialize:
+    def test_round_trip(self, tmp_path):
+        bytecode = compile_bytecode('let add = fn(a, b) { a + b }; add(1, 2); "monkey"; fn() { 3 };')
+        filepath = tmp_path / "program.monkeybyte"
+
+        serialize_bytecode(bytecode, filepath)
+        deserialized = deserialize_bytecode(filepath)
+
+        assert deserialized.instructions == bytecode.instructions
+        assert deserialized.constants == bytecode.constants
+        assert function_names(deserialized) == ["add", None]
+
+    @pytest.mark.parametrize(
+        "constant",
+        [
+            objs.IntegerObject(0),
+            objs.IntegerObject(-1),
+            objs.IntegerObject(127),
+            objs.IntegerObject(128),
+            objs.IntegerObject(-129),
+            objs.IntegerObject(2**100),
+            objs.IntegerObject(-(2**100)),
+            objs.StringObject(""),
+            objs.StringObject("monkey 🐒 ünïcödé"),
+            objs.CompiledFunctionObject(make_instruction(opcodes.OPRETURN), 0, 0),
+            objs.CompiledFunctionObject(make_instruction(opcodes.OPRETURN), 2, 1, "ü"),
+        ],
+    )
+    def test_constant_round_trip(self, constant: objs.Object):
+        bytecode = comp.Bytecode(make_instruction(opcodes.OPCONSTANT, 0), [constant])
+        decoded = decode_bytecode(encode_bytecode(bytecode))
+
+        assert decoded.instructions == bytecode.instructions
+        assert decoded.constants == [constant]
+        assert function_names(decoded) == function_names(bytecode)
+
+    def test_empty_program(self):
+        bytecode = comp.Bytecode(make_instruction(opcodes.OPNULL)[:0], [])
+        decoded = decode_bytecode(encode_bytecode(bytecode))
+
+        assert decoded.instructions == bytecode.instructions
+        assert decoded.constants == []
+
+    def test_decoded_instructions_are_mutable(self):
+        # the compiler and the VM expect Instructions, not a read-only view of the data
+        decoded = decode_bytecode(encode_bytecode(compile_bytecode("let f = fn() { 1 }; f();")))
+
+        assert isinstance(decoded.instructions, bytearray)
+        for function in decoded.constants:
+            if isinstance(function, objs.CompiledFunctionObject):
+                assert isinstance(function.instructions, bytearray)
+
+    def test_header(self):
+        data = encode_bytecode(compile_bytecode("1 + 2;"))
+
+        assert data.startswith(MAGIC_NUMBER)
+        assert struct.unpack_from(">H", data, len(MAGIC_NUMBER))[0] == FORMAT_VERSION
+
+    def test_wrong_magic_number(self):
+        data = bytearray(encode_bytecode(compile_bytecode("1;")))
+        data[0:1] = b"X"
+
+        with pytest.raises(SerializeError, match="magic number"):
+            decode_bytecode(data)
+
+    def test_unsupported_version(self):
+        data = bytearray(encode_bytecode(compile_bytecode("1;")))
+        struct.pack_into(">H", data, len(MAGIC_NUMBER), FORMAT_VERSION + 1)
+
+        with pytest.raises(SerializeError, match="version"):
+            decode_bytecode(data)
+
+    def test_corrupted_data(self):
+        data = bytearray(encode_bytecode(compile_bytecode('"monkey";')))
+        data[-1] ^= 0xFF
+
+        with pytest.raises(SerializeError, match="checksum"):
+            decode_bytecode(data)
+
+    @pytest.mark.parametrize("n_bytes", [0, 10, CHECKSUM_START, CHECKSUM_START + 5])
+    def test_truncated_data(self, n_bytes: int):
+        data = encode_bytecode(compile_bytecode('let f = fn() { "monkey" }; f();'))
+
+        with pytest.raises(SerializeError):
+            decode_bytecode(data[:n_bytes])
+
+    @pytest.mark.parametrize("name_length", [100, -2])
+    def test_invalid_function_name_length(self, name_length: int):
+        function = objs.CompiledFunctionObject(make_instruction(opcodes.OPRETURN), 0, 0, "main")
+        data = damage_function_name_length(
+            encode_bytecode(comp.Bytecode(make_instruction(opcodes.OPCONSTANT, 0), [function])), name_length
+        )
+
+        with pytest.raises(SerializeError, match="name"):
+            decode_bytecode(data)
+        with pytest.raises(SerializeError, match="name"):
+            bytecode_from_buffer(data, check_checksum=True).constants[0]
+
+    def test_pickled_file_is_rejected(self, tmp_path):
+        # the format that came before this one; pickles are never loaded
+        filepath = tmp_path / "program.monkeybyte"
+        with open(filepath, "wb") as fout:
+            pickle.dump([make_instruction(opcodes.OPNULL), 1], fout)
+
+        with pytest.raises(SerializeError):
+            deserialize_bytecode(filepath)
+
+    def test_unserializable_constant(self):
+        bytecode = comp.Bytecode(make_instruction(opcodes.OPCONSTANT, 0), [objs.ArrayObject([])])
+
+        with pytest.raises(SerializeError):
+            encode_bytecode(bytecode)
+
+
+# two of the functions are never called, and their constants are never used
+LAZY_PROGRAM = """
+let unused = fn(x) { x * 1000 };
+let also_unused = fn() { "never created" };
+let fibonacci = fn(n) { if (n < 2) { n } else { fibonacci(n - 1) + fibonacci(n - 2) } };
+let adder = fn(a) { fn(b) { a + b } };
+fibonacci(10) + adder(3)(4);
+"""
+
+
+def run_program(bytecode: comp.Bytecode, mode: vm.ExecutionMode) -> objs.Object | None:
+    machine = vm.VirtualMachine(bytecode)
+    vm.run(machine, mode)
+    return machine.stack.maybe_get_last_popped()
+
+
+class TestMappedBytecode:
+    @pytest.mark.parametrize("mode", list(vm.ExecutionMode))
+    @pytest.mark.parametrize("use_superinstructions", [False, True])
+    def test_runs_like_eager_bytecode(self, tmp_path, mode: vm.ExecutionMode, use_superinstructions: bool):
+        compiler = comp.Compiler(comp.CompilerOptions(use_superinstructions=use_superinstructions))
+        comp.compile(compiler, compiler_utils.parse(LAZY_PROGRAM))
+        filepath = tmp_path / "program.monkeybyte"
+        serialize_bytecode(comp.bytecode_from_compiler(compiler), filepath)
+
+        eager_result = run_program(deserialize_bytecode(filepath), mode)
+        mapped_result = run_program(map_bytecode(filepath), mode)
+
+        assert mapped_result == eager_result == objs.IntegerObject(62)
+
+    def test_constants_are_created_when_used(self, tmp_path):
+        filepath = tmp_path / "program.monkeybyte"
+        serialize_bytecode(compile_bytecode(LAZY_PROGRAM), filepath)
+
+        bytecode = map_bytecode(filepath)
+        constants = bytecode.constants
+        assert isinstance(constants, LazyConstantPool)
+        assert constants.n_created() == 0
+
+        run_program(bytecode, vm.ExecutionMode.BYTECODE)
+        assert 0 < constants.n_created() < len(constants)
+
+    def test_constants_match_eager_constants(self):
+        bytecode = compile_bytecode(LAZY_PROGRAM)
+        mapped = bytecode_from_buffer(encode_bytecode(bytecode))
+
+        assert mapped.instructions == bytecode.instructions
+        assert list(mapped.constants) == list(bytecode.constants)
+        assert function_names(mapped) == function_names(bytecode)
+
+    def test_constants_are_created_once(self):
+        mapped = bytecode_from_buffer(encode_bytecode(compile_bytecode(LAZY_PROGRAM)))
+
+        assert mapped.constants[0] is mapped.constants[0]
+        assert mapped.constants[-1] is mapped.constants[len(mapped.constants) - 1]
+        with pytest.raises(IndexError):
+            mapped.constants[len(mapped.constants)]
+
+    def test_instructions_are_not_copied(self):
+        mapped = bytecode_from_buffer(encode_bytecode(compile_bytecode("let f = fn() { 1 }; f();")))
+
+        assert isinstance(mapped.instructions, memoryview)
+        assert mapped.instructions.readonly
+        for function in mapped.constants:
+            if isinstance(function, objs.CompiledFunctionObject):
+                assert isinstance(function.instructions, memoryview)
+
+    def test_checksum_is_checked_when_asked(self):
+        data = bytearray(encode_bytecode(compile_bytecode('"monkey";')))
+        data[-1] ^= 0xFF
+
+        bytecode_from_buffer(data)
+        with pytest.raises(SerializeError, match="checksum"):
+            bytecode_from_buffer(data, check_checksum=True)
+
+    def test_truncated_constant(self):
+        data = encode_bytecode(compile_bytecode('"monkey";'))
+        mapped = bytecode_from_buffer(data[:-1])
+
+        with pytest.raises(SerializeError, match="truncated"):
+            mapped.constants[0]
+
+    @pytest.mark.parametrize("contents", [b"", b"MONKEY", pickle.dumps([1, 2, 3])])
+    def test_invalid_file(self, tmp_path, contents: bytes):
+        filepath = tmp_path / "program.monkeybyte"
+        filepath.write_bytes(contents)
+
+        with pytest.raises(SerializeError):
+            map_bytecode(filepath)
@@ -0,0 +1,74 @@
+import pytest
+
+import monkey.object as objs
+import monkey.virtual_machine as vm
+
+from monkey.compiler import bytecode_from_compiler
+from monkey.compiler import Compiler
+from monkey.compiler import compile
+from monkey.evaluator.evaluator import evaluate
+
+from monkey.object.small_integers import DEFAULT_SMALL_INTEGER_MAXIMUM
+from monkey.object.small_integers import DEFAULT_SMALL_INTEGER_MINIMUM
+
+from compiler_utils import parse
+from utils_for_tests import program_and_env
+
+
+@pytest.fixture
+def restore_small_integer_cache():
+    yield
+    objs.configure_small_integer_cache(DEFAULT_SMALL_INTEGER_MINIMUM, DEFAULT_SMALL_INTEGER_MAXIMUM)
+
+
+@pytest.mark.parametrize(
+    "value", [DEFAULT_SMALL_INTEGER_MINIMUM, -1, 0, 1, 255, DEFAULT_SMALL_INTEGER_MAXIMUM]
+)
+def test_small_integers_are_shared(value):
+    assert objs.integer_object(value) is objs.integer_object(value)
+    assert objs.integer_object(value) == objs.IntegerObject(value)
+
+
+@pytest.mark.parametrize(
+    "value", [DEFAULT_SMALL_INTEGER_MINIMUM - 1, DEFAULT_SMALL_INTEGER_MAXIMUM + 1, 10**20]
+)
+def test_large_integers_are_created(value):
+    assert objs.integer_object(value) is not objs.integer_object(value)
+    assert objs.integer_object(value) == objs.IntegerObject(value)
+
+
+def test_configure_small_integer_cache(restore_small_integer_cache):
+    objs.configure_small_integer_cache(0, 10)
+    assert objs.small_integer_cache_range() == (0, 10)
+    assert objs.integer_object(10) is objs.integer_object(10)
+    assert objs.integer_object(11) is not objs.integer_object(11)
+
+    objs.configure_small_integer_cache(0, -1)
+    assert objs.small_integer_cache_range() == (0, -1)
+    assert objs.integer_object(0) is not objs.integer_object(0)
+
+
+def test_boolean_object():
+    assert objs.boolean_object(True) is objs.TRUE_BOOL_OBJ
+    assert objs.boolean_object(False) is objs.FALSE_BOOL_OBJ
+
+    program, env = program_and_env("1 < 2;")
+    assert evaluate(program, env) is objs.TRUE_BOOL_OBJ
+
+
+# the expected objects are looked up inside each test; reconfiguring the cache replaces them
+@pytest.mark.parametrize("monkey_code, value", [("2 + 3;", 5), ("-7;", -7), ("len([1, 2]);", 2)])
+def test_evaluator_results_are_shared(monkey_code, value):
+    program, env = program_and_env(monkey_code)
+    assert evaluate(program, env) is objs.integer_object(value)
+
+
+@pytest.mark.parametrize("mode", list(vm.ExecutionMode))
+def test_virtual_machine_results_are_shared(mode):
+    compiler = Compiler()
+    compile(compiler, parse("let i = 0; while (i < 10) { i = i + 1; }; i * 2 - 3;"))
+
+    machine = vm.VirtualMachine(bytecode_from_compiler(compiler))
+    vm.run(machine, mode)
+
+    assert machine.stack.maybe_get_last_popped() is objs.integer_object(17)
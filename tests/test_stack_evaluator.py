@@ -0,0 +1,89 @@
+import sys
+
+import pytest
+
+from monkey.evaluator import EvaluationError
+from monkey.evaluator import evaluate
+from monkey.evaluator import evaluate_iteratively
+from monkey.evaluator import resolve
+import monkey.object as objs
+
+from utils_for_tests import DIFFERENTIAL_PROGRAMS
+from utils_for_tests import program_and_env
+
+COUNT_DOWN = "let count = fn(n) { if (n == 0) { 0 } else { 1 + count(n - 1) } };"
+
+
+@pytest.mark.parametrize("monkey_code", DIFFERENTIAL_PROGRAMS)
+def test_agrees_with_evaluate(monkey_code):
+    program, env = program_and_env(monkey_code)
+    assert not program.has_errors()
+
+    expected = evaluate(program, env)
+    actual = evaluate_iteratively(program, objs.Environment())
+
+    assert actual == expected
+    assert actual.inspect() == expected.inspect()
+
+
+@pytest.mark.parametrize("monkey_code", DIFFERENTIAL_PROGRAMS)
+def test_agrees_with_evaluate_after_resolving(monkey_code):
+    program, env = program_and_env(monkey_code)
+
+    expected = evaluate(program, env)
+    actual = evaluate_iteratively(resolve(program), objs.Environment())
+
+    assert actual.inspect() == expected.inspect()
+
+
+def test_deep_recursion_does_not_use_the_python_stack():
+    depth = 20 * sys.getrecursionlimit()
+    program, env = program_and_env(f"{COUNT_DOWN} count({depth});")
+
+    assert evaluate_iteratively(program, env) == objs.IntegerObject(depth)
+
+
+def test_deep_mutual_recursion():
+    monkey_code = """
+    let is_even = fn(n) { if (n == 0) { true } else { is_odd(n - 1) } };
+    let is_odd = fn(n) { if (n == 0) { false } else { is_even(n - 1) } };
+    [is_even(5000), is_odd(5000), is_even(5001)];
+    """
+    program, env = program_and_env(monkey_code)
+    expected = objs.ArrayObject([objs.TRUE_BOOL_OBJ, objs.FALSE_BOOL_OBJ, objs.FALSE_BOOL_OBJ])
+
+    assert evaluate_iteratively(program, env) == expected
+
+
+# counting down from `depth` makes `depth + 1` nested calls
+@pytest.mark.parametrize("depth", [0, 9, 999])
+def test_max_call_depth_allows_calls_up_to_it(depth):
+    program, env = program_and_env(f"{COUNT_DOWN} count({depth});")
+
+    assert evaluate_iteratively(program, env, max_call_depth=depth + 1) == objs.IntegerObject(depth)
+
+
+@pytest.mark.parametrize("depth", [0, 9, 999])
+def test_max_call_depth_exceeded(depth):
+    program, env = program_and_env(f"{COUNT_DOWN} count({depth});")
+
+    with pytest.raises(EvaluationError):
+        evaluate_iteratively(program, env, max_call_depth=depth)
+
+
+def test_call_depth_is_not_the_number_of_calls():
+    monkey_code = "let f = fn(x) { x + 1 }; let i = 0; while (i < 100) { i = f(i); } i;"
+    program, env = program_and_env(monkey_code)
+
+    assert evaluate_iteratively(program, env, max_call_depth=1) == objs.IntegerObject(100)
+
+
+def test_error_stops_evaluation():
+    # the array is never built; the second `push` would add to it if the loop carried on
+    monkey_code = "let a = [1]; let f = fn() { a = push(a, 2); }; [1 + true, f()]; a;"
+    program, env = program_and_env(monkey_code)
+
+    result = evaluate_iteratively(program, env)
+
+    assert result == objs.TypeMismatchErrorObject(objs.ObjectType.INTEGER, objs.ObjectType.BOOLEAN, "+")
+    assert env.get("a") == objs.ArrayObject([objs.IntegerObject(1)])
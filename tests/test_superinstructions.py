@@ -0,0 +1,163 @@
+import pytest
+
+from monkey.compiler import CompilerOptions
+
+import monkey.code as code
+import monkey.code.opcodes as op
+
+from monkey.compiler.instruction_rewriting import find_jump_targets
+from monkey.compiler.instruction_rewriting import read_instructions
+from monkey.compiler.instruction_rewriting import write_instructions
+from monkey.compiler.superinstructions import fuse_superinstructions
+
+from compiler_utils import CompilerTestCase
+from compiler_utils import perform_compiler_test_case
+
+SUPERINSTRUCTION_OPTIONS = CompilerOptions(
+    use_constant_folding=False, use_peephole=False, use_superinstructions=True
+)
+
+
+class TestSuperinstructions:
+    @pytest.mark.parametrize(
+        "case",
+        [
+            CompilerTestCase(
+                "let x = 1;",
+                (1,),
+                [(op.OPCONSTSETGLOBAL, (0, 0))],
+            ),
+            CompilerTestCase(
+                "fn(a) { a + 1 };",
+                (
+                    1,
+                    (
+                        code.make_instructions_from_opcode_operand_pairs(
+                            [
+                                (op.OPLOCALCONSTADD, (0, 0)),
+                                (op.OPRETURNVALUE, ()),
+                            ]
+                        ),
+                        0,
+                        1,
+                    ),
+                ),
+                [(op.OPCLOSURE, (1, 0)), (op.OPPOP, ())],
+            ),
+            CompilerTestCase(
+                "fn(a) { a - 1 };",
+                (
+                    1,
+                    (
+                        code.make_instructions_from_opcode_operand_pairs(
+                            [
+                                (op.OPLOCALCONSTSUB, (0, 0)),
+                                (op.OPRETURNVALUE, ()),
+                            ]
+                        ),
+                        0,
+                        1,
+                    ),
+                ),
+                [(op.OPCLOSURE, (1, 0)), (op.OPPOP, ())],
+            ),
+            CompilerTestCase(
+                "fn(a, b) { if (a > b) { a } else { b } };",
+                (
+                    (
+                        code.make_instructions_from_opcode_operand_pairs(
+                            [
+                                # replaces the instructions in bytes 0000 to 0008
+                                (op.OPLOCALLOCALGTJUMP, (0, 1, 10)),
+                                (op.OPGETLOCAL, (0,)),
+                                # both jump targets move 3 bytes forward
+                                (op.OPJUMP, (12,)),
+                                (op.OPGETLOCAL, (1,)),
+                                (op.OPRETURNVALUE, ()),
+                            ]
+                        ),
+                        0,
+                        2,
+                    ),
+                ),
+                [(op.OPCLOSURE, (0, 0)), (op.OPPOP, ())],
+            ),
+            CompilerTestCase(
+                "fn(n) { if (n < 2) { n } };",
+                (
+                    2,
+                    (
+                        code.make_instructions_from_opcode_operand_pairs(
+                            [
+                                (op.OPCONSTLOCALGTJUMP, (0, 0, 11)),
+                                (op.OPGETLOCAL, (0,)),
+                                (op.OPJUMP, (12,)),
+                                (op.OPNULL, ()),
+                                (op.OPRETURNVALUE, ()),
+                            ]
+                        ),
+                        0,
+                        1,
+                    ),
+                ),
+                [(op.OPCLOSURE, (1, 0)), (op.OPPOP, ())],
+            ),
+        ],
+    )
+    def test_fused_sequences(self, case: CompilerTestCase):
+        perform_compiler_test_case(case, SUPERINSTRUCTION_OPTIONS)
+
+
+def test_no_fusion_across_a_jump_target():
+    # the OPSETGLOBAL at byte 13 is the target of a jump, so the OPCONSTANT in front of it
+    # cannot be fused together with it
+    instruction_pairs = [
+        (op.OPTRUE, ()),  # 0000
+        (op.OPJUMPWHENFALSE, (10,)),  # 0001
+        (op.OPGETLOCAL, (0,)),  # 0004
+        (op.OPJUMP, (13,)),  # 0006
+        (op.OPTRUE, ()),  # 0009
+        (op.OPCONSTANT, (0,)),  # 0010
+        (op.OPSETGLOBAL, (0,)),  # 0013
+    ]
+    instructions = code.make_instructions_from_opcode_operand_pairs(instruction_pairs)
+
+    expected = code.make_instructions_from_opcode_operand_pairs(
+        [
+            (op.OPTRUE, ()),
+            (op.OPJUMPWHENFALSE, (10,)),
+            (op.OPGETLOCAL, (0,)),
+            (op.OPJUMP, (13,)),
+            (op.OPTRUE, ()),
+            (op.OPCONSTANT, (0,)),
+            (op.OPSETGLOBAL, (0,)),
+        ]
+    )
+
+    assert fuse_superinstructions(instructions) == expected
+
+
+def test_write_instructions_relocates_jumps_past_dropped_instructions():
+    instruction_pairs = [
+        (op.OPJUMP, (5,)),  # 0000
+        (op.OPNULL, ()),  # 0003
+        (op.OPPOP, ()),  # 0004
+        (op.OPTRUE, ()),  # 0005
+        (op.OPJUMP, (9,)),  # 0006, jumps to the end
+    ]
+    instructions = code.make_instructions_from_opcode_operand_pairs(instruction_pairs)
+    located_instructions = read_instructions(instructions)
+    assert find_jump_targets(located_instructions) == {5, 9}
+
+    # dropping the OPNULL and OPPOP moves everything after them forward by two bytes
+    kept = [located_instructions[i] for i in (0, 3, 4)]
+
+    expected = code.make_instructions_from_opcode_operand_pairs(
+        [
+            (op.OPJUMP, (3,)),
+            (op.OPTRUE, ()),
+            (op.OPJUMP, (7,)),
+        ]
+    )
+
+    assert write_instructions(kept, len(instructions)) == expected
@@ -0,0 +1,108 @@
+import pytest
+
+from monkey.compiler import CompilerOptions
+
+import monkey.code as code
+import monkey.code.opcodes as op
+
+from compiler_utils import CompilerTestCase
+from compiler_utils import perform_compiler_test_case
+
+TAIL_CALL_OPTIONS = CompilerOptions(
+    use_constant_folding=False,
+    use_constant_interning=False,
+    use_peephole=False,
+    use_tail_calls=True,
+    use_superinstructions=False,
+)
+
+
+def make_function(instruction_pairs, n_locals: int, n_arguments: int):
+    return (code.make_instructions_from_opcode_operand_pairs(instruction_pairs), n_locals, n_arguments)
+
+
+class TestTailCalls:
+    @pytest.mark.parametrize(
+        "input_text",
+        [
+            "fn(f) { return f(); };",
+            "fn(f) { f() };",
+        ],
+    )
+    def test_call_in_tail_position(self, input_text: str):
+        function = make_function(
+            [(op.OPGETLOCAL, (0,)), (op.OPTAILCALL, (0,))],
+            n_locals=0,
+            n_arguments=1,
+        )
+        case = CompilerTestCase(input_text, (function,), [(op.OPCLOSURE, (0, 0)), (op.OPPOP, ())])
+        perform_compiler_test_case(case, TAIL_CALL_OPTIONS)
+
+    def test_calls_in_tail_position_of_both_branches(self):
+        function = make_function(
+            [
+                (op.OPTRUE, ()),  # 0000
+                (op.OPJUMPWHENFALSE, (8,)),  # 0001
+                (op.OPGETLOCAL, (0,)),  # 0004
+                (op.OPTAILCALL, (0,)),  # 0006
+                (op.OPGETLOCAL, (1,)),  # 0008
+                (op.OPTAILCALL, (0,)),  # 0010
+                (op.OPRETURNVALUE, ()),  # 0012
+            ],
+            n_locals=0,
+            n_arguments=2,
+        )
+        # the OPJUMP after the first call is dropped; the OPRETURNVALUE after the second call
+        # stays, because that OPJUMP landed on it
+        case = CompilerTestCase(
+            "fn(f, g) { if (true) { f() } else { g() } };",
+            (function,),
+            [(op.OPCLOSURE, (0, 0)), (op.OPPOP, ())],
+        )
+        perform_compiler_test_case(case, TAIL_CALL_OPTIONS)
+
+    @pytest.mark.parametrize(
+        "input_text, function",
+        [
+            # the result of the call is still needed after it returns
+            (
+                "fn(f) { f() + 1 };",
+                make_function(
+                    [
+                        (op.OPGETLOCAL, (0,)),
+                        (op.OPCALL, (0,)),
+                        (op.OPCONSTANT, (0,)),
+                        (op.OPADD, ()),
+                        (op.OPRETURNVALUE, ()),
+                    ],
+                    n_locals=0,
+                    n_arguments=1,
+                ),
+            ),
+            (
+                "fn(f) { f(); 1 };",
+                make_function(
+                    [
+                        (op.OPGETLOCAL, (0,)),
+                        (op.OPCALL, (0,)),
+                        (op.OPPOP, ()),
+                        (op.OPCONSTANT, (0,)),
+                        (op.OPRETURNVALUE, ()),
+                    ],
+                    n_locals=0,
+                    n_arguments=1,
+                ),
+            ),
+        ],
+    )
+    def test_call_not_in_tail_position(self, input_text: str, function):
+        case = CompilerTestCase(input_text, (1, function), [(op.OPCLOSURE, (1, 0)), (op.OPPOP, ())])
+        perform_compiler_test_case(case, TAIL_CALL_OPTIONS)
+
+    def test_main_program_has_no_tail_calls(self):
+        case = CompilerTestCase(
+            "len([]);",
+            (),
+            [(op.OPGETBUILTIN, (0,)), (op.OPARRAY, (0,)), (op.OPCALL, (1,)), (op.OPPOP, ())],
+        )
+        perform_compiler_test_case(case, TAIL_CALL_OPTIONS)
@@ -3,8 +3,13 @@ from typing import Any
 
 import pytest
 
+import monkey.code as code
+import monkey.code.opcodes as opcodes
 import monkey.compiler as comp
+import monkey.object as objs
 import monkey.virtual_machine as vm
+from monkey.virtual_machine.constants import MAX_VM_FRAME_SIZE
+from monkey.virtual_machine.constants import MAX_VM_STACK_SIZE
 
 import compiler_utils
 import object_utils
@@ -16,6 +21,15 @@ class VirtualMachineTestCase:
     expected: Any
 
 
+# every program is compiled with each of these, to check that the optional compiler passes
+# do not change what the program does
+COMPILER_OPTIONS_VARIANTS = [
+    compiler_utils.UNOPTIMIZED_OPTIONS,
+    comp.CompilerOptions(),
+    comp.CompilerOptions(use_superinstructions=True),
+]
+
+
 class TestVirtualMachine:
     # NOTE: we don't have to implement anything to do with priorities to get the parentheses
     #       to work properly; this is because the parser has already taken care of that, and
@@ -88,6 +102,21 @@ class TestVirtualMachine:
     def test_infix_expression_equals_boolean_literal(self, test_case: VirtualMachineTestCase):
         virtual_machine_test_case_internals(test_case)
 
+    @pytest.mark.parametrize(
+        "test_case_input_text",
+        [
+            "1 / 0;",
+            "10 / (5 - 5);",
+            "let f = fn(x) { x / 0 }; f(1);",
+            '"a" + 1;',
+            "-true;",
+            "true > false;",
+            '"a" == "a";',
+        ],
+    )
+    def test_invalid_infix_and_prefix_operations_raise(self, test_case_input_text: str):
+        virtual_machine_test_case_raises_internals(test_case_input_text)
+
     @pytest.mark.parametrize(
         "test_case",
         [
@@ -140,6 +169,9 @@ class TestVirtualMachine:
             VirtualMachineTestCase("if (false) { 10 };", None),
             VirtualMachineTestCase("!(if (false) { 10 });", True),
             VirtualMachineTestCase("if ( (if (false) { 10 }) ) { 10 } else { 20 };", 20),
+            VirtualMachineTestCase("let x = true; if (!x) { 10 } else { 20 };", 20),
+            VirtualMachineTestCase("let x = 1 > 2; if (!x) { 10 } else { 20 };", 10),
+            VirtualMachineTestCase("let f = fn(x) { if (!x) { 10 } }; f(5);", None),
         ],
     )
     def test_if_else_expression(self, test_case: VirtualMachineTestCase):
@@ -224,6 +256,9 @@ class TestVirtualMachine:
             VirtualMachineTestCase("{true: 5, false: 10, 7: 123}[true];", 5),
             VirtualMachineTestCase("{true: 5, false: 10, 7: 123}[false];", 10),
             VirtualMachineTestCase("{true: 5, false: 10, 7: 123}[7];", 123),
+            VirtualMachineTestCase("{1: 5, true: 10}[1];", 5),
+            VirtualMachineTestCase("{1: 5, true: 10}[true];", 10),
+            VirtualMachineTestCase('{0: 5, false: 10, "0": 15}["0"];', 15),
         ],
     )
     def test_hash_indexing(self, test_case: VirtualMachineTestCase):
@@ -235,6 +270,8 @@ class TestVirtualMachine:
             "{1: 2}[3];",
             "{1: 2}[0];",
             "{}[0];",
+            "{true: 2}[1];",
+            "{[1]: 2};",
         ],
     )
     def test_hash_index_raises(self, test_case_input_text: str):
@@ -305,6 +342,29 @@ class TestVirtualMachine:
     def test_function_call_no_return_value_no_arguments(self, test_case: VirtualMachineTestCase):
         virtual_machine_test_case_internals(test_case)
 
+    @pytest.mark.parametrize(
+        "test_case",
+        [
+            VirtualMachineTestCase(
+                """
+                let no_return = fn(a) {};
+                [no_return(1), no_return(2)];
+                """,
+                [None, None],
+            ),
+            VirtualMachineTestCase(
+                """
+                let no_return = fn(a, b) { let c = a + b; };
+                let one = fn() { 1 };
+                one() + [no_return(1, 2), 2][1];
+                """,
+                3,
+            ),
+        ],
+    )
+    def test_function_call_no_return_value_with_arguments(self, test_case: VirtualMachineTestCase):
+        virtual_machine_test_case_internals(test_case)
+
     @pytest.mark.parametrize(
         "test_case",
         [
@@ -849,6 +909,272 @@ class TestVirtualMachine:
     def test_recursive_closures(self, test_case: VirtualMachineTestCase):
         virtual_machine_test_case_internals(test_case)
 
+    @pytest.mark.parametrize(
+        "test_case",
+        [
+            VirtualMachineTestCase(
+                """
+                let fibonacci = fn(n) {
+                    if (n < 2) {
+                        return n;
+                    }
+                    fibonacci(n - 1) + fibonacci(n - 2);
+                };
+                fibonacci(15);
+                """,
+                610,
+            ),
+            VirtualMachineTestCase(
+                """
+                let maximum = fn(a, b) {
+                    if (a > b) { a } else { b }
+                };
+                maximum(3, 5) + maximum(7, 2);
+                """,
+                12,
+            ),
+            VirtualMachineTestCase(
+                """
+                let add_one = fn(x) { x + 1 };
+                let y = 10;
+                add_one(y);
+                """,
+                11,
+            ),
+            VirtualMachineTestCase("let a = 1; let b = 2; a > b;", False),
+        ],
+    )
+    def test_recursive_numeric_workloads(self, test_case: VirtualMachineTestCase):
+        virtual_machine_test_case_internals(test_case)
+
+    @pytest.mark.parametrize(
+        "test_case",
+        [
+            VirtualMachineTestCase(
+                """
+                let add = fn(a, b) { let c = a + b; c };
+                let double_and_add = fn(x) { let y = x * 2; add(x, y) };
+                double_and_add(3);
+                """,
+                9,
+            ),
+            VirtualMachineTestCase(
+                """
+                let last_length = fn(x) { len(x) };
+                let wrapper = fn() { last_length([1, 2, 3]) + 1 };
+                wrapper();
+                """,
+                4,
+            ),
+            VirtualMachineTestCase(
+                """
+                let make_adder = fn(x) { fn(y) { x + y } };
+                let apply = fn(f, value) { f(value) };
+                apply(make_adder(5), 10);
+                """,
+                15,
+            ),
+            VirtualMachineTestCase(
+                """
+                let sum = fn(n, total) {
+                    if (n == 0) { total } else { sum(n - 1, total + n) }
+                };
+                sum(100, 0);
+                """,
+                5050,
+            ),
+        ],
+    )
+    def test_tail_calls(self, test_case: VirtualMachineTestCase):
+        virtual_machine_test_case_internals(test_case)
+
+    @pytest.mark.parametrize(
+        "test_case",
+        [
+            VirtualMachineTestCase("let x = 1; x = 2; x;", 2),
+            VirtualMachineTestCase("let x = 0; while (x < 10) { x = x + 1; } x;", 10),
+            VirtualMachineTestCase("let x = 0; while (x > 0) { x = x - 1; } x;", 0),
+            VirtualMachineTestCase("while (false) { 1 };", None),
+            VirtualMachineTestCase(
+                """
+                let sum = fn(n) {
+                    let i = 0;
+                    let total = 0;
+                    while (i < n) {
+                        i = i + 1;
+                        total = total + i;
+                    }
+                    total
+                };
+                sum(100);
+                """,
+                5050,
+            ),
+            VirtualMachineTestCase(
+                """
+                let count_pairs = fn(n) {
+                    let count = 0;
+                    let i = 0;
+                    while (i < n) {
+                        let j = 0;
+                        while (j < n) {
+                            if (j > i) { count = count + 1; }
+                            j = j + 1;
+                        }
+                        i = i + 1;
+                    }
+                    count
+                };
+                count_pairs(5);
+                """,
+                10,
+            ),
+            VirtualMachineTestCase(
+                """
+                let first_square_above = fn(limit) {
+                    let i = 0;
+                    while (true) {
+                        if (i * i > limit) { return i; }
+                        i = i + 1;
+                    }
+                };
+                first_square_above(50);
+                """,
+                8,
+            ),
+            VirtualMachineTestCase(
+                """
+                let total = 0;
+                let add = fn(x) { total = total + x; };
+                add(3);
+                add(4);
+                total;
+                """,
+                7,
+            ),
+        ],
+    )
+    def test_while_and_assignment(self, test_case: VirtualMachineTestCase):
+        virtual_machine_test_case_internals(test_case)
+
+    @pytest.mark.parametrize(
+        "input_text",
+        [
+            """
+            let countdown = fn(x) {
+                if (x == 0) { return 0; }
+                return countdown(x - 1);
+            };
+            countdown(5000);
+            """,
+            """
+            let countdown = fn(x) {
+                if (x == 0) { 0 } else { countdown(x - 1) }
+            };
+            countdown(5000);
+            """,
+        ],
+    )
+    def test_tail_recursion_runs_in_constant_frame_depth(self, input_text: str):
+        # far deeper than the number of frames or the size of the stack would allow, if every
+        # call needed a frame of its own
+        assert 5000 > MAX_VM_FRAME_SIZE
+        assert 5000 > MAX_VM_STACK_SIZE
+
+        program = compiler_utils.parse(input_text)
+
+        compiler = comp.Compiler(comp.CompilerOptions(use_tail_calls=True))
+        comp.compile(compiler, program)
+        bytecode = comp.bytecode_from_compiler(compiler)
+
+        for mode in vm.ExecutionMode:
+            machine = vm.VirtualMachine(bytecode)
+            vm.run(machine, mode)
+
+            top_object = machine.stack.maybe_get_last_popped()
+            assert top_object is not None
+            assert object_utils.is_expected_object(top_object, 0)
+
+    @pytest.mark.parametrize(
+        "input_text",
+        [
+            """
+            let deep = fn(x) {
+                if (x == 0) { 0 } else { 1 + deep(x - 1) }
+            };
+            deep(5000);
+            """,
+            """
+            let deep = fn(x) {
+                let a = 1;
+                let b = 2;
+                if (x == 0) { 0 } else { a + b + deep(x - 1) }
+            };
+            deep(5000);
+            """,
+        ],
+    )
+    def test_stack_overflow_raises(self, input_text: str):
+        virtual_machine_test_case_raises_internals(input_text)
+
+    @pytest.mark.parametrize("mode", list(vm.ExecutionMode))
+    @pytest.mark.parametrize(
+        "instruction_pair",
+        [
+            (opcodes.OPCONSTANT, (0,)),
+            (opcodes.OPTRUE, ()),
+            (opcodes.OPNULL, ()),
+            (opcodes.OPGETBUILTIN, (0,)),
+            (opcodes.OPARRAY, (0,)),
+            (opcodes.OPHASH, (0,)),
+        ],
+    )
+    def test_pushing_past_the_end_of_the_stack_raises(self, mode: vm.ExecutionMode, instruction_pair):
+        instruction_pairs = [instruction_pair] * (MAX_VM_STACK_SIZE + 1)
+        instructions = code.make_instructions_from_opcode_operand_pairs(instruction_pairs)
+        machine = vm.VirtualMachine(comp.Bytecode(instructions, [objs.IntegerObject(1)]))
+
+        with pytest.raises(vm.VirtualMachineError, match="Stack overflow"):
+            vm.run(machine, mode)
+
+    @pytest.mark.parametrize("mode", list(vm.ExecutionMode))
+    @pytest.mark.parametrize("call_opcode", [opcodes.OPCALL, opcodes.OPTAILCALL])
+    def test_calling_a_function_whose_operands_overflow_raises(self, mode: vm.ExecutionMode, call_opcode):
+        # the function's operands don't fit on the stack, so the call fails before the function runs
+        function_instructions = code.make_instructions_from_opcode_operand_pairs(
+            [(opcodes.OPTRUE, ())] * MAX_VM_STACK_SIZE + [(opcodes.OPRETURNVALUE, ())]
+        )
+        function = objs.CompiledFunctionObject(function_instructions, 0, 0)
+        caller_instructions = code.make_instructions_from_opcode_operand_pairs(
+            [(opcodes.OPCLOSURE, (0, 0)), (call_opcode, (0,)), (opcodes.OPRETURNVALUE, ())]
+        )
+        caller = objs.CompiledFunctionObject(caller_instructions, 0, 0)
+        instructions = code.make_instructions_from_opcode_operand_pairs(
+            [(opcodes.OPCLOSURE, (1, 0)), (opcodes.OPCALL, (0,))]
+        )
+        machine = vm.VirtualMachine(comp.Bytecode(instructions, [function, caller]))
+
+        with pytest.raises(vm.VirtualMachineError, match="Stack overflow"):
+            vm.run(machine, mode)
+
+    @pytest.mark.parametrize("mode", list(vm.ExecutionMode))
+    def test_index_error_that_is_not_an_overflow_is_not_reported_as_one(self, mode: vm.ExecutionMode):
+        # the constant pool is empty, so there is no constant to push
+        instructions = code.make_instructions_from_opcode_operand_pairs([(opcodes.OPCONSTANT, (0,))])
+        machine = vm.VirtualMachine(comp.Bytecode(instructions, []))
+
+        with pytest.raises(IndexError):
+            vm.run(machine, mode)
+
+    @pytest.mark.parametrize("mode", [vm.ExecutionMode.PREDECODED, vm.ExecutionMode.DISPATCH_TABLE])
+    def test_debug_mode_only_runs_bytecode(self, mode: vm.ExecutionMode):
+        compiler = comp.Compiler()
+        comp.compile(compiler, compiler_utils.parse("1 + 2;"))
+        machine = vm.VirtualMachine(comp.bytecode_from_compiler(compiler), debug=True)
+
+        with pytest.raises(vm.VirtualMachineError):
+            vm.run(machine, mode)
+
 
 def virtual_machine_test_case_internals(test_case: VirtualMachineTestCase):
     """
@@ -864,16 +1190,29 @@ def virtual_machine_test_case_internals(test_case: VirtualMachineTestCase):
     be better organized.
     """
     program = compiler_utils.parse(test_case.input_text)
-    compiler = comp.Compiler()
-    comp.compile(compiler, program)
 
-    bytecode = comp.bytecode_from_compiler(compiler)
-    machine = vm.VirtualMachine(bytecode)
-    vm.run(machine)
+    # every execution mode of the VM has to agree on the result
+    for options in COMPILER_OPTIONS_VARIANTS:
+        compiler = comp.Compiler(options)
+        comp.compile(compiler, program)
+
+        bytecode = comp.bytecode_from_compiler(compiler)
+
+        for mode in vm.ExecutionMode:
+            machine = vm.VirtualMachine(bytecode)
+            vm.run(machine, mode)
+
+            top_object = machine.stack.maybe_get_last_popped()
+            assert top_object is not None
+            assert object_utils.is_expected_object(top_object, test_case.expected)
+
+        # the checked stack of the debug mode must not find anything out of bounds
+        machine = vm.VirtualMachine(bytecode, debug=True)
+        vm.run(machine, vm.ExecutionMode.BYTECODE)
 
-    top_object = machine.stack.maybe_get_last_popped()
-    assert top_object is not None
-    assert object_utils.is_expected_object(top_object, test_case.expected)
+        top_object = machine.stack.maybe_get_last_popped()
+        assert top_object is not None
+        assert object_utils.is_expected_object(top_object, test_case.expected)
 
 
 def virtual_machine_test_case_raises_internals(input_text: str):
@@ -882,11 +1221,20 @@ def virtual_machine_test_case_raises_internals(input_text: str):
     is raised.
     """
     program = compiler_utils.parse(input_text)
-    compiler = comp.Compiler()
-    comp.compile(compiler, program)
 
-    bytecode = comp.bytecode_from_compiler(compiler)
-    machine = vm.VirtualMachine(bytecode)
+    for options in COMPILER_OPTIONS_VARIANTS:
+        compiler = comp.Compiler(options)
+        comp.compile(compiler, program)
+
+        bytecode = comp.bytecode_from_compiler(compiler)
+
+        for mode in vm.ExecutionMode:
+            machine = vm.VirtualMachine(bytecode)
+
+            with pytest.raises(vm.VirtualMachineError):
+                vm.run(machine, mode)
+
+        machine = vm.VirtualMachine(bytecode, debug=True)
 
-    with pytest.raises(vm.VirtualMachineError):
-        vm.run(machine)
+        with pytest.raises(vm.VirtualMachineError):
+            vm.run(machine, vm.ExecutionMode.BYTECODE)
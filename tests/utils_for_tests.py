@@ -12,3 +12,58 @@ def program_and_env(monkey_code: str) -> tuple[Program, objs.Environment]:
     env = objs.Environment()
 
     return program, env
+
+
+# programs that every other way of running the AST must agree with `evaluate` on
+DIFFERENTIAL_PROGRAMS = [
+    "5;",
+    "-5 + 10 * 2 - 3 / 2;",
+    "!true; !5; !!false;",
+    "1 < 2; 1 > 2; 1 == 1; 1 != 1; true == false; true != false;",
+    '"hello" + " " + "world";',
+    "if (1 < 2) { 10 } else { 20 };",
+    "if (1 > 2) { 10 };",
+    "if (10 > 1) { if (10 > 1) { return 123; } return 456; };",
+    "9; return 2 * 5; 9;",
+    "let f = fn(x) { if (x > 1) { return x; } 0 }; f(5) + f(0);",
+    "let a = 5; let b = a * 2; let c = a + b; c;",
+    "let add = fn(a, b) { a + b }; add(add(1, 2), add(3, 4));",
+    "let fact = fn(n) { if (n < 2) { 1 } else { n * fact(n - 1) } }; fact(20);",
+    "let adder = fn(a) { fn(b) { a + b } }; let add_two = adder(2); add_two(40);",
+    "let compose = fn(f, g) { fn(x) { g(f(x)) } }; compose(fn(x) { x + 1 }, fn(x) { x * 2 })(5);",
+    "let i = 0; let total = 0; while (i < 10) { total = total + i; i = i + 1; } total;",
+    "let f = fn() { let i = 0; while (true) { if (i == 5) { return i; } i = i + 1; } }; f();",
+    "let count = 0; let bump = fn() { count = count + 1; }; bump(); bump(); count;",
+    "let f = fn(a) { a = a * 2; a }; f(21);",
+    "let f = fn(a) { let g = fn() { a = 1; }; g() }; f(0);",
+    "let f = fn() { b = 1; }; f();",
+    "while (1 < 2) { 1 + true; };",
+    "5 + true; 5;",
+    "-true;",
+    "true + false;",
+    '"a" - "b";',
+    "foobar;",
+    "let f = fn(x) { x }; f(y);",
+    "5(1);",
+    'len([1, 2, 3]) + len("four");',
+    "push(rest([1, 2, 3]), 4);",
+    "let len = fn(x) { 42 }; len([1]);",
+    "len(1);",
+    "[1, 2 * 2, 3 + 3][1];",
+    "[1, 2, 3][3];",
+    '"abc"[1];',
+    '{"one": 1, "two": 2, true: 3, 4: 4}["two"];',
+    '{"one": 1}["three"];',
+    "{[1]: 2};",
+    "{1: 2}[fn(x) { x }];",
+    "fn(x, y) { x + y };",
+    "let f = fn(x) { x }; f(1, 2);",
+    # `x` refers to the global binding until the function binds its own
+    "let x = 1; let f = fn() { let a = x; let x = 2; a + x }; f();",
+    # the inner function is created before the outer one binds `y`
+    "let f = fn() { let g = fn() { y }; let y = 7; g() }; f();",
+    # a binding inside of a block belongs to the function around it
+    "let f = fn() { if (true) { let z = 3; } z }; f();",
+    "let f = fn() { [if (true) { let w = 4; w }, w] }; f();",
+    "let x = if (true) { return 5; }; x;",
+]